@@ -1,6 +1,5 @@
 import asyncio
 import base64
-import glob
 import json
 import os
 import random
@@ -23,12 +22,20 @@ from .config import (
     TEXT_ONLY_MODE,
 )
 from .logger import logger
+from .metrics import (
+    MIC_FRAMES_DROPPED,
+    MIC_FRAMES_SENT,
+    PLAYBACK_QUEUE_DEPTH,
+    TTS_UNDERRUNS,
+    mark_audio_written,
+)
 from .movements import (
     flap_from_pcm_chunk,
     interlude,
     move_head,
     move_tail_async,
 )
+from .tracing import turn_tracer
 
 
 # === Audio Device Globals ===
@@ -39,12 +46,13 @@ OUTPUT_DEVICE_INDEX = None
 OUTPUT_CHANNELS = 2
 OUTPUT_RATE = None
 CHUNK_SIZE = None
-WAKE_UP_DIR = "sounds/wake-up/custom"
-WAKE_UP_DIR_DEFAULT = "sounds/wake-up/default"
 RESPONSE_HISTORY_DIR = "sounds/response-history"
 os.makedirs(RESPONSE_HISTORY_DIR, exist_ok=True)
 
 playback_queue = Queue()
+PLAYBACK_QUEUE_DEPTH.set_function(playback_queue.qsize)
+# True while a provider response is streaming audio; an empty queue then is an underrun
+tts_streaming = False
 head_move_queue = Queue()
 playback_done_event = threading.Event()
 _playback_thread = None
@@ -77,7 +85,7 @@ def detect_devices(debug=False):
 
     devices: sd.DeviceList = sd.query_devices()
 
-    logger.info("Enumerating audio devices...", "🔢")
+    logger.info("Enumerating audio devices...", emoji="🔢")
     for i, d in enumerate(devices):
         if debug:
             logger.verbose(
@@ -136,8 +144,10 @@ def playback_worker(chunk_ms):
         with sd.OutputStream(
             samplerate=48000, channels=2, dtype='int16', device=OUTPUT_DEVICE_INDEX
         ) as stream:
-            logger.info("Output stream opened", "🔈")
+            logger.info("Output stream opened", emoji="🔈")
             while True:
+                if tts_streaming and playback_queue.empty():
+                    TTS_UNDERRUNS.inc()
                 item = playback_queue.get()
                 now = time.time()
 
@@ -158,7 +168,7 @@ def playback_worker(chunk_ms):
                         print(f"🐟 Head move started for {move_duration:.2f} seconds")
 
                 if item is None:
-                    logger.info("Received stop signal, cleaning up.", "🧵")
+                    logger.info("Received stop signal, cleaning up.", emoji="🧵")
                     playback_queue.task_done()
                     break
 
@@ -231,6 +241,9 @@ def playback_worker(chunk_ms):
                             interlude_counter, interlude_target
                         )
 
+                if tts_streaming:
+                    mark_audio_written()
+                    turn_tracer.mark("first_audible_sample")
                 playback_queue.task_done()
                 last_played_time = time.time()
 
@@ -258,7 +271,7 @@ def save_audio_to_wav(audio_bytes, filename):
         wf.setsampwidth(2)
         wf.setframerate(PROVIDER_OUTPUT_RATE)
         wf.writeframes(audio_bytes)
-    logger.verbose(f"Saved response audio to {full_path}", "🎨")
+    logger.verbose(f"Saved response audio to {full_path}", emoji="🎨")
 
 
 def rotate_and_save_response_audio(audio_bytes):
@@ -283,10 +296,13 @@ def send_mic_audio(ws, samples, loop):
     try:
         # Session teardown races can call this with invalid websocket/loop.
         if ws is None or loop is None:
+            MIC_FRAMES_DROPPED.inc()
             return
         if getattr(ws, "closed", False):
+            MIC_FRAMES_DROPPED.inc()
             return
         if getattr(loop, "is_closed", lambda: False)():
+            MIC_FRAMES_DROPPED.inc()
             return
 
         # Ensure samples is a proper numpy array
@@ -316,18 +332,22 @@ def send_mic_audio(ws, samples, loop):
             ),
             loop,
         )
+        MIC_FRAMES_SENT.inc()
 
         # Don't block on websocket send - let it complete asynchronously
         # This significantly improves audio response latency
     except RuntimeError as e:
         # Typical during shutdown (event loop closed / scheduling after stop).
-        logger.verbose(f"Skipping mic chunk during shutdown: {e}", "ℹ️")
+        MIC_FRAMES_DROPPED.inc()
+        logger.verbose("Skipping mic chunk during shutdown: %s", e, emoji="ℹ️")
     except Exception as e:
-        logger.warning(f"Failed to send audio chunk: {e}")
+        MIC_FRAMES_DROPPED.inc()
+        logger.warning("Failed to send audio chunk: %s", e, emoji="⚠️")
         logger.verbose(
-            f"Mic chunk debug | type={type(samples)} "
-            f"| shape={getattr(samples, 'shape', 'no shape')}",
-            "🔍",
+            "Mic chunk debug | type=%s | shape=%s",
+            type(samples),
+            getattr(samples, 'shape', 'no shape'),
+            emoji="🔍",
         )
 
 
@@ -349,43 +369,35 @@ def enqueue_wav_to_playback(filepath):
             playback_queue.put(frames)
 
 
+def enqueue_pcm_to_playback(pcm: bytes):
+    """Enqueue already decoded 24 kHz mono 16-bit PCM in CHUNK_MS pieces."""
+    chunk_bytes = int(PROVIDER_OUTPUT_RATE * CHUNK_MS / 1000) * 2
+    for offset in range(0, len(pcm), chunk_bytes):
+        playback_queue.put(pcm[offset : offset + chunk_bytes])
+
+
 def play_random_wake_up_clip():
     """Select and enqueue a random wake-up WAV file with mouth movement."""
-    clips = []
+    clips = ()
 
-    # First, try to get current persona and check appropriate directory
+    # Clips are decoded once per persona bundle, with the folder fallbacks
+    # (persona folder, custom clips, stock clips) already applied.
     try:
         from .persona_manager import persona_manager
 
-        current_persona = persona_manager.current_persona
-        if current_persona and current_persona != "default":
-            # For non-default personas, check persona-specific directory
-            persona_wakeup_dir = os.path.join("personas", current_persona, "wakeup")
-            if os.path.exists(persona_wakeup_dir):
-                clips = glob.glob(os.path.join(persona_wakeup_dir, "*.wav"))
-                if clips:
-                    logger.info(f"Using wake-up clips from persona: {current_persona}", "🎭")
-        elif current_persona == "default":
-            # For default persona, use the custom folder
-            clips = glob.glob(os.path.join(WAKE_UP_DIR, "*.wav"))
-            if clips:
-                logger.info("Using custom wake-up clips for default persona", "🔊")
-    except Exception as e:
-        logger.warning(f"Failed to get current persona: {e}", "⚠️")
-
-    # If no clips found yet, check custom folder as fallback
-    if not clips:
-        clips = glob.glob(os.path.join(WAKE_UP_DIR, "*.wav"))
+        bundle = persona_manager.get_current_bundle()
+        clips = bundle.wakeup_clips
         if clips:
-            logger.info("Using custom wake-up clips (fallback)", "🔊")
-
-    # If still no clips, fall back to default
-    if not clips:
-        logger.info("No custom clips found, falling back to default.", "🔁")
-        clips = glob.glob(os.path.join(WAKE_UP_DIR_DEFAULT, "*.wav"))
+            logger.info(
+                f"Using wake-up clips from {bundle.wakeup_source} "
+                f"(persona: {bundle.name})",
+                emoji="🎭",
+            )
+    except Exception as e:
+        logger.warning(f"Failed to get current persona: {e}", emoji="⚠️")
 
     if not clips:
-        logger.warning("No wake-up clips found in any directory.", "⚠️")
+        logger.warning("No wake-up clips found in any directory.", emoji="⚠️")
         playback_done_event.set()  # SRES-01: prevent mic start deadlock
         return None
 
@@ -394,12 +406,12 @@ def play_random_wake_up_clip():
     # Track how many tasks were pending before enqueue
     already_pending = playback_queue.unfinished_tasks
     logger.info(
-        f"🔧 Enqueuing wake-up clip: {os.path.basename(clip)}, already_pending={already_pending}",
-        "🔧",
+        f"🔧 Enqueuing wake-up clip: {os.path.basename(clip.path)}, already_pending={already_pending}",
+        emoji="🔧",
     )
 
-    # Enqueue the WAV file
-    enqueue_wav_to_playback(clip)
+    # Enqueue the decoded clip
+    enqueue_pcm_to_playback(clip.pcm)
 
     # Give the queue a moment to register the new tasks
     time.sleep(0.05)
@@ -407,7 +419,7 @@ def play_random_wake_up_clip():
     new_tasks = playback_queue.unfinished_tasks
     logger.info(
         f"🔧 After enqueue: unfinished_tasks={new_tasks} (added {new_tasks - already_pending} chunks)",
-        "🔧",
+        emoji="🔧",
     )
 
     # Wait for exactly those new chunks to finish
@@ -417,17 +429,19 @@ def play_random_wake_up_clip():
         time.sleep(0.01)
 
     elapsed = time.time() - start_time
-    logger.info(f"🔧 Wake-up sound playback completed in {elapsed:.2f}s", "🔧")
+    logger.info(f"🔧 Wake-up sound playback completed in {elapsed:.2f}s", emoji="🔧")
 
     # Once done, set the event
     playback_done_event.set()
-    logger.info("🔧 playback_done_event SET (wake-up sound finished)", "🔧")
+    logger.info("🔧 playback_done_event SET (wake-up sound finished)", emoji="🔧")
 
-    return clip
+    return clip.path
 
 
 def stop_playback():
     """Immediately stop playback and flush queue."""
+    global tts_streaming
+    tts_streaming = False
     while not playback_queue.empty():
         try:
             playback_queue.get_nowait()
@@ -470,6 +484,7 @@ async def play_song(song_name, interrupt_event=None):
     import contextlib
 
     from core import audio
+    from core.ipc import publish_state
     from core.movements import stop_all_motors
     from core.mqtt import mqtt_publish
     from core.song_manager import song_manager
@@ -606,6 +621,7 @@ async def play_song(song_name, interrupt_event=None):
     ensure_playback_worker_started(CHUNK_MS)
 
     mqtt_publish("billy/state", "playing_song")
+    publish_state("playing_song")
     print(f"\n🎧 Playing {song_name} with mouth (vocals) and tail (drums) flaps")
 
     try:
@@ -714,6 +730,7 @@ async def play_song(song_name, interrupt_event=None):
         audio.song_mode = False
         stop_all_motors()
         mqtt_publish("billy/state", "idle")
+        publish_state("idle")
         print("🎶 Song finished, waiting for button press.")
 
 
@@ -5,7 +5,7 @@ These are the custom Billy functions.
 
 from typing import Any
 
-from .config import PERSONALITY
+from .config import MEMORY_RECALL, PERSONALITY
 from .song_manager import song_manager
 
 
@@ -60,6 +60,25 @@ def get_base_tools() -> list[dict[str, Any]]:
                 "required": ["prompt"],
             },
         },
+        {
+            "name": "smart_home_state",
+            "type": "function",
+            "description": "Look up the current state of Home Assistant devices (e.g., 'Is the front door locked?', 'Are the kitchen lights on?', 'What is the living room temperature?'). Answers from Billy's live copy of Home Assistant state, so it is instant. Use this instead of smart_home_command for questions.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "entity": {
+                        "type": "string",
+                        "description": "The device or area to check (e.g., 'front door', 'kitchen lights')",
+                    },
+                    "question": {
+                        "type": "string",
+                        "description": "The user's full question, used if the device can't be found locally",
+                    },
+                },
+                "required": ["entity"],
+            },
+        },
         {
             "name": "conversation_state",
             "type": "function",
@@ -177,7 +196,7 @@ def get_base_tools() -> list[dict[str, Any]]:
 
 def get_user_tools() -> list[dict[str, Any]]:
     """Get user-specific tools (only available when not in guest mode)"""
-    return [
+    tools = [
         {
             "name": "store_memory",
             "type": "function",
@@ -253,3 +272,24 @@ def get_user_tools() -> list[dict[str, Any]]:
             },
         },
     ]
+    if MEMORY_RECALL:
+        tools.append({
+            "name": "recall_memory",
+            "type": "function",
+            "description": "Search everything remembered about the current user by meaning. Use when the user refers to something they told you before, or when a stored fact would help answer.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "What to look for, e.g. 'dog's name' or 'favorite music'",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of memories to return (default 5)",
+                    },
+                },
+                "required": ["query"],
+            },
+        })
+    return tools
@@ -21,10 +21,10 @@ if config.MOCKFISH or not gpiozero_available:
             self.when_pressed = None
             self.is_pressed = False
             if config.MOCKFISH:
-                logger.info(f"Mockfish: Button on pin {pin} mocked", "Fish")
+                logger.info(f"Mockfish: Button on pin {pin} mocked", emoji="Fish")
             elif not gpiozero_available:
                 logger.info(
-                    f"gpiozero not available: Button on pin {pin} mocked", "Fish"
+                    f"gpiozero not available: Button on pin {pin} mocked", emoji="Fish"
                 )
                 # Start thread to listen for Enter key using pynput
                 import threading
@@ -40,7 +40,8 @@ if config.MOCKFISH or not gpiozero_available:
 
             if not sys.stdin.isatty():
                 logger.warning(
-                    "stdin is not a tty, mock button input not available", "Warning"
+                    "stdin is not a tty, mock button input not available",
+                    emoji="Warning",
                 )
                 return
             while True:
@@ -68,9 +69,9 @@ def _ensure_button_hold_thread():
         hold_thread = getattr(button, "_hold_thread", None)
         if hold_thread is None:
             button._hold_thread = HoldThread(button)
-            logger.warning("Repaired gpiozero button hold thread", "Wrench")
+            logger.warning("Repaired gpiozero button hold thread", emoji="Wrench")
     except Exception as e:
-        logger.warning(f"Failed to repair button hold thread: {e}", "Warning")
+        logger.warning(f"Failed to repair button hold thread: {e}", emoji="Warning")
 
 
 def is_billy_speaking():
@@ -95,17 +96,19 @@ def start_loop():
 
         def _on_wake_word_detected(payload: dict) -> None:
             """Callback invoked by hotword controller on wake word detection."""
-            logger.info(f"Wake word detected: {payload}", "Speech")
+            logger.info(f"Wake word detected: {payload}", emoji="Speech")
             trigger.trigger_session_start("wake_word")
 
         wake_word_controller.set_detection_callback(_on_wake_word_detected)
         wake_word_controller.start()
-        logger.info("Wake word detection enabled and started", "Ear")
+        logger.info("Wake word detection enabled and started", emoji="Ear")
     else:
-        logger.info("Wake word detection disabled (WAKE_WORD_ENABLED=false)", "Info")
+        logger.info(
+            "Wake word detection disabled (WAKE_WORD_ENABLED=false)", emoji="Info"
+        )
 
     if config.FLAP_ON_BOOT:
-        logger.info("Starting Billy startup animation", "Theater")
+        logger.info("Starting Billy startup animation", emoji="Theater")
         move_head("on")
         time.sleep(0.5)
         move_tail(0.3)
@@ -114,15 +117,16 @@ def start_loop():
         time.sleep(0.5)
         move_tail(0.3)
         move_tail(0.3)
-        logger.info("Billy startup animation complete", "Check")
+        logger.info("Billy startup animation complete", emoji="Check")
 
     button.when_pressed = on_button
     logger.info(
-        "Ready. Press button to start a voice session. Press Ctrl+C to quit.", "Movie"
+        "Ready. Press button to start a voice session. Press Ctrl+C to quit.",
+        emoji="Movie",
     )
-    logger.info("Waiting for button press...", "Clock")
+    logger.info("Waiting for button press...", emoji="Clock")
     if config.MOCKFISH:
-        logger.info("Mockfish mode: use Enter to simulate button press", "Fish")
+        logger.info("Mockfish mode: use Enter to simulate button press", emoji="Fish")
         try:
             while True:
                 input("Press Enter to simulate button press: ")
@@ -91,6 +91,7 @@ def _float_env_ranged(
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ENV_PATH = os.path.join(ROOT_DIR, ".env")
 PERSONA_PATH = os.path.join(ROOT_DIR, "persona.ini")
+CACHE_DIR = os.path.join(ROOT_DIR, "cache")
 
 # === Load .env ===
 load_dotenv(dotenv_path=ENV_PATH)
@@ -118,11 +119,13 @@ NEVER speak or print tool calls out loud. Do NOT include text like
 PERSONALITY: Use update_personality when users request changes (e.g., "be funnier" -> update_personality({"humor": 80}))
 
 SMART HOME: Only call smart_home_command for DIRECT commands ("turn on lights"). If asked to "ask if" or "check if", just speak the question.
+SMART HOME STATUS: For questions about device state ("is the front door locked?", "what's the living room temperature?"), call smart_home_state.
 NEWS: When the user asks for news, headlines, or updates, you MUST call get_news_digest. Do NOT just say you will check — actually call the tool. Set category="headlines" and a concise subject keyword. Do NOT call conversation_state before the tool returns. Call the tool FIRST, wait for results, THEN speak.
 
 USER SYSTEM:
 - identify_user: Call when someone introduces themselves ("I am Tom")
 - store_memory: Store lasting facts users voluntarily share (NOT answers to your questions)
+- recall_memory: Look up what you know about the user ("what's my dog called?", "remember my favorite band?") before saying you don't know
 - manage_profile/switch_persona: Change personas
 
 SONGS: Use play_song for special songs
@@ -155,11 +158,13 @@ TOOL_INSTRUCTIONS_NO_CONVERSATION_STATE = """
 PERSONALITY: Use update_personality when users request changes (e.g., "be funnier" -> update_personality({"humor": 80}))
 
 SMART HOME: Only call smart_home_command for DIRECT commands ("turn on lights"). If asked to "ask if" or "check if", just speak the question.
+SMART HOME STATUS: For questions about device state ("is the front door locked?", "what's the living room temperature?"), call smart_home_state.
 NEWS: When the user asks for news, headlines, or updates, you MUST call get_news_digest. Do NOT just say you will check — actually call the tool. Set category="headlines" and a concise subject keyword. Do NOT call conversation_state before the tool returns. Call the tool FIRST, wait for results, THEN speak.
 
 USER SYSTEM:
 - identify_user: Call when someone introduces themselves ("I am Tom")
 - store_memory: Store lasting facts users voluntarily share (NOT answers to your questions)
+- recall_memory: Look up what you know about the user ("what's my dog called?", "remember my favorite band?") before saying you don't know
 - manage_profile/switch_persona: Change personas
 
 SONGS: Use play_song for special songs
@@ -309,10 +314,29 @@ WAKE_WORD_ENABLED = os.getenv("WAKE_WORD_ENABLED", "false").lower() == "true"
 WAKE_WORD_SENSITIVITY = _float_env_ranged("WAKE_WORD_SENSITIVITY", "0.5", min_val=0.0, max_val=1.0)
 WAKE_WORD_THRESHOLD = _float_env_ranged("WAKE_WORD_THRESHOLD", "2400", min_val=0.0)
 WAKE_WORD_ENDPOINT = os.getenv("WAKE_WORD_ENDPOINT", "").strip()
+# auto | porcupine | openwakeword | rms (auto prefers Porcupine when it has a key)
+WAKE_WORD_ENGINE = os.getenv("WAKE_WORD_ENGINE", "auto").strip().lower() or "auto"
 WAKE_WORD_PORCUPINE_ACCESS_KEY = (
     os.getenv("WAKE_WORD_PORCUPINE_ACCESS_KEY")
     or os.getenv("PICOVOICE_ACCESS_KEY", "")
 ).strip()
+# Two-stage detection: a cheap energy/spectral-flux gate runs on every block
+# and the keyword engine only sees audio while it is open
+WAKE_WORD_GATE_ENABLED = os.getenv("WAKE_WORD_GATE_ENABLED", "true").lower() == "true"
+WAKE_WORD_GATE_RATIO = _float_env_ranged("WAKE_WORD_GATE_RATIO", "3.0", min_val=1.0)
+WAKE_WORD_GATE_FLUX = _float_env_ranged("WAKE_WORD_GATE_FLUX", "0.3", min_val=0.0)
+WAKE_WORD_GATE_HOLD_MS = _int_env("WAKE_WORD_GATE_HOLD_MS", "1000", min_val=0)
+WAKE_WORD_PREROLL_MS = _int_env("WAKE_WORD_PREROLL_MS", "1000", min_val=0, max_val=5000)
+# Audio said straight after the wake word is captured and sent to the session
+WAKE_WORD_HANDOFF_ENABLED = (
+    os.getenv("WAKE_WORD_HANDOFF_ENABLED", "true").lower() == "true"
+)
+WAKE_WORD_CAPTURE_SECONDS = _float_env_ranged(
+    "WAKE_WORD_CAPTURE_SECONDS", "4.0", min_val=1.0, max_val=15.0
+)
+WAKE_WORD_HANDOFF_LISTEN_MS = _int_env(
+    "WAKE_WORD_HANDOFF_LISTEN_MS", "600", min_val=0, max_val=2000
+)
 
 # === GPIO Config ===
 BUTTON_PIN = 27 if BILLY_PINS == "legacy" else 24  # legacy=pin 13, new=pin 18
@@ -327,6 +351,10 @@ MQTT_PASSWORD = os.getenv("MQTT_PASSWORD", "")
 HA_HOST = os.getenv("HA_HOST")
 HA_TOKEN = os.getenv("HA_TOKEN")
 HA_LANG = os.getenv("HA_LANG", "en")
+# Resolve simple commands ("turn on kitchen lights") locally as direct service calls
+HA_LOCAL_INTENTS = os.getenv("HA_LOCAL_INTENTS", "true").lower() == "true"
+# Keep a persistent websocket to HA for commands, health and live entity state
+HA_WEBSOCKET = os.getenv("HA_WEBSOCKET", "true").lower() == "true"
 
 # === Weather Config ===
 WEATHER_LATITUDE = os.getenv("WEATHER_LATITUDE")
@@ -337,6 +365,7 @@ WEATHER_LOCATION_NAME = os.getenv("WEATHER_LOCATION_NAME", "")
 ALLOW_UPDATE_PERSONALITY_INI = (
     os.getenv("ALLOW_UPDATE_PERSONALITY_INI", "true").lower() == "true"
 )
+PERSONA_BUNDLE_CACHE_SIZE = _int_env("PERSONA_BUNDLE_CACHE_SIZE", "4", min_val=1)
 
 # === Software Config ===
 FLASK_PORT = _int_env("FLASK_PORT", "80", min_val=1, max_val=65535)
@@ -346,12 +375,40 @@ SHOW_RC_VERSIONS = os.getenv("SHOW_RC_VERSIONS", "False")
 FLAP_ON_BOOT = os.getenv("FLAP_ON_BOOT", "false").lower() == "true"
 MOCKFISH = os.getenv("MOCKFISH", "false").lower() == "true"
 
+# === Metrics Config ===
+# Serve Prometheus metrics on this port (0 = disabled)
+METRICS_PORT = _int_env("METRICS_PORT", "0", min_val=0, max_val=65535)
+METRICS_HOST = os.getenv("METRICS_HOST", "0.0.0.0")
+
+# === IPC Config ===
+# Unix socket the web UI uses to talk to the running Billy process (empty = off)
+IPC_SOCKET_PATH = os.getenv("IPC_SOCKET_PATH", os.path.join(CACHE_DIR, "billy.sock"))
+if IPC_SOCKET_PATH:
+    IPC_SOCKET_PATH = os.path.join(ROOT_DIR, IPC_SOCKET_PATH)
+
+# === Turn Tracing Config ===
+# Write per-turn stage timings to cache/turn_traces.jsonl
+TURN_TRACE_ENABLED = os.getenv("TURN_TRACE_ENABLED", "false").lower() == "true"
+TURN_TRACE_MAX_BYTES = _int_env("TURN_TRACE_MAX_BYTES", "1000000", min_val=1024)
+# Also publish each finished turn to billy/trace/turn
+TURN_TRACE_MQTT = os.getenv("TURN_TRACE_MQTT", "false").lower() == "true"
+
 # === News Digest Config ===
 NEWS_REQUEST_TIMEOUT_SECONDS = float(os.getenv("NEWS_REQUEST_TIMEOUT_SECONDS", "6"))
 
+# === Web Search Config ===
+WEB_SEARCH_CACHE_TTL_SECONDS = _float_env_ranged(
+    "WEB_SEARCH_CACHE_TTL_SECONDS", "900", min_val=0.0
+)
+WEB_SEARCH_CACHE_SIZE = _int_env("WEB_SEARCH_CACHE_SIZE", "128", min_val=1)
+WEB_SEARCH_CACHE_PERSIST = (
+    os.getenv("WEB_SEARCH_CACHE_PERSIST", "false").lower() == "true"
+)
+
 # === User Profile Config ===
 DEFAULT_USER = os.getenv("DEFAULT_USER", "guest").strip()
 CURRENT_USER = os.getenv("CURRENT_USER", "").strip()
+MEMORY_RECALL = os.getenv("MEMORY_RECALL", "true").lower() == "true"
 
 
 def is_classic_billy():
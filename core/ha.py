@@ -1,9 +1,12 @@
-import asyncio
 import time as _time
+from typing import Any
 
 import aiohttp
 
-from core.config import HA_HOST, HA_LANG, HA_TOKEN
+from core.config import HA_HOST, HA_LANG, HA_LOCAL_INTENTS, HA_TOKEN
+from core.ha_entities import ha_entity_cache
+from core.ha_ws import ha_ws_client
+from core.http_client import get_session
 from core.logger import logger
 
 
@@ -11,6 +14,12 @@ from core.logger import logger
 _ha_unavailable_until: float = 0.0
 _HA_CACHE_TTL: float = 30.0  # seconds
 
+# Per-path command latency: "local" (direct service call) vs "conversation".
+_command_stats: dict[str, dict[str, float]] = {
+    "local": {"count": 0, "total_ms": 0.0, "last_ms": 0.0, "max_ms": 0.0},
+    "conversation": {"count": 0, "total_ms": 0.0, "last_ms": 0.0, "max_ms": 0.0},
+}
+
 
 def _mark_ha_unavailable() -> None:
     """Mark HA as temporarily unavailable for ``_HA_CACHE_TTL`` seconds."""
@@ -19,9 +28,16 @@ def _mark_ha_unavailable() -> None:
 
 
 def ha_available() -> bool:
-    """Return True when HA is configured and not in the failure cool-down."""
+    """Return True when HA is configured and currently reachable.
+
+    A connected websocket proves HA is up. A disconnected one proves nothing
+    (still starting, backing off, or blocked while REST works), so otherwise
+    only the REST failure cool-down decides.
+    """
     if not (HA_HOST and HA_TOKEN):
         return False
+    if ha_ws_client.connected:
+        return True
     return _time.time() >= _ha_unavailable_until
 
 
@@ -29,7 +45,7 @@ async def send_conversation_prompt(prompt: str) -> str | None:
     """Send a conversation prompt to Home Assistant's conversation API."""
     if not ha_available():
         logger.warning(
-            "Home Assistant not configured or temporarily unavailable.", "⚠️"
+            "Home Assistant not configured or temporarily unavailable.", emoji="⚠️"
         )
         return None
 
@@ -40,22 +56,185 @@ async def send_conversation_prompt(prompt: str) -> str | None:
     }
     payload = {"text": prompt, "language": HA_LANG}
 
+    if ha_ws_client.connected:
+        try:
+            result = await ha_ws_client.request(
+                {"type": "conversation/process", **payload}, timeout=5.0
+            )
+            return (result or {}).get("response", "")
+        except TimeoutError:
+            logger.warning("HA conversation prompt timed out (5s)", emoji="⏱️")
+            return None
+        except Exception as e:
+            logger.error(f"Error sending conversation prompt over HA websocket: {e}")
+            return None
+
     try:
         timeout = aiohttp.ClientTimeout(total=5)  # HARE-01: 5s timeout
-        async with (
-            aiohttp.ClientSession(timeout=timeout) as session,
-            session.post(url, headers=headers, json=payload) as resp,
-        ):
+        session = get_session()
+        async with session.post(
+            url, headers=headers, json=payload, timeout=timeout
+        ) as resp:
             if resp.status == 200:
                 data = await resp.json()
                 return data.get("response", "")
-            logger.warning(f"HA API returned HTTP {resp.status}", "⚠️")
+            logger.warning(f"HA API returned HTTP {resp.status}", emoji="⚠️")
             return None
-    except asyncio.TimeoutError:
-        logger.warning("HA conversation prompt timed out (5s)", "⏱️")
+    except TimeoutError:
+        logger.warning("HA conversation prompt timed out (5s)", emoji="⏱️")
         _mark_ha_unavailable()
         return None
     except Exception as e:
         logger.error(f"Error reaching Home Assistant API: {e}")
         _mark_ha_unavailable()
         return None
+
+
+def _record_command_latency(path: str, elapsed_ms: float) -> None:
+    stats = _command_stats[path]
+    stats["count"] += 1
+    stats["total_ms"] += elapsed_ms
+    stats["last_ms"] = elapsed_ms
+    stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+    logger.info(f"HA command via {path} path took {elapsed_ms:.0f} ms", emoji="⏱️")
+
+
+def get_command_stats() -> dict[str, dict[str, float]]:
+    """Return smart-home command latency statistics per path."""
+    result = {}
+    for path, stats in _command_stats.items():
+        entry = dict(stats)
+        entry["avg_ms"] = stats["total_ms"] / stats["count"] if stats["count"] else 0.0
+        result[path] = entry
+    return result
+
+
+async def call_service(
+    domain: str, service: str, data: dict[str, Any]
+) -> list[dict[str, Any]] | None:
+    """Call an HA service directly and return the states it changed.
+
+    Over the websocket the changed states arrive as ``state_changed`` events
+    instead, so an empty list is returned on success.
+    """
+    if ha_ws_client.connected:
+        entity_ids = data.get("entity_id")
+        try:
+            await ha_ws_client.request(
+                {
+                    "type": "call_service",
+                    "domain": domain,
+                    "service": service,
+                    "target": {"entity_id": entity_ids},
+                },
+                timeout=5.0,
+            )
+            return []
+        except TimeoutError:
+            logger.warning(f"HA service {domain}.{service} timed out (5s)", emoji="⏱️")
+            return None
+        except Exception as e:
+            logger.error(
+                f"Error calling Home Assistant service {domain}.{service}: {e}"
+            )
+            return None
+
+    url = f"{HA_HOST.rstrip('/')}/api/services/{domain}/{service}"
+    headers = {
+        "Authorization": f"Bearer {HA_TOKEN}",
+        "Content-Type": "application/json",
+    }
+    try:
+        timeout = aiohttp.ClientTimeout(total=5)
+        async with get_session().post(
+            url, headers=headers, json=data, timeout=timeout
+        ) as resp:
+            if resp.status == 200:
+                return await resp.json()
+            logger.warning(
+                f"HA service {domain}.{service} returned HTTP {resp.status}", emoji="⚠️"
+            )
+            return None
+    except TimeoutError:
+        logger.warning(f"HA service {domain}.{service} timed out (5s)", emoji="⏱️")
+        _mark_ha_unavailable()
+        return None
+    except Exception as e:
+        logger.error(f"Error calling Home Assistant service {domain}.{service}: {e}")
+        _mark_ha_unavailable()
+        return None
+
+
+async def _try_local_command(prompt: str) -> dict[str, Any] | None:
+    """Resolve ``prompt`` against the entity cache and call the service directly."""
+    await ha_entity_cache.refresh_if_stale()
+    intent = ha_entity_cache.resolve(prompt)
+    if intent is None:
+        logger.verbose(
+            f"No local HA intent for {prompt!r}; using conversation", emoji="🏠"
+        )
+        return None
+
+    logger.info(
+        f"Local HA intent: {intent.domain}.{intent.service} -> {intent.entity_ids}",
+        emoji="🏠",
+    )
+    changed = await call_service(
+        intent.domain, intent.service, {"entity_id": intent.entity_ids}
+    )
+    if changed is None:
+        return None
+    ha_entity_cache.apply_states(changed)
+
+    # Mirror the conversation API response shape used by FunctionHandler.
+    return {
+        "response_type": "action_done",
+        "speech": {"plain": {"speech": intent.speech()}},
+        "data": {"targets": intent.entity_ids, "source": "local"},
+    }
+
+
+async def warm_entity_cache() -> None:
+    """Preload the entity cache so the first command can use the local path."""
+    if HA_LOCAL_INTENTS and ha_available():
+        await ha_entity_cache.refresh_if_stale()
+
+
+async def handle_smart_home_prompt(prompt: str) -> dict[str, Any] | None:
+    """Run a smart-home command, preferring a local direct service call."""
+    if not ha_available():
+        logger.warning(
+            "Home Assistant not configured or temporarily unavailable.", emoji="⚠️"
+        )
+        return None
+
+    started_at = _time.perf_counter()
+    if HA_LOCAL_INTENTS:
+        response = await _try_local_command(prompt)
+        if response is not None:
+            _record_command_latency(
+                "local", (_time.perf_counter() - started_at) * 1000.0
+            )
+            return response
+
+    started_at = _time.perf_counter()
+    response = await send_conversation_prompt(prompt)
+    _record_command_latency(
+        "conversation", (_time.perf_counter() - started_at) * 1000.0
+    )
+    return response
+
+
+async def get_entity_states(phrase: str) -> list[dict[str, Any]]:
+    """Answer state questions ("is the door locked?") from the local cache."""
+    await ha_entity_cache.refresh_if_stale()
+    return [
+        {
+            "entity_id": state.get("entity_id"),
+            "name": (state.get("attributes") or {}).get("friendly_name"),
+            "state": state.get("state"),
+            "unit": (state.get("attributes") or {}).get("unit_of_measurement"),
+            "last_changed": state.get("last_changed"),
+        }
+        for state in ha_entity_cache.find_states(phrase)
+    ]
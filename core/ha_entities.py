@@ -0,0 +1,404 @@
+"""Local Home Assistant entity/area/service cache and simple intent resolver.
+
+The cache is loaded over HA's REST API and lets ``core.ha`` resolve simple
+commands such as "turn on the kitchen lights" to a direct service call,
+without a round-trip through HA's conversation agent. Anything the resolver
+is not sure about returns None so the caller can fall back to the
+conversation API.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+
+from .config import HA_HOST, HA_TOKEN
+from .http_client import get_session
+from .logger import logger
+
+
+# Refresh the full entity list at most this often; state-change events and
+# service-call responses keep individual entities fresh in between.
+CACHE_TTL_SECONDS = 300.0
+RETRY_AFTER_FAILURE_SECONDS = 30.0
+REQUEST_TIMEOUT_SECONDS = 5.0
+
+# Renders {"area name": ["entity_id", ...]} using HA's template helpers.
+AREA_TEMPLATE = (
+    "{% set ns = namespace(areas={}) %}"
+    "{% for area in areas() %}"
+    "{% set ns.areas = dict(ns.areas, **{area_name(area): area_entities(area)}) %}"
+    "{% endfor %}"
+    "{{ ns.areas | tojson }}"
+)
+
+# Spoken words that name a domain, singular first.
+DOMAIN_WORDS: dict[str, tuple[str, ...]] = {
+    "light": ("light", "lights", "lamp", "lamps"),
+    "switch": ("switch", "switches", "plug", "plugs", "outlet", "outlets"),
+    "fan": ("fan", "fans"),
+    "cover": ("blind", "blinds", "curtain", "curtains", "shade", "shades"),
+    "lock": ("lock", "locks"),
+    "media_player": ("speaker", "speakers", "tv", "television"),
+    "input_boolean": (),
+}
+PLURAL_WORDS = {
+    "lights",
+    "lamps",
+    "switches",
+    "plugs",
+    "outlets",
+    "fans",
+    "blinds",
+    "curtains",
+    "shades",
+    "locks",
+    "speakers",
+}
+
+# (pattern, action) pairs; the first capture group is the target phrase.
+ACTION_PATTERNS: list[tuple[re.Pattern, str]] = [
+    (re.compile(r"^(?:turn|switch) on (?:the )?(.+)$"), "on"),
+    (re.compile(r"^(?:turn|switch) (?:the )?(.+) on$"), "on"),
+    (re.compile(r"^(?:turn|switch) off (?:the )?(.+)$"), "off"),
+    (re.compile(r"^(?:turn|switch) (?:the )?(.+) off$"), "off"),
+    (re.compile(r"^toggle (?:the )?(.+)$"), "toggle"),
+    (re.compile(r"^lock (?:the )?(.+)$"), "lock"),
+    (re.compile(r"^unlock (?:the )?(.+)$"), "unlock"),
+    (re.compile(r"^open (?:the )?(.+)$"), "open"),
+    (re.compile(r"^close (?:the )?(.+)$"), "close"),
+]
+
+# action -> {domain: service}
+ACTION_SERVICES: dict[str, dict[str, str]] = {
+    "on": {
+        "light": "turn_on",
+        "switch": "turn_on",
+        "fan": "turn_on",
+        "media_player": "turn_on",
+        "input_boolean": "turn_on",
+    },
+    "off": {
+        "light": "turn_off",
+        "switch": "turn_off",
+        "fan": "turn_off",
+        "media_player": "turn_off",
+        "input_boolean": "turn_off",
+    },
+    "toggle": {
+        "light": "toggle",
+        "switch": "toggle",
+        "fan": "toggle",
+        "input_boolean": "toggle",
+    },
+    "lock": {"lock": "lock"},
+    "unlock": {"lock": "unlock"},
+    "open": {"cover": "open_cover"},
+    "close": {"cover": "close_cover"},
+}
+
+ACTION_VERBS = {
+    "on": "Turned on",
+    "off": "Turned off",
+    "toggle": "Toggled",
+    "lock": "Locked",
+    "unlock": "Unlocked",
+    "open": "Opened",
+    "close": "Closed",
+}
+
+
+def normalize_phrase(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    text = re.sub(r"[^\w\s]", " ", (text or "").lower().replace("_", " "))
+    return " ".join(text.split())
+
+
+@dataclass
+class LocalIntent:
+    """A smart-home command resolved to a direct HA service call."""
+
+    action: str
+    domain: str
+    service: str
+    entity_ids: list[str]
+    names: list[str] = field(default_factory=list)
+
+    def speech(self) -> str:
+        names = self.names or self.entity_ids
+        if len(names) > 1:
+            target = ", ".join(names[:-1]) + f" and {names[-1]}"
+        else:
+            target = names[0]
+        return f"{ACTION_VERBS.get(self.action, 'Done:')} {target}."
+
+
+class HAEntityCache:
+    """In-memory view of HA entities, areas and services."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entities: dict[str, dict[str, Any]] = {}
+        self.services: dict[str, set[str]] = {}
+        self.areas: dict[str, list[str]] = {}
+        self._entity_area: dict[str, str] = {}
+        self.loaded_at = 0.0
+        self._retry_after = 0.0
+        # Set while the HA websocket feeds state_changed events into the cache.
+        self.live = False
+
+    # ---- Loading ---------------------------------------------------------
+    def is_stale(self) -> bool:
+        if self.live and self.loaded_at:
+            return False
+        now = time.time()
+        return now - self.loaded_at > CACHE_TTL_SECONDS and now >= self._retry_after
+
+    async def _request_json(self, method: str, path: str, **kwargs) -> Any:
+        url = f"{HA_HOST.rstrip('/')}{path}"
+        headers = {
+            "Authorization": f"Bearer {HA_TOKEN}",
+            "Content-Type": "application/json",
+        }
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
+        async with get_session().request(
+            method, url, headers=headers, timeout=timeout, **kwargs
+        ) as resp:
+            resp.raise_for_status()
+            # /api/template answers with text/plain even when it renders JSON.
+            return await resp.json(content_type=None)
+
+    async def refresh(self) -> bool:
+        """Reload entities, services and areas from HA's REST API."""
+        if not (HA_HOST and HA_TOKEN):
+            return False
+        started_at = time.perf_counter()
+        try:
+            states = await self._request_json("GET", "/api/states")
+            services = await self._request_json("GET", "/api/services")
+        except Exception as e:
+            logger.warning(f"Failed to load Home Assistant entities: {e}")
+            self._retry_after = time.time() + RETRY_AFTER_FAILURE_SECONDS
+            return False
+
+        try:
+            areas = await self._request_json(
+                "POST", "/api/template", json={"template": AREA_TEMPLATE}
+            )
+        except Exception as e:
+            # Older HA versions lack the area template helpers; fall back to
+            # matching area names inside friendly names.
+            logger.verbose(f"HA area lookup unavailable: {e}", emoji="🏠")
+            areas = {}
+        if not isinstance(areas, dict):
+            areas = {}
+
+        self.load(
+            states,
+            {
+                entry.get("domain"): (entry.get("services") or {}).keys()
+                for entry in services or []
+                if isinstance(entry, dict) and entry.get("domain")
+            },
+            areas,
+        )
+        elapsed_ms = (time.perf_counter() - started_at) * 1000.0
+        logger.info(
+            f"Loaded {len(self.entities)} HA entities, {len(self.areas)} areas "
+            f"in {elapsed_ms:.0f} ms",
+            emoji="🏠",
+        )
+        return True
+
+    def load(
+        self,
+        states: list[dict[str, Any]],
+        services: dict[str, Any],
+        areas: dict[str, list[str]],
+    ) -> None:
+        """Replace the cached entities, services ({domain: names}) and areas."""
+        with self._lock:
+            self.entities = {
+                state["entity_id"]: state
+                for state in states or []
+                if isinstance(state, dict) and state.get("entity_id")
+            }
+            self.services = {
+                domain: set(names or []) for domain, names in (services or {}).items()
+            }
+            self.areas = {
+                normalize_phrase(name): list(entity_ids or [])
+                for name, entity_ids in (areas or {}).items()
+            }
+            self._entity_area = {
+                entity_id: area
+                for area, entity_ids in self.areas.items()
+                for entity_id in entity_ids
+            }
+            self.loaded_at = time.time()
+
+    async def refresh_if_stale(self) -> None:
+        if self.is_stale():
+            await self.refresh()
+
+    # ---- State updates ---------------------------------------------------
+    def apply_state_changed(self, event_data: dict[str, Any]) -> None:
+        """Apply a ``state_changed`` event payload to the cache."""
+        entity_id = event_data.get("entity_id")
+        if not entity_id:
+            return
+        new_state = event_data.get("new_state")
+        with self._lock:
+            if new_state is None:
+                self.entities.pop(entity_id, None)
+            else:
+                self.entities[entity_id] = new_state
+
+    def apply_states(self, states: list[dict[str, Any]]) -> None:
+        """Apply the changed states returned by a service call."""
+        for state in states or []:
+            if isinstance(state, dict):
+                self.apply_state_changed({
+                    "entity_id": state.get("entity_id"),
+                    "new_state": state,
+                })
+
+    def get_state(self, entity_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self.entities.get(entity_id)
+
+    def find_states(self, phrase: str) -> list[dict[str, Any]]:
+        """Return cached states whose name, id or area matches ``phrase``."""
+        target = normalize_phrase(phrase)
+        target = re.sub(r"^(?:the |my |our )", "", target)
+        if not target:
+            return []
+        with self._lock:
+            resolved = self._match_target(target, set(DOMAIN_WORDS) | self._domains())
+            if resolved:
+                return list(resolved[1])
+            return [
+                state
+                for state in self.entities.values()
+                if target in normalize_phrase(self._friendly_name(state))
+            ][:5]
+
+    def _domains(self) -> set[str]:
+        return {entity_id.split(".", 1)[0] for entity_id in self.entities}
+
+    # ---- Intent resolution -----------------------------------------------
+    @staticmethod
+    def _friendly_name(state: dict[str, Any]) -> str:
+        attributes = state.get("attributes") or {}
+        return str(attributes.get("friendly_name") or state.get("entity_id", ""))
+
+    def _domain_entities(self, domains: set[str]) -> list[dict[str, Any]]:
+        return [
+            state
+            for entity_id, state in self.entities.items()
+            if entity_id.split(".", 1)[0] in domains
+        ]
+
+    def _match_target(
+        self, target: str, domains: set[str]
+    ) -> tuple[str, list[dict[str, Any]]] | None:
+        """Return (domain, entities) for an unambiguous target, else None."""
+        candidates = self._domain_entities(domains)
+
+        # 1. Exact friendly name or object id.
+        exact = [
+            state
+            for state in candidates
+            if target
+            in {
+                normalize_phrase(self._friendly_name(state)),
+                normalize_phrase(state["entity_id"].split(".", 1)[1]),
+            }
+        ]
+        if len(exact) == 1:
+            return exact[0]["entity_id"].split(".", 1)[0], exact
+
+        # 2. "<area> <domain word>", e.g. "kitchen lights".
+        words = target.split()
+        if len(words) < 2:
+            return None
+        domain_word = words[-1]
+        area = " ".join(words[:-1])
+        domain = next(
+            (
+                name
+                for name, spoken in DOMAIN_WORDS.items()
+                if domain_word in spoken and name in domains
+            ),
+            None,
+        )
+        if not domain:
+            return None
+
+        in_domain = [
+            state
+            for state in candidates
+            if state["entity_id"].split(".", 1)[0] == domain
+        ]
+        if area in self.areas:
+            matched = [
+                state
+                for state in in_domain
+                if self._entity_area.get(state["entity_id"]) == area
+            ]
+        elif any(area in known for known in self.areas):
+            # "bed" inside "bedroom": not sure which room was meant.
+            return None
+        else:
+            # Whole words only, so "bed lights" never picks "Bedroom Lamp".
+            matched = [
+                state
+                for state in in_domain
+                if f" {area} " in f" {normalize_phrase(self._friendly_name(state))} "
+            ]
+
+        if not matched:
+            return None
+        if len(matched) > 1 and domain_word not in PLURAL_WORDS:
+            return None
+        return domain, matched
+
+    def resolve(self, prompt: str) -> LocalIntent | None:
+        """Resolve a simple command to a service call, or None if unsure."""
+        text = normalize_phrase(prompt)
+        text = re.sub(r"^(?:please |hey |can you |could you )+", "", text)
+        text = re.sub(r"(?: please| now)+$", "", text)
+
+        for pattern, action in ACTION_PATTERNS:
+            match = pattern.match(text)
+            if not match:
+                continue
+            target = re.sub(r"^(?:all (?:the )?|the )", "", match.group(1)).strip()
+            service_map = ACTION_SERVICES[action]
+            with self._lock:
+                domains = {
+                    domain
+                    for domain, service in service_map.items()
+                    if service in self.services.get(domain, set())
+                }
+                resolved = self._match_target(target, domains)
+                if not resolved:
+                    return None
+                domain, states = resolved
+                return LocalIntent(
+                    action=action,
+                    domain=domain,
+                    service=service_map[domain],
+                    entity_ids=[state["entity_id"] for state in states],
+                    names=[self._friendly_name(state) for state in states],
+                )
+        return None
+
+
+# Global instance
+ha_entity_cache = HAEntityCache()
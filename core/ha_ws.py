@@ -0,0 +1,274 @@
+"""Persistent Home Assistant websocket client.
+
+Runs on its own event loop in a daemon thread (like the MQTT client), so it
+outlives the per-conversation ``BillySession`` loops. It authenticates once,
+multiplexes commands by message id, subscribes to ``state_changed`` events to
+keep ``ha_entity_cache`` live, and reconnects with jittered exponential
+backoff. ``core.ha`` uses it for availability and commands when connected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from typing import Any
+
+import aiohttp
+
+from .config import HA_HOST, HA_TOKEN, HA_WEBSOCKET
+from .ha_entities import ha_entity_cache
+from .http_client import close_session, get_session
+from .logger import logger
+
+
+AUTH_TIMEOUT_SECONDS = 10.0
+HEARTBEAT_SECONDS = 30.0
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+
+class HAWebSocketError(Exception):
+    """Raised when HA answers a websocket command with an error."""
+
+
+def _websocket_url() -> str:
+    base = (HA_HOST or "").rstrip("/")
+    if base.startswith("https://"):
+        base = "wss://" + base[len("https://") :]
+    elif base.startswith("http://"):
+        base = "ws://" + base[len("http://") :]
+    return f"{base}/api/websocket"
+
+
+class HAWebSocketClient:
+    """Long-lived, multiplexed connection to Home Assistant's websocket API."""
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._next_id = 1
+        self._pending: dict[int, asyncio.Future] = {}
+        self._connected = threading.Event()
+        self._stopping = False
+        self._wake: asyncio.Event | None = None
+        self.connected_since = 0.0
+        self.reconnects = 0
+        self.last_error: str | None = None
+
+    # ---- Lifecycle -------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self) -> None:
+        """Start the background connection thread if HA is configured."""
+        if not (HA_HOST and HA_TOKEN and HA_WEBSOCKET) or self.running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._thread_main, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Close the connection and stop reconnecting."""
+        self._stopping = True
+        if self._loop and not self._loop.is_closed():
+            with contextlib.suppress(RuntimeError):
+                self._loop.call_soon_threadsafe(self._request_shutdown)
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+    def _request_shutdown(self) -> None:
+        if self._wake:
+            self._wake.set()
+        if self._ws and not self._ws.closed:
+            asyncio.ensure_future(self._ws.close())
+
+    def _thread_main(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run())
+        except Exception as e:
+            logger.error(f"HA websocket thread crashed: {e}")
+        finally:
+            self._loop.close()
+
+    async def _run(self) -> None:
+        self._wake = asyncio.Event()
+        attempt = 0
+        while not self._stopping:
+            try:
+                await self._connect_and_listen()
+                attempt = 0
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+                logger.warning(f"HA websocket error: {self.last_error}", emoji="🏠")
+            finally:
+                self._mark_disconnected()
+
+            if self._stopping:
+                break
+            # Full jitter keeps several Billys from reconnecting in lockstep.
+            delay = random.uniform(
+                0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)
+            )
+            attempt += 1
+            self.reconnects += 1
+            logger.verbose(f"Reconnecting to HA websocket in {delay:.1f}s", emoji="🏠")
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+        await close_session()
+
+    def _mark_disconnected(self) -> None:
+        was_connected = self.connected
+        self._connected.clear()
+        ha_entity_cache.live = False
+        self._ws = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("HA websocket disconnected"))
+        self._pending.clear()
+        if was_connected:
+            logger.warning("Home Assistant websocket disconnected", emoji="🏠")
+
+    # ---- Connection ------------------------------------------------------
+    async def _connect_and_listen(self) -> None:
+        async with get_session().ws_connect(
+            _websocket_url(), heartbeat=HEARTBEAT_SECONDS
+        ) as ws:
+            message = await ws.receive_json(timeout=AUTH_TIMEOUT_SECONDS)
+            if message.get("type") != "auth_required":
+                raise HAWebSocketError(f"Unexpected greeting: {message}")
+            await ws.send_json({"type": "auth", "access_token": HA_TOKEN})
+            message = await ws.receive_json(timeout=AUTH_TIMEOUT_SECONDS)
+            if message.get("type") != "auth_ok":
+                raise HAWebSocketError(message.get("message") or "auth failed")
+
+            self._ws = ws
+            self._connected.set()
+            self.connected_since = time.time()
+            logger.success(
+                f"Home Assistant websocket connected (HA {message.get('ha_version')})",
+                emoji="🏠",
+            )
+
+            reader = asyncio.create_task(self._read_messages(ws))
+            try:
+                await self._subscribe_and_load()
+            except Exception as e:
+                logger.warning(f"HA websocket initial sync failed: {e}", emoji="🏠")
+            await reader
+
+    async def _read_messages(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                continue
+            data = msg.json()
+            # HA may coalesce several messages into one JSON array.
+            for message in data if isinstance(data, list) else [data]:
+                self._dispatch(message)
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        message_type = message.get("type")
+        if message_type == "event":
+            event = message.get("event") or {}
+            if event.get("event_type") == "state_changed":
+                ha_entity_cache.apply_state_changed(event.get("data") or {})
+            return
+        if message_type != "result":
+            return
+        future = self._pending.get(message.get("id"))
+        if future is None or future.done():
+            return
+        if message.get("success"):
+            future.set_result(message.get("result"))
+        else:
+            error = message.get("error") or {}
+            future.set_exception(
+                HAWebSocketError(error.get("message") or error.get("code") or "error")
+            )
+
+    async def _subscribe_and_load(self) -> None:
+        await self._send_command({
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+        })
+        states = await self._send_command({"type": "get_states"})
+        services = await self._send_command({"type": "get_services"})
+        ha_entity_cache.load(states, services, await self._load_areas())
+        ha_entity_cache.live = True
+        logger.info(
+            f"HA websocket synced {len(ha_entity_cache.entities)} entities",
+            emoji="🏠",
+        )
+
+    async def _load_areas(self) -> dict[str, list[str]]:
+        """Map area names to entity ids using the area/device/entity registries."""
+        try:
+            areas = await self._send_command({"type": "config/area_registry/list"})
+            devices = await self._send_command({"type": "config/device_registry/list"})
+            entities = await self._send_command({"type": "config/entity_registry/list"})
+        except Exception as e:
+            logger.verbose(f"HA registries unavailable: {e}", emoji="🏠")
+            return {}
+
+        area_names = {area["area_id"]: area.get("name") for area in areas or []}
+        device_areas = {device["id"]: device.get("area_id") for device in devices or []}
+        by_area: dict[str, list[str]] = {}
+        for entity in entities or []:
+            area_id = entity.get("area_id") or device_areas.get(entity.get("device_id"))
+            name = area_names.get(area_id)
+            if name:
+                by_area.setdefault(name, []).append(entity["entity_id"])
+        return by_area
+
+    # ---- Commands --------------------------------------------------------
+    async def _send_command(self, payload: dict[str, Any]) -> Any:
+        """Send a command on the client loop and wait for its result."""
+        ws = self._ws
+        if ws is None or ws.closed:
+            raise ConnectionError("HA websocket not connected")
+        message_id = self._next_id
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await ws.send_json({**payload, "id": message_id})
+            return await future
+        finally:
+            self._pending.pop(message_id, None)
+
+    async def request(self, payload: dict[str, Any], timeout: float = 5.0) -> Any:
+        """Send a command from any event loop and await its result."""
+        if not self.connected or self._loop is None:
+            raise ConnectionError("HA websocket not connected")
+        future = asyncio.run_coroutine_threadsafe(
+            self._send_command(payload), self._loop
+        )
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "connected": self.connected,
+            "connected_since": self.connected_since or None,
+            "reconnects": self.reconnects,
+            "last_error": self.last_error,
+            "pending": len(self._pending),
+        }
+
+
+# Global instance
+ha_ws_client = HAWebSocketClient()
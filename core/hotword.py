@@ -1,27 +1,27 @@
-import os
+import math
 import queue
 import threading
 import time
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Callable, Optional, TYPE_CHECKING
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
 
 import numpy as np
 import sounddevice as sd
-from scipy.signal import resample
 
 from . import config
-
-if TYPE_CHECKING:  # pragma: no cover - only for static analysis
-    from . import audio as audio_module
-
-try:  # Optional dependency for Porcupine support
-    import pvporcupine
-
-    _PORCUPINE_AVAILABLE = True
-except Exception:
-    pvporcupine = None
-    _PORCUPINE_AVAILABLE = False
+from .ipc import bus
+from .logger import logger
+from .meters import meter
+from .wake_dsp import (
+    Downmixer,
+    FrameAssembler,
+    PreRollBuffer,
+    StreamingResampler,
+    VadGate,
+    block_rms,
+)
+from .wake_engines import WakeWordEngine, available_engines, create_engine
 
 
 WakeWordCallback = Callable[[dict], None]
@@ -41,11 +41,13 @@ class WakeWordController:
     """Lightweight wake-word detector with amplitude-based fallback logic."""
 
     cooldown_seconds = 2.0
+    # Speech this soon after a detection is still the tail of the keyword
+    handoff_settle_seconds = 0.15
 
     def __init__(self, on_detect: WakeWordCallback | None = None):
         self._on_detect: WakeWordCallback | None = on_detect
         self.enabled = config.WAKE_WORD_ENABLED
-        self.engine = "porcupine"
+        self.engine = config.WAKE_WORD_ENGINE
         self.sensitivity = self._clamp_sensitivity(config.WAKE_WORD_SENSITIVITY)
         self.threshold = max(config.WAKE_WORD_THRESHOLD, 0.0)
         self.endpoint = config.WAKE_WORD_ENDPOINT
@@ -63,10 +65,41 @@ class WakeWordController:
         self._input_samplerate = None
         self._detector_mode = "rms"
         self._hardware_enabled = True
-        self._porcupine = None
-        self._porcupine_buffer = np.zeros(0, dtype=np.int16)
-        self._porcupine_frame_len = 0
-        self._porcupine_keywords: list[str] = []
+        self._engine: WakeWordEngine | None = None
+        # Idle-path buffers, sized when the stream opens
+        self._downmixer: Downmixer | None = None
+        self._resampler: StreamingResampler | None = None
+        self._frame_assembler: FrameAssembler | None = None
+        self._block_timestamp = 0.0
+        self._block_time = 0.0
+        self._callback_seconds = 0.0
+        self._callback_blocks = 0
+        self._on_engine_frame = self._process_engine_frame
+        # Stage one of the cascade: the keyword engine only runs while the
+        # VAD gate is open, starting with the pre-roll kept in a ring buffer
+        self.gate_enabled = config.WAKE_WORD_GATE_ENABLED
+        self._gate: VadGate | None = None
+        self._preroll: PreRollBuffer | None = None
+        self._preroll_frames: np.ndarray | None = None
+        self._gate_opened_at = 0.0
+        self._gate_detected = False
+        self._gate_opens = 0
+        self._gate_false_opens = 0
+        self._gate_blocks_open = 0
+        self._gate_blocks = 0
+        self._engine_samples_run = 0
+        self._engine_samples_skipped = 0
+        self._engine_seconds = 0.0
+        self._detection_latencies: deque[float] = deque(maxlen=50)
+        # Rolling capture of the mic so speech right after the keyword can be
+        # handed to the session that the detection starts
+        self.handoff_enabled = config.WAKE_WORD_HANDOFF_ENABLED
+        self._capture: PreRollBuffer | None = None
+        self._captured_samples = 0
+        self._detection_sample: int | None = None
+        self._handoff_active = False
+        self._post_keyword_speech = threading.Event()
+        self._last_handoff_ms: float | None = None
 
     def set_detection_callback(self, callback: WakeWordCallback | None) -> None:
         with self._lock:
@@ -92,13 +125,58 @@ class WakeWordController:
 
     def notify_session_state(self, active: bool) -> None:
         with self._lock:
+            self._handoff_active = False
             self._session_active = active
             self._sync_stream_state()
 
+    def begin_handoff(self) -> bool:
+        """Keep capturing after a detection instead of listening for keywords.
+
+        Returns False when there is no recent detection to hand off from.
+        """
+        with self._lock:
+            if (
+                not self.handoff_enabled
+                or not self._running
+                or self._capture is None
+                or self._detection_sample is None
+            ):
+                return False
+            self._post_keyword_speech.clear()
+            self._handoff_active = True
+            return True
+
+    def wait_for_post_keyword_speech(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for speech following the keyword."""
+        return self._post_keyword_speech.wait(timeout)
+
+    def take_handoff_audio(self) -> np.ndarray | None:
+        """Pause the listener and return the mono int16 audio since the detection.
+
+        Samples are at the mic rate. Returns None, leaving the listener alone,
+        if no handoff is in progress.
+        """
+        with self._lock:
+            capture = self._capture
+            start = self._detection_sample
+            samplerate = self._input_samplerate
+            if not self._handoff_active or capture is None or start is None:
+                return None
+            # Closing the stream first means the callback is done writing
+            self.notify_session_state(True)
+            count = min(self._captured_samples - start, capture.capacity)
+            samples = np.zeros(count, dtype=np.int16)
+            capture.latest(samples)
+            self._detection_sample = None
+            if samplerate:
+                self._last_handoff_ms = round(count * 1000.0 / samplerate, 1)
+            return samples
+
     def set_parameters(
         self,
         *,
         enabled: Optional[bool] = None,
+        engine: Optional[str] = None,
         sensitivity: Optional[float] = None,
         threshold: Optional[float] = None,
         endpoint: Optional[str] = None,
@@ -109,8 +187,17 @@ class WakeWordController:
                 self.enabled = bool(enabled)
             restart_required = False
 
+            if engine is not None:
+                new_engine = str(engine).strip().lower() or "auto"
+                if new_engine != self.engine:
+                    self.engine = new_engine
+                    restart_required = True
             if sensitivity is not None:
                 self.sensitivity = self._clamp_sensitivity(float(sensitivity))
+                if self._engine is not None and not self._engine.set_sensitivity(
+                    self.sensitivity
+                ):
+                    restart_required = True
             if threshold is not None:
                 self.threshold = max(float(threshold), 0.0)
             if endpoint is not None and endpoint != self.endpoint:
@@ -127,6 +214,7 @@ class WakeWordController:
             self._sync_stream_state()
 
     def get_status(self) -> dict:
+        engines = available_engines()
         with self._lock:
             return {
                 "enabled": self.enabled,
@@ -140,8 +228,16 @@ class WakeWordController:
                 "last_error": self._last_error,
                 "events_pending": self._event_queue.qsize(),
                 "detector_mode": self._detector_mode,
-                "porcupine_available": _PORCUPINE_AVAILABLE,
+                "keywords": self._engine.keywords if self._engine else [],
+                "engine_threshold": self._engine.threshold if self._engine else None,
+                "engines_available": engines,
+                "porcupine_available": engines["porcupine"],
                 "hardware_enabled": self._hardware_enabled,
+                "callback_load": self._callback_load(),
+                "gate": self._gate_status(),
+                "handoff_enabled": self.handoff_enabled,
+                "handoff_active": self._handoff_active,
+                "last_handoff_ms": self._last_handoff_ms,
             }
 
     def get_event_queue(self) -> "queue.Queue[WakeWordEvent]":
@@ -154,7 +250,9 @@ class WakeWordController:
         return min(max(value, 0.0), 1.0)
 
     def _sync_stream_state(self) -> None:
-        should_run = self.enabled and self._hardware_enabled and not self._session_active
+        should_run = (
+            self.enabled and self._hardware_enabled and not self._session_active
+        )
         if should_run and not self._running:
             self._open_stream()
         elif not should_run and self._running:
@@ -180,6 +278,7 @@ class WakeWordController:
                 blocksize=blocksize,
                 callback=self._audio_callback,
             )
+            self._setup_buffers(samplerate, channels, blocksize)
             self._stream.start()
             self._running = True
             self._input_samplerate = samplerate
@@ -214,104 +313,204 @@ class WakeWordController:
             self._running = False
             self._publish_event("status", message="listener_stopped")
             self._input_samplerate = None
-            # Free Porcupine native memory when stream closes
-            if self._porcupine is not None:
-                try:
-                    self._porcupine.delete()
-                except Exception:
-                    pass
-                self._porcupine = None
+            # Free engine native memory when stream closes
+            self._release_engine()
+
+    def _release_engine(self) -> None:
+        if self._engine is not None:
+            self._engine.close()
+            self._engine = None
 
     def _prepare_engine(self) -> None:
-        # Clean up previous Porcupine instance to free native memory
-        if self._porcupine is not None:
-            try:
-                self._porcupine.delete()
-            except Exception:
-                pass
+        # Clean up the previous engine to free native memory
+        self._release_engine()
         self._detector_mode = "rms"
-        self._porcupine = None
-        self._porcupine_buffer = np.zeros(0, dtype=np.int16)
-        self._porcupine_frame_len = 0
-        self._porcupine_keywords = []
-
-        if not _PORCUPINE_AVAILABLE or pvporcupine is None:
-            raise RuntimeError(
-                "Porcupine engine requested but the pvporcupine package is not installed"
-            )
-
-        keyword_path = (self.endpoint or "").strip()
-        if not keyword_path:
-            raise RuntimeError(
-                "WAKE_WORD_ENDPOINT must point to a Porcupine keyword (.ppn) file"
-            )
-        if not os.path.exists(keyword_path):
-            raise RuntimeError(f"Porcupine keyword not found: {keyword_path}")
-
-        access_key = (self.porcupine_access_key or "").strip()
-        if not access_key:
-            raise RuntimeError("WAKE_WORD_PORCUPINE_ACCESS_KEY must be set for Porcupine")
-
-        sensitivity = self._clamp_sensitivity(self.sensitivity)
-        try:
-            self._porcupine = pvporcupine.create(
-                access_key=access_key,
-                keyword_paths=[keyword_path],
-                sensitivities=[sensitivity],
-            )
-        except Exception as exc:  # noqa: BLE001
-            raise RuntimeError(f"Failed to load Porcupine keyword: {exc}") from exc
+        if self.engine == "rms":
+            return
 
-        self._porcupine_buffer = np.zeros(0, dtype=np.int16)
-        self._porcupine_frame_len = self._porcupine.frame_length
-        self._porcupine_keywords = [Path(keyword_path).stem]
-        self._detector_mode = "porcupine"
+        self._engine = create_engine(
+            self.engine, self.endpoint, self.porcupine_access_key, self.sensitivity
+        )
+        self._detector_mode = self._engine.name
         if config.DEBUG_MODE:
-            print(
-                "[wake-word] porcupine frame_len="
-                f"{self._porcupine_frame_len} sample_rate={self._porcupine.sample_rate}"
+            logger.debug(
+                "[wake-word] %s frame_len=%s sample_rate=%s keywords=%s",
+                self._engine.name,
+                self._engine.frame_length,
+                self._engine.sample_rate,
+                self._engine.keywords,
+                emoji="🐛",
             )
         self._publish_event(
             "status",
-            message="porcupine_keyword_loaded",
-            payload={"keyword": self._porcupine_keywords[0]},
+            message="keyword_engine_loaded",
+            payload=self._engine.describe(),
         )
 
     def _frames_required(self) -> int:
         # Higher sensitivity means fewer consecutive frames required.
         return max(1, int(round(3 - self.sensitivity * 2)))
 
+    def _setup_buffers(self, samplerate: int, channels: int, blocksize: int) -> None:
+        """Preallocate the idle-path buffers so the callback never allocates."""
+        self._downmixer = Downmixer(channels, blocksize)
+        self._block_time = blocksize / float(samplerate)
+        self._callback_seconds = 0.0
+        self._callback_blocks = 0
+        self._gate = None
+        self._preroll = None
+        self._preroll_frames = None
+        self._capture = None
+        self._captured_samples = 0
+        self._detection_sample = None
+        self._handoff_active = False
+        if self.handoff_enabled:
+            self._capture = PreRollBuffer(
+                int(samplerate * config.WAKE_WORD_CAPTURE_SECONDS)
+            )
+        if self.gate_enabled:
+            self._gate = VadGate(
+                blocksize,
+                self._block_time,
+                ratio=config.WAKE_WORD_GATE_RATIO,
+                flux=config.WAKE_WORD_GATE_FLUX,
+                hold=config.WAKE_WORD_GATE_HOLD_MS / 1000.0,
+            )
+        if self._engine is not None:
+            self._resampler = StreamingResampler(
+                samplerate, self._engine.sample_rate, blocksize
+            )
+            self._frame_assembler = FrameAssembler(self._engine.frame_length)
+            frame_length = self._engine.frame_length
+            preroll = self._engine.sample_rate * config.WAKE_WORD_PREROLL_MS // 1000
+            if self._gate is not None and preroll >= frame_length:
+                frames = preroll // frame_length
+                self._preroll = PreRollBuffer(frames * frame_length)
+                self._preroll_frames = np.zeros((frames, frame_length), dtype=np.int16)
+        else:
+            self._resampler = None
+            self._frame_assembler = None
+
+    def _callback_load(self) -> float | None:
+        """Fraction of real time spent in the audio callback since the stream opened."""
+        if not self._callback_blocks or not self._block_time:
+            return None
+        return self._callback_seconds / (self._callback_blocks * self._block_time)
+
     def _audio_callback(self, indata, frames, time_info, status):  # noqa: ANN001
         if status:
             self._publish_event("stream_warning", message=str(status))
 
-        if not self._running:
+        if not self._running or self._downmixer is None:
             return
 
-        mono = np.asarray(indata)
-        if mono.ndim > 1:
-            mono = mono.mean(axis=1)
-        mono_float = mono.astype(np.float32)
+        started = time.perf_counter()
+        try:
+            self._process_block(indata)
+        finally:
+            self._callback_seconds += time.perf_counter() - started
+            self._callback_blocks += 1
+
+    def _update_gate(
+        self, now: float, mono: np.ndarray, rms: float
+    ) -> tuple[bool, bool]:
+        """Run the VAD gate on a block; returns ``(is_open, just_opened)``."""
+        gate = self._gate
+        if gate is None:
+            return True, False
+        was_open = gate.is_open
+        is_open = gate.process(mono, rms)
+        self._gate_blocks += 1
+        if is_open:
+            self._gate_blocks_open += 1
+        if is_open and not was_open:
+            self._gate_opens += 1
+            self._gate_opened_at = now
+            self._gate_detected = False
+            return True, True
+        if was_open and not is_open and not self._gate_detected:
+            self._gate_false_opens += 1
+        return is_open, False
+
+    def _gate_active(self) -> bool | None:
+        return self._gate.active if self._gate is not None else None
+
+    def _gate_status(self) -> dict:
+        """Cascade statistics accumulated over the life of the controller."""
+        gate = self._gate
+        closed_opens = self._gate_opens - (
+            1 if gate is not None and gate.is_open else 0
+        )
+        engine_samples = self._engine_samples_run + self._engine_samples_skipped
+        cpu_saved = None
+        if self._engine_samples_run and self._block_time and self._gate_blocks:
+            per_sample = self._engine_seconds / self._engine_samples_run
+            audio_seconds = self._gate_blocks * self._block_time
+            cpu_saved = self._engine_samples_skipped * per_sample / audio_seconds
+        latencies = sorted(self._detection_latencies)
+        return {
+            "enabled": self.gate_enabled,
+            "open": bool(gate is not None and gate.is_open),
+            "noise_floor": gate.noise_floor if gate is not None else None,
+            "opens": self._gate_opens,
+            "false_opens": self._gate_false_opens,
+            "false_open_rate": (
+                self._gate_false_opens / closed_opens if closed_opens > 0 else None
+            ),
+            "open_fraction": (
+                self._gate_blocks_open / self._gate_blocks
+                if self._gate_blocks
+                else None
+            ),
+            "engine_skipped_fraction": (
+                self._engine_samples_skipped / engine_samples
+                if engine_samples
+                else None
+            ),
+            "cpu_saved": cpu_saved,
+            "detection_latency_ms": {
+                "last": round(self._detection_latencies[-1], 1) if latencies else None,
+                "p50": round(latencies[len(latencies) // 2], 1) if latencies else None,
+                "count": len(latencies),
+            },
+        }
 
-        rms = float(np.sqrt(np.mean(np.square(mono_float))))
+    def _process_block(self, indata) -> None:  # noqa: ANN001
+        mono = self._downmixer.process(indata)
+        rms = block_rms(mono)
         now = time.time()
 
-        if np.isnan(rms) or np.isinf(rms):
+        if not math.isfinite(rms):
             return
 
+        if self._capture is not None:
+            self._capture.write(mono)
+            self._captured_samples += mono.shape[0]
+            if self._handoff_active:
+                self._process_handoff(now, mono, rms)
+                meter.feed(mono, "wake_word", rms=rms, vad=self._gate_active())
+                return
+
+        gate_open, gate_opened = self._update_gate(now, mono, rms)
+        meter.feed(mono, "wake_word", rms=rms, vad=self._gate_active())
+
         if now - self._last_meter_emit > 0.25:
             if config.DEBUG_MODE:
-                print(f"[wake-word] RMS={rms:.0f} threshold={self.threshold:.0f}")
+                logger.debug(
+                    "[wake-word] RMS=%.0f threshold=%.0f",
+                    rms,
+                    self.threshold,
+                    emoji="🐛",
+                )
             self._publish_event("meter", level=rms, threshold=self.threshold)
             self._last_meter_emit = now
 
-        mono_int16 = np.clip(mono_float, -32768, 32767).astype(np.int16)
-
-        if self._detector_mode == "porcupine" and self._porcupine is not None:
-            self._process_porcupine(now, mono_int16)
+        if self._engine is not None:
+            self._process_engine(now, mono, gate_open, gate_opened)
             return
 
-        if rms >= self.threshold:
+        # Loud but steady noise keeps the gate shut, so it can't trigger
+        if rms >= self.threshold and gate_open:
             self._trigger_streak += 1
         else:
             self._trigger_streak = 0
@@ -338,49 +537,109 @@ class WakeWordController:
             payload=payload,
         )
 
+        self._record_gated_detection()
+        self._detection_sample = self._captured_samples
         self._dispatch_detection(payload)
 
-    def _process_porcupine(self, timestamp: float, samples: np.ndarray) -> None:
-        if self._porcupine is None or self._input_samplerate is None:
-            return
+    def _process_handoff(self, now: float, mono: np.ndarray, rms: float) -> None:
+        """Watch for speech after the keyword while the session is starting.
 
-        chunk = samples.astype(np.float32)
-        if self._input_samplerate != self._porcupine.sample_rate:
-            target_len = int(len(chunk) * self._porcupine.sample_rate / self._input_samplerate)
-            if target_len <= 0:
-                return
-            chunk = resample(chunk, target_len)
-        chunk = np.clip(chunk, -32768, 32767).astype(np.int16)
-        if chunk.size == 0:
-            return
-
-        self._porcupine_buffer = np.concatenate((self._porcupine_buffer, chunk))
+        The session ends the handoff via ``take_handoff_audio`` or, if it fails
+        before opening its mic, ``notify_session_state``.
+        """
+        gate = self._gate
+        if gate is not None:
+            gate.process(mono, rms)
+            speech = gate.active
+        else:
+            speech = rms >= self.threshold
+        if speech and now - self._last_detection >= self.handoff_settle_seconds:
+            self._post_keyword_speech.set()
 
-        while self._porcupine_buffer.size >= self._porcupine_frame_len:
-            frame = self._porcupine_buffer[: self._porcupine_frame_len]
-            self._porcupine_buffer = self._porcupine_buffer[self._porcupine_frame_len :]
+    def _process_engine(
+        self,
+        timestamp: float,
+        samples: np.ndarray,
+        gate_open: bool = True,
+        gate_opened: bool = False,
+    ) -> None:
+        if self._resampler is None or self._frame_assembler is None:
+            return
+        self._block_timestamp = timestamp
+        resampled = self._resampler.process(samples)
+        preroll = self._preroll
+        if preroll is not None:
+            preroll.write(resampled)
+        if not gate_open:
+            self._engine_samples_skipped += resampled.shape[0]
+            return
+        if gate_opened and preroll is not None and self._preroll_frames is not None:
+            self._process_preroll(preroll, self._preroll_frames)
+            return
+        self._frame_assembler.push(resampled, self._on_engine_frame)
 
-            result = self._porcupine.process(frame)
-            if config.DEBUG_MODE:
-                print(
-                    f"[wake-word] porcupine result={result} frame_len={self._porcupine_frame_len}"
-                )
+    def _process_preroll(self, preroll: PreRollBuffer, frames: np.ndarray) -> None:
+        """Score the audio leading up to the gate opening in one batch."""
+        engine = self._engine
+        if engine is None:
+            return
+        engine.reset()
+        self._frame_assembler.reset()
+        count = preroll.latest(frames.reshape(-1)) // engine.frame_length
+        if count == 0:
+            return
+        started = time.perf_counter()
+        scores = engine.process_batch(frames[frames.shape[0] - count :])
+        self._engine_seconds += time.perf_counter() - started
+        self._engine_samples_run += count * engine.frame_length
+        self._check_scores(engine, scores)
+
+    def _process_engine_frame(self, frame: np.ndarray) -> None:
+        engine = self._engine
+        if engine is None:
+            return
+        started = time.perf_counter()
+        scores = engine.process(frame)
+        self._engine_seconds += time.perf_counter() - started
+        self._engine_samples_run += frame.shape[0]
+        self._check_scores(engine, scores)
+
+    def _check_scores(self, engine: WakeWordEngine, scores: np.ndarray) -> None:
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        if config.DEBUG_MODE:
+            logger.debug(
+                "[wake-word] %s score=%.2f keyword=%s",
+                engine.name,
+                score,
+                engine.keywords[best],
+                emoji="🐛",
+            )
 
-            if result >= 0 and (timestamp - self._last_detection) >= self.cooldown_seconds:
-                self._last_detection = timestamp
-                label = (
-                    self._porcupine_keywords[result]
-                    if result < len(self._porcupine_keywords)
-                    else f"keyword_{result}"
-                )
-                payload = {
-                    "engine": self.engine,
-                    "mode": self._detector_mode,
-                    "label": label,
-                    "score": 1.0,
-                }
-                self._publish_event("detected", payload=payload)
-                self._dispatch_detection(payload)
+        timestamp = self._block_timestamp
+        if (
+            score >= engine.threshold
+            and (timestamp - self._last_detection) >= self.cooldown_seconds
+        ):
+            self._last_detection = timestamp
+            payload = {
+                "engine": engine.name,
+                "mode": self._detector_mode,
+                "label": engine.keywords[best],
+                "score": round(score, 3),
+            }
+            self._publish_event("detected", payload=payload)
+            self._record_gated_detection()
+            self._detection_sample = self._captured_samples
+            self._dispatch_detection(payload)
+
+    def _record_gated_detection(self) -> None:
+        # Latency from the gate opening (stage one) to the detection firing,
+        # including the time spent scoring the pre-roll
+        if self._gate is None or not self._gate.is_open or self._gate_detected:
+            return
+        self._gate_detected = True
+        self._detection_latencies.append((time.time() - self._gate_opened_at) * 1000.0)
 
     def _publish_event(
         self,
@@ -399,6 +658,8 @@ class WakeWordController:
             message=message,
             payload=payload,
         )
+        if bus.wants("wake_word"):
+            bus.publish("wake_word", asdict(event))
         try:
             self._event_queue.put_nowait(event)
         except queue.Full:
@@ -0,0 +1,136 @@
+"""Shared aiohttp client sessions with connection pooling.
+
+Each ``BillySession`` runs on its own event loop (``asyncio.run`` in a session
+thread), and aiohttp sessions cannot be shared across loops. This module keeps
+one pooled ``ClientSession`` per running loop so HA, search and weather calls
+reuse keep-alive connections and cached DNS lookups within that loop, and
+closes it when the owning session ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+
+import aiohttp
+
+from .logger import logger
+
+
+# Connection pool tuning
+POOL_LIMIT = 20
+POOL_LIMIT_PER_HOST = 4
+DNS_CACHE_TTL_SECONDS = 300
+KEEPALIVE_TIMEOUT_SECONDS = 30.0
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+_sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+_sessions_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "connections_created": 0,
+    "connections_reused": 0,
+    "dns_cache_hits": 0,
+    "dns_cache_misses": 0,
+    "sessions_opened": 0,
+    "sessions_closed": 0,
+}
+
+
+def _bump(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _build_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+
+    async def _on_request_start(session, ctx, params):
+        _bump("requests")
+
+    async def _on_connection_create_end(session, ctx, params):
+        _bump("connections_created")
+
+    async def _on_connection_reuseconn(session, ctx, params):
+        _bump("connections_reused")
+
+    async def _on_dns_cache_hit(session, ctx, params):
+        _bump("dns_cache_hits")
+
+    async def _on_dns_cache_miss(session, ctx, params):
+        _bump("dns_cache_misses")
+
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    trace_config.on_dns_cache_hit.append(_on_dns_cache_hit)
+    trace_config.on_dns_cache_miss.append(_on_dns_cache_miss)
+    return trace_config
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the pooled ClientSession bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        session = _sessions.get(loop)
+        if session is not None and not session.closed:
+            return session
+
+        # Drop sessions whose loops have already gone away.
+        for stale_loop in [lp for lp in _sessions if lp.is_closed()]:
+            _sessions.pop(stale_loop, None)
+
+        connector = aiohttp.TCPConnector(
+            limit=POOL_LIMIT,
+            limit_per_host=POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+            keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=DEFAULT_TIMEOUT,
+            trace_configs=[_build_trace_config()],
+        )
+        _sessions[loop] = session
+    _bump("sessions_opened")
+    logger.verbose("Opened pooled HTTP client session", emoji="🌐")
+    return session
+
+
+async def close_session() -> None:
+    """Close the pooled ClientSession bound to the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        session = _sessions.pop(loop, None)
+    if session is None or session.closed:
+        return
+    try:
+        await session.close()
+    except Exception as e:
+        logger.warning(f"Error closing HTTP client session: {e}")
+    _bump("sessions_closed")
+    stats = get_stats()
+    logger.verbose(
+        "Closed pooled HTTP client session "
+        f"(requests={stats['requests']}, "
+        f"created={stats['connections_created']}, "
+        f"reused={stats['connections_reused']}, "
+        f"reuse_ratio={stats['reuse_ratio']:.2f})",
+        emoji="🌐",
+    )
+
+
+def get_stats() -> dict[str, Any]:
+    """Return cumulative connection-reuse statistics across all sessions."""
+    with _stats_lock:
+        stats: dict[str, Any] = dict(_stats)
+    with _sessions_lock:
+        stats["open_sessions"] = sum(1 for s in _sessions.values() if not s.closed)
+    connections = stats["connections_created"] + stats["connections_reused"]
+    stats["reuse_ratio"] = (
+        stats["connections_reused"] / connections if connections else 0.0
+    )
+    return stats
@@ -0,0 +1,357 @@
+"""
+Local control channel between the Billy runtime and the web UI.
+
+The runtime listens on a Unix socket (``IPC_SOCKET_PATH``) and speaks
+newline-delimited JSON:
+
+    {"id": 1, "method": "status", "params": {}}          request
+    {"id": 1, "result": {...}}                             reply, or "error"
+    {"event": "state", "data": {"state": "listening"}}     pushed event
+
+Methods are registered with ``@method("name")`` and run on a small worker
+pool, so a slow one (a motor test) does not hold up the others. Events are
+only sent to connections that asked for the topic with ``subscribe``
+(``{"topics": ["*"]}`` for all of them); retained topics (state, persona) are
+replayed on subscribe. ``bus.publish`` is cheap enough for the audio callback:
+without a subscriber it returns at once, otherwise it only queues the message
+on each connection's bounded outbox, and a writer thread per connection does
+the encoding and socket I/O. A client that stops reading loses events; if
+its outbox is still full after ``REPLY_TIMEOUT_SECONDS`` when a reply is due,
+the connection is dropped rather than holding up a worker.
+"""
+
+import contextlib
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from .logger import logger
+
+
+MAX_LINE_BYTES = 64 * 1024
+OUTBOX_SIZE = 256
+WORKERS = 4
+REPLY_TIMEOUT_SECONDS = 1.0
+
+_methods: dict[str, Callable[..., object]] = {}
+
+
+def method(name: str):
+    """Register a function as an IPC method; params are passed as kwargs."""
+
+    def register(function):
+        _methods[name] = function
+        return function
+
+    return register
+
+
+class _Connection:
+    """One client: its subscriptions and an outbox drained by a writer thread."""
+
+    def __init__(self, wfile, sock: socket.socket | None = None):
+        self._wfile = wfile
+        self._sock = sock
+        self._outbox: queue.Queue[dict | None] = queue.Queue(maxsize=OUTBOX_SIZE)
+        self.topics: frozenset[str] = frozenset()
+        self.dropped = 0
+        threading.Thread(
+            target=self._write_loop, name="ipc-writer", daemon=True
+        ).start()
+
+    def wants(self, topic: str) -> bool:
+        return topic in self.topics or "*" in self.topics
+
+    def send_event(self, message: dict) -> None:
+        try:
+            self._outbox.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def send_reply(self, message: dict) -> None:
+        try:
+            self._outbox.put(message, timeout=REPLY_TIMEOUT_SECONDS)
+        except queue.Full:
+            logger.warning("IPC: client is not reading its replies; dropping it")
+            self.drop()
+
+    def drop(self) -> None:
+        """Shut the socket down; the reader and writer threads then exit."""
+        if self._sock is not None:
+            with contextlib.suppress(OSError):
+                self._sock.shutdown(socket.SHUT_RDWR)
+
+    def close(self) -> None:
+        # If the outbox is full the writer exits on its own once the socket is gone
+        with contextlib.suppress(queue.Full):
+            self._outbox.put_nowait(None)
+
+    def _write_loop(self) -> None:
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                return
+            try:
+                line = json.dumps(message, default=str).encode("utf-8") + b"\n"
+                self._wfile.write(line)
+                self._wfile.flush()
+            except (OSError, ValueError):
+                return
+
+
+class EventBus:
+    """Route published events to the connections subscribed to them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections: list[_Connection] = []
+        self._retained: dict[str, object] = {}
+
+    def wants(self, topic: str) -> bool:
+        """Whether anyone listens to ``topic``; use it to skip building data."""
+        return any(c.wants(topic) for c in self._connections)
+
+    def publish(self, topic: str, data: object, *, retain: bool = False) -> None:
+        if retain:
+            self._retained[topic] = data
+        # The list is replaced, never mutated, so iterating it needs no lock
+        for connection in self._connections:
+            if connection.wants(topic):
+                connection.send_event({"event": topic, "data": data})
+
+    def retained(self, topic: str, default: object = None) -> object:
+        return self._retained.get(topic, default)
+
+    def subscribe(self, connection: _Connection, topics: list[str]) -> None:
+        connection.topics = frozenset(str(t) for t in topics)
+        for topic, data in list(self._retained.items()):
+            if connection.wants(topic):
+                connection.send_event({"event": topic, "data": data})
+
+    def _add(self, connection: _Connection) -> None:
+        with self._lock:
+            self._connections = [*self._connections, connection]
+
+    def _remove(self, connection: _Connection) -> None:
+        with self._lock:
+            self._connections = [c for c in self._connections if c is not connection]
+
+
+# Global instance
+bus = EventBus()
+_executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="ipc")
+
+
+def publish_state(state: str) -> None:
+    """Publish Billy's state (idle, listening, speaking, playing_song)."""
+    bus.publish("state", {"state": state}, retain=True)
+
+
+def publish_persona() -> None:
+    bus.publish("persona", _persona_status(), retain=True)
+
+
+def _persona_status() -> dict:
+    from .config import PERSONALITY
+    from .persona_manager import persona_manager
+
+    return {
+        "current_persona": persona_manager.current_persona,
+        "current_personality": PERSONALITY.to_dict()
+        if hasattr(PERSONALITY, "to_dict")
+        else None,
+    }
+
+
+def _run(connection: _Connection, request_id, name: str, params: dict) -> None:
+    try:
+        result = _methods[name](**params)
+        reply = {"id": request_id, "result": result}
+    except Exception as e:
+        reply = {"id": request_id, "error": str(e) or type(e).__name__}
+    connection.send_reply(reply)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        connection = _Connection(self.wfile, self.request)
+        bus._add(connection)
+        try:
+            while True:
+                line = self.rfile.readline(MAX_LINE_BYTES)
+                if not line:
+                    return
+                self._dispatch(connection, line)
+        except OSError:
+            pass
+        finally:
+            bus._remove(connection)
+            connection.close()
+
+    def _dispatch(self, connection: _Connection, line: bytes) -> None:
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            name = request["method"]
+            params = request.get("params") or {}
+        except (ValueError, KeyError, AttributeError, TypeError):
+            connection.send_reply({"id": None, "error": "malformed request"})
+            return
+
+        if name == "subscribe":
+            # Answered inline so the replay of retained events follows the reply
+            connection.send_reply({"id": request_id, "result": "ok"})
+            bus.subscribe(connection, params.get("topics") or [])
+        elif name in _methods:
+            _executor.submit(_run, connection, request_id, name, params)
+        else:
+            connection.send_reply({
+                "id": request_id,
+                "error": f"unknown method: {name}",
+            })
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def start_ipc_server(path: str) -> _UnixServer:
+    """Listen on ``path`` on a daemon thread and return the server."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if os.path.exists(path):
+        os.unlink(path)  # stale socket from a previous run
+    server = _UnixServer(path, _RequestHandler)
+    os.chmod(path, 0o660)
+    if bus.retained("state") is None:
+        publish_state("idle")
+    try:
+        publish_persona()
+    except Exception as e:
+        logger.warning(f"IPC: could not read the current persona: {e}")
+    threading.Thread(target=server.serve_forever, name="ipc", daemon=True).start()
+    logger.info(f"Control socket listening at {path}", emoji="🔌")
+    return server
+
+
+# ---- Methods ---------------------------------------------------------------
+@method("ping")
+def _ping():
+    return "pong"
+
+
+@method("status")
+def _status():
+    from .hotword import controller
+
+    return {
+        "pid": os.getpid(),
+        "state": bus.retained("state", {}).get("state"),
+        **_persona_status(),
+        "wake_word": controller.get_status(),
+    }
+
+
+@method("persona.switch")
+def _switch_persona(name: str):
+    from .persona_manager import persona_manager
+
+    if not persona_manager.switch_persona(name):
+        raise ValueError(f"Persona '{name}' not found")
+    return {"current_persona": name}
+
+
+@method("session.start")
+def _start_session(source: str = "ui"):
+    from .trigger import trigger_session_start
+
+    trigger_session_start(source)
+    return "ok"
+
+
+@method("session.stop")
+def _stop_session(source: str = "ui"):
+    from .trigger import trigger_session_stop
+
+    trigger_session_stop(source)
+    return "ok"
+
+
+@method("wake_word.status")
+def _wake_word_status():
+    from .hotword import controller
+
+    return controller.get_status()
+
+
+@method("wake_word.events")
+def _wake_word_events(limit: int = 50):
+    import dataclasses
+
+    from .hotword import controller
+
+    event_queue = controller.get_event_queue()
+    drained = []
+    for _ in range(int(limit)):
+        try:
+            drained.append(dataclasses.asdict(event_queue.get_nowait()))
+        except queue.Empty:
+            break
+    return drained
+
+
+@method("wake_word.configure")
+def _configure_wake_word(**params):
+    from .hotword import controller
+
+    controller.set_parameters(**params)
+    return sorted(params)
+
+
+@method("meter.capture")
+def _capture_meter(seconds: float = 3.0):
+    """Meter frames from Billy's own mic input over ``seconds``."""
+    from .meters import meter
+
+    return meter.capture(min(float(seconds), 10.0))
+
+
+@method("wakeup.play")
+def _play_wakeup(index: int, persona: str | None = None):
+    from .config import CHUNK_MS
+    from .persona_manager import persona_manager
+    from .wakeup import find_wakeup_clip
+
+    persona = persona or persona_manager.current_persona
+    path = find_wakeup_clip(int(index), persona)
+    if path is None:
+        raise FileNotFoundError(f"Clip {index}.wav not found")
+
+    from .audio import enqueue_wav_to_playback, ensure_playback_worker_started
+
+    ensure_playback_worker_started(CHUNK_MS)
+    enqueue_wav_to_playback(path)
+    return {"path": path, "persona": persona}
+
+
+@method("motor.test")
+def _test_motor(motor: str):
+    import time
+
+    from . import movements
+
+    if motor == "mouth":
+        movements.move_mouth(100, 1, brake=True)
+    elif motor == "head":
+        movements.move_head("on")
+        time.sleep(1)
+        movements.move_head("off")
+    elif motor == "tail":
+        movements.move_tail(duration=1)
+    else:
+        raise ValueError(f"Invalid motor: {motor}")
+    return "ok"
@@ -1,12 +1,28 @@
 """
 Centralized logging system for Billy Bass Assistant.
 Supports different log levels: ERROR, WARNING, INFO, VERBOSE
+
+The level is read from ``LOG_LEVEL`` once and cached; change it with
+``set_level`` or re-read the environment with ``reload_level``. Messages may
+use ``%``-style arguments (``logger.verbose("rms=%.0f", "🔍", rms)``), which
+are only formatted when the level is enabled, and ``is_enabled_for`` guards
+more expensive message construction. Enabled messages are handed to a bounded
+queue drained by a background sink thread, so callers such as the audio
+callbacks never block on stdout/journald; when the queue is full the message
+is dropped and counted instead.
 """
 
+import atexit
 import os
+import queue
+import sys
+import threading
 from enum import Enum
 
 
+SINK_QUEUE_SIZE = 1024
+
+
 class LogLevel(Enum):
     ERROR = 0
     WARNING = 1
@@ -14,73 +30,144 @@ class LogLevel(Enum):
     VERBOSE = 3
 
 
+def _level_from_env() -> LogLevel:
+    level_str = os.getenv("LOG_LEVEL", "INFO").upper()
+    try:
+        return LogLevel[level_str]
+    except KeyError:
+        print(f"⚠️ Invalid LOG_LEVEL '{level_str}', using INFO")
+        return LogLevel.INFO
+
+
 class BillyLogger:
-    def __init__(self):
-        self._level = LogLevel.INFO  # Default level
-        self._cached_level = None  # Cache the level to avoid repeated env lookups
-
-    def _get_current_level(self):
-        """Get the current log level, loading from environment if needed."""
-        # Always check the environment variable to pick up changes
-        level_str = os.getenv("LOG_LEVEL", "INFO").upper()
-        try:
-            return LogLevel[level_str]
-        except KeyError:
-            print(f"⚠️ Invalid LOG_LEVEL '{level_str}', using INFO")
-            return LogLevel.INFO
+    def __init__(self, queue_size: int = SINK_QUEUE_SIZE):
+        self._level = _level_from_env()
+        self._level_value = self._level.value
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=queue_size)
+        self._sink_lock = threading.Lock()
+        self._sink: threading.Thread | None = None
+        self._dropped = 0
+        self._dropped_reported = 0
+
+    @property
+    def dropped(self) -> int:
+        """Number of messages dropped because the sink queue was full."""
+        return self._dropped
 
     def set_level(self, level: LogLevel):
         """Set the current log level."""
         self._level = level
+        self._level_value = level.value
         os.environ["LOG_LEVEL"] = level.name
 
     def reload_level(self):
         """Force reload the log level from environment variable."""
-        self._cached_level = None  # Clear cache
-        return self._get_current_level()
+        self._level = _level_from_env()
+        self._level_value = self._level.value
+        return self._level
 
     def get_level(self) -> LogLevel:
         """Get the current log level."""
-        return self._get_current_level()
+        return self._level
+
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        """Check if a message at this level would be logged."""
+        return level.value <= self._level_value
+
+    # ---- Sink ------------------------------------------------------------
+    def _ensure_sink(self):
+        with self._sink_lock:
+            if self._sink is None or not self._sink.is_alive():
+                self._sink = threading.Thread(
+                    target=self._drain, name="log-sink", daemon=True
+                )
+                self._sink.start()
+
+    def _drain(self):
+        while True:
+            line = self._queue.get()
+            try:
+                if line is None:
+                    return
+                dropped = self._dropped
+                if dropped != self._dropped_reported:
+                    missed = dropped - self._dropped_reported
+                    self._dropped_reported = dropped
+                    self._write(f"⚠️ Logger dropped {missed} message(s)")
+                self._write(line)
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write(line: str):
+        try:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+        except Exception:
+            pass
+
+    def _enqueue(self, line: str):
+        sink = self._sink
+        if sink is None or not sink.is_alive():
+            self._ensure_sink()
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self._dropped += 1
 
-    def _should_log(self, level: LogLevel) -> bool:
-        """Check if a message at this level should be logged."""
-        current_level = self._get_current_level()
-        return level.value <= current_level.value
+    def flush(self, timeout: float = 2.0):
+        """Wait (up to ``timeout`` seconds) for queued messages to be written."""
+        if self._sink is None or not self._sink.is_alive():
+            return
+        done = threading.Event()
 
-    def _log(self, level: LogLevel, message: str, emoji: str = ""):
-        """Internal logging method."""
-        if self._should_log(level):
-            prefix = f"{emoji} " if emoji else ""
-            print(f"{prefix}{message}", flush=True)
+        def _join():
+            self._queue.join()
+            done.set()
 
-    def error(self, message: str, emoji: str = "❌"):
+        threading.Thread(target=_join, name="log-flush", daemon=True).start()
+        done.wait(timeout)
+
+    # ---- Logging ---------------------------------------------------------
+    def _log(self, level: LogLevel, message: str, emoji: str = "", args=()):
+        """Internal logging method."""
+        if level.value > self._level_value:
+            return
+        if args:
+            try:
+                message = message % args
+            except Exception:
+                message = f"{message} {args!r}"
+        self._enqueue(f"{emoji} {message}" if emoji else message)
+
+    def error(self, message: str, *args, emoji: str = "❌"):
         """Log an error message."""
-        self._log(LogLevel.ERROR, message, emoji)
+        self._log(LogLevel.ERROR, message, emoji, args)
 
-    def warning(self, message: str, emoji: str = "⚠️"):
+    def warning(self, message: str, *args, emoji: str = "⚠️"):
         """Log a warning message."""
-        self._log(LogLevel.WARNING, message, emoji)
+        self._log(LogLevel.WARNING, message, emoji, args)
 
-    def info(self, message: str, emoji: str = "ℹ️"):
+    def info(self, message: str, *args, emoji: str = "ℹ️"):
         """Log an info message."""
-        self._log(LogLevel.INFO, message, emoji)
+        self._log(LogLevel.INFO, message, emoji, args)
 
-    def verbose(self, message: str, emoji: str = "🔍"):
+    def verbose(self, message: str, *args, emoji: str = "🔍"):
         """Log a verbose/debug message."""
-        self._log(LogLevel.VERBOSE, message, emoji)
+        self._log(LogLevel.VERBOSE, message, emoji, args)
 
-    def success(self, message: str, emoji: str = "✅"):
+    def success(self, message: str, *args, emoji: str = "✅"):
         """Log a success message (INFO level)."""
-        self._log(LogLevel.INFO, message, emoji)
+        self._log(LogLevel.INFO, message, emoji, args)
 
-    def debug(self, message: str, emoji: str = "🐛"):
+    def debug(self, message: str, *args, emoji: str = "🐛"):
         """Log a debug message (VERBOSE level)."""
-        self._log(LogLevel.VERBOSE, message, emoji)
+        self._log(LogLevel.VERBOSE, message, emoji, args)
 
 
 # Global logger instance
 logger = BillyLogger()
+atexit.register(logger.flush)
 
 
 def set_log_level(level: LogLevel):
@@ -100,24 +187,24 @@ def reload_log_level() -> LogLevel:
 
 # Convenience functions for backward compatibility
 def log_error(message: str, emoji: str = "❌"):
-    logger.error(message, emoji)
+    logger.error(message, emoji=emoji)
 
 
 def log_warning(message: str, emoji: str = "⚠️"):
-    logger.warning(message, emoji)
+    logger.warning(message, emoji=emoji)
 
 
 def log_info(message: str, emoji: str = "ℹ️"):
-    logger.info(message, emoji)
+    logger.info(message, emoji=emoji)
 
 
 def log_verbose(message: str, emoji: str = "🔍"):
-    logger.verbose(message, emoji)
+    logger.verbose(message, emoji=emoji)
 
 
 def log_success(message: str, emoji: str = "✅"):
-    logger.success(message, emoji)
+    logger.success(message, emoji=emoji)
 
 
 def log_debug(message: str, emoji: str = "🐛"):
-    logger.debug(message, emoji)
+    logger.debug(message, emoji=emoji)
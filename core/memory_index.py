@@ -0,0 +1,146 @@
+"""
+Local, CPU-only semantic index over user memories.
+
+Memories are embedded with a hashing-trick vectorizer (word stems, word
+bigrams and character trigrams hashed into a fixed number of signed buckets),
+so no model download is needed and vectors are stable across processes. Each
+user's vectors are kept in one L2-normalized numpy matrix and searched brute
+force with a single matrix-vector product, which stays in the low
+milliseconds at 10k memories. The index follows ``memory_store.version`` and only
+re-embeds memories whose text changed. It backs the ``recall_memory`` tool.
+"""
+
+import threading
+import zlib
+from typing import Any
+
+import numpy as np
+
+from .logger import logger
+from .memory_store import memory_store, tokenize
+
+
+EMBEDDING_DIM = 256
+MIN_SIMILARITY = 0.12
+DEFAULT_RECALL_LIMIT = 5
+
+# Relative weight of each feature family in the hashed vector
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.5
+TRIGRAM_WEIGHT = 0.3
+
+
+class HashingEncoder:
+    """Embed text by hashing n-gram features into signed buckets."""
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> list[tuple[str, float]]:
+        words = tokenize(text)
+        features = [(f"w:{word}", WORD_WEIGHT) for word in words]
+        features += [
+            (f"b:{first}_{second}", BIGRAM_WEIGHT)
+            for first, second in zip(words, words[1:])
+        ]
+        for word in words:
+            padded = f"<{word}>"
+            features += [
+                (f"t:{padded[i : i + 3]}", TRIGRAM_WEIGHT)
+                for i in range(len(padded) - 2)
+            ]
+        return features
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Return an L2-normalized ``(len(texts), dim)`` float32 matrix."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = -1.0 if digest & 0x80000000 else 1.0
+                matrix[row, digest % self.dim] += sign * weight
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+class _UserIndex:
+    def __init__(self):
+        self.version = -1
+        self.memories: list[dict[str, Any]] = []
+        self.matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self.vectors: dict[str, tuple[str, np.ndarray]] = {}  # id -> (text, vec)
+
+
+class MemoryIndex:
+    """Per-user embedding matrices kept in sync with the memory store."""
+
+    def __init__(self, encoder: HashingEncoder | None = None):
+        self.encoder = encoder or HashingEncoder()
+        self._lock = threading.Lock()
+        self._users: dict[str, _UserIndex] = {}
+
+    def _refresh(self, user: str) -> _UserIndex:
+        key = user.strip().lower()
+        index = self._users.setdefault(key, _UserIndex())
+        version = memory_store.version(key)
+        if version == index.version:
+            return index
+
+        memories = memory_store.recent(key)
+        stale = [
+            m for m in memories if index.vectors.get(m["id"], ("",))[0] != m["memory"]
+        ]
+        if stale:
+            encoded = self.encoder.encode([m["memory"] for m in stale])
+            for memory, vector in zip(stale, encoded):
+                index.vectors[memory["id"]] = (memory["memory"], vector)
+        live_ids = {m["id"] for m in memories}
+        for memory_id in [i for i in index.vectors if i not in live_ids]:
+            del index.vectors[memory_id]
+
+        index.memories = memories
+        index.matrix = (
+            np.stack([index.vectors[m["id"]][1] for m in memories])
+            if memories
+            else np.zeros((0, self.encoder.dim), dtype=np.float32)
+        )
+        index.version = version
+        logger.verbose(
+            f"Memory index for {user}: {len(memories)} memories "
+            f"({len(stale)} embedded)",
+            emoji="🧠",
+        )
+        return index
+
+    def search(
+        self, user: str, query: str, limit: int = DEFAULT_RECALL_LIMIT
+    ) -> list[dict[str, Any]]:
+        """Return up to ``limit`` memories most similar to ``query``."""
+        query_vector = self.encoder.encode([query])[0]
+        if not query_vector.any():
+            return []
+        with self._lock:
+            index = self._refresh(user)
+            if not index.memories:
+                return []
+            scores = index.matrix @ query_vector
+            limit = min(limit, len(scores))
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {**index.memories[i], "similarity": round(float(scores[i]), 3)}
+                for i in top
+                if scores[i] >= MIN_SIMILARITY
+            ]
+
+    def invalidate(self, user: str | None = None) -> None:
+        with self._lock:
+            if user is None:
+                self._users.clear()
+            else:
+                self._users.pop(user.strip().lower(), None)
+
+
+# Global instance
+memory_index = MemoryIndex()
@@ -0,0 +1,403 @@
+"""
+SQLite-backed store for user memories.
+
+Memories live in ``profiles/memories.db`` (WAL mode, so the webconfig process
+can read and edit while Billy is running) with indexes on importance,
+category and timestamp, and an FTS5 table for keyword search. ``top_k`` ranks
+memories by a blend of importance, recency and keyword overlap with the
+current conversation so important old memories still reach the prompt.
+Profiles that still carry a ``CORE_MEMORIES`` blob in their INI are migrated
+on first load. A per-user version counter, bumped by triggers, lets caches
+such as the embedding index notice edits made by other processes.
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .logger import logger
+
+
+MEMORY_DB_PATH = Path("profiles") / "memories.db"
+
+IMPORTANCE_RANK = {"low": 1, "medium": 2, "high": 3}
+IMPORTANCE_WEIGHT = {1: 0.3, 2: 0.6, 3: 1.0}
+
+# Relevance scoring
+SCORE_WEIGHT_IMPORTANCE = 0.4
+SCORE_WEIGHT_RECENCY = 0.2
+SCORE_WEIGHT_KEYWORDS = 0.4
+RECENCY_HALF_LIFE_DAYS = 30.0
+CANDIDATE_LIMIT = 100
+
+_STOPWORDS_TEXT = (
+    "a an and are as at be but by do for from has have i im in is it its me my "
+    "of on or our so that the their them they this to was we what when where "
+    "who why will with you your"
+)
+STOPWORDS = frozenset(_STOPWORDS_TEXT.split())
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id TEXT PRIMARY KEY,
+    user TEXT NOT NULL,
+    memory TEXT NOT NULL,
+    importance TEXT NOT NULL DEFAULT 'medium',
+    importance_rank INTEGER NOT NULL DEFAULT 2,
+    category TEXT NOT NULL DEFAULT 'fact',
+    date TEXT NOT NULL,
+    created_ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_memories_user_importance
+    ON memories (user, importance_rank);
+CREATE INDEX IF NOT EXISTS idx_memories_user_category
+    ON memories (user, category);
+CREATE INDEX IF NOT EXISTS idx_memories_user_created
+    ON memories (user, created_ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+    memory, content='memories', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+    INSERT INTO memories_fts (rowid, memory) VALUES (new.rowid, new.memory);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, memory)
+        VALUES ('delete', old.rowid, old.memory);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF memory ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, memory)
+        VALUES ('delete', old.rowid, old.memory);
+    INSERT INTO memories_fts (rowid, memory) VALUES (new.rowid, new.memory);
+END;
+CREATE TABLE IF NOT EXISTS memory_versions (
+    user TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS memory_versions_ai AFTER INSERT ON memories BEGIN
+    INSERT INTO memory_versions VALUES (new.user, 1)
+        ON CONFLICT (user) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS memory_versions_ad AFTER DELETE ON memories BEGIN
+    INSERT INTO memory_versions VALUES (old.user, 1)
+        ON CONFLICT (user) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS memory_versions_au AFTER UPDATE ON memories BEGIN
+    INSERT INTO memory_versions VALUES (new.user, 1)
+        ON CONFLICT (user) DO UPDATE SET version = version + 1;
+    INSERT INTO memory_versions VALUES (old.user, 1)
+        ON CONFLICT (user) DO UPDATE SET version = version + 1;
+END;
+CREATE TABLE IF NOT EXISTS migrated_users (
+    user TEXT PRIMARY KEY,
+    migrated_at TEXT NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase keyword stems (plural ``s`` stripped) without stopwords."""
+    return [
+        word[:-1] if len(word) > 3 and word.endswith("s") else word
+        for word in re.findall(r"\w+", (text or "").lower())
+        if len(word) > 2 and word not in STOPWORDS
+    ]
+
+
+def _user_key(user: str) -> str:
+    return (user or "").strip().lower()
+
+
+def _timestamp(date: str) -> float:
+    try:
+        return datetime.fromisoformat(date).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+def _row_to_memory(row: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "id": row["id"],
+        "date": row["date"],
+        "memory": row["memory"],
+        "importance": row["importance"],
+        "category": row["category"],
+    }
+
+
+class MemoryStore:
+    """Per-user memories with indexed CRUD and relevance-ranked retrieval."""
+
+    def __init__(self, db_path: Path = MEMORY_DB_PATH):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _fetch(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---- Writes ----------------------------------------------------------
+    @staticmethod
+    def _row_values(user: str, memory: dict[str, Any]) -> tuple:
+        importance = str(memory.get("importance") or "medium").lower()
+        date = memory.get("date") or datetime.now().isoformat()
+        return (
+            memory.get("id") or str(uuid.uuid4()),
+            _user_key(user),
+            str(memory.get("memory") or ""),
+            importance,
+            IMPORTANCE_RANK.get(importance, 2),
+            str(memory.get("category") or "fact"),
+            date,
+            _timestamp(date),
+        )
+
+    def add(
+        self,
+        user: str,
+        memory: str,
+        importance: str = "medium",
+        category: str = "fact",
+    ) -> dict[str, Any]:
+        """Insert a memory and return it in the profile memory format."""
+        entry = {
+            "id": str(uuid.uuid4()),
+            "date": datetime.now().isoformat(),
+            "memory": memory,
+            "importance": importance,
+            "category": category,
+        }
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO memories VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._row_values(user, entry),
+                )
+        return entry
+
+    def update(
+        self,
+        user: str,
+        memory_id: str,
+        memory: str,
+        category: str,
+        importance: str,
+    ) -> bool:
+        """Update one memory by id. Returns False when it does not exist."""
+        importance = (importance or "medium").lower()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE memories SET memory = ?, category = ?, importance = ?, "
+                    "importance_rank = ? WHERE user = ? AND id = ?",
+                    (
+                        memory,
+                        category,
+                        importance,
+                        IMPORTANCE_RANK.get(importance, 2),
+                        _user_key(user),
+                        memory_id,
+                    ),
+                )
+        return cursor.rowcount > 0
+
+    def delete(self, user: str, memory_id: str) -> bool:
+        """Delete one memory by id. Returns False when it does not exist."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM memories WHERE user = ? AND id = ?",
+                    (_user_key(user), memory_id),
+                )
+        return cursor.rowcount > 0
+
+    def delete_by_date(self, user: str, date: str) -> bool:
+        """Delete memories by timestamp (for legacy entries without an id)."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM memories WHERE user = ? AND date = ?",
+                    (_user_key(user), date),
+                )
+        return cursor.rowcount > 0
+
+    def replace_all(self, user: str, memories: list[dict[str, Any]]) -> int:
+        """Replace every memory for a user in one transaction."""
+        rows = [self._row_values(user, m) for m in memories if isinstance(m, dict)]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM memories WHERE user = ?", (_user_key(user),))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO memories VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._mark_migrated(conn, user)
+        return len(rows)
+
+    def delete_user(self, user: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM memories WHERE user = ?", (_user_key(user),))
+                conn.execute(
+                    "DELETE FROM migrated_users WHERE user = ?", (_user_key(user),)
+                )
+
+    def rename_user(self, old_user: str, new_user: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for table in ("memories", "migrated_users"):
+                    conn.execute(
+                        f"UPDATE {table} SET user = ? WHERE user = ?",
+                        (_user_key(new_user), _user_key(old_user)),
+                    )
+
+    # ---- Migration -------------------------------------------------------
+    @staticmethod
+    def _mark_migrated(conn: sqlite3.Connection, user: str) -> None:
+        conn.execute(
+            "INSERT OR IGNORE INTO migrated_users VALUES (?, ?)",
+            (_user_key(user), datetime.now().isoformat()),
+        )
+
+    def is_migrated(self, user: str) -> bool:
+        rows = self._fetch(
+            "SELECT 1 FROM migrated_users WHERE user = ?", (_user_key(user),)
+        )
+        return bool(rows)
+
+    def import_legacy(self, user: str, memories: list[dict[str, Any]]) -> int:
+        """Import memories from a profile INI once; later calls are no-ops."""
+        rows = [self._row_values(user, m) for m in memories if isinstance(m, dict)]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                done = conn.execute(
+                    "SELECT 1 FROM migrated_users WHERE user = ?", (_user_key(user),)
+                ).fetchone()
+                if done:
+                    return 0
+                conn.executemany(
+                    "INSERT OR IGNORE INTO memories VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._mark_migrated(conn, user)
+        if rows:
+            logger.info(
+                f"Migrated {len(rows)} memories for {user} to SQLite", emoji="💭"
+            )
+        return len(rows)
+
+    # ---- Reads -----------------------------------------------------------
+    def version(self, user: str) -> int:
+        """Return a counter that changes whenever the user's memories change."""
+        rows = self._fetch(
+            "SELECT version FROM memory_versions WHERE user = ?", (_user_key(user),)
+        )
+        return rows[0][0] if rows else 0
+
+    def count(self, user: str) -> int:
+        rows = self._fetch(
+            "SELECT COUNT(*) FROM memories WHERE user = ?", (_user_key(user),)
+        )
+        return rows[0][0]
+
+    def recent(self, user: str, limit: int | None = None) -> list[dict[str, Any]]:
+        """Return memories oldest-first, limited to the ``limit`` newest."""
+        rows = self._fetch(
+            "SELECT * FROM memories WHERE user = ? ORDER BY created_ts DESC LIMIT ?",
+            (_user_key(user), -1 if limit is None else limit),
+        )
+        return [_row_to_memory(row) for row in reversed(rows)]
+
+    def top_k(self, user: str, query: str = "", k: int = 5) -> list[dict[str, Any]]:
+        """Return the ``k`` memories scoring highest for ``query``.
+
+        Candidates are FTS matches for the query plus the most important and
+        most recent memories; each is scored on importance, recency
+        (exponential decay) and how many query keywords it shares, with each
+        additional shared keyword counting half as much as the previous one.
+        """
+        user_key = _user_key(user)
+        terms = sorted(set(tokenize(query)))
+        with self._lock:
+            conn = self._connect()
+            candidates = {
+                row["id"]: row
+                for row in conn.execute(
+                    "SELECT * FROM memories WHERE user = ? "
+                    "ORDER BY importance_rank DESC, created_ts DESC LIMIT ?",
+                    (user_key, CANDIDATE_LIMIT),
+                )
+            }
+            if terms:
+                match = " OR ".join(f'"{term}"*' for term in terms)
+                for row in conn.execute(
+                    "SELECT m.* FROM memories_fts f JOIN memories m "
+                    "ON m.rowid = f.rowid WHERE memories_fts MATCH ? AND m.user = ? "
+                    "ORDER BY bm25(memories_fts) LIMIT ?",
+                    (match, user_key, CANDIDATE_LIMIT),
+                ):
+                    candidates[row["id"]] = row
+
+        now = time.time()
+        scored = []
+        for row in candidates.values():
+            age_days = max(0.0, now - row["created_ts"]) / 86400
+            recency = math.pow(0.5, age_days / RECENCY_HALF_LIFE_DAYS)
+            overlap = 0.0
+            if terms:
+                matches = len(set(terms) & set(tokenize(row["memory"])))
+                overlap = 1 - math.pow(0.5, matches)
+            score = (
+                SCORE_WEIGHT_IMPORTANCE * IMPORTANCE_WEIGHT[row["importance_rank"]]
+                + SCORE_WEIGHT_RECENCY * recency
+                + SCORE_WEIGHT_KEYWORDS * overlap
+            )
+            scored.append((score, row["created_ts"], row))
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [_row_to_memory(row) for _score, _ts, row in scored[:k]]
+
+
+def parse_ini_memories(raw: str) -> list[dict[str, Any]]:
+    """Parse the legacy ``CORE_MEMORIES.memories`` JSON blob."""
+    try:
+        memories = json.loads(raw or "[]")
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ignoring unreadable CORE_MEMORIES blob: {e}")
+        return []
+    return memories if isinstance(memories, list) else []
+
+
+# Global instance
+memory_store = MemoryStore()
@@ -0,0 +1,112 @@
+"""
+Live mic meters for the web UI.
+
+The audio callbacks that already read the mic (the wake-word listener while
+Billy is idle, the session mic while talking) pass each block to
+``meter.feed``. Blocks are folded into frames of peak, RMS and voice
+activity about every ``FRAME_SECONDS`` and published once on the IPC bus as
+``meter`` events; the web UI fans them out to however many viewers are open,
+so no viewer opens the device or adds work to the audio path. Nothing is computed unless someone
+subscribed to ``meter`` or ``capture`` is collecting frames.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from .config import SILENCE_THRESHOLD
+from .ipc import bus
+from .wake_dsp import block_rms
+
+
+FRAME_SECONDS = 0.05  # 20 frames per second
+
+
+class AudioMeter:
+    """Downsample mic blocks to peak/RMS/VAD frames."""
+
+    def __init__(self, interval: float = FRAME_SECONDS):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._captures: list[list[dict]] = []
+        self._emitted = 0.0
+        self._last_block = 0.0
+        self._clear()
+
+    def _clear(self) -> None:
+        self._peak = 0.0
+        self._energy = 0.0
+        self._samples = 0
+        self._voiced = False
+
+    @property
+    def active(self) -> bool:
+        return bool(self._captures) or bus.wants("meter")
+
+    def feed(
+        self,
+        samples: np.ndarray,
+        source: str,
+        *,
+        rms: float | None = None,
+        vad: bool | None = None,
+    ) -> None:
+        """Add one mono block (int16 scale).
+
+        ``vad`` defaults to the block being above ``SILENCE_THRESHOLD``, the
+        session's own notion of speech.
+        """
+        count = samples.shape[0]
+        if not count or not self.active:
+            if self._samples:
+                self._clear()
+            return
+
+        now = time.monotonic()
+        gap = min(now - self._last_block, self.interval)
+        self._last_block = now
+        if rms is None:
+            rms = block_rms(samples.astype(np.float32, copy=False))
+        if vad is None:
+            vad = rms > SILENCE_THRESHOLD
+        # int() first: -(-32768) does not fit in int16
+        peak = max(int(samples.max()), -int(samples.min()))
+
+        self._peak = max(self._peak, float(peak))
+        self._energy += rms * rms * count
+        self._samples += count
+        self._voiced = self._voiced or bool(vad)
+        # Emit at the block boundary nearest to ``interval`` (every block
+        # when blocks are longer than half of it)
+        if now - self._emitted < self.interval - gap / 2:
+            return
+        self._emitted = now
+
+        frame = {
+            "source": source,
+            "peak": round(self._peak, 1),
+            "rms": round(float(np.sqrt(self._energy / self._samples)), 1),
+            "vad": self._voiced,
+            "threshold": SILENCE_THRESHOLD,
+        }
+        self._clear()
+        bus.publish("meter", frame)
+        for frames in self._captures:
+            frames.append(frame)
+
+    def capture(self, seconds: float) -> list[dict]:
+        """Collect the frames produced over the next ``seconds``."""
+        frames: list[dict] = []
+        with self._lock:
+            self._captures = [*self._captures, frames]
+        try:
+            time.sleep(seconds)
+        finally:
+            with self._lock:
+                self._captures = [c for c in self._captures if c is not frames]
+        return frames
+
+
+# Global instance
+meter = AudioMeter()
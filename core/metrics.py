@@ -0,0 +1,366 @@
+"""
+In-process metrics for the Billy runtime.
+
+Counters, gauges and fixed-bucket histograms, rendered in the Prometheus text
+exposition format. Updating a metric is a dict-free attribute update under a
+per-value lock, cheap enough for the audio callback and playback worker; look
+up labelled children once (``METRIC.labels("mouth")``) and keep the handle on
+hot paths. Gauges and counters can be backed by a function that is only
+evaluated at scrape time. ``start_metrics_server`` serves ``/metrics`` from a small threaded HTTP
+listener when ``METRICS_PORT`` is set.
+"""
+
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .logger import logger
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in labels.items())
+    return "{" + pairs + "}"
+
+
+# ---- Values ----------------------------------------------------------------
+class _CounterValue:
+    __slots__ = ("_lock", "value", "_function")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` (a running total) at scrape time."""
+        self._function = function
+
+    def samples(self, name: str, labels: dict[str, str]):
+        value = self.value
+        if self._function is not None:
+            try:
+                value = float(self._function())
+            except Exception:
+                value = math.nan
+        yield name, labels, value
+
+
+class _GaugeValue:
+    __slots__ = ("_lock", "value", "_function")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` at scrape time instead."""
+        self._function = function
+
+    def samples(self, name: str, labels: dict[str, str]):
+        value = self.value
+        if self._function is not None:
+            try:
+                value = float(self._function())
+            except Exception:
+                value = math.nan
+        yield name, labels, value
+
+
+class _HistogramValue:
+    __slots__ = ("_lock", "_bounds", "_counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self, name: str, labels: dict[str, str]):
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self.sum, self.count
+        cumulative = 0
+        for bound, bucket_count in zip((*self._bounds, math.inf), counts):
+            cumulative += bucket_count
+            yield f"{name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+        yield f"{name}_sum", labels, total
+        yield f"{name}_count", labels, count
+
+
+# ---- Metric families -------------------------------------------------------
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_value()
+
+    @abstractmethod
+    def _new_value(self):
+        """Create the value held by one label combination."""
+
+    def labels(self, *values: str):
+        """Return the child for these label values, creating it on first use."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_value())
+        return child
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key))
+            for name, sample_labels, value in child.samples(self.name, labels):
+                lines.append(
+                    f"{name}{_format_labels(sample_labels)} {_format_value(value)}"
+                )
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_value(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default.set_function(function)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_value(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default.set_function(function)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float],
+    ):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_value(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+
+class MetricsRegistry:
+    """Named collection of metrics; registering a name twice returns it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} already registered")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = (),
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+registry = MetricsRegistry()
+
+# ---- Billy metrics ---------------------------------------------------------
+PRESS_TO_FIRST_AUDIO = registry.histogram(
+    "billy_press_to_first_audio_seconds",
+    "Time from a session trigger to the first audio chunk written to the speaker.",
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0),
+)
+TTS_UNDERRUNS = registry.counter(
+    "billy_tts_underruns_total",
+    "Times the playback queue ran dry while a response was still streaming.",
+)
+MIC_FRAMES_SENT = registry.counter(
+    "billy_mic_frames_sent_total", "Mic frames sent to the realtime provider."
+)
+MIC_FRAMES_DROPPED = registry.counter(
+    "billy_mic_frames_dropped_total",
+    "Mic frames that could not be sent (no websocket, closed loop or error).",
+)
+WEBSOCKET_CONNECTS = registry.counter(
+    "billy_websocket_connects_total", "Provider websocket connections opened."
+)
+WEBSOCKET_RECONNECTS = registry.counter(
+    "billy_websocket_reconnects_total",
+    "Provider websockets replaced mid-session.",
+    labelnames=("reason",),
+)
+TOOL_LATENCY = registry.histogram(
+    "billy_tool_latency_seconds",
+    "Tool call handler latency.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    labelnames=("tool",),
+)
+MOTOR_EVENTS = registry.counter(
+    "billy_motor_events_total", "Motor movements started.", labelnames=("motor",)
+)
+PLAYBACK_QUEUE_DEPTH = registry.gauge(
+    "billy_playback_queue_depth", "Audio chunks waiting in the playback queue."
+)
+LOG_MESSAGES_DROPPED = registry.counter(
+    "billy_log_messages_dropped_total",
+    "Log messages dropped because the log sink queue was full.",
+)
+LOG_MESSAGES_DROPPED.set_function(lambda: logger.dropped)
+
+_press_started: float | None = None
+
+
+def mark_press() -> None:
+    """Start the press-to-first-audio clock for a new session trigger."""
+    global _press_started
+    _press_started = time.monotonic()
+
+
+def mark_audio_written() -> None:
+    """Stop the press-to-first-audio clock; called for every chunk played."""
+    global _press_started
+    started = _press_started
+    if started is not None:
+        _press_started = None
+        PRESS_TO_FIRST_AUDIO.observe(time.monotonic() - started)
+
+
+# ---- HTTP listener ---------------------------------------------------------
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the journal.
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on a daemon thread and return the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-http", daemon=True
+    ).start()
+    bound_port = server.server_address[1]
+    logger.info(f"Metrics available at http://{host}:{bound_port}/metrics", emoji="📈")
+    return server
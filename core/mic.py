@@ -8,7 +8,7 @@ from .logger import logger
 
 def diagnose_audio_issues():
     """Diagnose common audio issues that might cause mic failures."""
-    logger.info("Running audio diagnostics...", "🔍")
+    logger.info("Running audio diagnostics...", emoji="🔍")
 
     try:
         # Check for processes using audio devices
@@ -21,7 +21,7 @@ def diagnose_audio_issues():
                 if line.strip():
                     logger.warning(f"  {line}")
         else:
-            logger.info("No processes found using audio devices", "✅")
+            logger.info("No processes found using audio devices", emoji="✅")
     except Exception as e:
         logger.warning(f"Could not check audio device usage: {e}")
 
@@ -9,6 +9,7 @@ import numpy as np
 
 from .config import BILLY_PINS, MOCKFISH, is_classic_billy
 from .logger import logger
+from .metrics import MOTOR_EVENTS
 
 
 try:
@@ -49,14 +50,16 @@ if MOCKFISH or not lgpio_available:
 
     lgpio = MockLgpio
     if MOCKFISH:
-        logger.info("Mockfish: GPIO mocked for development", "🐟")
+        logger.info("Mockfish: GPIO mocked for development", emoji="🐟")
     elif not lgpio_available:
-        logger.info("lgpio not available: GPIO mocked", "🐟")
+        logger.info("lgpio not available: GPIO mocked", emoji="🐟")
 
 
 # === Configuration ===
 USE_THIRD_MOTOR = is_classic_billy()
-logger.info(f"Using third motor: {USE_THIRD_MOTOR} | Pin profile: {BILLY_PINS}", "⚙️")
+logger.info(
+    f"Using third motor: {USE_THIRD_MOTOR} | Pin profile: {BILLY_PINS}", emoji="⚙️"
+)
 
 # === GPIO Setup ===
 h = lgpio.gpiochip_open(0)
@@ -101,7 +104,7 @@ for pin in motor_pins:
             # Pin is already claimed (likely from a previous crashed instance)
             # Try to free it first, then claim it again
             logger.warning(
-                f"GPIO pin {pin} is busy, attempting to free and reclaim...", "⚠️"
+                f"GPIO pin {pin} is busy, attempting to free and reclaim...", emoji="⚠️"
             )
             try:
                 # Try to free the pin (may fail if not claimed by this handle, but worth trying)
@@ -112,10 +115,10 @@ for pin in motor_pins:
                 # Now try to claim it again
                 lgpio.gpio_claim_output(h, pin)
                 lgpio.gpio_write(h, pin, 0)
-                logger.info(f"Successfully reclaimed GPIO pin {pin}", "✅")
+                logger.info(f"Successfully reclaimed GPIO pin {pin}", emoji="✅")
             except Exception as free_error:
                 logger.error(
-                    f"Failed to free/reclaim GPIO pin {pin}: {free_error}", "❌"
+                    f"Failed to free/reclaim GPIO pin {pin}: {free_error}", emoji="❌"
                 )
                 raise
         else:
@@ -210,7 +213,13 @@ def run_motor_async(pwm_pin, low_pin=None, speed_percent=100, duration=0.3, brak
 
 
 # === Movement Functions (keep signatures/behavior) ===
+_mouth_events = MOTOR_EVENTS.labels("mouth")
+_head_events = MOTOR_EVENTS.labels("head")
+_tail_events = MOTOR_EVENTS.labels("tail")
+
+
 def move_mouth(speed_percent, duration, brake=False):
+    _mouth_events.inc()
     run_motor_async(MOUTH, GND_1, speed_percent, duration, brake)
 
 
@@ -239,6 +248,7 @@ def move_head(state="on"):
 
     if state == "on":
         if not head_out:
+            _head_events.inc()
             threading.Thread(target=_move_head_on, daemon=True).start()
             head_out = True
     else:
@@ -255,6 +265,7 @@ def move_tail(duration=0.2):
       - new    + classic(3): dedicated channel with mate tied to GND => mate = None
       - new    + modern(2):  shared bridge with HEAD => mate = HEAD
     """
+    _tail_events.inc()
     if BILLY_PINS == "legacy":
         if USE_THIRD_MOTOR and TAIL is not None and GND_3 is not None:
             run_motor_async(TAIL, GND_3, speed_percent=80, duration=duration)
@@ -274,19 +285,11 @@ def move_tail_async(duration=0.3):
 def _articulation_multiplier():
     """Return direct articulation multiplier (1 = normal, higher = slower)."""
     try:
-        # Try to get mouth articulation from current persona
+        # Precompiled with the current persona; no disk access per audio chunk
         from .persona_manager import persona_manager
 
-        current_persona_data = persona_manager.get_current_persona_data()
-
-        if current_persona_data and current_persona_data.get('meta', {}).get(
-            'mouth_articulation'
-        ):
-            persona_articulation = current_persona_data['meta']['mouth_articulation']
-            return max(0, min(10, float(persona_articulation)))
-        # Fall back to global setting
-        return 5
-    except Exception as e:
+        return persona_manager.get_current_bundle(validate=False).articulation
+    except Exception:
         # Fall back to global setting on error
         return 5
 
@@ -424,7 +427,7 @@ def _pin_is_active(pin: int) -> bool:
 
 def stop_all_motors():
     global _gpio_active
-    logger.info("Stopping all motors", "🛑")
+    logger.info("Stopping all motors", emoji="🛑")
     if not _gpio_active:
         return  # GPIO handle already closed, skip
     for pin in motor_pins:
@@ -454,9 +457,9 @@ def cleanup_gpio():
 
         with contextlib.suppress(lgpio.error, Exception):
             lgpio.gpiochip_close(h)  # Handle might already be closed, ignore
-        logger.info("GPIO cleanup complete", "✅")
+        logger.info("GPIO cleanup complete", emoji="✅")
     except Exception as e:
-        logger.warning(f"GPIO cleanup error: {e}", "⚠️")
+        logger.warning(f"GPIO cleanup error: {e}", emoji="⚠️")
 
 
 def is_motor_active():
@@ -482,7 +485,7 @@ def motor_watchdog():
                     if (now - since_on[pin]) >= WATCHDOG_TIMEOUT_SEC:
                         logger.warning(
                             f"Watchdog: pin {pin} active > {WATCHDOG_TIMEOUT_SEC}s → braking channel",
-                            "⏱️",
+                            emoji="⏱️",
                         )
                         _stop_channel(pin)
                         since_on[pin] = None
@@ -1,6 +1,5 @@
 import asyncio
 import json
-import os
 import subprocess
 import threading
 import time
@@ -24,7 +23,7 @@ def on_connect(client, userdata, flags, rc):
     global mqtt_connected
     if rc == 0:
         mqtt_connected = True
-        logger.success("MQTT connected successfully!", "🔌")
+        logger.success("MQTT connected successfully!", emoji="🔌")
         mqtt_send_discovery()
         client.subscribe("billy/command")
         client.subscribe("billy/say")  # single endpoint
@@ -64,7 +63,7 @@ def stop_mqtt():
     if mqtt_client:
         mqtt_client.loop_stop()
         mqtt_client.disconnect()
-        logger.info("MQTT disconnected.", "🔌")
+        logger.info("MQTT disconnected.", emoji="🔌")
 
 
 def mqtt_publish(topic, payload, retain=True, retry=True):
@@ -73,7 +72,7 @@ def mqtt_publish(topic, payload, retain=True, retry=True):
     if mqtt_available():
         if not mqtt_client or not mqtt_connected:
             if retry:
-                logger.info("MQTT not connected. Trying to reconnect...", "🔁")
+                logger.info("MQTT not connected. Trying to reconnect...", emoji="🔁")
                 try:
                     mqtt_client.reconnect()
                     mqtt_connected = True
@@ -88,7 +87,9 @@ def mqtt_publish(topic, payload, retain=True, retry=True):
 
         try:
             mqtt_client.publish(topic, payload, retain=retain)
-            logger.verbose(f"MQTT publish: {topic} = {payload} (retain={retain})", "📡")
+            logger.verbose(
+                f"MQTT publish: {topic} = {payload} (retain={retain})", emoji="📡"
+            )
         except Exception as e:
             logger.error(f"MQTT publish failed: {e}")
 
@@ -307,12 +308,14 @@ def mqtt_stop_listening():
 
 
 def on_message(client, userdata, msg):
-    logger.verbose(f"MQTT message received: {msg.topic} = {msg.payload.decode()}", "📩")
+    logger.verbose(
+        f"MQTT message received: {msg.topic} = {msg.payload.decode()}", emoji="📩"
+    )
     if msg.topic == "billy/command":
         command = msg.payload.decode().strip().lower()
         if command == "shutdown":
             logger.warning(
-                "Shutdown command received over MQTT. Shutting down...", "🛑"
+                "Shutdown command received over MQTT. Shutting down...", emoji="🛑"
             )
             try:
                 stop_all_motors()
@@ -323,7 +326,8 @@ def on_message(client, userdata, msg):
 
         elif command == "restart-billy":
             logger.warning(
-                "Restart Billy command received over MQTT. Restarting service...", "🔁"
+                "Restart Billy command received over MQTT. Restarting service...",
+                emoji="🔁",
             )
             try:
                 stop_all_motors()
@@ -332,7 +336,7 @@ def on_message(client, userdata, msg):
             subprocess.Popen(["sudo", "systemctl", "restart", "billy.service"])
         elif command == "reboot":
             logger.warning(
-                "Reboot command received over MQTT. Rebooting system...", "🔁"
+                "Reboot command received over MQTT. Rebooting system...", emoji="🔁"
             )
             try:
                 stop_all_motors()
@@ -343,7 +347,7 @@ def on_message(client, userdata, msg):
         elif command == "listen":
             logger.warning(
                 "Listen command received over MQTT. Starting or stopping listening...",
-                "🔁",
+                emoji="🔁",
             )
             try:
                 mqtt_toggle_listening()
@@ -397,7 +401,8 @@ def on_message(client, userdata, msg):
 
             if index < 1 or index > 99:
                 logger.warning(
-                    f"Invalid wakeup preview index received over MQTT: {index}", "⚠️"
+                    f"Invalid wakeup preview index received over MQTT: {index}",
+                    emoji="⚠️",
                 )
                 return
 
@@ -406,30 +411,13 @@ def on_message(client, userdata, msg):
 
                 persona_name = persona_manager.current_persona
 
-            project_root = os.path.abspath(
-                os.path.join(os.path.dirname(__file__), "..")
-            )
-            sound_path = None
-            if persona_name and persona_name != "default":
-                persona_sound_path = os.path.join(
-                    project_root, "personas", persona_name, "wakeup", f"{index}.wav"
-                )
-                if os.path.exists(persona_sound_path):
-                    sound_path = persona_sound_path
-            elif persona_name == "default":
-                sound_path = os.path.join(
-                    project_root, "sounds", "wake-up", "custom", f"{index}.wav"
-                )
+            from .wakeup import find_wakeup_clip
 
+            sound_path = find_wakeup_clip(index, persona_name)
             if not sound_path:
-                sound_path = os.path.join(
-                    project_root, "sounds", "wake-up", "custom", f"{index}.wav"
-                )
-
-            if not os.path.exists(sound_path):
                 logger.warning(
                     f"Wakeup preview clip not found: persona={persona_name} index={index}",
-                    "⚠️",
+                    emoji="⚠️",
                 )
                 return
 
@@ -439,7 +427,7 @@ def on_message(client, userdata, msg):
             enqueue_wav_to_playback(sound_path)
             logger.info(
                 f"Queued wakeup preview via MQTT: persona={persona_name} index={index}",
-                "🔊",
+                emoji="🔊",
             )
         except Exception as e:
             logger.error(f"Failed to process MQTT wakeup preview: {e}")
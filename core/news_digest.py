@@ -15,8 +15,9 @@ import requests
 from .config import (
     NEWS_REQUEST_TIMEOUT_SECONDS,
 )
-from .logger import logger
+from .logger import LogLevel, logger
 from .news_manager import load_news_sources
+from .weather_cache import build_forecast_params, weather_cache
 
 
 OPEN_METEO_GEOCODE = "https://geocoding-api.open-meteo.com/v1/search"
@@ -96,10 +97,10 @@ def _get_headlines_digest(args: dict[str, Any], max_items: int) -> DigestResult:
 
     matching_sources = _select_matching_sources(sources, subject)
     if not matching_sources:
-        if logger.get_level().name == "VERBOSE":
+        if logger.is_enabled_for(LogLevel.VERBOSE):
             logger.verbose(
                 "get_news_digest: no configured matching sources, skipping headline fetch",
-                "🗞️",
+                emoji="🗞️",
             )
         return DigestResult(
             ok=False,
@@ -163,10 +164,10 @@ def _get_weather_digest(args: dict[str, Any]) -> DigestResult:
         resolved_url = _resolve_source_fetch_url(source, "")
         if _is_open_meteo_forecast_url(resolved_url):
             source_name = str(source.get("name") or "Open-Meteo").strip()
-            if logger.get_level().name == "VERBOSE":
+            if logger.is_enabled_for(LogLevel.VERBOSE):
                 logger.verbose(
                     f"weather_digest: using open-meteo handler source={source_name} url={resolved_url}",
-                    "🗞️",
+                    emoji="🗞️",
                 )
             return _get_weather_digest_open_meteo(
                 args,
@@ -528,29 +529,32 @@ def _get_weather_digest_open_meteo(
                     error="Missing location",
                 )
 
-            geocode_response = requests.get(
-                OPEN_METEO_GEOCODE,
-                params={
-                    "name": location,
-                    "count": 1,
-                    "language": str(args.get("language") or "en").strip(),
-                    "format": "json",
-                },
-                timeout=NEWS_REQUEST_TIMEOUT_SECONDS,
-            )
-            geocode_response.raise_for_status()
-            geocode_data = geocode_response.json()
-            results = geocode_data.get("results") or []
-            if not results:
-                return DigestResult(
-                    ok=False,
-                    category="weather",
-                    summary=f"I couldn't find a location match for {location}.",
-                    items=[],
-                    source=source_name,
+            language = str(args.get("language") or "en").strip()
+            place = weather_cache.get_geocode(location, language)
+            if place is None:
+                geocode_response = requests.get(
+                    OPEN_METEO_GEOCODE,
+                    params={
+                        "name": location,
+                        "count": 1,
+                        "language": language,
+                        "format": "json",
+                    },
+                    timeout=NEWS_REQUEST_TIMEOUT_SECONDS,
                 )
-
-            place = results[0]
+                geocode_response.raise_for_status()
+                geocode_data = geocode_response.json()
+                results = geocode_data.get("results") or []
+                if not results:
+                    return DigestResult(
+                        ok=False,
+                        category="weather",
+                        summary=f"I couldn't find a location match for {location}.",
+                        items=[],
+                        source=source_name,
+                    )
+                place = results[0]
+                weather_cache.store_geocode(location, language, place)
             latitude = place.get("latitude")
             longitude = place.get("longitude")
             resolved_location = ", ".join(
@@ -573,29 +577,22 @@ def _get_weather_digest_open_meteo(
                 error="Missing coordinates",
             )
 
-        forecast_response = requests.get(
-            OPEN_METEO_FORECAST,
-            params={
-                "latitude": latitude,
-                "longitude": longitude,
-                "current": ",".join([
-                    "temperature_2m",
-                    "apparent_temperature",
-                    "wind_speed_10m",
-                    "weather_code",
-                ]),
-                "daily": ",".join([
-                    "temperature_2m_max",
-                    "temperature_2m_min",
-                    "precipitation_probability_max",
-                ]),
-                "timezone": source_timezone,
-                "forecast_days": 1,
-            },
-            timeout=NEWS_REQUEST_TIMEOUT_SECONDS,
-        )
-        forecast_response.raise_for_status()
-        forecast_data = forecast_response.json()
+        forecast_data = weather_cache.get_forecast(latitude, longitude, source_timezone)
+        if forecast_data is None:
+            forecast_response = requests.get(
+                OPEN_METEO_FORECAST,
+                params=build_forecast_params(latitude, longitude, source_timezone),
+                timeout=NEWS_REQUEST_TIMEOUT_SECONDS,
+            )
+            forecast_response.raise_for_status()
+            forecast_data = forecast_response.json()
+            weather_cache.store_forecast(
+                latitude, longitude, source_timezone, forecast_data
+            )
+        elif logger.is_enabled_for(LogLevel.VERBOSE):
+            logger.verbose(
+                f"weather_digest: forecast cache hit for {resolved_location}", emoji="🗞️"
+            )
     except Exception as exc:
         return DigestResult(
             ok=False,
@@ -738,11 +735,11 @@ def _get_sports_digest(args: dict[str, Any], max_items: int) -> DigestResult:
             chosen = espn_candidates[0]
         source, url, inferred_sport = chosen
         source_name = str(source.get("name") or "ESPN").strip()
-        if logger.get_level().name == "VERBOSE":
+        if logger.is_enabled_for(LogLevel.VERBOSE):
             logger.verbose(
                 "sports_digest: using espn handler "
                 f"source={source_name} sport={inferred_sport} url={url}",
-                "🗞️",
+                emoji="🗞️",
             )
         return _get_sports_digest_espn(
             args,
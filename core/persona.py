@@ -208,7 +208,7 @@ def update_persona_ini(trait: str, value: int, ini_path="persona.ini"):
 
     logger.info(
         f"update_persona_ini called: trait={trait}, value={value}, ini_path={ini_path}, ALLOW_UPDATE={ALLOW_UPDATE_PERSONALITY_INI}",
-        "🎛️",
+        emoji="🎛️",
     )
 
     if ALLOW_UPDATE_PERSONALITY_INI:
@@ -225,8 +225,9 @@ def update_persona_ini(trait: str, value: int, ini_path="persona.ini"):
         with open(ini_path, "w") as f:
             config.write(f)
 
-        logger.info(f"Successfully updated {trait}={value} in {ini_path}", "✅")
+        logger.info(f"Successfully updated {trait}={value} in {ini_path}", emoji="✅")
     else:
         logger.warning(
-            f"Personality update disabled (ALLOW_UPDATE_PERSONALITY_INI=False)", "⚠️"
+            f"Personality update disabled (ALLOW_UPDATE_PERSONALITY_INI=False)",
+            emoji="⚠️",
         )
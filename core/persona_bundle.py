@@ -0,0 +1,186 @@
+"""
+Precompiled persona bundles.
+
+A bundle holds everything a persona switch needs: the rendered persona
+instruction sections, the resolved voice, the mouth articulation multiplier
+and the decoded wake-up clip bank. Bundles are immutable, compiled on first
+use and kept in a small LRU. Each bundle is keyed by the persona file
+signature and the mtimes of its wake-up clip folders, so an edit made
+through webconfig produces a fresh bundle while switching back to a
+recently used persona is just a pointer swap.
+"""
+
+import glob
+import os
+import threading
+import wave
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .logger import logger
+from .persona import PersonaProfile
+
+
+WAKE_UP_DIR = "sounds/wake-up/custom"
+WAKE_UP_DIR_DEFAULT = "sounds/wake-up/default"
+CLIP_SAMPLE_RATE = 24000
+DEFAULT_ARTICULATION = 5.0
+
+
+@dataclass(frozen=True)
+class WakeupClip:
+    path: str
+    pcm: bytes  # 24 kHz mono 16-bit frames
+
+
+@dataclass(frozen=True)
+class PersonaBundle:
+    name: str
+    key: tuple
+    description: str
+    instructions: str  # persona role text
+    personality_section: str
+    backstory_section: str
+    voice: str
+    articulation: float
+    wakeup_source: str  # folder the clip bank was loaded from
+    wakeup_clips: tuple[WakeupClip, ...]
+
+
+# ---- Instruction sections --------------------------------------------------
+def render_personality_section(persona_data: dict) -> str:
+    """Render the personality traits section of the instructions."""
+    if not persona_data.get('personality'):
+        return ""
+
+    personality = PersonaProfile()
+    for trait, value in persona_data['personality'].items():
+        if hasattr(personality, trait):
+            setattr(personality, trait, int(value))
+
+    return f"# Personality & Tone\n{personality.generate_prompt()}"
+
+
+def render_backstory_section(persona_data: dict) -> str:
+    """Render the backstory section of the instructions."""
+    backstory = persona_data.get('backstory', {})
+    if not backstory:
+        return ""
+
+    backstory_lines = [f"- {k}: {v}" for k, v in backstory.items()]
+    return (
+        f"# Context (backstory)\nUse your backstory to inspire jokes, metaphors, or occasional references in conversation, staying consistent with your personality.\n"
+        + "\n".join(backstory_lines)
+    )
+
+
+def parse_articulation(persona_data: dict | None) -> float:
+    """Return the mouth articulation multiplier (1 = normal, higher = slower)."""
+    raw = (persona_data or {}).get("meta", {}).get("mouth_articulation")
+    if not raw:
+        return DEFAULT_ARTICULATION
+    try:
+        return max(0.0, min(10.0, float(raw)))
+    except ValueError:
+        return DEFAULT_ARTICULATION
+
+
+# ---- Wake-up clips ---------------------------------------------------------
+def wakeup_dirs(persona_name: str) -> list[str]:
+    """Folders searched for wake-up clips, in order of preference."""
+    if persona_name == "default":
+        return [WAKE_UP_DIR, WAKE_UP_DIR_DEFAULT]
+    persona_dir = os.path.join("personas", persona_name, "wakeup")
+    return [persona_dir, WAKE_UP_DIR, WAKE_UP_DIR_DEFAULT]
+
+
+def wakeup_key(persona_name: str) -> tuple:
+    """Mtimes of the wake-up folders; clip writers bump these on change."""
+    key = []
+    for directory in wakeup_dirs(persona_name):
+        try:
+            key.append(os.stat(directory).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    return tuple(key)
+
+
+def _decode_clip(path: str) -> WakeupClip | None:
+    try:
+        with wave.open(path, 'rb') as wf:
+            if (
+                wf.getframerate() != CLIP_SAMPLE_RATE
+                or wf.getnchannels() != 1
+                or wf.getsampwidth() != 2
+            ):
+                logger.warning(
+                    f"Skipping wake-up clip {path}: must be {CLIP_SAMPLE_RATE}Hz, mono, 16-bit"
+                )
+                return None
+            return WakeupClip(path, wf.readframes(wf.getnframes()))
+    except (OSError, EOFError, wave.Error) as e:
+        logger.warning(f"Skipping unreadable wake-up clip {path}: {e}")
+        return None
+
+
+def load_wakeup_clips(persona_name: str) -> tuple[str, tuple[WakeupClip, ...]]:
+    """Decode the clips from the first wake-up folder that has any."""
+    for directory in wakeup_dirs(persona_name):
+        clips = [
+            clip
+            for clip in map(
+                _decode_clip, sorted(glob.glob(os.path.join(directory, "*.wav")))
+            )
+            if clip is not None
+        ]
+        if clips:
+            return directory, tuple(clips)
+    return "", ()
+
+
+# ---- Cache -----------------------------------------------------------------
+class PersonaBundleCache:
+    """LRU of the most recently used persona bundles."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._lock = threading.Lock()
+        self._bundles: OrderedDict[str, PersonaBundle] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, persona_name: str, key: tuple) -> PersonaBundle | None:
+        """Return the cached bundle if it was compiled from the same files."""
+        with self._lock:
+            bundle = self._bundles.get(persona_name)
+            if bundle is None or bundle.key != key:
+                self.misses += 1
+                return None
+            self._bundles.move_to_end(persona_name)
+            self.hits += 1
+            return bundle
+
+    def put(self, bundle: PersonaBundle) -> None:
+        with self._lock:
+            self._bundles[bundle.name] = bundle
+            self._bundles.move_to_end(bundle.name)
+            while len(self._bundles) > self.capacity:
+                self._bundles.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, persona_name: str | None = None) -> None:
+        with self._lock:
+            if persona_name is None:
+                self._bundles.clear()
+            else:
+                self._bundles.pop(persona_name, None)
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "cached": len(self._bundles),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
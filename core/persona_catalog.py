@@ -0,0 +1,206 @@
+"""
+Shared catalog of persona files.
+
+Personas live either in ``personas/<name>/persona.ini`` or, in the older
+layout, ``personas/<name>.ini``; the default persona is ``persona.ini`` in the
+project root. The catalog keeps one parsed entry per persona, keyed by its
+path, mtime and size, so lookups cost a single ``stat`` and a file is only
+re-parsed when it actually changed on disk. The persona list is validated
+against the personas directory mtime. Writers call ``mark_changed``, which
+also bumps that mtime so the other process (Billy or webconfig) rescans
+without re-reading unchanged files.
+"""
+
+import configparser
+import contextlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .logger import logger
+
+
+DEFAULT_PERSONA = "default"
+
+
+@dataclass
+class _CatalogEntry:
+    path: Path
+    signature: tuple[int, int]  # (mtime_ns, size)
+    data: dict[str, Any]
+
+
+def _signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def parse_persona_file(persona_name: str, persona_file: Path) -> dict[str, Any]:
+    """Parse a persona INI into the dict shape used throughout Billy."""
+    from .persona import migrate_traits
+
+    config = configparser.ConfigParser()
+    config.read(persona_file)
+
+    def section(name: str) -> dict[str, str]:
+        return dict(config.items(name)) if config.has_section(name) else {}
+
+    return {
+        "name": persona_name,
+        "personality": migrate_traits(section("PERSONALITY")),
+        "backstory": section("BACKSTORY"),
+        "meta": section("META"),
+    }
+
+
+class PersonaCatalog:
+    """Path- and mtime-keyed cache of parsed persona files."""
+
+    def __init__(self, personas_dir: Path, default_path: Path):
+        self.personas_dir = Path(personas_dir)
+        self.default_path = Path(default_path)
+        self._lock = threading.RLock()
+        self._entries: dict[str, _CatalogEntry] = {}
+        self._paths: dict[str, Path] = {}  # persona name -> file, from last scan
+        self._listing: list[dict[str, str]] | None = None
+        self._scan_key: tuple[int | None, bool] | None = None
+        self.hits = 0
+        self.loads = 0
+        self.scans = 0
+
+    # ---- Validation ------------------------------------------------------
+    def _current_scan_key(self) -> tuple[int | None, bool]:
+        try:
+            dir_mtime_ns = self.personas_dir.stat().st_mtime_ns
+        except OSError:
+            dir_mtime_ns = None
+        return dir_mtime_ns, self.default_path.exists()
+
+    def _ensure_fresh(self) -> None:
+        scan_key = self._current_scan_key()
+        if scan_key != self._scan_key:
+            self._scan(scan_key)
+
+    def _scan(self, scan_key: tuple[int | None, bool]) -> None:
+        """Rediscover persona files. Parsed entries are kept if still valid."""
+        paths: dict[str, Path] = {}
+        if scan_key[1]:
+            paths[DEFAULT_PERSONA] = self.default_path
+        if scan_key[0] is not None:
+            with os.scandir(self.personas_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        persona_file = Path(entry.path) / "persona.ini"
+                        if persona_file.is_file():
+                            # The folder layout wins over a same-named flat file
+                            paths[entry.name] = persona_file
+                    elif entry.name.endswith(".ini") and entry.is_file():
+                        paths.setdefault(entry.name[:-4], Path(entry.path))
+
+        for name in [n for n, e in self._entries.items() if paths.get(n) != e.path]:
+            del self._entries[name]
+        self._paths = paths
+        self._listing = None
+        self._scan_key = scan_key
+        self.scans += 1
+        logger.verbose(f"Persona catalog: {len(paths)} personas", emoji="🎭")
+
+    def _resolve_path(self, persona_name: str) -> Path:
+        if persona_name == DEFAULT_PERSONA:
+            return self.default_path
+        folder_file = self.personas_dir / persona_name / "persona.ini"
+        if folder_file.exists():
+            return folder_file
+        return self.personas_dir / f"{persona_name}.ini"
+
+    # ---- Lookups ---------------------------------------------------------
+    def get(self, persona_name: str) -> dict[str, Any] | None:
+        """Return parsed persona data, re-reading the file only if it changed."""
+        with self._lock:
+            self._ensure_fresh()
+            path = self._paths.get(persona_name) or self._resolve_path(persona_name)
+            signature = _signature(path)
+            if signature is None:
+                self._entries.pop(persona_name, None)
+                logger.warning(f"Persona file not found: {path}")
+                return None
+
+            entry = self._entries.get(persona_name)
+            if entry and entry.path == path and entry.signature == signature:
+                self.hits += 1
+                return entry.data
+
+            try:
+                data = parse_persona_file(persona_name, path)
+            except Exception as e:
+                logger.error(f"Failed to load persona {persona_name}: {e}")
+                return None
+            self._entries[persona_name] = _CatalogEntry(path, signature, data)
+            self._listing = None
+            self.loads += 1
+            logger.info(f"Loaded persona: {persona_name}", emoji="🎭")
+            return data
+
+    def path_for(self, persona_name: str) -> Path | None:
+        """Return the file backing a persona, or None if it does not exist."""
+        with self._lock:
+            self._ensure_fresh()
+            return self._paths.get(persona_name)
+
+    def exists(self, persona_name: str) -> bool:
+        return self.path_for(persona_name) is not None
+
+    def signature(self, persona_name: str) -> tuple[str, int, int] | None:
+        """Return ``(path, mtime_ns, size)`` of a persona file, or None."""
+        with self._lock:
+            self._ensure_fresh()
+            path = self._paths.get(persona_name) or self._resolve_path(persona_name)
+            signature = _signature(path)
+            return (str(path), *signature) if signature else None
+
+    def list(self) -> list[dict[str, str]]:
+        """Return ``{"name", "description"}`` for every persona, sorted by name."""
+        with self._lock:
+            self._ensure_fresh()
+            if self._listing is None:
+                listing = []
+                for name in sorted(self._paths):
+                    if name == DEFAULT_PERSONA:
+                        listing.append({"name": name, "description": "Default"})
+                        continue
+                    data = self.get(name)
+                    if data:
+                        description = data.get("meta", {}).get("description", name)
+                        listing.append({"name": name, "description": description})
+                self._listing = listing
+            return [dict(item) for item in self._listing]
+
+    # ---- Invalidation ----------------------------------------------------
+    def mark_changed(self, persona_name: str | None = None) -> None:
+        """Record that a persona was written, created or deleted.
+
+        Drops the cached entry and bumps the personas directory mtime so other
+        processes rescan on their next lookup.
+        """
+        with self._lock:
+            if persona_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(persona_name, None)
+            with contextlib.suppress(OSError):
+                os.utime(self.personas_dir)
+            self._scan_key = None
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "personas": len(self._paths),
+            "cached": len(self._entries),
+            "hits": self.hits,
+            "loads": self.loads,
+            "scans": self.scans,
+        }
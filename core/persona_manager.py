@@ -4,10 +4,22 @@ Handles loading and switching between different personality configurations.
 """
 
 import configparser
+import time
 from pathlib import Path
 from typing import Any, Optional
 
+from .config import PERSONA_BUNDLE_CACHE_SIZE
 from .logger import logger
+from .persona_bundle import (
+    PersonaBundle,
+    PersonaBundleCache,
+    load_wakeup_clips,
+    parse_articulation,
+    render_backstory_section,
+    render_personality_section,
+    wakeup_key,
+)
+from .persona_catalog import PersonaCatalog
 from .realtime_ai_provider import voice_provider_registry
 
 
@@ -19,112 +31,27 @@ class PersonaManager:
         self.personas_dir.mkdir(exist_ok=True)
         self.persona_presets_dir = Path("persona_presets")
         self.current_persona = "default"  # Default persona
-        self._persona_cache: dict[str, dict[str, Any]] = {}
+        self.catalog = PersonaCatalog(self.personas_dir, Path("persona.ini"))
+        self.bundles = PersonaBundleCache(PERSONA_BUNDLE_CACHE_SIZE)
+        self.current_bundle: Optional[PersonaBundle] = None
+        self.last_switch_ms: Optional[float] = None
 
     def get_available_personas(self) -> list[dict]:
         """Get list of available persona files with their metadata."""
-        personas = []
-
-        # Add default persona.ini if it exists
-        default_persona_file = Path("persona.ini")
-        if default_persona_file.exists():
-            try:
-                config = configparser.ConfigParser()
-                config.read(default_persona_file)
-                personas.append({
-                    "name": "default",
-                    "description": "Default",
-                })
-            except Exception as e:
-                logger.warning(f"Failed to load default persona: {e}")
-
-        # Add custom personas from personas directory (both old format and new folder format)
-        if self.personas_dir.exists():
-            # Check for old format: personas/*.ini
-            for file_path in self.personas_dir.glob("*.ini"):
-                persona_name = file_path.stem
-                persona_data = self.load_persona(persona_name)
-                if persona_data:
-                    personas.append({
-                        "name": persona_name,
-                        "description": persona_data.get("meta", {}).get(
-                            "description", persona_name
-                        ),
-                    })
-
-            # Check for new format: personas/*/persona.ini
-            for folder_path in self.personas_dir.iterdir():
-                if folder_path.is_dir():
-                    persona_file = folder_path / "persona.ini"
-                    if persona_file.exists():
-                        persona_name = folder_path.name
-                        persona_data = self.load_persona(persona_name)
-                        if persona_data:
-                            personas.append({
-                                "name": persona_name,
-                                "description": persona_data.get("meta", {}).get(
-                                    "description", persona_name
-                                ),
-                            })
-
-        return (
-            sorted(personas, key=lambda x: x["name"])
-            if personas
-            else [{"name": "default", "description": "Default"}]
-        )
+        personas = self.catalog.list()
+        return personas or [{"name": "default", "description": "Default"}]
 
     def load_persona(self, persona_name: str) -> Optional[dict[str, Any]]:
-        """Load a persona configuration from file."""
-        if persona_name in self._persona_cache:
-            return self._persona_cache[persona_name]
-
-        # Handle default persona
-        if persona_name == "default":
-            persona_file = Path("persona.ini")
-        else:
-            # Check new folder structure first: personas/persona_name/persona.ini
-            persona_file = self.personas_dir / persona_name / "persona.ini"
-            if not persona_file.exists():
-                # Fall back to old structure: personas/persona_name.ini
-                persona_file = self.personas_dir / f"{persona_name}.ini"
-
-        if not persona_file.exists():
-            logger.warning(f"Persona file not found: {persona_file}")
-            return None
-
-        try:
-            config = configparser.ConfigParser()
-            config.read(persona_file)
-
-            persona_data = {
-                "name": persona_name,
-                "personality": dict(config.items("PERSONALITY"))
-                if config.has_section("PERSONALITY")
-                else {},
-                "backstory": dict(config.items("BACKSTORY"))
-                if config.has_section("BACKSTORY")
-                else {},
-                "meta": dict(config.items("META"))
-                if config.has_section("META")
-                else {},
-            }
-
-            # Migrate and convert personality values to integers
-            from .persona import migrate_traits
-
-            persona_data["personality"] = migrate_traits(persona_data["personality"])
-
-            self._persona_cache[persona_name] = persona_data
-            logger.info(f"Loaded persona: {persona_name}", "🎭")
-            return persona_data
-
-        except Exception as e:
-            logger.error(f"Failed to load persona {persona_name}: {e}")
-            return None
+        """Load a persona configuration, re-reading it only if the file changed."""
+        return self.catalog.get(persona_name)
 
     def get_persona_instructions(self, persona_name: str) -> str:
         """Get formatted instructions for a specific persona."""
-        persona_data = self.load_persona(persona_name)
+        return self.get_bundle(persona_name).instructions
+
+    def _render_instructions(
+        self, persona_name: str, persona_data: Optional[dict[str, Any]]
+    ) -> str:
         if not persona_data:
             return ""
 
@@ -157,17 +84,72 @@ class PersonaManager:
 
     def switch_persona(self, persona_name: str) -> bool:
         """Switch to a different persona."""
-        available_personas = [p["name"] for p in self.get_available_personas()]
-        if persona_name not in available_personas:
+        start = time.perf_counter()
+        if persona_name not in [p["name"] for p in self.get_available_personas()]:
             logger.warning(f"Persona not available: {persona_name}")
             return False
 
-        # Force reload from disk in case persona.ini was edited during runtime.
-        self.clear_persona_cache(persona_name)
+        # A cached bundle is reused unless persona.ini or its clips changed.
+        bundle = self.get_bundle(persona_name)
         self.current_persona = persona_name
-        logger.info(f"Switched to persona: {persona_name}", "🎭")
+        self.current_bundle = bundle
+        self.last_switch_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Switched to persona: {persona_name} ({self.last_switch_ms:.1f} ms)",
+            emoji="🎭",
+        )
+        from .ipc import publish_persona
+
+        publish_persona()
         return True
 
+    # ---- Bundles ---------------------------------------------------------
+    def get_bundle(self, persona_name: str) -> PersonaBundle:
+        """Return the compiled bundle for a persona, compiling it if needed."""
+        key = (self.catalog.signature(persona_name), wakeup_key(persona_name))
+        bundle = self.bundles.get(persona_name, key)
+        if bundle is None:
+            bundle = self._compile_bundle(persona_name, key)
+            self.bundles.put(bundle)
+        return bundle
+
+    def get_current_bundle(self, validate: bool = True) -> PersonaBundle:
+        """Return the bundle of the current persona.
+
+        With ``validate=False`` the current pointer is returned without
+        touching the disk unless the persona changed; used on the audio path.
+        """
+        bundle = self.current_bundle
+        if validate or bundle is None or bundle.name != self.current_persona:
+            bundle = self.current_bundle = self.get_bundle(self.current_persona)
+        return bundle
+
+    def _compile_bundle(self, persona_name: str, key: tuple) -> PersonaBundle:
+        start = time.perf_counter()
+        persona_data = self.load_persona(persona_name)
+        wakeup_source, wakeup_clips = load_wakeup_clips(persona_name)
+        bundle = PersonaBundle(
+            name=persona_name,
+            key=key,
+            description=(persona_data or {})
+            .get("meta", {})
+            .get("description", persona_name),
+            instructions=self._render_instructions(persona_name, persona_data),
+            personality_section=render_personality_section(persona_data or {}),
+            backstory_section=render_backstory_section(persona_data or {}),
+            voice=self._resolve_voice(persona_name, persona_data),
+            articulation=parse_articulation(persona_data),
+            wakeup_source=wakeup_source,
+            wakeup_clips=wakeup_clips,
+        )
+        logger.verbose(
+            f"Compiled persona bundle: {persona_name} "
+            f"({len(wakeup_clips)} wake-up clips, "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms)",
+            emoji="🎭",
+        )
+        return bundle
+
     def get_current_persona_data(self) -> Optional[dict[str, Any]]:
         """Get data for the current persona."""
         return self.load_persona(self.current_persona)
@@ -178,7 +160,11 @@ class PersonaManager:
 
     def get_persona_voice(self, persona_name: str) -> str:
         """Get the voice setting for a specific persona."""
-        persona_data = self.load_persona(persona_name)
+        return self.get_bundle(persona_name).voice
+
+    def _resolve_voice(
+        self, persona_name: str, persona_data: Optional[dict[str, Any]]
+    ) -> str:
         try:
             provider = voice_provider_registry.get_provider()
             default_voice = provider.default_voice
@@ -205,16 +191,16 @@ class PersonaManager:
 
     def get_current_persona_voice(self) -> str:
         """Get the voice setting for the current persona."""
-        return self.get_persona_voice(self.current_persona)
+        return self.get_current_bundle().voice
 
     def clear_persona_cache(self, persona_name: str = None) -> None:
-        """Clear the cache for a specific persona or all personas."""
+        """Mark a persona (or all personas) as changed on disk."""
+        self.catalog.mark_changed(persona_name)
+        self.bundles.clear(persona_name)
         if persona_name:
-            self._persona_cache.pop(persona_name, None)
-            logger.info(f"Cleared cache for persona: {persona_name}", "🎭")
+            logger.info(f"Cleared cache for persona: {persona_name}", emoji="🎭")
         else:
-            self._persona_cache.clear()
-            logger.info("Cleared all persona cache", "🎭")
+            logger.info("Cleared all persona cache", emoji="🎭")
 
     def get_persona_presets(self) -> list[dict]:
         """Get list of available persona preset templates."""
@@ -283,7 +269,8 @@ class PersonaManager:
             self.clear_persona_cache(new_persona_name)
 
             logger.info(
-                f"Created persona '{new_persona_name}' from preset '{preset_id}'", "🎭"
+                f"Created persona '{new_persona_name}' from preset '{preset_id}'",
+                emoji="🎭",
             )
             return True
 
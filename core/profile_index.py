@@ -0,0 +1,179 @@
+"""
+In-memory index of user profiles.
+
+Maps normalized profile names and display names to profile file stems so
+``identify_user`` does not have to glob and parse every INI on each lookup.
+The index is validated against the profiles directory mtime, which changes
+whenever a profile is created, renamed, deleted or atomically rewritten; a
+rescan only re-reads INIs whose own mtime changed. Writers that change a
+display name in place call ``update`` so the index (and, through the bumped
+directory mtime, other processes such as webconfig) stay current.
+"""
+
+import configparser
+import contextlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from .logger import logger
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a profile or display name for lookups."""
+    return " ".join((name or "").split()).lower()
+
+
+def read_display_name(profile_path: Path) -> str:
+    """Read the display name from a profile INI, falling back to the file stem."""
+    fallback = profile_path.stem.title()
+    config = configparser.ConfigParser()
+    try:
+        config.read(profile_path)
+    except configparser.Error:
+        return fallback
+    if not config.has_section("USER_INFO"):
+        return fallback
+    display_name = config.get("USER_INFO", "display_name", fallback="")
+    if display_name:
+        return display_name
+    # Older profiles stored aliases; the first alias became the display name.
+    try:
+        aliases = json.loads(config.get("USER_INFO", "aliases", fallback="[]"))
+    except json.JSONDecodeError:
+        aliases = []
+    return aliases[0] if aliases else fallback
+
+
+class ProfileIndex:
+    """Name and display-name index over ``profiles/*.ini``."""
+
+    def __init__(self, profiles_dir: Path):
+        self.profiles_dir = Path(profiles_dir)
+        self._lock = threading.RLock()
+        self._display_names: dict[str, str] = {}  # stem -> display name
+        self._by_display: dict[str, str] = {}  # normalized display name -> stem
+        self._file_mtimes: dict[str, int | None] = {}  # stem -> INI mtime
+        self._dir_mtime_ns: int | None = None
+        self.rebuilds = 0
+
+    # ---- Validation ------------------------------------------------------
+    def _current_mtime_ns(self) -> int | None:
+        try:
+            return self.profiles_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _ensure_fresh(self) -> None:
+        mtime_ns = self._current_mtime_ns()
+        if self.rebuilds and mtime_ns == self._dir_mtime_ns:
+            return
+        self._rebuild(mtime_ns)
+
+    def _ensure_loaded(self) -> None:
+        # Our own writes apply directly instead of forcing a full rescan.
+        if not self.rebuilds:
+            self._rebuild(self._current_mtime_ns())
+
+    def _rebuild(self, mtime_ns: int | None) -> None:
+        """Rescan the directory, re-reading only INIs whose mtime changed."""
+        seen: dict[str, int] = {}
+        if mtime_ns is not None:
+            with os.scandir(self.profiles_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".ini") and entry.is_file():
+                        seen[entry.name[:-4].lower()] = entry.stat().st_mtime_ns
+        for stem in [s for s in self._display_names if s not in seen]:
+            self._drop(stem)
+        for stem in sorted(seen):
+            if self._file_mtimes.get(stem) == seen[stem]:
+                continue
+            self._drop(stem)
+            self._add(stem, read_display_name(self.profiles_dir / f"{stem}.ini"))
+        self._file_mtimes = dict(seen)
+        self._dir_mtime_ns = mtime_ns
+        self.rebuilds += 1
+        logger.verbose(
+            f"Indexed {len(self._display_names)} profiles in {self.profiles_dir}",
+            emoji="👤",
+        )
+
+    def _add(self, stem: str, display_name: str) -> None:
+        self._display_names[stem] = display_name
+        self._by_display.setdefault(normalize_name(display_name), stem)
+
+    def _drop(self, stem: str) -> None:
+        self._file_mtimes.pop(stem, None)
+        display_name = self._display_names.pop(stem, None)
+        if display_name is None:
+            return
+        key = normalize_name(display_name)
+        if self._by_display.get(key) != stem:
+            return
+        del self._by_display[key]
+        # Another profile may share this display name.
+        for other_stem, other_display in self._display_names.items():
+            if normalize_name(other_display) == key:
+                self._by_display[key] = other_stem
+                break
+
+    def _mark_changed(self) -> None:
+        """Bump the directory mtime so other processes revalidate their index."""
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(self.profiles_dir)
+        self._dir_mtime_ns = self._current_mtime_ns()
+
+    # ---- Lookups ---------------------------------------------------------
+    def find(self, name: str) -> str | None:
+        """Return the profile stem matching a name or display name, if any."""
+        key = normalize_name(name)
+        with self._lock:
+            self._ensure_fresh()
+            if key in self._display_names:
+                return key
+            return self._by_display.get(key)
+
+    def names(self) -> list[str]:
+        """Return all profile stems, sorted."""
+        with self._lock:
+            self._ensure_fresh()
+            return sorted(self._display_names)
+
+    def display_name(self, name: str) -> str | None:
+        with self._lock:
+            self._ensure_fresh()
+            return self._display_names.get(normalize_name(name))
+
+    # ---- Updates ---------------------------------------------------------
+    def update(self, name: str, display_name: str | None = None) -> None:
+        """Record a created or edited profile.
+
+        When ``display_name`` is omitted it is read from the profile file.
+        """
+        stem = normalize_name(name)
+        if display_name is None:
+            display_name = read_display_name(self.profiles_dir / f"{stem}.ini")
+        with self._lock:
+            self._ensure_loaded()
+            self._drop(stem)
+            self._add(stem, display_name)
+            self._mark_changed()
+
+    def remove(self, name: str) -> None:
+        """Forget a deleted profile."""
+        with self._lock:
+            self._ensure_loaded()
+            self._drop(normalize_name(name))
+            self._mark_changed()
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        """Move an entry to a renamed profile file."""
+        new_stem = normalize_name(new_name)
+        display_name = read_display_name(self.profiles_dir / f"{new_stem}.ini")
+        with self._lock:
+            self._ensure_loaded()
+            self._drop(normalize_name(old_name))
+            self._drop(new_stem)
+            self._add(new_stem, display_name)
+            self._mark_changed()
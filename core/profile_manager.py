@@ -4,13 +4,53 @@ Handles user identification, memory storage, and profile management.
 """
 
 import configparser
+import copy
+import io
 import json
-import os
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
 from .logger import logger
+from .memory_store import memory_store, parse_ini_memories
+from .profile_index import ProfileIndex
+from .profile_store import COMPACT_AFTER_OPS, profile_store, read_journal
+
+
+def _apply_op(data: dict[str, Any], op: dict[str, Any]) -> None:
+    """Apply a journaled mutation to profile data. Ops are idempotent."""
+    kind = op.get("op")
+    if kind == "set":
+        data.setdefault('USER_INFO', {}).update(op.get("fields") or {})
+    elif kind == "add_memory":
+        # Journals written before memories moved to SQLite; migrated on load
+        data.setdefault('core_memories', []).append(op.get("memory") or {})
+    else:
+        logger.warning(f"Ignoring unknown profile journal op: {kind}")
+
+
+def _render_profile_ini(data: dict[str, Any]) -> str:
+    """Serialize profile data to the INI format webconfig reads."""
+    config = configparser.ConfigParser()
+
+    # Convert dict to INI sections (memories live in the memory store)
+    for section_name, section_data in data.items():
+        if section_name in ('core_memories', 'CORE_MEMORIES'):
+            continue
+
+        if not config.has_section(section_name):
+            config.add_section(section_name)
+        for key, value in section_data.items():
+            # Handle JSON fields properly
+            if key == 'aliases' and isinstance(value, list):
+                config.set(section_name, key, json.dumps(value))
+            else:
+                config.set(section_name, key, str(value))
+
+    buffer = io.StringIO()
+    config.write(buffer)
+    return buffer.getvalue()
 
 
 class UserProfile:
@@ -19,7 +59,12 @@ class UserProfile:
     def __init__(self, name: str):
         self.name = name
         self.profile_path = Path("profiles") / f"{name.lower()}.ini"
+        self._journaled_ops = 0
+        self._has_legacy_memories = False
         self.data = self._load_or_create_profile()
+        if self._has_legacy_memories:
+            # Drop the migrated CORE_MEMORIES blob from the INI
+            self.compact()
 
     def _load_or_create_profile(self) -> dict[str, Any]:
         """Load existing profile or create new one."""
@@ -37,48 +82,11 @@ class UserProfile:
         for section in config.sections():
             data[section] = dict(config[section])
 
-        # Parse core memories from JSON
-        if 'CORE_MEMORIES' in data:
-            try:
-                memories_str = data['CORE_MEMORIES'].get('memories', '[]')
-                data['core_memories'] = json.loads(memories_str)
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse memories JSON for {self.name}: {e}")
-                logger.warning(f"Corrupted memories string: {memories_str[:200]}...")
-
-                # Try to recover by extracting valid JSON entries
-                try:
-                    # Look for complete JSON objects in the corrupted string
-                    import re
-
-                    # Find all complete JSON objects that start with { and end with }
-                    json_objects = re.findall(r'\{[^{}]*"id"[^{}]*\}', memories_str)
-                    recovered_memories = []
-                    for obj_str in json_objects:
-                        try:
-                            recovered_memories.append(json.loads(obj_str))
-                        except json.JSONDecodeError:
-                            continue
-
-                    if recovered_memories:
-                        data['core_memories'] = recovered_memories
-                        logger.info(
-                            f"Recovered {len(recovered_memories)} memories for {self.name}"
-                        )
-                        # Save the recovered memories back to the file
-                        self._save_profile()
-                    else:
-                        data['core_memories'] = []
-                        logger.warning(
-                            f"Could not recover any memories for {self.name}, starting fresh"
-                        )
-                except Exception as recovery_error:
-                    logger.error(
-                        f"Memory recovery failed for {self.name}: {recovery_error}"
-                    )
-                    data['core_memories'] = []
-        else:
-            data['core_memories'] = []
+        # Older profiles keep memories as a JSON blob in the INI
+        legacy_section = data.pop('CORE_MEMORIES', None)
+        data['core_memories'] = parse_ini_memories(
+            (legacy_section or {}).get('memories', '[]')
+        )
 
         # Parse display_name (migrate from aliases if needed)
         if 'USER_INFO' in data:
@@ -102,6 +110,13 @@ class UserProfile:
                 data['USER_INFO'] = {}
             data['USER_INFO']['display_name'] = self.name
 
+        # Replay mutations journaled since the last compaction
+        for op in read_journal(self.profile_path):
+            _apply_op(data, op)
+
+        legacy_memories = data.pop('core_memories')
+        memory_store.import_legacy(self.name, legacy_memories)
+        self._has_legacy_memories = legacy_section is not None or bool(legacy_memories)
         return data
 
     def _create_new_profile(self) -> dict[str, Any]:
@@ -121,17 +136,20 @@ class UserProfile:
                 'interaction_count': '0',
                 'bond_level': 'new',
             },
-            'core_memories': [],
         }
 
+        # A recreated profile must not inherit memories of a deleted one
+        memory_store.delete_user(self.name)
         self._save_profile(data)
+        user_manager.profile_index.update(self.name, self.name)
 
         # If this is the first time creating a guest profile, set it as default user
         if self.name.lower() == 'guest':
             self._set_guest_as_default_if_first_time()
 
         logger.info(
-            f"Created new profile for {self.name} with persona: {current_persona}", "👤"
+            f"Created new profile for {self.name} with persona: {current_persona}",
+            emoji="👤",
         )
         return data
 
@@ -148,194 +166,107 @@ class UserProfile:
                 # DEFAULT_USER is already set to a specific user, don't change it
                 logger.info(
                     f"DEFAULT_USER already set to '{current_default}', not changing to guest",
-                    "👤",
+                    emoji="👤",
                 )
                 return
 
             # Set DEFAULT_USER to guest (lowercase to match folder name)
             set_key(ENV_PATH, "DEFAULT_USER", "guest", quote_mode='never')
-            logger.info("Set guest as default user in .env file", "👤")
+            logger.info("Set guest as default user in .env file", emoji="👤")
 
         except Exception as e:
             logger.warning(f"Failed to set guest as default user: {e}")
 
     def _save_profile(self, data: Optional[dict[str, Any]] = None):
-        """Save profile to INI file."""
-        if data is None:
-            data = self.data
-
-        config = configparser.ConfigParser()
-
-        # Convert dict to INI sections
-        for section_name, section_data in data.items():
-            if section_name == 'core_memories':
-                continue  # Handle separately
-
-            if not config.has_section(section_name):
-                config.add_section(section_name)
-            for key, value in section_data.items():
-                # Handle JSON fields properly
-                if key == 'aliases' and isinstance(value, list):
-                    config.set(section_name, key, json.dumps(value))
-                else:
-                    config.set(section_name, key, str(value))
-
-        # Save core memories as JSON
-        if not config.has_section('CORE_MEMORIES'):
-            config.add_section('CORE_MEMORIES')
-        config.set(
-            'CORE_MEMORIES', 'memories', json.dumps(data.get('core_memories', []))
+        """Write the full profile to its INI file and clear the journal."""
+        self.compact(data, wait=True)
+
+    def compact(self, data: Optional[dict[str, Any]] = None, wait: bool = False):
+        """Fold the journal back into the INI file on the profile store thread."""
+        snapshot = copy.deepcopy(self.data if data is None else data)
+        self._journaled_ops = 0
+        profile_store.compact(
+            self.profile_path, lambda: _render_profile_ini(snapshot), wait=wait
         )
 
-        # Ensure directory exists
-        self.profile_path.parent.mkdir(exist_ok=True)
-
-        with open(self.profile_path, 'w') as f:
-            config.write(f)
-            f.flush()  # Flush Python buffer
-            os.fsync(f.fileno())  # Force write to disk
+    def _journal(self, op: dict[str, Any]):
+        """Apply a mutation in memory and append it to the profile journal."""
+        _apply_op(self.data, op)
+        profile_store.append(self.profile_path, op)
+        self._journaled_ops += 1
+        if self._journaled_ops >= COMPACT_AFTER_OPS:
+            self.compact()
 
     def add_memory(
         self, memory: str, importance: str = "medium", category: str = "fact"
     ):
         """Add a memory to the user's profile."""
-        import uuid
-
-        memory_entry = {
-            "id": str(uuid.uuid4()),
-            "date": datetime.now().isoformat(),
-            "memory": memory,
-            "importance": importance,
-            "category": category,
-        }
-
-        # Ensure core_memories is a valid list
-        if not isinstance(self.data.get('core_memories'), list):
-            self.data['core_memories'] = []
-
-        self.data['core_memories'].append(memory_entry)
-
-        # Keep only most important memories (limit to 20)
-        importance_order = {"high": 3, "medium": 2, "low": 1}
-        self.data['core_memories'] = sorted(
-            self.data['core_memories'],
-            key=lambda x: importance_order.get(x.get("importance", "low"), 1),
-        )[-20:]
-
-        # Validate memories before saving
         try:
-            # Test that memories can be serialized to JSON
-            json.dumps(self.data['core_memories'])
-            self._save_profile()
-            logger.info(f"Added memory for {self.name}: {memory[:50]}...", "💭")
-        except (TypeError, ValueError) as e:
+            memory_store.add(self.name, memory, importance, category)
+        except sqlite3.Error as e:
             logger.error(f"Failed to save memory for {self.name}: {e}")
-            # Remove the problematic memory
-            self.data['core_memories'] = self.data['core_memories'][:-1]
+            return
+        logger.info(f"Added memory for {self.name}: {memory[:50]}...", emoji="💭")
 
     def update_last_seen(self):
         """Update the last seen timestamp."""
-        self.data['USER_INFO']['last_seen'] = datetime.now().isoformat()
-        self._save_profile()
+        self._journal({
+            "op": "set",
+            "fields": {"last_seen": datetime.now().isoformat()},
+        })
 
     def increment_interaction_count(self):
         """Increment the interaction count and update last_seen (called at end of session)."""
         interaction_count = int(self.data['USER_INFO'].get('interaction_count', '0'))
-        self.data['USER_INFO']['interaction_count'] = str(interaction_count + 1)
-        self.data['USER_INFO']['last_seen'] = datetime.now().isoformat()
-        self._save_profile()
+        self._journal({
+            "op": "set",
+            "fields": {
+                "interaction_count": str(interaction_count + 1),
+                "last_seen": datetime.now().isoformat(),
+            },
+        })
+        # Sessions are a natural checkpoint for folding the journal into the INI
+        self.compact()
         logger.info(
             f"Incremented interaction count for {self.name}: {interaction_count + 1}",
-            "👤",
+            emoji="👤",
         )
 
     def set_preferred_persona(self, persona: str):
         """Set the user's preferred Billy persona."""
-        self.data['USER_INFO']['preferred_persona'] = persona
-        self._save_profile()
-        logger.info(f"Set {self.name}'s preferred persona to {persona}", "🎭")
+        self._journal({"op": "set", "fields": {"preferred_persona": persona}})
+        logger.info(f"Set {self.name}'s preferred persona to {persona}", emoji="🎭")
 
     def set_display_name(self, display_name: str):
         """Set the user's display name."""
         self.data['USER_INFO']['display_name'] = display_name
         self._save_profile()
-        logger.info(f"Set {self.name}'s display name to {display_name}", "👤")
+        user_manager.profile_index.update(self.name, display_name)
+        logger.info(f"Set {self.name}'s display name to {display_name}", emoji="👤")
 
     def get_memories(self, limit: int = 5) -> list[dict[str, Any]]:
         """Get recent memories for the user."""
-        return self.data['core_memories'][-limit:]
+        return memory_store.recent(self.name, limit)
+
+    def get_relevant_memories(
+        self, conversation: str = "", limit: int = 3
+    ) -> list[dict[str, Any]]:
+        """Get the memories most relevant to the conversation so far."""
+        return memory_store.top_k(self.name, conversation, limit)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Profile data including all memories, as webconfig expects it."""
+        return {**self.data, 'core_memories': memory_store.recent(self.name)}
 
     def get_local_time(self) -> datetime:
         """Get current time in system timezone."""
         return datetime.now()
 
-    def fix_corrupted_memories(self):
-        """Manually fix corrupted memories by reading the raw INI file."""
-        try:
-            import configparser
-
-            config = configparser.ConfigParser()
-            config.read(self.profile_path)
-
-            if config.has_section('CORE_MEMORIES'):
-                memories_str = config.get('CORE_MEMORIES', 'memories', fallback='[]')
-                logger.info(f"Raw memories string: {memories_str[:200]}...")
-
-                # Try to extract valid JSON objects using regex
-                import re
-
-                # Find all complete JSON objects
-                json_objects = re.findall(r'\{[^{}]*"id"[^{}]*\}', memories_str)
-                logger.info(f"Found {len(json_objects)} potential JSON objects")
-
-                recovered_memories = []
-                for i, obj_str in enumerate(json_objects):
-                    try:
-                        memory_obj = json.loads(obj_str)
-                        # Validate required fields
-                        if all(
-                            key in memory_obj
-                            for key in [
-                                'id',
-                                'date',
-                                'memory',
-                                'importance',
-                                'category',
-                            ]
-                        ):
-                            recovered_memories.append(memory_obj)
-                            logger.info(
-                                f"Recovered memory {i + 1}: {memory_obj.get('memory', '')[:30]}..."
-                            )
-                        else:
-                            logger.warning(
-                                f"Memory {i + 1} missing required fields: {memory_obj}"
-                            )
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse memory {i + 1}: {e}")
-                        logger.warning(f"Problematic string: {obj_str[:100]}...")
-
-                if recovered_memories:
-                    self.data['core_memories'] = recovered_memories
-                    self._save_profile()
-                    logger.info(
-                        f"Fixed {len(recovered_memories)} memories for {self.name}"
-                    )
-                    return True
-                logger.warning(f"Could not recover any memories for {self.name}")
-                return False
-            logger.info(f"No CORE_MEMORIES section found for {self.name}")
-            return False
-
-        except Exception as e:
-            logger.error(f"Failed to fix corrupted memories for {self.name}: {e}")
-            return False
-
-    def get_context_string(self) -> str:
+    def get_context_string(self, conversation: str = "") -> str:
         """Get formatted context string for AI prompt."""
         context = f"\n[USER: {self.name} | PERSONA: {self.data['USER_INFO'].get('preferred_persona', 'default')} | BOND: {self.data['USER_INFO'].get('bond_level', 'new')}]\n"
 
-        memories = self.get_memories(3)  # Reduced from 5 to 3
+        memories = self.get_relevant_memories(conversation, 3)
         if memories:
             context += f"Memories: {'; '.join([m['memory'] for m in memories])}\n"
 
@@ -349,37 +280,12 @@ class UserProfileManager:
         self.current_user: Optional[UserProfile] = None
         self.profiles_dir = Path("profiles")
         self.profiles_dir.mkdir(exist_ok=True)
+        self.profile_index = ProfileIndex(self.profiles_dir)
 
     def find_user_by_name_or_display_name(self, name: str) -> Optional[str]:
         """Find a user profile by name or display name. Returns the actual profile name if found."""
-        name = name.strip().title()
-
-        # First check if there's an exact match
-        profile_path = Path("profiles") / f"{name.lower()}.ini"
-        if profile_path.exists():
-            return name
-
-        # Check all profiles for display_name
-        profiles_dir = Path("profiles")
-        if not profiles_dir.exists():
-            return None
-
-        for profile_file in profiles_dir.glob("*.ini"):
-            try:
-                config = configparser.ConfigParser()
-                config.read(profile_file)
-
-                if config.has_section("USER_INFO"):
-                    # Check if the name matches the display_name
-                    display_name = config.get("USER_INFO", "display_name", fallback="")
-                    if name.lower() == display_name.lower():
-                        # Return the actual profile name (from filename)
-                        return profile_file.stem.title()
-
-            except Exception:
-                continue
-
-        return None
+        profile_name = self.profile_index.find(name)
+        return profile_name.title() if profile_name else None
 
     def identify_user(
         self, name: str, confidence: str = "medium"
@@ -400,13 +306,14 @@ class UserProfileManager:
             profile = UserProfile(actual_name)
             self.current_user = profile
             logger.info(
-                f"Identified existing user: {actual_name} (matched '{name}')", "👤"
+                f"Identified existing user: {actual_name} (matched '{name}')",
+                emoji="👤",
             )
             return profile
         # Create new profile
         profile = UserProfile(name)
         self.current_user = profile
-        logger.info(f"Created new user profile: {name}", "👤")
+        logger.info(f"Created new user profile: {name}", emoji="👤")
         return profile
 
     def get_current_user(self) -> Optional[UserProfile]:
@@ -416,15 +323,11 @@ class UserProfileManager:
     def clear_current_user(self):
         """Clear the current user (for guest mode)."""
         self.current_user = None
-        logger.info("Cleared current user", "👤")
+        logger.info("Cleared current user", emoji="👤")
 
     def list_all_users(self) -> list[str]:
         """List all known users."""
-        users = []
-        for profile_file in self.profiles_dir.glob("*.ini"):
-            name = profile_file.stem.title()
-            users.append(name)
-        return sorted(users)
+        return sorted(name.title() for name in self.profile_index.names())
 
     def get_user_context(self) -> str:
         """Get context string for current user."""
@@ -437,8 +340,22 @@ class UserProfileManager:
         if self.current_user:
             self.current_user.increment_interaction_count()
 
+    def migrate_memories(self) -> int:
+        """Move memories still stored in profile INIs into the memory store."""
+        migrated = 0
+        for name in self.profile_index.names():
+            if memory_store.is_migrated(name):
+                continue
+            try:
+                UserProfile(name.title())  # Loading imports and strips the blob
+                migrated += 1
+            except Exception as e:
+                logger.warning(f"Failed to migrate memories for {name}: {e}")
+        return migrated
+
     def load_default_user(self):
         """Load the default user on startup and always set current_user to default_user."""
+        self.migrate_memories()
         try:
             from .config import DEFAULT_USER
 
@@ -447,15 +364,15 @@ class UserProfileManager:
                 # Try to load the default user
                 profile = self.identify_user(DEFAULT_USER, "high")
                 if profile:
-                    logger.info(f"Loaded default user: {DEFAULT_USER}", "👤")
+                    logger.info(f"Loaded default user: {DEFAULT_USER}", emoji="👤")
                 else:
                     logger.warning(
                         f"Default user '{DEFAULT_USER}' not found, staying in guest mode",
-                        "⚠️",
+                        emoji="⚠️",
                     )
                     self.clear_current_user()
             else:
-                logger.info("Starting in guest mode", "👤")
+                logger.info("Starting in guest mode", emoji="👤")
                 self.clear_current_user()
                 # Load the guest profile's preferred persona for guest mode
                 try:
@@ -468,12 +385,13 @@ class UserProfileManager:
 
                         persona_manager.switch_persona(preferred_persona)
                         logger.info(
-                            f"Loaded guest preferred persona: {preferred_persona}", "🎭"
+                            f"Loaded guest preferred persona: {preferred_persona}",
+                            emoji="🎭",
                         )
                 except Exception as e:
                     logger.warning(f"Failed to load guest preferred persona: {e}")
         except Exception as e:
-            logger.warning(f"Failed to load default user: {e}", "⚠️")
+            logger.warning(f"Failed to load default user: {e}", emoji="⚠️")
             self.clear_current_user()
 
 
@@ -0,0 +1,185 @@
+"""
+Append-only journal and background writer for user profiles.
+
+Profile mutations made during a conversation (new memories, last_seen,
+interaction counts, persona changes) are appended as JSON lines to
+``profiles/.journal/<name>.jsonl`` by a background thread, which batches
+appends and fsyncs once per batch. The INI file stays the source of truth for
+webconfig: it is only rewritten by compaction, atomically (temp file, fsync,
+``os.replace``), after which the journal is truncated. Journal ops are
+idempotent, so a crash between those two steps replays harmlessly, and a torn
+final line from a crash mid-append is ignored.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .logger import logger
+
+
+JOURNAL_DIR_NAME = ".journal"
+# Compact a profile back into its INI after this many journaled ops.
+COMPACT_AFTER_OPS = 64
+# How long the writer waits for more work before writing a batch.
+BATCH_WINDOW_SECONDS = 0.25
+
+
+def journal_path_for(profile_path: Path) -> Path:
+    """Return the journal file that belongs to a profile INI."""
+    profile_path = Path(profile_path)
+    return profile_path.parent / JOURNAL_DIR_NAME / f"{profile_path.stem}.jsonl"
+
+
+def read_journal(profile_path: Path) -> list[dict[str, Any]]:
+    """Return the journaled ops for a profile, skipping a torn trailing line."""
+    path = journal_path_for(profile_path)
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+    ops = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            ops.append(json.loads(line))
+        except json.JSONDecodeError:
+            if number == len(lines):
+                logger.warning(f"Ignoring torn journal entry in {path.name}")
+            else:
+                logger.warning(f"Skipping unreadable journal line {number} in {path}")
+    return ops
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Replace ``path`` with ``text`` so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ProfileStore:
+    """Background writer that journals profile ops and compacts them to INI."""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.appended = 0
+        self.batches = 0
+        self.compactions = 0
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="profile-store", daemon=True
+            )
+            self._thread.start()
+
+    # ---- Public API ------------------------------------------------------
+    def append(self, profile_path: Path, op: dict[str, Any]) -> None:
+        """Queue an op for the profile's journal. Never blocks on disk."""
+        self._ensure_started()
+        self._queue.put(("append", Path(profile_path), op, None))
+
+    def compact(
+        self, profile_path: Path, render: Callable[[], str], wait: bool = False
+    ) -> None:
+        """Queue an INI rewrite from ``render()`` and truncate the journal.
+
+        ``render`` must capture a snapshot that already includes every op
+        appended before this call. With ``wait`` the call returns once the INI
+        is on disk.
+        """
+        done = threading.Event() if wait else None
+        self._ensure_started()
+        self._queue.put(("compact", Path(profile_path), render, done))
+        if done is not None:
+            done.wait()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far has been written."""
+        if not (self._thread and self._thread.is_alive()):
+            return True
+        done = threading.Event()
+        self._queue.put(("flush", None, None, done))
+        return done.wait(timeout)
+
+    # ---- Writer thread ---------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            # Let more appends pile up unless someone is waiting on this write
+            if items[0][3] is None:
+                time.sleep(BATCH_WINDOW_SECONDS)
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(items)
+            except Exception as e:
+                logger.error(f"Profile store write failed: {e}")
+            finally:
+                for _kind, _path, _payload, done in items:
+                    if done is not None:
+                        done.set()
+
+    def _write_batch(self, items: list[tuple]) -> None:
+        pending: dict[Path, list[dict[str, Any]]] = {}
+        for kind, path, payload, _done in items:
+            if kind == "append":
+                pending.setdefault(path, []).append(payload)
+            elif kind == "compact":
+                # Ops queued before the snapshot are already part of it.
+                pending.pop(path, None)
+                self._compact(path, payload)
+        for path, ops in pending.items():
+            self._append_ops(path, ops)
+        self.batches += 1
+
+    def _append_ops(self, profile_path: Path, ops: list[dict[str, Any]]) -> None:
+        path = journal_path_for(profile_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops)
+        with open(path, "a+b") as f:
+            # Start on a fresh line if a previous crash left a torn entry
+            if f.tell() and (f.seek(-1, os.SEEK_END), f.read(1))[1] != b"\n":
+                payload = "\n" + payload
+            f.write(payload.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        self.appended += len(ops)
+
+    def _compact(self, profile_path: Path, render: Callable[[], str]) -> None:
+        write_atomic(profile_path, render())
+        journal_path_for(profile_path).unlink(missing_ok=True)
+        self.compactions += 1
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "appended": self.appended,
+            "batches": self.batches,
+            "compactions": self.compactions,
+            "queued": self._queue.qsize(),
+        }
+
+
+# Global instance
+profile_store = ProfileStore()
+atexit.register(profile_store.flush)
@@ -1,5 +1,5 @@
 import json
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from ..realtime_ai_provider import RealtimeAIProvider
 
@@ -38,28 +38,7 @@ class OpenAIProvider(RealtimeAIProvider):
         ws = await self._connect_websocket()
         async with ws:
             # Send session update
-            session_instructions = "IMPORTANT: Always respond by speaking the exact user text out loud. Do not add, change or rephrase anything!"
-            if instructions:
-                session_instructions += "\n\n" + instructions
-
-            await ws.send(
-                json.dumps({
-                    "type": "session.update",
-                    "session": {
-                        "type": "realtime",
-                        "instructions": session_instructions,
-                        "audio": {
-                            "input": {
-                                "format": {"type": "audio/pcm", "rate": 24000},
-                            },
-                            "output": {
-                                "format": {"type": "audio/pcm", "rate": 24000},
-                                "voice": voice,
-                            },
-                        },
-                    },
-                })
-            )
+            await ws.send(json.dumps(self._clip_session_update(voice, instructions)))
 
             # Send conversation item
             await ws.send(
@@ -89,6 +68,59 @@ class OpenAIProvider(RealtimeAIProvider):
 
             return audio_bytes
 
+    async def generate_audio_clips(
+        self,
+        prompts: list[str],
+        voice: Optional[str] = None,
+        instructions: Optional[str] = None,
+        on_clip: Optional[Callable[[int, bytes], None]] = None,
+        **kwargs,
+    ) -> list[bytes]:
+        """Generate every clip over one websocket.
+
+        Each prompt is an out-of-band response (``conversation: none``) so
+        earlier phrases do not end up in the context of later ones.
+        """
+        if voice is None:
+            voice = self.default_voice
+        _ = kwargs
+
+        clips = []
+        ws = await self._connect_websocket()
+        async with ws:
+            await ws.send(json.dumps(self._clip_session_update(voice, instructions)))
+            for i, prompt in enumerate(prompts):
+                await ws.send(
+                    json.dumps({
+                        "type": "response.create",
+                        "response": {
+                            "conversation": "none",
+                            "input": [
+                                {
+                                    "type": "message",
+                                    "role": "user",
+                                    "content": [
+                                        {
+                                            "type": "input_text",
+                                            "text": "Repeat this literal message:"
+                                            + prompt,
+                                        }
+                                    ],
+                                }
+                            ],
+                        },
+                    })
+                )
+                audio_bytes = await self._collect_audio_response(ws)
+                if not audio_bytes:
+                    raise RuntimeError(
+                        f"No audio data received from OpenAI for {prompt!r}."
+                    )
+                if on_clip:
+                    on_clip(i, audio_bytes)
+                clips.append(audio_bytes)
+        return clips
+
     def get_supported_voices(self) -> list[str]:
         return [
             "alloy",
@@ -106,6 +138,29 @@ class OpenAIProvider(RealtimeAIProvider):
         return "openai"
 
     # Private methods
+    def _clip_session_update(
+        self, voice: str, instructions: Optional[str]
+    ) -> dict[str, Any]:
+        session_instructions = "IMPORTANT: Always respond by speaking the exact user text out loud. Do not add, change or rephrase anything!"
+        if instructions:
+            session_instructions += "\n\n" + instructions
+        return {
+            "type": "session.update",
+            "session": {
+                "type": "realtime",
+                "instructions": session_instructions,
+                "audio": {
+                    "input": {
+                        "format": {"type": "audio/pcm", "rate": 24000},
+                    },
+                    "output": {
+                        "format": {"type": "audio/pcm", "rate": 24000},
+                        "voice": voice,
+                    },
+                },
+            },
+        }
+
     def _get_websocket_uri(self) -> str:
         return f"wss://api.openai.com/v1/realtime?model={self.model}"
 
@@ -1,11 +1,16 @@
+import asyncio
 import base64
 import json
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import websockets.asyncio.client
 
 
+# Clips generated at once by the default ``generate_audio_clips``
+CLIP_CONCURRENCY = 3
+
+
 class RealtimeAIProvider(ABC):
     @abstractmethod
     async def generate_audio_clip(
@@ -18,6 +23,35 @@ class RealtimeAIProvider(ABC):
         """Generate audio clip from text prompt using specified voice or default"""
         pass
 
+    async def generate_audio_clips(
+        self,
+        prompts: list[str],
+        voice: Optional[str] = None,
+        instructions: Optional[str] = None,
+        on_clip: Optional[Callable[[int, bytes], None]] = None,
+        **kwargs,
+    ) -> list[bytes]:
+        """Generate one clip per prompt with the same voice and instructions.
+
+        Runs up to ``CLIP_CONCURRENCY`` ``generate_audio_clip`` calls at once;
+        providers that can serve several responses over one websocket override
+        this. ``on_clip(i, audio)`` is called as soon as clip ``i`` is ready.
+        """
+        semaphore = asyncio.Semaphore(CLIP_CONCURRENCY)
+
+        async def generate(i: int, prompt: str) -> bytes:
+            async with semaphore:
+                audio = await self.generate_audio_clip(
+                    prompt, voice=voice, instructions=instructions, **kwargs
+                )
+            if on_clip:
+                on_clip(i, audio)
+            return audio
+
+        return list(
+            await asyncio.gather(*(generate(i, p) for i, p in enumerate(prompts)))
+        )
+
     @abstractmethod
     def get_supported_voices(self) -> list[str]:
         """Return list of supported voice names"""
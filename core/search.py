@@ -3,21 +3,201 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
 from typing import Iterable
 
-import aiohttp
+from .config import (
+    CACHE_DIR,
+    WEB_SEARCH_CACHE_PERSIST,
+    WEB_SEARCH_CACHE_SIZE,
+    WEB_SEARCH_CACHE_TTL_SECONDS,
+)
+from .http_client import get_session
+from .logger import logger
 
 
 DUCKDUCKGO_API_ENDPOINT = "https://api.duckduckgo.com/"
+SEARCH_CACHE_PATH = Path(CACHE_DIR) / "web_search.json"
+# How long after a put the cache file is rewritten, so a burst of searches
+# costs one write, made off the event loop.
+PERSIST_DELAY_SECONDS = 2.0
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache entry."""
+    text = re.sub(r"[^\w\s]", " ", (query or "").lower())
+    return " ".join(text.split())
+
+
+class SearchCache:
+    """TTL + LRU cache of search snippets, optionally persisted to disk."""
+
+    def __init__(
+        self,
+        max_entries: int = WEB_SEARCH_CACHE_SIZE,
+        ttl_seconds: float = WEB_SEARCH_CACHE_TTL_SECONDS,
+        persist_path: Path | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+        self._entries: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._persist_timer: threading.Timer | None = None
+        self._loaded = persist_path is None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            payload = json.loads(self.persist_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable web search cache: {e}")
+            return
+        now = time.time()
+        for key, (expires_at, snippets) in payload.items():
+            if expires_at > now:
+                self._entries[key] = (expires_at, list(snippets))
+
+    def _schedule_persist(self) -> None:
+        """Write the cache file shortly; call with ``_lock`` held."""
+        if self.persist_path is None or self._persist_timer is not None:
+            return
+        self._persist_timer = threading.Timer(PERSIST_DELAY_SECONDS, self.flush)
+        self._persist_timer.daemon = True
+        self._persist_timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes to disk now."""
+        with self._write_lock:
+            with self._lock:
+                timer, self._persist_timer = self._persist_timer, None
+                if timer is None:
+                    return
+                timer.cancel()
+                entries = dict(self._entries)
+            self._persist(entries)
+
+    def _persist(self, entries: dict[str, tuple[float, list[str]]]) -> None:
+        snapshot = json.dumps(entries, ensure_ascii=False)
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.persist_path.with_suffix(".tmp")
+            tmp_path.write_text(snapshot, encoding="utf-8")
+            os.replace(tmp_path, self.persist_path)
+        except Exception as e:
+            logger.warning(f"Failed to persist web search cache: {e}")
+
+    def get(self, key: str) -> list[str] | None:
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, key: str, snippets: list[str]) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[key] = (time.time() + self.ttl_seconds, list(snippets))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._schedule_persist()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+search_cache = SearchCache(
+    persist_path=SEARCH_CACHE_PATH if WEB_SEARCH_CACHE_PERSIST else None
+)
+atexit.register(search_cache.flush)
+# In-flight lookups keyed by (event loop, cache key) so identical concurrent
+# queries share one request.
+_inflight: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+
+def get_search_cache_stats() -> dict[str, float]:
+    """Return web search cache hit/miss statistics."""
+    return search_cache.stats()
 
 
 async def fetch_duckduckgo_results(query: str, *, max_entries: int = 4) -> list[str]:
     """Return up to ``max_entries`` concise snippets for the given query.
 
+    Results are served from ``search_cache`` while fresh, and identical
+    concurrent queries share a single in-flight request.
+    """
+    key = f"{max_entries}:{normalize_query(query)}"
+    cached = search_cache.get(key)
+    if cached is not None:
+        _log_cache_event("hit", query)
+        return cached
+
+    inflight_key = (asyncio.get_running_loop(), key)
+    pending = _inflight.get(inflight_key)
+    if pending is not None:
+        search_cache.coalesced += 1
+        _log_cache_event("coalesced", query)
+        snippets, _ = await asyncio.shield(pending)
+        return list(snippets)
+
+    future = asyncio.ensure_future(_query_duckduckgo(query, max_entries))
+    _inflight[inflight_key] = future
+    try:
+        snippets, cacheable = await asyncio.shield(future)
+    finally:
+        _inflight.pop(inflight_key, None)
+    if cacheable:
+        search_cache.put(key, snippets)
+    _log_cache_event("miss", query)
+    return list(snippets)
+
+
+def _log_cache_event(event: str, query: str) -> None:
+    stats = search_cache.stats()
+    logger.verbose(
+        f"Web search cache {event} for {query!r} "
+        f"(hit_ratio={stats['hit_ratio']:.2f}, entries={stats['entries']})",
+        emoji="🔍",
+    )
+
+
+async def _query_duckduckgo(query: str, max_entries: int) -> tuple[list[str], bool]:
+    """Query DuckDuckGo and return (snippets, cacheable).
+
     Uses the DuckDuckGo Instant Answer API, which is anonymous and does not
     require an API key. The API can occasionally respond with nested related
     topics, so we walk the structure recursively until we have collected enough
-    human-readable snippets.
+    human-readable snippets. Failures are returned as a snippet but are not
+    cacheable.
     """
 
     params = {
@@ -27,18 +207,18 @@ async def fetch_duckduckgo_results(query: str, *, max_entries: int = 4) -> list[
         "skip_disambig": 1,
     }
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(DUCKDUCKGO_API_ENDPOINT, params=params) as resp:
-                if resp.status != 200:
-                    return [
-                        f"DuckDuckGo search failed with HTTP status {resp.status}."
-                    ]
-                payload = await resp.json(content_type=None)
-        except asyncio.CancelledError:
-            raise
-        except Exception as exc:  # pragma: no cover - network failure path
-            return [f"DuckDuckGo search failed: {exc}"]
+    session = get_session()
+    try:
+        async with session.get(DUCKDUCKGO_API_ENDPOINT, params=params) as resp:
+            if resp.status != 200:
+                return [
+                    f"DuckDuckGo search failed with HTTP status {resp.status}."
+                ], False
+            payload = await resp.json(content_type=None)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:  # pragma: no cover - network failure path
+        return [f"DuckDuckGo search failed: {exc}"], False
 
     snippets: list[str] = []
 
@@ -81,7 +261,7 @@ async def fetch_duckduckgo_results(query: str, *, max_entries: int = 4) -> list[
         if len(unique_snippets) >= max_entries:
             break
 
-    return unique_snippets
+    return unique_snippets, True
 
 
 async def web_search_summary(query: str) -> str:
@@ -84,7 +84,7 @@ def get_tools_for_current_mode():
     current_user_env = os.getenv("CURRENT_USER", "").strip().strip("'\"")
 
     logger.info(
-        f"🔧 get_tools_for_current_mode: CURRENT_USER='{current_user_env}'", "🔧"
+        f"🔧 get_tools_for_current_mode: CURRENT_USER='{current_user_env}'", emoji="🔧"
     )
 
     # Determine mode
@@ -8,6 +8,7 @@ from typing import Any
 from .. import audio
 from ..config import CHUNK_MS, TEXT_ONLY_MODE
 from ..logger import logger
+from ..tracing import turn_tracer
 
 
 class AudioHandler:
@@ -37,14 +38,16 @@ class AudioHandler:
         if not self.audio_buffer and audio.playback_done_event.is_set():
             audio.playback_done_event.clear()
 
+        turn_tracer.mark("first_audio_delta")
         audio_chunk = base64.b64decode(audio_b64)
         self.audio_buffer.extend(audio_chunk)
         self.session.last_activity[0] = time.time()
         audio.playback_queue.put(audio_chunk)
+        audio.tts_streaming = True
 
         if self.session.interrupt_event.is_set():
             logger.warning(
-                "Assistant turn interrupted. Stopping response playback.", "⛔"
+                "Assistant turn interrupted. Stopping response playback.", emoji="⛔"
             )
             while not audio.playback_queue.empty():
                 try:
@@ -65,7 +68,7 @@ class AudioHandler:
         """Save the response audio buffer to disk."""
         if len(self.audio_buffer) > 0:
             logger.verbose(
-                f"Saving audio buffer ({len(self.audio_buffer)} bytes)", "💾"
+                f"Saving audio buffer ({len(self.audio_buffer)} bytes)", emoji="💾"
             )
             audio.rotate_and_save_response_audio(self.audio_buffer)
         else:
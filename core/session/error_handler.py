@@ -22,7 +22,7 @@ class ErrorHandler:
         sound_path = os.path.join("sounds", filename)
 
         logger.error(f"Error ({code}): {message or 'No message'}")
-        logger.info(f"Attempting to play {filename}...", "🔊")
+        logger.info(f"Attempting to play {filename}...", emoji="🔊")
 
         if os.path.exists(sound_path):
             await asyncio.to_thread(audio.enqueue_wav_to_playback, sound_path)
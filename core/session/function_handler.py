@@ -6,12 +6,14 @@ import time
 from typing import Any
 
 from ..config import PERSONALITY, TEXT_ONLY_MODE
-from ..ha import send_conversation_prompt
-from ..logger import logger
+from ..ha import get_entity_states, handle_smart_home_prompt, send_conversation_prompt
+from ..logger import LogLevel, logger
+from ..metrics import TOOL_LATENCY
 from ..news_digest import get_news_digest
 from ..persona import update_persona_ini
 from ..persona_manager import persona_manager
 from ..search import web_search_summary
+from ..tracing import turn_tracer
 from ..weather import fetch_current_weather
 
 
@@ -30,8 +32,10 @@ class FunctionHandler:
             "update_personality": self._handle_update_personality,
             "play_song": self._handle_play_song,
             "smart_home_command": self._handle_smart_home_command,
+            "smart_home_state": self._handle_smart_home_state,
             "identify_user": self._handle_identify_user,
             "store_memory": self._handle_store_memory,
+            "recall_memory": self._handle_recall_memory,
             "manage_profile": self._handle_manage_profile,
             "switch_persona": self._handle_switch_persona,
             "get_news_digest": self._handle_get_news_digest,
@@ -44,22 +48,26 @@ class FunctionHandler:
             logger.warning(f"No handler for function: {function_name}")
             return
 
+        started_at = time.perf_counter()
+        turn_tracer.tool_start(function_name, call_id)
         try:
-            if logger.get_level().name == "VERBOSE":
+            if logger.is_enabled_for(LogLevel.VERBOSE):
                 logger.verbose(
                     f"tool_call:start name={function_name} call_id={call_id} raw_args={raw_args!r}",
-                    "🧰",
+                    emoji="🧰",
                 )
-            started_at = time.perf_counter()
             await handler(raw_args, call_id)
-            if logger.get_level().name == "VERBOSE":
+            if logger.is_enabled_for(LogLevel.VERBOSE):
                 elapsed_ms = (time.perf_counter() - started_at) * 1000.0
                 logger.verbose(
                     f"tool_call:done name={function_name} call_id={call_id} elapsed_ms={elapsed_ms:.1f}",
-                    "🧰",
+                    emoji="🧰",
                 )
         except Exception as e:
             logger.error(f"Function {function_name} failed: {e}")
+        finally:
+            turn_tracer.tool_end(function_name, call_id)
+            TOOL_LATENCY.labels(function_name).observe(time.perf_counter() - started_at)
 
     def _parse_json_args(self, raw_args: str | None, tool_name: str) -> dict:
         """Parse JSON arguments with fallback for malformed JSON."""
@@ -78,7 +86,7 @@ class FunctionHandler:
                 args = json.loads(fixed_json)
                 logger.info(
                     f"{tool_name}: fixed malformed JSON | original={raw_args!r} | fixed={fixed_json!r}",
-                    "🔧",
+                    emoji="🔧",
                 )
                 return args
             except Exception as fix_e:
@@ -114,12 +122,12 @@ class FunctionHandler:
         self.session.state.follow_up_prompt = args.get("suggested_prompt") or None
         self.session.state._saw_follow_up_call = True
 
-        if logger.get_level().name == "VERBOSE":
+        if logger.is_enabled_for(LogLevel.VERBOSE):
             logger.verbose(
                 f"conversation_state | expects_follow_up={self.session.state.follow_up_expected}"
                 f" | suggested_prompt={self.session.state.follow_up_prompt!r}"
                 f" | reason={args.get('reason')!r}",
-                "🧭",
+                emoji="🧭",
             )
 
     async def _handle_update_personality(
@@ -142,7 +150,7 @@ class FunctionHandler:
 
         logger.info(
             f"Updating personality for persona: {current_persona}, file: {persona_file_path}",
-            "🎛️",
+            emoji="🎛️",
         )
 
         level_to_value = {'min': 7, 'low': 24, 'med': 49, 'high': 74, 'max': 92}
@@ -209,7 +217,7 @@ class FunctionHandler:
         args = self._parse_json_args(raw_args, "play_song")
         song_name = args.get("song")
         if song_name:
-            logger.info(f"Assistant requested to play song: {song_name}", "🎵")
+            logger.info(f"Assistant requested to play song: {song_name}", emoji="🎵")
             await self.session.stop_session()
             await asyncio.sleep(1.0)
             await audio.play_song(
@@ -225,14 +233,16 @@ class FunctionHandler:
         if not prompt:
             return
 
-        logger.info(f"Sending to Home Assistant Conversation API: {prompt}", "🏠")
-        ha_response = await send_conversation_prompt(prompt)
+        logger.info(
+            f"Sending smart home command to Home Assistant: {prompt}", emoji="🏠"
+        )
+        ha_response = await handle_smart_home_prompt(prompt)
         speech_text = None
 
         if isinstance(ha_response, dict):
             speech_text = ha_response.get("speech", {}).get("plain", {}).get("speech")
             if speech_text:
-                logger.verbose(f"HA debug: {ha_response.get('data')}", "🔍")
+                logger.verbose(f"HA debug: {ha_response.get('data')}", emoji="🔍")
                 print(f"\n📣 Home Assistant says: {speech_text}")
 
             if call_id:
@@ -292,6 +302,61 @@ class FunctionHandler:
             self.session.state._triggered_new_response = True
             await self.session._ws_send_json({"type": "response.create"})
 
+    async def _handle_smart_home_state(
+        self, raw_args: str | None, call_id: str | None = None
+    ):
+        """Handle Home Assistant state questions from the local entity cache."""
+        args = self._parse_json_args(raw_args, "smart_home_state")
+        entity = str(args.get("entity") or "").strip()
+        question = str(args.get("question") or "").strip()
+        if not entity and not question:
+            return
+
+        states = await get_entity_states(entity) if entity else []
+        if states:
+            logger.info(f"Home Assistant state for {entity!r}: {states}", emoji="🏠")
+            result: dict[str, Any] = {"status": "success", "states": states}
+        else:
+            # Not in the local cache: let HA's conversation agent answer it.
+            ha_response = await send_conversation_prompt(question or entity)
+            speech_text = None
+            if isinstance(ha_response, dict):
+                speech_text = (
+                    ha_response.get("speech", {}).get("plain", {}).get("speech")
+                )
+            result = (
+                {"status": "success", "response": speech_text}
+                if speech_text
+                else {"status": "error", "message": f"No device found for {entity!r}"}
+            )
+
+        if call_id:
+            await self.session._ws_send_json({
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "function_call_output",
+                    "call_id": call_id,
+                    "output": json.dumps(result),
+                },
+            })
+            await asyncio.sleep(0.1)
+
+        await self.session._ws_send_json({
+            "type": "conversation.item.create",
+            "item": {
+                "type": "message",
+                "role": "user",
+                "content": [
+                    {
+                        "type": "input_text",
+                        "text": f"Home Assistant state lookup returned: {json.dumps(result)}. Answer the user's question naturally.",
+                    }
+                ],
+            },
+        })
+        self.session.state._triggered_new_response = True
+        await self.session._ws_send_json({"type": "response.create"})
+
     async def _handle_identify_user(
         self, raw_args: str | None, call_id: str | None = None
     ):
@@ -306,6 +371,13 @@ class FunctionHandler:
         args = self._parse_json_args(raw_args, "store_memory")
         await self.session.user_handler.handle_store_memory(args, call_id)
 
+    async def _handle_recall_memory(
+        self, raw_args: str | None, call_id: str | None = None
+    ):
+        """Handle semantic memory recall."""
+        args = self._parse_json_args(raw_args, "recall_memory")
+        await self.session.user_handler.handle_recall_memory(args, call_id)
+
     async def _handle_manage_profile(
         self, raw_args: str | None, call_id: str | None = None
     ):
@@ -325,10 +397,10 @@ class FunctionHandler:
     ):
         """Handle location-aware news/weather/sports digest retrieval."""
         args = self._parse_json_args(raw_args, "get_news_digest")
-        if logger.get_level().name == "VERBOSE":
-            logger.verbose(f"get_news_digest:args {args}", "🗞️")
+        if logger.is_enabled_for(LogLevel.VERBOSE):
+            logger.verbose(f"get_news_digest:args {args}", emoji="🗞️")
         result = await asyncio.to_thread(get_news_digest, args)
-        if logger.get_level().name == "VERBOSE":
+        if logger.is_enabled_for(LogLevel.VERBOSE):
             logger.verbose(
                 "get_news_digest:result "
                 f"ok={result.get('ok')} "
@@ -336,7 +408,7 @@ class FunctionHandler:
                 f"source={result.get('source')} "
                 f"items={len(result.get('items') or [])} "
                 f"summary={result.get('summary')!r}",
-                "🗞️",
+                emoji="🗞️",
             )
 
         if call_id:
@@ -377,7 +449,7 @@ class FunctionHandler:
         self, raw_args: str | None, call_id: str | None = None
     ):
         """Handle weather lookup via Open-Meteo."""
-        logger.info("Fetching weather...", "🌤️")
+        logger.info("Fetching weather...", emoji="🌤️")
         result = await fetch_current_weather()
 
         if call_id:
@@ -416,7 +488,7 @@ class FunctionHandler:
         if not query:
             return
 
-        logger.info(f"Web search: {query}", "🔍")
+        logger.info(f"Web search: {query}", emoji="🔍")
         result = await web_search_summary(query)
 
         if call_id:
@@ -460,7 +532,9 @@ class FunctionHandler:
                 "type": "session.update",
                 "session": {
                     "type": "realtime",
-                    "instructions": get_instructions_with_user_context(),
+                    "instructions": get_instructions_with_user_context(
+                        self.session.conversation_context()
+                    ),
                 },
             }
 
@@ -474,7 +548,7 @@ class FunctionHandler:
             await self.session._ws_send_json(session_update)
             logger.info(
                 f"Updated session with user context (persona={persona_manager.current_persona}, voice={session_voice})",
-                "👤",
+                emoji="👤",
             )
         except Exception as e:
             logger.warning(f"Failed to update session with user context: {e}")
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 from ..config import INSTRUCTIONS, get_tool_instructions
-from ..persona import PersonaProfile
+from ..persona_bundle import render_backstory_section, render_personality_section
 from ..persona_manager import persona_manager
 
 
@@ -17,6 +17,7 @@ class InstructionContext:
     mode: str  # "guest" or "user"
     persona_name: str
     user_profile: Optional[object] = None
+    conversation: str = ""  # Recent conversation text for memory ranking
 
 
 class InstructionBuilder:
@@ -33,17 +34,14 @@ class InstructionBuilder:
 
     def _build_guest_instructions(self, context: InstructionContext) -> str:
         """Build instructions for guest mode."""
-        persona_data = persona_manager.load_persona(context.persona_name)
-        persona_instructions = persona_manager.get_persona_instructions(
-            context.persona_name
-        )
+        bundle = persona_manager.get_bundle(context.persona_name)
 
-        if persona_data and persona_instructions:
+        if bundle.instructions:
             sections = [
-                f"# Role & Objective\n{persona_instructions}",
+                f"# Role & Objective\n{bundle.instructions}",
                 f"# Tools\n{get_tool_instructions().strip()}",
-                self._build_personality_section(persona_data),
-                self._build_backstory_section(persona_data),
+                bundle.personality_section,
+                bundle.backstory_section,
             ]
             return "\n---\n".join(filter(None, sections))
 
@@ -62,56 +60,41 @@ class InstructionBuilder:
         preferred_persona = user_profile.data['USER_INFO'].get(
             'preferred_persona', 'default'
         )
-        persona_data = persona_manager.load_persona(preferred_persona)
-        persona_instructions = persona_manager.get_persona_instructions(
-            preferred_persona
-        )
+        bundle = persona_manager.get_bundle(preferred_persona)
 
-        if persona_data and persona_instructions:
+        if bundle.instructions:
             sections = [
-                f"# Role & Objective\n{persona_instructions}",
+                f"# Role & Objective\n{bundle.instructions}",
                 f"# Tools\n{get_tool_instructions().strip()}",
-                self._build_personality_section(persona_data),
-                self._build_backstory_section(persona_data),
-                self._build_user_context_section(user_profile),
+                bundle.personality_section,
+                bundle.backstory_section,
+                self._build_user_context_section(user_profile, context.conversation),
             ]
             return "\n---\n".join(filter(None, sections))
 
         # Fallback
-        user_context = user_profile.get_context_string() if user_profile else ""
+        user_context = (
+            user_profile.get_context_string(context.conversation)
+            if user_profile
+            else ""
+        )
         return INSTRUCTIONS + (
             f"\n---\n# Current User Context\n{user_context}" if user_context else ""
         )
 
     def _build_personality_section(self, persona_data: dict) -> str:
         """Build personality traits section."""
-        if not persona_data.get('personality'):
-            return ""
-
-        personality = PersonaProfile()
-        for trait, value in persona_data['personality'].items():
-            if hasattr(personality, trait):
-                setattr(personality, trait, int(value))
-
-        return f"# Personality & Tone\n{personality.generate_prompt()}"
+        return render_personality_section(persona_data)
 
     def _build_backstory_section(self, persona_data: dict) -> str:
         """Build backstory section."""
-        backstory = persona_data.get('backstory', {})
-        if not backstory:
-            return ""
-
-        backstory_lines = [f"- {k}: {v}" for k, v in backstory.items()]
-        return (
-            f"# Context (backstory)\nUse your backstory to inspire jokes, metaphors, or occasional references in conversation, staying consistent with your personality.\n"
-            + "\n".join(backstory_lines)
-        )
+        return render_backstory_section(persona_data)
 
-    def _build_user_context_section(self, user_profile) -> str:
+    def _build_user_context_section(self, user_profile, conversation: str = "") -> str:
         """Build user context section."""
         if not user_profile:
             return ""
-        context = user_profile.get_context_string()
+        context = user_profile.get_context_string(conversation)
         return f"# Current User Context\n{context}" if context else ""
 
     def clear_cache(self):
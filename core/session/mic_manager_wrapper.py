@@ -6,8 +6,9 @@ import time
 import numpy as np
 
 from .. import audio
-from ..config import DEBUG_MODE, SILENCE_THRESHOLD, TEXT_ONLY_MODE
+from ..config import CHUNK_MS, DEBUG_MODE, SILENCE_THRESHOLD, TEXT_ONLY_MODE
 from ..logger import logger
+from ..meters import meter
 from ..mic import MicManager
 
 
@@ -24,8 +25,12 @@ class MicManagerWrapper:
         self._mic_data_started = False
         self._logged_waiting_for_wakeup = False
 
-    def start(self, *, retry=True):
-        """Try to open the mic with optional retry on failure."""
+    def start(self, *, retry=True, guard=True):
+        """Try to open the mic with optional retry on failure.
+
+        ``guard`` drops the first moments of input (clicks, wake-up clip tail);
+        it is skipped when the session continues from handed-off audio.
+        """
         if self.mic_running or not self.session.session_active.is_set():
             return
 
@@ -37,9 +42,9 @@ class MicManagerWrapper:
 
             self.mic.start(self.callback)
             self.mic_running = True
-            self._mic_guard_until = time.time() + 0.35
+            self._mic_guard_until = time.time() + 0.35 if guard else 0.0
             if DEBUG_MODE:
-                logger.info("Mic started", "🎤")
+                logger.info("Mic started", emoji="🎤")
             if not self.mic_timeout_task or self.mic_timeout_task.done():
                 self.mic_timeout_task = asyncio.create_task(self.timeout_checker())
             self.session._set_listening_state()
@@ -60,6 +65,35 @@ class MicManagerWrapper:
                 logger.warning(f"Error stopping mic: {e}")
             self.mic_running = False
 
+    async def flush_wake_word_audio(self) -> bool:
+        """Send the audio captured after the wake word, before the mic opens.
+
+        Returns True if any audio was handed over by the wake word listener.
+        """
+        from ..hotword import controller as wake_word_controller
+
+        samples = await asyncio.to_thread(wake_word_controller.take_handoff_audio)
+        if samples is None or not samples.size:
+            return False
+
+        rate = audio.MIC_RATE or audio.PROVIDER_MIC_RATE
+        chunk = max(1, int(rate * CHUNK_MS / 1000))
+        # Count it the way the mic callback would, chunk by chunk
+        for offset in range(0, samples.shape[0], chunk):
+            piece = samples[offset : offset + chunk].astype(np.float32)
+            if np.sqrt(np.mean(np.square(piece))) > SILENCE_THRESHOLD:
+                self.session.state.update_activity()
+                self.session.state.increment_loud_mic_chunks()
+            self.session.state.increment_mic_chunks()
+
+        audio.send_mic_audio(self.session.ws, samples, self.session.loop)
+        logger.info(
+            f"Sent {samples.shape[0] * 1000 // rate} ms of speech captured after "
+            "the wake word",
+            emoji="🗣️",
+        )
+        return True
+
     async def start_after_playback(self, delay: float = 0.6, retries: int = 3) -> bool:
         """Open mic after playback with retry logic."""
         for attempt in range(1, retries + 1):
@@ -67,7 +101,8 @@ class MicManagerWrapper:
                 if attempt > 1:
                     wait_time = delay * (attempt - 1) + 0.5
                     logger.info(
-                        f"Waiting {wait_time:.1f}s before mic retry {attempt}...", "⏳"
+                        f"Waiting {wait_time:.1f}s before mic retry {attempt}...",
+                        emoji="⏳",
                     )
                     await asyncio.sleep(wait_time)
 
@@ -106,7 +141,7 @@ class MicManagerWrapper:
                 if "Device unavailable" in err or "PaErrorCode -9985" in err:
                     logger.error(
                         "Mic device unavailable during follow-up reopen; skipping reset/retries.",
-                        "🛑",
+                        emoji="🛑",
                     )
                     return False
 
@@ -118,6 +153,9 @@ class MicManagerWrapper:
         if not self.session.session_active.is_set():
             return
 
+        # Meters show the mic even while its input is being held back
+        meter.feed(indata[:, 0], "session")
+
         if not self.session.state.allow_mic_input:
             return
 
@@ -131,12 +169,12 @@ class MicManagerWrapper:
 
         if not TEXT_ONLY_MODE and not audio.playback_done_event.is_set():
             if not self._logged_waiting_for_wakeup:
-                logger.info("🔇 Mic waiting for wake-up sound to finish...", "⏳")
+                logger.info("🔇 Mic waiting for wake-up sound to finish...", emoji="⏳")
                 self._logged_waiting_for_wakeup = True
             return
 
         if not self._mic_data_started and not TEXT_ONLY_MODE:
-            logger.info("Mic data now being sent (wake-up sound finished)", "🎤")
+            logger.info("Mic data now being sent (wake-up sound finished)", emoji="🎤")
             self._mic_data_started = True
 
         samples = indata[:, 0]
@@ -161,7 +199,7 @@ class MicManagerWrapper:
         from ..config import MIC_TIMEOUT_SECONDS
         from ..movements import move_tail_async
 
-        logger.info("Mic timeout checker active", "🛡️")
+        logger.info("Mic timeout checker active", emoji="🛡️")
         last_tail_move = 0
 
         while self.session.session_active.is_set():
@@ -203,13 +241,12 @@ class MicManagerWrapper:
                         logger.info(
                             "Mic timeout reached but session already stopping;"
                             " skipping duplicate stop.",
-                            "ℹ️",
+                            emoji="ℹ️",
                         )
                         break
                     logger.info(
-                        f"No mic activity for {MIC_TIMEOUT_SECONDS}s."
-                        " Ending input...",
-                        "⏱️",
+                        f"No mic activity for {MIC_TIMEOUT_SECONDS}s. Ending input...",
+                        emoji="⏱️",
                     )
                     await self.session.stop_session()
                     break
@@ -219,7 +256,7 @@ class MicManagerWrapper:
     async def _retry_loop(self):
         """Retry opening mic once with backoff."""
         if DEBUG_MODE:
-            logger.verbose("Mic retry loop started", "🔁")
+            logger.verbose("Mic retry loop started", emoji="🔁")
 
         if not self.session.session_active.is_set():
             return
@@ -235,19 +272,19 @@ class MicManagerWrapper:
             self.mic.start(self.callback)
             self.mic_running = True
             self._mic_guard_until = time.time() + 0.35
-            logger.info("Mic started after retry", "✅")
+            logger.info("Mic started after retry", emoji="✅")
             if not self.mic_timeout_task or self.mic_timeout_task.done():
                 self.mic_timeout_task = asyncio.create_task(self.timeout_checker())
             self.session._set_listening_state()
         except Exception as e:
             self.mic_running = False
             logger.warning(f"Mic retry failed: {e}")
-            logger.info("Assuming no follow-up needed, ending session.", "🛑")
+            logger.info("Assuming no follow-up needed, ending session.", emoji="🛑")
             await self.session.stop_session()
 
     async def _reset_audio_system(self):
         """Reset audio system for device unavailable errors."""
-        logger.info("Attempting audio system reset...", "🔄")
+        logger.info("Attempting audio system reset...", emoji="🔄")
         try:
             import subprocess
 
@@ -265,6 +302,6 @@ class MicManagerWrapper:
             )
 
             await asyncio.sleep(2.0)
-            logger.info("Audio system reset completed", "✅")
+            logger.info("Audio system reset completed", emoji="✅")
         except Exception as e:
             logger.warning(f"Audio reset failed: {e}")
@@ -1,17 +1,32 @@
 """Persona management for Billy session."""
 
+import asyncio
+import contextlib
+import json
+import time
 from datetime import datetime
 
 from ..config import TEXT_ONLY_MODE
 from ..logger import logger
+from ..metrics import WEBSOCKET_RECONNECTS
 from ..persona_manager import persona_manager
 
 
+# Recent turns replayed into the new websocket on a voice switch
+REPLAY_MAX_TURNS = 8
+REPLAY_MAX_CHARS = 400
+# How long the new websocket may take to confirm session.updated
+VOICE_SWITCH_CONFIRM_TIMEOUT = 10.0
+# How long to wait for the current turn to finish before giving up the switch
+VOICE_SWITCH_CUTOVER_TIMEOUT = 15.0
+
+
 class PersonaHandler:
     """Handles persona switching and management."""
 
     def __init__(self, session):
         self.session = session
+        self._voice_switch_task: asyncio.Task | None = None
 
     async def reload_persona_from_profile(self):
         """Reload persona from current user's profile."""
@@ -35,7 +50,9 @@ class PersonaHandler:
                         "preferred_persona", "default"
                     )
                     persona_manager.switch_persona(preferred_persona)
-                    logger.info(f"🎭 Reloaded guest persona: {preferred_persona}", "🎭")
+                    logger.info(
+                        f"🎭 Reloaded guest persona: {preferred_persona}", emoji="🎭"
+                    )
             else:
                 current_user = user_manager.get_current_user()
                 if current_user:
@@ -43,9 +60,11 @@ class PersonaHandler:
                         "preferred_persona", "default"
                     )
                     persona_manager.switch_persona(preferred_persona)
-                    logger.info(f"🎭 Reloaded user persona: {preferred_persona}", "🎭")
+                    logger.info(
+                        f"🎭 Reloaded user persona: {preferred_persona}", emoji="🎭"
+                    )
         except Exception as e:
-            logger.warning(f"Failed to reload persona: {e}", "⚠️")
+            logger.warning(f"Failed to reload persona: {e}", emoji="⚠️")
 
     async def handle_switch_persona(self, args: dict):
         """Handle persona switching mid-session."""
@@ -53,12 +72,13 @@ class PersonaHandler:
         reason = args.get("reason", "")
 
         logger.verbose(
-            f"switch_persona: persona='{persona_name}', reason='{reason}'", "🔧"
+            f"switch_persona: persona='{persona_name}', reason='{reason}'", emoji="🔧"
         )
 
         if not persona_name:
             return
 
+        start = time.perf_counter()
         try:
             available_personas = persona_manager.get_available_personas()
             persona_names = [p["name"] for p in available_personas]
@@ -80,16 +100,13 @@ class PersonaHandler:
                 })
                 return
 
+            voice_changed = self._check_voice_change(persona_name)
             persona_manager.switch_persona(persona_name)
-            await self._update_session_with_persona()
+            await self._apply_persona(persona_name, voice_changed)
             await self._notify_persona_change(persona_name)
 
-            persona_data = persona_manager.get_current_persona_data()
-            persona_desc = (
-                persona_data.get("meta", {}).get("description", persona_name)
-                if persona_data
-                else persona_name
-            )
+            bundle = persona_manager.get_current_bundle(validate=False)
+            persona_desc = bundle.description
 
             message = (
                 f"Right then! Switching to {persona_desc} mode. {reason}"
@@ -106,7 +123,7 @@ class PersonaHandler:
                 },
             })
 
-            logger.info(f"Switched to persona: {persona_name}", "🎭")
+            self._log_switch_latency(persona_name, start)
 
         except Exception as e:
             logger.warning(f"Failed to switch persona: {e}")
@@ -136,6 +153,7 @@ class PersonaHandler:
                 return
 
             new_persona = args.get("preferred_persona", "default")
+            start = time.perf_counter()
 
             available_personas = persona_manager.get_available_personas()
             persona_names = [p["name"] for p in available_personas]
@@ -159,20 +177,11 @@ class PersonaHandler:
             voice_changed = self._check_voice_change(new_persona)
             current_user.set_preferred_persona(new_persona)
             persona_manager.switch_persona(new_persona)
-            await self._update_session_with_persona()
+            await self._apply_persona(new_persona, voice_changed)
             await self._notify_persona_change(new_persona)
-            if voice_changed:
-                logger.info(
-                    f"Applied voice change for persona '{new_persona}' via session.update",
-                    "🎭",
-                )
 
-            persona_data = persona_manager.get_current_persona_data()
-            persona_desc = (
-                persona_data.get("meta", {}).get("description", new_persona)
-                if persona_data
-                else new_persona
-            )
+            bundle = persona_manager.get_current_bundle(validate=False)
+            persona_desc = bundle.description
 
             await self.session._ws_send_json({
                 "type": "conversation.item.create",
@@ -187,8 +196,35 @@ class PersonaHandler:
                     ],
                 },
             })
+            self._log_switch_latency(new_persona, start)
+
+    def _log_switch_latency(self, persona_name: str, start: float):
+        """Log how long a mid-session persona switch took end to end."""
+        total_ms = (time.perf_counter() - start) * 1000
+        catalog_ms = persona_manager.last_switch_ms or 0.0
+        logger.info(
+            f"Switched to persona: {persona_name} in {total_ms:.1f} ms "
+            f"(catalog {catalog_ms:.1f} ms)",
+            emoji="🎭",
+        )
+
+    async def _apply_persona(self, persona_name: str, voice_changed: bool):
+        """Push the new persona to the provider.
+
+        Instructions change in place via ``session.update``. The voice cannot
+        change once the session has produced audio, so a voice change moves
+        the conversation to a new websocket in the background instead.
+        """
+        if voice_changed and not TEXT_ONLY_MODE and self.session.ws:
+            if self._voice_switch_task and not self._voice_switch_task.done():
+                self._voice_switch_task.cancel()
+            self._voice_switch_task = asyncio.create_task(
+                self._switch_voice(persona_name)
+            )
+            return
+        await self._update_session_with_persona()
 
-    async def _update_session_with_persona(self):
+    async def _update_session_with_persona(self, include_voice: bool = True):
         """Update session with new persona context."""
         if not self.session.ws:
             return
@@ -200,11 +236,13 @@ class PersonaHandler:
                 "type": "session.update",
                 "session": {
                     "type": "realtime",
-                    "instructions": get_instructions_with_user_context(),
+                    "instructions": get_instructions_with_user_context(
+                        self.session.conversation_context()
+                    ),
                 },
             }
 
-            if not TEXT_ONLY_MODE:
+            if include_voice and not TEXT_ONLY_MODE:
                 session_update["session"]["audio"] = {
                     "output": {
                         "voice": persona_manager.get_current_persona_voice(),
@@ -212,7 +250,7 @@ class PersonaHandler:
                 }
 
             await self.session._ws_send_json(session_update)
-            logger.info("Updated session with persona context", "🎭")
+            logger.info("Updated session with persona context", emoji="🎭")
         except Exception as e:
             logger.warning(f"Failed to update session: {e}")
 
@@ -224,7 +262,7 @@ class PersonaHandler:
                 "persona": persona_name,
                 "timestamp": datetime.now().isoformat(),
             })
-            logger.info(f"Notified frontend: {persona_name}", "🎭")
+            logger.info(f"Notified frontend: {persona_name}", emoji="🎭")
         except Exception as e:
             logger.warning(f"Failed to notify frontend: {e}")
 
@@ -238,30 +276,99 @@ class PersonaHandler:
             logger.warning(f"Failed to check voice change: {e}")
             return False
 
-    async def _restart_for_voice_change(self, new_persona: str):
-        """Restart session for voice change."""
+    async def _switch_voice(self, persona_name: str):
+        """Move the conversation to a new websocket that uses the new voice.
+
+        The new socket is opened in parallel with the persona's instructions
+        and voice, primed with a compact replay of recent turns, and swapped
+        in once it confirms ``session.updated`` and the current turn is over.
+        The old socket keeps streaming until then, so playback has no gap. If
+        the turn does not end within ``VOICE_SWITCH_CUTOVER_TIMEOUT`` the
+        switch is abandoned and the old socket (and voice) kept.
+        """
+        start = time.perf_counter()
+        voice = persona_manager.get_current_persona_voice()
+        new_ws = None
         try:
-            logger.info(f"Voice changed, restarting for {new_persona}", "🔄")
+            new_ws = await self.session.connect_provider(voice)
+            await self._replay_turns(new_ws)
+            await asyncio.wait_for(
+                self._wait_for_session_updated(new_ws), VOICE_SWITCH_CONFIRM_TIMEOUT
+            )
+            if not await self._wait_for_turn_boundary():
+                # Cutting over now would close the old socket mid-response,
+                # and its response.done would never reset the turn state
+                raise RuntimeError(
+                    f"turn still running after {VOICE_SWITCH_CUTOVER_TIMEOUT:.0f}s"
+                )
+            if not self.session.session_active.is_set():
+                return
+            if persona_manager.current_persona != persona_name:
+                return
 
-            await self.session._ws_send_json({
-                "type": "conversation.item.create",
-                "item": {
-                    "type": "message",
-                    "role": "assistant",
-                    "content": [
-                        {
-                            "type": "output_text",
-                            "text": f"Switching to {new_persona} persona. "
-                            "This requires a quick restart to change my voice...",
-                        }
-                    ],
+            async with self.session.ws_lock:
+                old_ws, self.session.ws = self.session.ws, new_ws
+            new_ws = None
+            WEBSOCKET_RECONNECTS.labels("voice_switch").inc()
+        except Exception as e:
+            logger.warning(f"Voice switch failed, keeping current websocket: {e}")
+            await self._update_session_with_persona(include_voice=False)
+            return
+        finally:
+            if new_ws is not None:
+                with contextlib.suppress(Exception):
+                    await asyncio.wait_for(new_ws.close(), timeout=2.0)
+
+        logger.info(
+            f"Switched voice to '{voice}' for persona '{persona_name}' in "
+            f"{(time.perf_counter() - start) * 1000:.0f} ms without a restart",
+            emoji="🔀",
+        )
+        # Closing the old socket ends its read loop; run_stream moves on.
+        if old_ws is not None:
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(old_ws.close(), timeout=2.0)
+
+    async def _replay_turns(self, ws):
+        """Seed a new websocket with a compact copy of recent turns."""
+        from ..session_manager import REPLAY_ITEM_PREFIX
+
+        turns = self.session.recent_turns()[-REPLAY_MAX_TURNS:]
+        for index, (role, text) in enumerate(turns):
+            content_type = "input_text" if role == "user" else "output_text"
+            await self.session.realtime_ai_provider.send_message(
+                ws,
+                {
+                    "type": "conversation.item.create",
+                    "item": {
+                        "id": f"{REPLAY_ITEM_PREFIX}{index}",
+                        "type": "message",
+                        "role": role,
+                        "content": [
+                            {"type": content_type, "text": text[:REPLAY_MAX_CHARS]}
+                        ],
+                    },
                 },
-            })
-
-            await self.session._ws_send_json({"type": "session.close"})
-            import asyncio
-
-            await asyncio.sleep(1)
+            )
+        logger.verbose(f"Replayed {len(turns)} turns into new websocket", emoji="🔀")
 
-        except Exception as e:
-            logger.error(f"Failed to restart for voice change: {e}")
+    async def _wait_for_session_updated(self, ws):
+        async for message in ws:
+            data = json.loads(message)
+            t = data.get("type")
+            if t in ("session.updated", "session_updated"):
+                return
+            if t == "error":
+                error = data.get("error") or {}
+                raise RuntimeError(error.get("message", "provider error"))
+        raise RuntimeError("websocket closed before session.updated")
+
+    async def _wait_for_turn_boundary(self) -> bool:
+        """Wait until neither Billy nor the user is mid-turn; False on timeout."""
+        state = self.session.state
+        deadline = time.monotonic() + VOICE_SWITCH_CUTOVER_TIMEOUT
+        while state.response_active or state.user_speaking:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
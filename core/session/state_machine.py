@@ -5,6 +5,7 @@ import time
 from typing import Any
 
 from ..config import DEBUG_MODE, HEAD_RETRACT_DELAY_SECONDS
+from ..ipc import publish_state
 from ..logger import logger
 from ..movements import move_head
 from ..mqtt import mqtt_publish
@@ -47,6 +48,11 @@ class SessionState:
         self._last_committed_had_server_speech = False
         self._head_retract_timer: threading.Timer | None = None
 
+    @property
+    def user_speaking(self) -> bool:
+        """Server VAD heard speech in input that has not been committed yet."""
+        return self._current_input_had_server_speech
+
     def reset_for_new_session(self):
         """Reset state for a new session."""
         self.full_response_text = ""
@@ -112,7 +118,7 @@ class SessionState:
                 f"Committed audio turn with {self._last_committed_audio_chunks} chunks "
                 f"({self._last_committed_loud_audio_chunks} above threshold, "
                 f"server_speech={self._last_committed_had_server_speech}).",
-                "🎚️",
+                emoji="🎚️",
             )
 
     def on_conversation_item_done(self, data: dict[str, Any]):
@@ -177,7 +183,7 @@ class SessionState:
                     f"server_speech={self._last_committed_had_server_speech}, "
                     f"has_transcript={has_transcript}, "
                     f"low_signal_noise={low_signal_noise}).",
-                    "🔇",
+                    emoji="🔇",
                 )
 
         # Reset follow-up retry only when we actually received meaningful user content.
@@ -207,7 +213,7 @@ class SessionState:
 
         if not self._turn_announced:
             self.set_speaking_state()
-            logger.info("Billy: ", "🐟")
+            logger.info("Billy: ", emoji="🐟")
             self._turn_announced = True
 
         self.full_response_text += delta
@@ -220,7 +226,7 @@ class SessionState:
             self._added_done_text = True
         self.full_response_text += "\n\n"
         if DEBUG_MODE:
-            logger.info(f"Transcript completed: {transcript!r}", "📝")
+            logger.info(f"Transcript completed: {transcript!r}", emoji="📝")
 
     def on_response_done(self):
         """Handle response.done event."""
@@ -248,7 +254,7 @@ class SessionState:
             if signature != self._last_heuristic_signature:
                 logger.info(
                     f"Heuristic check: text='{txt}' | has_question={has_question}",
-                    "🔍",
+                    emoji="🔍",
                 )
                 self._last_heuristic_signature = signature
         # If Billy asks a question, keep mic open for user to respond
@@ -271,17 +277,20 @@ class SessionState:
         self._cancel_head_retract_timer()
         move_head("on")
         mqtt_publish("billy/state", "listening")
+        publish_state("listening")
 
     def set_speaking_state(self):
         """Set Billy to speaking state."""
         self._schedule_head_retract()
         mqtt_publish("billy/state", "speaking")
+        publish_state("speaking")
 
     def set_idle_state(self):
         """Set Billy to idle state."""
         self._cancel_head_retract_timer()
         move_head("off")
         mqtt_publish("billy/state", "idle")
+        publish_state("idle")
 
     def _cancel_head_retract_timer(self):
         """Cancel any pending delayed head retract."""
@@ -3,10 +3,12 @@
 import asyncio
 import json
 import os
+import time
 from datetime import datetime
 
 from ..config import TEXT_ONLY_MODE
 from ..logger import logger
+from ..memory_index import DEFAULT_RECALL_LIMIT, memory_index
 from ..persona_manager import persona_manager
 from ..profile_manager import user_manager
 
@@ -26,7 +28,7 @@ class UserHandler:
 
         logger.verbose(
             f"🔧 identify_user: name='{name}', confidence='{confidence}', context='{context}'",
-            "🔧",
+            emoji="🔧",
         )
 
         if not name:
@@ -58,7 +60,8 @@ class UserHandler:
                 await self.send_user_greeting(profile, call_id)
             else:
                 logger.info(
-                    f"Profile loaded for {profile.name} (auto-load, no greeting)", "👤"
+                    f"Profile loaded for {profile.name} (auto-load, no greeting)",
+                    emoji="👤",
                 )
         elif self._waiting_for_name_after_denial:
             await self._fallback_to_guest()
@@ -67,7 +70,7 @@ class UserHandler:
         """Handle memory storage via tool calling."""
         current_user = user_manager.get_current_user()
         if not current_user:
-            logger.warning("store_memory: No current user", "🔧")
+            logger.warning("store_memory: No current user", emoji="🔧")
             return
 
         memory = args.get("memory", "")
@@ -82,7 +85,7 @@ class UserHandler:
 
         logger.verbose(
             f"store_memory: '{memory}', importance={importance}, category={category}",
-            "🔧",
+            emoji="🔧",
         )
 
         current_user.add_memory(memory, importance, category)
@@ -115,6 +118,69 @@ class UserHandler:
             self.session.state._triggered_new_response = True
             await self.session._ws_send_json({"type": "response.create"})
 
+    async def handle_recall_memory(self, args: dict, call_id: str | None = None):
+        """Handle semantic memory recall via tool calling."""
+        current_user = user_manager.get_current_user()
+        query = str(args.get("query") or "").strip()
+        try:
+            limit = max(1, min(int(args.get("limit") or DEFAULT_RECALL_LIMIT), 20))
+        except (TypeError, ValueError):
+            limit = DEFAULT_RECALL_LIMIT
+
+        memories = []
+        if current_user and query:
+            start = time.perf_counter()
+            memories = await asyncio.to_thread(
+                memory_index.search, current_user.name, query, limit
+            )
+            logger.verbose(
+                f"recall_memory: {query!r} -> {len(memories)} memories "
+                f"in {(time.perf_counter() - start) * 1000:.1f} ms",
+                emoji="🧠",
+            )
+        elif not current_user:
+            logger.warning("recall_memory: No current user", emoji="🔧")
+
+        if not call_id:
+            return
+
+        output = {
+            "query": query,
+            "memories": [
+                {
+                    "memory": m["memory"],
+                    "category": m["category"],
+                    "date": m["date"][:10],
+                }
+                for m in memories
+            ],
+        }
+        await self.session._ws_send_json({
+            "type": "conversation.item.create",
+            "item": {
+                "type": "function_call_output",
+                "call_id": call_id,
+                "output": json.dumps(output),
+            },
+        })
+        await asyncio.sleep(0.1)
+
+        await self.session._ws_send_json({
+            "type": "conversation.item.create",
+            "item": {
+                "type": "message",
+                "role": "user",
+                "content": [
+                    {
+                        "type": "input_text",
+                        "text": "[System: Use the recalled memories to answer naturally. If none are relevant, say you don't remember.]",
+                    }
+                ],
+            },
+        })
+        self.session.state._triggered_new_response = True
+        await self.session._ws_send_json({"type": "response.create"})
+
     async def auto_identify_default_user(self):
         """Automatically identify the current user if set."""
         try:
@@ -136,12 +202,12 @@ class UserHandler:
             logger.info(
                 f"Auto-identify: CURRENT_USER='{current_user_env}', DEFAULT_USER='{default_user_env}', "
                 f"current={current_user.name if current_user else None}",
-                "👤",
+                emoji="👤",
             )
 
             if current_user_env and current_user_env.lower() == "guest":
                 if current_user:
-                    logger.info("Switching to guest mode", "👤")
+                    logger.info("Switching to guest mode", emoji="👤")
                     user_manager.clear_current_user()
                 return
 
@@ -150,12 +216,12 @@ class UserHandler:
                     not current_user
                     or current_user.name.lower() != user_to_identify.lower()
                 ):
-                    logger.info(f"Auto-loading user: {user_to_identify}", "👤")
+                    logger.info(f"Auto-loading user: {user_to_identify}", emoji="👤")
                     await self.load_user_profile_silently(user_to_identify)
                 else:
-                    logger.info(f"User already loaded: {current_user.name}", "👤")
+                    logger.info(f"User already loaded: {current_user.name}", emoji="👤")
         except Exception as e:
-            logger.warning(f"Failed to auto-identify: {e}", "⚠️")
+            logger.warning(f"Failed to auto-identify: {e}", emoji="⚠️")
 
     async def load_user_profile_silently(self, user_name: str):
         """Load a user profile without greeting."""
@@ -165,11 +231,11 @@ class UserHandler:
                 await self.save_current_user_to_env(profile.name)
                 await self.switch_to_user_persona(profile)
                 await self.update_session_with_user_context()
-                logger.info(f"Silently loaded profile: {profile.name}", "👤")
+                logger.info(f"Silently loaded profile: {profile.name}", emoji="👤")
             else:
-                logger.warning(f"Failed to load profile: {user_name}", "⚠️")
+                logger.warning(f"Failed to load profile: {user_name}", emoji="⚠️")
         except Exception as e:
-            logger.warning(f"Failed to load profile silently: {e}", "⚠️")
+            logger.warning(f"Failed to load profile silently: {e}", emoji="⚠️")
 
     async def send_user_greeting(self, profile, call_id: str | None = None):
         """Send a personalized greeting."""
@@ -207,9 +273,9 @@ class UserHandler:
             })
 
             await self.session._ws_send_json({"type": "response.create"})
-            logger.info(f"Greeting sent for {profile.name}", "👤")
+            logger.info(f"Greeting sent for {profile.name}", emoji="👤")
         except Exception as e:
-            logger.warning(f"Failed to send greeting: {e}", "⚠️")
+            logger.warning(f"Failed to send greeting: {e}", emoji="⚠️")
 
     async def save_current_user_to_env(self, user_name: str):
         """Save current user to .env file."""
@@ -219,7 +285,7 @@ class UserHandler:
             from ..config import ENV_PATH
 
             set_key(ENV_PATH, "CURRENT_USER", user_name.lower(), quote_mode="never")
-            logger.info(f"Saved to .env: {user_name}", "👤")
+            logger.info(f"Saved to .env: {user_name}", emoji="👤")
         except Exception as e:
             logger.warning(f"Failed to save to .env: {e}")
 
@@ -230,7 +296,7 @@ class UserHandler:
                 "preferred_persona", "default"
             )
             persona_manager.switch_persona(preferred_persona)
-            logger.info(f"Switched to persona: {preferred_persona}", "🎭")
+            logger.info(f"Switched to persona: {preferred_persona}", emoji="🎭")
         except Exception as e:
             logger.warning(f"Failed to switch persona: {e}")
 
@@ -247,7 +313,9 @@ class UserHandler:
                 "type": "session.update",
                 "session": {
                     "type": "realtime",
-                    "instructions": get_instructions_with_user_context(),
+                    "instructions": get_instructions_with_user_context(
+                        self.session.conversation_context()
+                    ),
                 },
             }
 
@@ -261,7 +329,7 @@ class UserHandler:
             await self.session._ws_send_json(session_update)
             logger.info(
                 f"Updated session with user context (persona={persona_manager.current_persona}, voice={session_voice})",
-                "👤",
+                emoji="👤",
             )
         except Exception as e:
             logger.warning(f"Failed to update session: {e}")
@@ -280,7 +348,7 @@ class UserHandler:
 
     async def _handle_user_denial(self, current_name: str):
         """Handle user saying they're not the current user."""
-        logger.info(f"User denies being {current_name}", "👤")
+        logger.info(f"User denies being {current_name}", emoji="👤")
         await self.session._ws_send_json({
             "type": "conversation.item.create",
             "item": {
@@ -299,7 +367,7 @@ class UserHandler:
 
     async def _fallback_to_guest(self):
         """Fall back to guest mode."""
-        logger.info("Falling back to guest mode", "👤")
+        logger.info("Falling back to guest mode", emoji="👤")
         user_manager.clear_current_user()
         await self.save_current_user_to_env("guest")
         self._waiting_for_name_after_denial = False
@@ -3,6 +3,7 @@ import contextlib
 import json
 import socket
 import time
+from collections import deque
 from typing import Any
 
 import websockets.exceptions
@@ -21,15 +22,22 @@ from .config import (
     TURN_EAGERNESS,
     is_conversation_state_enabled,
 )
+from .ha import warm_entity_cache as warm_ha_entity_cache
+from .http_client import close_session as close_http_session
 from .logger import logger
+from .metrics import WEBSOCKET_CONNECTS
 from .movements import stop_all_motors
 from .persona_manager import persona_manager
 from .profile_manager import user_manager
 from .realtime_ai_provider import voice_provider_registry
+from .tracing import turn_tracer
 
 
-def get_instructions_with_user_context():
-    """Generate instructions with current user context and persona if available."""
+def get_instructions_with_user_context(conversation: str = ""):
+    """Generate instructions with current user context and persona if available.
+
+    ``conversation`` is recent conversation text used to pick relevant memories.
+    """
     import os
 
     from dotenv import load_dotenv
@@ -52,6 +60,7 @@ def get_instructions_with_user_context():
         mode=mode,
         persona_name=persona_manager.current_persona,
         user_profile=current_user,
+        conversation=conversation,
     )
 
     return instruction_builder.build(context)
@@ -70,7 +79,7 @@ def get_tools_for_current_mode():
     current_user_env = os.getenv("CURRENT_USER", "").strip().strip("'\"")
 
     logger.info(
-        f"🔧 get_tools_for_current_mode: CURRENT_USER='{current_user_env}'", "🔧"
+        f"🔧 get_tools_for_current_mode: CURRENT_USER='{current_user_env}'", emoji="🔧"
     )
 
     if current_user_env and current_user_env.lower() == "guest":
@@ -87,6 +96,10 @@ def get_tools_for_current_mode():
     return tools
 
 
+# Id prefix of conversation items replayed into a new websocket on voice switch
+REPLAY_ITEM_PREFIX = "replay_"
+
+
 class BillySession:
     # SRES-02: Dead websocket detection threshold
     _DEAD_WS_THRESHOLD = 3
@@ -134,6 +147,10 @@ class BillySession:
         self._tool_args_buffer: dict[str, str] = {}
 
         self._logged_user_transcript_item_ids: set[str] = set()
+        # Recent user utterances, used to rank memories for the instructions
+        self._recent_user_transcripts: deque[str] = deque(maxlen=6)
+        # Recent (role, text) turns, replayed into a new socket on voice switch
+        self._conversation_turns: deque[tuple[str, str]] = deque(maxlen=12)
 
         # Initialize handlers
         from .session import (
@@ -189,11 +206,9 @@ class BillySession:
                 f"Timed out acquiring ws_lock for send; dropping payload "
                 f"(consecutive: {self._consecutive_send_timeouts}"
                 f"/{self._DEAD_WS_THRESHOLD})",
-                "⚠️",
+                emoji="⚠️",
             )
-            if (
-                self._consecutive_send_timeouts >= self._DEAD_WS_THRESHOLD
-            ):
+            if self._consecutive_send_timeouts >= self._DEAD_WS_THRESHOLD:
                 logger.error(
                     f"Dead websocket detected after "
                     f"{self._consecutive_send_timeouts} consecutive "
@@ -219,7 +234,7 @@ class BillySession:
             ws_to_close = self.ws
             logger.warning(
                 "Timed out acquiring ws_lock during close; forcing websocket close without lock",
-                "⚠️",
+                emoji="⚠️",
             )
 
         if not ws_to_close:
@@ -229,18 +244,37 @@ class BillySession:
             await asyncio.wait_for(ws_to_close.close(), timeout=max(0.5, timeout))
         except asyncio.TimeoutError:
             # Close timeout is common during teardown races; detach quietly.
-            logger.info("Websocket close timed out during shutdown; continuing.", "⏱️")
+            logger.info(
+                "Websocket close timed out during shutdown; continuing.", emoji="⏱️"
+            )
         except websockets.exceptions.ConnectionClosed:
             # Already closed by remote/local side.
             pass
         except Exception as e:
-            logger.warning(f"Error closing websocket ({type(e).__name__}): {e!r}", "⚠️")
+            logger.warning(
+                f"Error closing websocket ({type(e).__name__}): {e!r}", emoji="⚠️"
+            )
         finally:
             if self.ws is ws_to_close:
                 self.ws = None
             if lock_acquired:
                 self.ws_lock.release()
 
+    async def connect_provider(self, voice: str):
+        """Open a provider websocket configured for the current context."""
+        ws = await self.realtime_ai_provider.connect(
+            instructions=get_instructions_with_user_context(
+                self.conversation_context()
+            ),
+            tools=get_tools_for_current_mode(),
+            server_vad_params=SERVER_VAD_PARAMS[TURN_EAGERNESS],
+            interrupt_response=False,
+            text_only_mode=TEXT_ONLY_MODE,
+            voice=voice,
+        )
+        WEBSOCKET_CONNECTS.inc()
+        return ws
+
     # ---- Message type constants ----------------------------------------
     AUDIO_OUT_TYPES = {
         "response.output_audio",
@@ -262,6 +296,7 @@ class BillySession:
 
     # ---- Private handlers -----------------------------------------------
     def _on_response_created(self):
+        turn_tracer.mark("response_created")
         self.state.on_response_created()
         # Clear any buffered audio on OpenAI's side to prevent echo
         asyncio.create_task(self._clear_input_audio_buffer())
@@ -271,7 +306,7 @@ class BillySession:
         try:
             await self._ws_send_json({"type": "input_audio_buffer.clear"})
             if DEBUG_MODE:
-                logger.verbose("Cleared input audio buffer to prevent echo", "🧹")
+                logger.verbose("Cleared input audio buffer to prevent echo", emoji="🧹")
         except Exception as e:
             logger.warning(f"Failed to clear audio buffer: {e}")
 
@@ -279,6 +314,10 @@ class BillySession:
         self.state.on_input_speech_started()
 
     def _on_conversation_item_done(self, data: dict[str, Any]):
+        item_id = (data.get("item") or {}).get("id") or ""
+        if item_id.startswith(REPLAY_ITEM_PREFIX):
+            # Context replayed into a new socket, not a new user turn
+            return
         self.state.on_conversation_item_done(data)
         self._log_user_transcript_from_item(data)
 
@@ -302,7 +341,9 @@ class BillySession:
         if item_id and item_id in self._logged_user_transcript_item_ids:
             return
 
-        logger.info(f"User said: {transcript!r}", "🗣️")
+        logger.info(f"User said: {transcript!r}", emoji="🗣️")
+        self._recent_user_transcripts.append(transcript)
+        self._conversation_turns.append(("user", transcript))
         if item_id:
             self._logged_user_transcript_item_ids.add(item_id)
 
@@ -314,7 +355,9 @@ class BillySession:
             # Meaningful user reply received: clear follow-up retry counter.
             self.state.mark_user_turn_meaningful()
             if not item_id or item_id not in self._logged_user_transcript_item_ids:
-                logger.info(f"User said: {transcript!r}", "🗣️")
+                logger.info(f"User said: {transcript!r}", emoji="🗣️")
+                self._recent_user_transcripts.append(transcript)
+                self._conversation_turns.append(("user", transcript))
             if item_id:
                 self._logged_user_transcript_item_ids.add(item_id)
             return
@@ -322,11 +365,24 @@ class BillySession:
         if DEBUG_MODE:
             logger.verbose(
                 f"User transcription completed but empty (item_id={item_id!r})",
-                "ℹ️",
+                emoji="ℹ️",
             )
 
+    def conversation_context(self) -> str:
+        """Return the kickoff text and recent user utterances as one string."""
+        return " ".join(
+            filter(None, [self.kickoff_text, *self._recent_user_transcripts])
+        )
+
+    def recent_turns(self) -> list[tuple[str, str]]:
+        """Return recent ``(role, text)`` turns, oldest first."""
+        return list(self._conversation_turns)
+
     def _on_transcript_done(self, data: dict[str, Any]):
         self.state.on_transcript_done(data)
+        transcript = (data.get("transcript") or data.get("text") or "").strip()
+        if transcript:
+            self._conversation_turns.append(("assistant", transcript))
 
     def _on_audio_out(self, data: dict[str, Any]):
         self.audio_handler.on_audio_delta(data)
@@ -352,6 +408,9 @@ class BillySession:
         await self.function_handler.handle(name, raw_args, call_id)
 
     async def _on_response_done(self, data: dict[str, Any]):
+        # Audio for this response is complete; a drained queue is no underrun
+        audio.tts_streaming = False
+        turn_tracer.mark("response_done")
         if self.state._skip_post_response_once:
             response = data.get("response") or {}
             status_details = response.get("status_details") or {}
@@ -380,7 +439,7 @@ class BillySession:
                 self.last_activity[0] = time.time()
                 logger.info(
                     "Skipping post-response handling for client-cancelled interrupt; mic handoff already active.",
-                    "🔇",
+                    emoji="🔇",
                 )
                 return
 
@@ -394,13 +453,13 @@ class BillySession:
                 self.last_activity[0] = time.time()
                 logger.info(
                     "Skipping post-response handling for cancelled short/noise turn; staying in listening mode.",
-                    "🔇",
+                    emoji="🔇",
                 )
                 return
 
             logger.info(
                 "Skip flag was set, but assistant output was present; continuing normal post-response handling.",
-                "🔄",
+                emoji="🔄",
             )
             self.state._skip_post_response_once = False
 
@@ -414,7 +473,7 @@ class BillySession:
             mapped_code = "noapikey" if "invalid_api_key" in error_type else "error"
             await self.error_handler.play_error_sound(mapped_code, error_message)
             return
-        logger.success("Assistant response complete.", "✿")
+        logger.success("Assistant response complete.", emoji="✿")
 
         if not TEXT_ONLY_MODE:
             await self.audio_handler.wait_for_playback_complete()
@@ -423,6 +482,10 @@ class BillySession:
             self.audio_handler.signal_playback_done()
             self.last_activity[0] = time.time()
 
+        # Tool-only responses are followed by another response in the same turn
+        if self.state._turn_had_speech:
+            turn_tracer.finish_turn()
+
         # Only mark assistant turn complete after local playback has finished.
         self.state.on_response_done()
 
@@ -440,7 +503,7 @@ class BillySession:
                 heuristic_result = self.state.wants_follow_up_heuristic()
                 logger.verbose(
                     f"Using heuristic fallback: follow_up_expected={heuristic_result}",
-                    "🔍",
+                    emoji="🔍",
                 )
 
         # Kickoff follow-up switch
@@ -459,7 +522,7 @@ class BillySession:
                         if not opened:
                             logger.error(
                                 "Failed to reopen mic for kickoff follow-up. Ending session.",
-                                "❌",
+                                emoji="❌",
                             )
                             await self.stop_session()
                             return
@@ -474,11 +537,13 @@ class BillySession:
                 if DEBUG_MODE:
                     logger.info(
                         "Kickoff turn ended with no speech (tool-only). Waiting for next turn.",
-                        "ℹ️",
+                        emoji="ℹ️",
                     )
 
         if self.run_mode == "dory":
-            logger.info("Dory mode active. Ending session after single response.", "🎣")
+            logger.info(
+                "Dory mode active. Ending session after single response.", emoji="🎣"
+            )
             await self.stop_session()
             return
 
@@ -492,17 +557,22 @@ class BillySession:
             print(
                 f"📝 Transcript completed: \"{self.state.full_response_text.strip()}\""
             )
-        logger.verbose(f"Full response: {self.state.full_response_text.strip()}", "🧠")
+        logger.verbose(
+            f"Full response: {self.state.full_response_text.strip()}", emoji="🧠"
+        )
 
         # If a new response was triggered (greeting, HA command, etc), skip post-response handling
         if self.state._triggered_new_response:
-            logger.info("New response triggered, skipping post-response handling", "🔄")
+            logger.info(
+                "New response triggered, skipping post-response handling", emoji="🔄"
+            )
             return
 
         if not self.session_active.is_set():
             print()  # Add newline to end the mic volume display line
             logger.info(
-                "Session inactive after timeout or interruption. Not restarting.", "🚪"
+                "Session inactive after timeout or interruption. Not restarting.",
+                emoji="🚪",
             )
             self._set_idle_state()
             stop_all_motors()
@@ -514,7 +584,7 @@ class BillySession:
         if not self.state._turn_had_speech:
             logger.info(
                 "No assistant speech this turn; staying in listening mode.",
-                "🔇",
+                emoji="🔇",
             )
             self.state._saw_follow_up_call = False
             self.state.full_response_text = ""
@@ -524,7 +594,7 @@ class BillySession:
             if not opened:
                 logger.error(
                     "Failed to reopen mic after tool-only turn. Ending session.",
-                    "❌",
+                    emoji="❌",
                 )
                 self._set_idle_state()
                 stop_all_motors()
@@ -541,7 +611,7 @@ class BillySession:
             f" | qmark={asked_question}"
             f" | had_speech={self.state._turn_had_speech}"
             f" | saw_follow_up_call={self.state._saw_follow_up_call}",
-            "🧪",
+            emoji="🧪",
         )
 
         if self.autofollowup == "always":
@@ -562,14 +632,14 @@ class BillySession:
                         wants_follow_up = True
                         logger.info(
                             "conversation_state requested follow-up on low-confidence user turn; allowing one grace retry.",
-                            "🔁",
+                            emoji="🔁",
                         )
                     else:
                         wants_follow_up = False
                     if self.state.follow_up_expected and not wants_follow_up:
                         logger.info(
                             "Ignoring conversation_state follow-up on empty/noisy user turn.",
-                            "🔇",
+                            emoji="🔇",
                         )
             else:
                 wants_follow_up = asked_question
@@ -585,7 +655,7 @@ class BillySession:
                 if self.state.follow_up_retry_count >= FOLLOW_UP_RETRY_LIMIT:
                     logger.info(
                         f"Follow-up retry limit reached ({FOLLOW_UP_RETRY_LIMIT}). Ending session.",
-                        "🛑",
+                        emoji="🛑",
                     )
                     self.state._saw_follow_up_call = False
                     self.state.follow_up_retry_count = 0
@@ -599,13 +669,13 @@ class BillySession:
                 logger.info(
                     f"Follow-up expected after empty/noisy turn. Keeping session open "
                     f"(retry {self.state.follow_up_retry_count}/{FOLLOW_UP_RETRY_LIMIT}).",
-                    "🔁",
+                    emoji="🔁",
                 )
             else:
                 self.state.follow_up_retry_count = 0
                 logger.info(
                     "Follow-up expected after meaningful user input. Keeping session open.",
-                    "🔁",
+                    emoji="🔁",
                 )
             # Reset the flag after using it
             self.state._saw_follow_up_call = False
@@ -614,7 +684,7 @@ class BillySession:
             if not opened:
                 logger.error(
                     "Failed to reopen mic for follow-up window. Ending session.",
-                    "❌",
+                    emoji="❌",
                 )
                 self.state.follow_up_retry_count = 0
                 self._set_idle_state()
@@ -625,7 +695,7 @@ class BillySession:
             self.last_activity[0] = time.time()
             return
 
-        logger.info("No follow-up. Ending session.", "🛑")
+        logger.info("No follow-up. Ending session.", emoji="🛑")
         # Reset the flag after using it
         self.state._saw_follow_up_call = False
         self.state.follow_up_retry_count = 0
@@ -636,8 +706,15 @@ class BillySession:
 
     # ---- Mic helpers -------------------------------------------------
     async def start(self):
+        try:
+            await self._start()
+        finally:
+            # Pooled HTTP sessions are bound to this session's event loop.
+            await close_http_session()
+
+    async def _start(self):
         self.loop = asyncio.get_running_loop()
-        logger.info("Session starting...", "⏱️")
+        logger.info("Session starting...", emoji="⏱️")
 
         await self.persona_handler.reload_persona_from_profile()
 
@@ -664,7 +741,7 @@ class BillySession:
             f"session_active={self.session_active.is_set()}, "
             f"playback_done_event={'SET' if audio.playback_done_event.is_set() else 'CLEAR (waiting for wake-up)'}, "
             f"TEXT_ONLY_MODE={TEXT_ONLY_MODE}",
-            "🔧",
+            emoji="🔧",
         )
 
         async with self.ws_lock:
@@ -673,16 +750,9 @@ class BillySession:
                     persona_voice = persona_manager.get_current_persona_voice()
                     logger.info(
                         f"Using persona '{persona_manager.current_persona}' voice '{persona_voice}' for session startup",
-                        "🎭",
-                    )
-                    self.ws = await self.realtime_ai_provider.connect(
-                        instructions=get_instructions_with_user_context(),
-                        tools=get_tools_for_current_mode(),
-                        server_vad_params=SERVER_VAD_PARAMS[TURN_EAGERNESS],
-                        interrupt_response=False,
-                        text_only_mode=TEXT_ONLY_MODE,
-                        voice=persona_voice,
+                        emoji="🎭",
                     )
+                    self.ws = await self.connect_provider(persona_voice)
 
                     # Kickoff message (from MQTT say)
                     if self.kickoff_text:
@@ -753,43 +823,55 @@ class BillySession:
             "Mic stream active. Say something..."
             if not self.kickoff_text
             else "Announcing kickoff...",
-            "🎙️" if not self.kickoff_text else "📣",
+            emoji="🎙️" if not self.kickoff_text else "📣",
         )
         if self.kickoff_text:
             self._set_speaking_state()
 
         try:
             asyncio.create_task(self.user_handler.auto_identify_default_user())
+            asyncio.create_task(warm_ha_entity_cache())
 
-            # Start mic immediately for normal interactive sessions.
+            # Start mic immediately for normal interactive sessions, after any
+            # speech the wake word listener captured past the keyword.
             # Keep the session.updated fallback below in case startup races.
             if not self.kickoff_text:
-                self.mic_manager.start()
+                handed_off = await self.mic_manager.flush_wake_word_audio()
+                self.mic_manager.start(guard=not handed_off)
+
+            while True:
+                ws = self.ws
+                assert ws is not None
+                async for message in ws:
+                    if not self.session_active.is_set():
+                        print("🚪 Session marked as inactive, stopping stream loop.")
+                        print()  # Add newline to end the mic volume display line
+                        break
+                    data = json.loads(message)
+                    if DEBUG_MODE and (
+                        DEBUG_MODE_INCLUDE_DELTA
+                        or not (data.get("type") or "").endswith("delta")
+                    ):
+                        logger.verbose(f"Raw message: {data}", emoji="🔁")
+
+                    if data.get("type") in ("session.updated", "session_updated"):
+                        self.session_initialized = True
+                        # Fallback: start mic if it wasn't already started.
+                        if not self.kickoff_text and not self.mic_manager.mic_running:
+                            logger.info(
+                                "🎵 Session initialized with VAD settings, starting mic",
+                                emoji="✅",
+                            )
+                            self.mic_manager.start()
 
-            assert self.ws is not None
-            async for message in self.ws:
+                    await self.handle_message(data)
+
+                # A voice switch swaps in a new websocket, then closes this one
+                if self.ws is ws or self.ws is None:
+                    break
                 if not self.session_active.is_set():
-                    print("🚪 Session marked as inactive, stopping stream loop.")
-                    print()  # Add newline to end the mic volume display line
                     break
-                data = json.loads(message)
-                if DEBUG_MODE and (
-                    DEBUG_MODE_INCLUDE_DELTA
-                    or not (data.get("type") or "").endswith("delta")
-                ):
-                    logger.verbose(f"Raw message: {data}", "🔁")
-
-                if data.get("type") in ("session.updated", "session_updated"):
-                    self.session_initialized = True
-                    # Fallback: start mic if it wasn't already started.
-                    if not self.kickoff_text and not self.mic_manager.mic_running:
-                        logger.info(
-                            "🎵 Session initialized with VAD settings, starting mic",
-                            "✅",
-                        )
-                        self.mic_manager.start()
-
-                await self.handle_message(data)
+                logger.info("Continuing conversation on the new websocket", emoji="🔀")
 
         except Exception as e:
             logger.error(f"Error opening mic input: {e}")
@@ -798,7 +880,7 @@ class BillySession:
         finally:
             try:
                 self.mic_manager.stop()
-                logger.info("Mic stream closed.", "🎙️")
+                logger.info("Mic stream closed.", emoji="🎙️")
             except Exception as e:
                 logger.warning(f"Error while stopping mic: {e}")
 
@@ -815,7 +897,7 @@ class BillySession:
                 self.last_activity[0] = time.time()
                 logger.info(
                     "Cancelled response triggered by short audio turn; staying in listening mode.",
-                    "🔇",
+                    emoji="🔇",
                 )
                 return
             self._on_response_created()
@@ -832,6 +914,7 @@ class BillySession:
             self._on_audio_out(data)
             return
         if t == "input_audio_buffer.committed":
+            turn_tracer.start_turn()
             self.state.on_audio_committed(self.state._pending_input_audio_chunks)
             return
         if t == "conversation.item.done":
@@ -859,13 +942,13 @@ class BillySession:
             if code == "response_cancel_not_active":
                 logger.verbose(
                     "Ignoring non-fatal cancel race: no active response to cancel.",
-                    "ℹ️",
+                    emoji="ℹ️",
                 )
                 return
             if code == "conversation_already_has_active_response":
                 logger.verbose(
                     "Ignoring non-fatal race: response already in progress.",
-                    "ℹ️",
+                    emoji="ℹ️",
                 )
                 return
             mapped_code = "noapikey" if "invalid_api_key" in code else "error"
@@ -878,7 +961,7 @@ class BillySession:
         if self._stopping:
             return
         self._stopping = True
-        logger.info("Stopping session...", "🛑")
+        logger.info("Stopping session...", emoji="🛑")
 
         # Increment interaction count for current user at end of session
         if not self._interaction_count_recorded:
@@ -888,12 +971,13 @@ class BillySession:
         self.session_active.clear()
         self.mic_manager.stop()
         await self._close_ws()
+        turn_tracer.flush()
 
         # Give the message loop a moment to exit
         await asyncio.sleep(0.1)
 
     async def request_stop(self):
-        logger.info("Stop requested via external signal.", "🛑")
+        logger.info("Stop requested via external signal.", emoji="🛑")
         self.session_active.clear()
 
     async def interrupt_to_user_turn(self):
@@ -901,7 +985,7 @@ class BillySession:
         if not self.session_active.is_set():
             return
 
-        logger.info("Interrupting assistant turn and reopening mic...", "🛑")
+        logger.info("Interrupting assistant turn and reopening mic...", emoji="🛑")
         self.interrupt_event.clear()
         audio.stop_playback()
 
@@ -921,5 +1005,5 @@ class BillySession:
         if not opened:
             logger.warning(
                 "Mic reopen failed after startup race fallback; session may need restart.",
-                "⚠️",
+                emoji="⚠️",
             )
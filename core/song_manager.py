@@ -170,7 +170,7 @@ class SongManager:
         try:
             with open(metadata_file, 'w') as f:
                 config.write(f)
-            logger.info(f"Saved metadata for song: {song_name}", "🎵")
+            logger.info(f"Saved metadata for song: {song_name}", emoji="🎵")
             return True
         except Exception as e:
             logger.error(f"Failed to save metadata for {song_name}: {e}")
@@ -198,7 +198,7 @@ class SongManager:
 
         try:
             shutil.rmtree(song_path)
-            logger.info(f"Deleted song: {song_name}", "🗑️")
+            logger.info(f"Deleted song: {song_name}", emoji="🗑️")
             return True
         except Exception as e:
             logger.error(f"Failed to delete song {song_name}: {e}")
@@ -219,7 +219,7 @@ class SongManager:
         try:
             with open(audio_file, 'wb') as f:
                 f.write(file_data)
-            logger.info(f"Saved {file_type}.wav for song: {song_name}", "🎵")
+            logger.info(f"Saved {file_type}.wav for song: {song_name}", emoji="🎵")
             return True
         except Exception as e:
             logger.error(f"Failed to save {file_type}.wav for {song_name}: {e}")
@@ -277,7 +277,7 @@ class SongManager:
             shutil.copytree(example_path, custom_path)
             logger.info(
                 f"Copied example song '{example_name}' to custom_songs as '{new_name}'",
-                "📋",
+                emoji="📋",
             )
             return True
         except Exception as e:
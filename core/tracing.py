@@ -0,0 +1,249 @@
+"""
+Per-turn latency tracing for the Billy runtime.
+
+A turn starts when the provider commits the user's speech
+(``input_audio_buffer.committed``), or at ``response.created`` for turns with no
+user audio such as MQTT kickoffs. Each stage is stamped once, on first
+occurrence, as milliseconds since the start of the turn; tool calls are kept as
+``start``/``end`` spans. When playback has drained the turn is written as one
+JSON line to a size-rotated file under ``cache/`` and, optionally, published to
+MQTT. ``python -m core.tracing`` prints p50/p95 per stage over recorded turns.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from .config import (
+    CACHE_DIR,
+    TURN_TRACE_ENABLED,
+    TURN_TRACE_MAX_BYTES,
+    TURN_TRACE_MQTT,
+)
+from .logger import logger
+
+
+TRACE_PATH = os.path.join(CACHE_DIR, "turn_traces.jsonl")
+TRACE_BACKUPS = 3
+MQTT_TOPIC = "billy/trace/turn"
+
+# Stages in the order they normally happen within a turn
+STAGES = (
+    "speech_end",
+    "response_created",
+    "first_audio_delta",
+    "first_audible_sample",
+    "response_done",
+    "playback_drained",
+)
+
+
+class TurnTracer:
+    """Collects stage timestamps for the current turn and writes finished turns."""
+
+    def __init__(
+        self,
+        path: str = TRACE_PATH,
+        *,
+        enabled: bool = True,
+        max_bytes: int = 1_000_000,
+        publish_mqtt: bool = False,
+    ):
+        self.path = path
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.publish_mqtt = publish_mqtt
+        self._lock = threading.Lock()
+        self._turn: dict | None = None
+        self._started = 0.0
+        self._open_tools: dict[str, dict] = {}
+        self._sink: logging.Logger | None = None
+
+    # ---- Recording -------------------------------------------------------
+    def _offset_ms(self) -> float:
+        return round((time.perf_counter() - self._started) * 1000.0, 1)
+
+    def _begin(self, first_stage: str) -> None:
+        self._turn = {"ts": time.time(), "stages": {first_stage: 0.0}, "tools": []}
+        self._started = time.perf_counter()
+        self._open_tools = {}
+
+    def start_turn(self) -> None:
+        """Start a new turn at speech end, flushing any turn still open."""
+        if not self.enabled:
+            return
+        with self._lock:
+            finished = self._take()
+            self._begin("speech_end")
+        self._write(finished)
+
+    def mark(self, stage: str) -> None:
+        """Stamp ``stage`` for the current turn if it has not been seen yet."""
+        if not self.enabled:
+            return
+        with self._lock:
+            turn = self._turn
+            if turn is None:
+                if stage == "response_created":
+                    self._begin(stage)
+                return
+            if stage not in turn["stages"]:
+                turn["stages"][stage] = self._offset_ms()
+
+    def tool_start(self, name: str, call_id: str | None = None) -> None:
+        """Open a tool span."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._turn is None:
+                return
+            span = {"name": name, "start": self._offset_ms(), "end": None}
+            self._turn["tools"].append(span)
+            self._open_tools[call_id or name] = span
+
+    def tool_end(self, name: str, call_id: str | None = None) -> None:
+        """Close the tool span opened for ``call_id`` (or ``name``)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            span = self._open_tools.pop(call_id or name, None)
+            if span is not None:
+                span["end"] = self._offset_ms()
+
+    def finish_turn(self) -> None:
+        """Stamp playback drained and write the current turn."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._turn is not None:
+                self._turn["stages"].setdefault("playback_drained", self._offset_ms())
+            finished = self._take()
+        self._write(finished)
+
+    def flush(self) -> None:
+        """Write the current turn as-is, e.g. when the session ends mid-turn."""
+        with self._lock:
+            finished = self._take()
+        self._write(finished)
+
+    def _take(self) -> dict | None:
+        turn, self._turn = self._turn, None
+        self._open_tools = {}
+        return turn
+
+    # ---- Output ----------------------------------------------------------
+    def _get_sink(self) -> logging.Logger:
+        if self._sink is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            handler = RotatingFileHandler(
+                self.path,
+                maxBytes=self.max_bytes,
+                backupCount=TRACE_BACKUPS,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            sink = logging.getLogger(f"billy.turn_trace.{id(self)}")
+            sink.propagate = False
+            sink.setLevel(logging.INFO)
+            sink.addHandler(handler)
+            self._sink = sink
+        return self._sink
+
+    def _write(self, turn: dict | None) -> None:
+        if turn is None or "response_created" not in turn["stages"]:
+            # Nothing answered this turn (e.g. a cancelled short/noise turn)
+            return
+        line = json.dumps(turn, separators=(",", ":"))
+        try:
+            self._get_sink().info(line)
+        except OSError as e:
+            logger.warning(f"Could not write turn trace: {e}")
+        if self.publish_mqtt:
+            from .mqtt import mqtt_publish
+
+            mqtt_publish(MQTT_TOPIC, line, retain=False, retry=False)
+        logger.verbose("turn trace %s", turn["stages"], emoji="⏱️")
+
+
+# Global instance
+turn_tracer = TurnTracer(
+    enabled=TURN_TRACE_ENABLED,
+    max_bytes=TURN_TRACE_MAX_BYTES,
+    publish_mqtt=TURN_TRACE_MQTT,
+)
+
+
+# ---- Summary ---------------------------------------------------------------
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def read_traces(path: str = TRACE_PATH) -> list[dict]:
+    """Read turns from ``path`` and its rotated backups, oldest first."""
+    paths = [f"{path}.{i}" for i in range(TRACE_BACKUPS, 0, -1)] + [path]
+    turns = []
+    for candidate in paths:
+        if not os.path.exists(candidate):
+            continue
+        with open(candidate, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    turns.append(json.loads(line))
+                except ValueError:
+                    continue
+    return turns
+
+
+def summarize(turns: list[dict]) -> list[tuple[str, int, float, float]]:
+    """Return ``(stage, count, p50_ms, p95_ms)`` rows for stages and tools."""
+    samples: dict[str, list[float]] = {}
+    for turn in turns:
+        for stage, offset in (turn.get("stages") or {}).items():
+            samples.setdefault(stage, []).append(offset)
+        for span in turn.get("tools") or []:
+            if span.get("end") is not None:
+                samples.setdefault(f"tool:{span.get('name')}", []).append(
+                    span["end"] - span["start"]
+                )
+
+    order = {stage: i for i, stage in enumerate(STAGES)}
+    rows = []
+    for stage in sorted(samples, key=lambda s: (order.get(s, len(order)), s)):
+        values = samples[stage]
+        rows.append((
+            stage,
+            len(values),
+            _percentile(values, 50),
+            _percentile(values, 95),
+        ))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Summarize Billy turn traces (stage offsets from speech end)."
+    )
+    parser.add_argument("path", nargs="?", default=TRACE_PATH)
+    args = parser.parse_args(argv)
+
+    turns = read_traces(args.path)
+    if not turns:
+        print(f"No turn traces found at {args.path}")
+        return 1
+
+    print(f"{len(turns)} turns from {args.path}")
+    print(f"{'stage':<28}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}")
+    for stage, count, p50, p95 in summarize(turns):
+        print(f"{stage:<28}{count:>6}{p50:>10.1f}{p95:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,6 +13,7 @@ from concurrent.futures import CancelledError
 
 from . import audio, config
 from .logger import logger
+from .metrics import mark_press
 from .movements import move_head
 from .session_manager import BillySession
 
@@ -37,7 +38,9 @@ def _force_release_session_start_lock(reason: str):
     if _session_start_lock.locked():
         try:
             _session_start_lock.release()
-            logger.warning(f"Force-released session start lock ({reason})", "Broom")
+            logger.warning(
+                f"Force-released session start lock ({reason})", emoji="Broom"
+            )
         except RuntimeError:
             # Lock may have been released concurrently.
             pass
@@ -77,7 +80,7 @@ def trigger_session_start(source: str) -> None:
         if not is_active:
             logger.warning(
                 "Session start lock busy while inactive; attempting recovery",
-                "Fire",
+                emoji="Fire",
             )
             if session_thread and session_thread.is_alive():
                 interrupt_event.set()
@@ -93,13 +96,13 @@ def trigger_session_start(source: str) -> None:
                     except Exception as e:
                         logger.warning(
                             f"Stale-session stop during recovery failed: {e}",
-                            "Warning",
+                            emoji="Warning",
                         )
                 session_thread.join(timeout=1.0)
             if session_thread and session_thread.is_alive():
                 logger.warning(
                     "Session thread still alive during recovery; forcing stale cleanup",
-                    "Warning",
+                    emoji="Warning",
                 )
             # Always attempt to recover lock here; stale thread may linger but
             # should not block new triggers indefinitely.
@@ -107,17 +110,19 @@ def trigger_session_start(source: str) -> None:
             session_thread = None
             _force_release_session_start_lock("inactive stale lock recovery")
             if _session_start_lock.acquire(blocking=False):
-                logger.info("Recovered stale session lock; continuing start", "Check")
+                logger.info(
+                    "Recovered stale session lock; continuing start", emoji="Check"
+                )
             else:
                 logger.warning(
                     "Could not recover session lock yet, try again",
-                    "Warning",
+                    emoji="Warning",
                 )
                 return
         else:
             logger.warning(
                 "Session start already in progress, ignoring trigger",
-                "Warning",
+                emoji="Warning",
             )
             return
 
@@ -125,17 +130,30 @@ def trigger_session_start(source: str) -> None:
         # D-05/WAKE-04: Notify hotword controller before session mic opens
         from .hotword import controller as _hw
 
-        _hw.notify_session_state(True)
-        time.sleep(_MIC_HANDOFF_DELAY)
+        # If the user keeps talking after the wake word, keep the listener
+        # capturing until the session mic opens and skip the wake-up clip;
+        # the session sends the captured audio first.
+        hand_off = (
+            source == "wake_word"
+            and _hw.begin_handoff()
+            and _hw.wait_for_post_keyword_speech(
+                config.WAKE_WORD_HANDOFF_LISTEN_MS / 1000.0
+            )
+        )
+        if not hand_off:
+            _hw.notify_session_state(True)
+            time.sleep(_MIC_HANDOFF_DELAY)
 
         # Ensure previous session thread is fully finished before starting new
         if session_thread and session_thread.is_alive():
-            logger.warning("Previous session thread still running, waiting...", "Wait")
+            logger.warning(
+                "Previous session thread still running, waiting...", emoji="Wait"
+            )
             session_thread.join(timeout=2.0)
             if session_thread.is_alive():
                 logger.warning(
                     "Previous session thread did not finish, attempting forced stop",
-                    "Warning",
+                    emoji="Warning",
                 )
                 if session_instance and session_instance.loop:
                     with contextlib.suppress(Exception):
@@ -155,7 +173,7 @@ def trigger_session_start(source: str) -> None:
                     if not is_active:
                         logger.warning(
                             "Detaching stale inactive session thread and continuing",
-                            "Broom",
+                            emoji="Broom",
                         )
                         session_thread = None
                         session_instance = None
@@ -163,19 +181,25 @@ def trigger_session_start(source: str) -> None:
                         logger.error(
                             "Previous session thread did not finish,"
                             " aborting new session",
-                            "Error",
+                            emoji="Error",
                         )
                         _session_start_lock.release()
                         return
 
+        mark_press()
         audio.ensure_playback_worker_started(config.CHUNK_MS)
-        # Clear the playback done event so session waits for wake-up sound
-        audio.playback_done_event.clear()
-        # WAKE-06: Play wake-up sound for all trigger sources
-        threading.Thread(target=audio.play_random_wake_up_clip, daemon=True).start()
+        if hand_off:
+            # Nothing to wait for: the session mic opens as soon as it can
+            audio.playback_done_event.set()
+            logger.info("Speech after the wake word; skipping wake-up sound", emoji="🗣️")
+        else:
+            # Clear the playback done event so session waits for wake-up sound
+            audio.playback_done_event.clear()
+            # WAKE-06: Play wake-up sound for all trigger sources
+            threading.Thread(target=audio.play_random_wake_up_clip, daemon=True).start()
         is_active = True
         interrupt_event = threading.Event()  # Fresh event for each session
-        logger.info(f"Session triggered by {source}. Listening...", "Mic")
+        logger.info(f"Session triggered by {source}. Listening...", emoji="Mic")
 
         def run_session():
             global session_instance, is_active
@@ -202,7 +226,7 @@ def trigger_session_start(source: str) -> None:
                         logger.warning(
                             "Wake word stream did not reopen after session;"
                             " retrying...",
-                            "Warning",
+                            emoji="Warning",
                         )
                         time.sleep(0.5)
                         _hw.notify_session_state(False)  # Retry
@@ -212,10 +236,10 @@ def trigger_session_start(source: str) -> None:
                             logger.error(
                                 "Wake word stream failed to reopen after"
                                 " retry. Wake word disabled until restart.",
-                                "Error",
+                                emoji="Error",
                             )
 
-                logger.info("Waiting for trigger...", "Clock")
+                logger.info("Waiting for trigger...", emoji="Clock")
                 # Release lock when session finishes
                 with contextlib.suppress(Exception):
                     _session_start_lock.release()
@@ -238,7 +262,7 @@ def trigger_session_stop(source: str) -> None:
     """
     global is_active, session_thread, session_instance
 
-    logger.info(f"Stop triggered by {source} during active session.", "Stop")
+    logger.info(f"Stop triggered by {source} during active session.", emoji="Stop")
 
     # Try to hand turn back to user if assistant is speaking
     if (
@@ -247,7 +271,9 @@ def trigger_session_stop(source: str) -> None:
         and session_instance.is_assistant_turn()
     ):
         try:
-            logger.info("Assistant is speaking. Handing turn back to user...", "Mic")
+            logger.info(
+                "Assistant is speaking. Handing turn back to user...", emoji="Mic"
+            )
             future = asyncio.run_coroutine_threadsafe(
                 session_instance.interrupt_to_user_turn(),
                 session_instance.loop,
@@ -263,7 +289,7 @@ def trigger_session_stop(source: str) -> None:
 
     if session_instance:
         try:
-            logger.info("Stopping active session...", "Stop")
+            logger.info("Stopping active session...", emoji="Stop")
             with contextlib.suppress(CancelledError):
                 future = asyncio.run_coroutine_threadsafe(
                     session_instance.stop_session(), session_instance.loop
@@ -293,9 +319,11 @@ def trigger_session_stop(source: str) -> None:
             session_instance = None
             # Wait for session thread to finish to ensure mic is fully closed
             if session_thread and session_thread.is_alive():
-                logger.info("Waiting for session thread to finish...", "Wait")
+                logger.info("Waiting for session thread to finish...", emoji="Wait")
                 session_thread.join(timeout=2.0)
                 if session_thread.is_alive():
-                    logger.warning("Session thread did not finish in time", "Warning")
+                    logger.warning(
+                        "Session thread did not finish in time", emoji="Warning"
+                    )
                     _force_release_session_start_lock("session thread timeout")
     is_active = False
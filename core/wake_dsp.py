@@ -0,0 +1,368 @@
+"""
+Preallocated DSP helpers for the idle wake-word listener.
+
+The wake-word callback runs for every mic block whenever Billy is idle, so
+everything here works on buffers sized once when the stream opens: an
+integer-domain downmix, a streaming polyphase resampler to the keyword
+engine's rate, a frame assembler that hands out fixed-size frames, and the
+voice activity gate plus pre-roll ring that keep the keyword engine idle
+until something speech-like happens.
+"""
+
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from scipy.signal import firwin
+
+
+# Up-sampling factors up to this use strided per-phase groups (48k, 24k, 32k
+# mics); larger ones such as 44.1k -> 16k (160/441) use cached gather plans.
+_GROUPED_MAX_UP = 4
+
+
+class Downmixer:
+    """Average int16 channels into a float32 mono buffer."""
+
+    def __init__(self, channels: int, max_frames: int):
+        self.channels = max(1, int(channels))
+        self._scale = np.float32(1.0 / self.channels)
+        self._sum = np.zeros(max_frames, dtype=np.int32)
+        self._mono = np.zeros(max_frames, dtype=np.float32)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Return a float32 view of the mono mix of ``block`` (frames x channels)."""
+        frames = block.shape[0]
+        if frames > self._mono.shape[0]:
+            self._grow(frames)
+        mono = self._mono[:frames]
+        if self.channels == 1 or block.ndim == 1:
+            np.copyto(mono, block if block.ndim == 1 else block[:, 0], casting="unsafe")
+            return mono
+        # Sum channel by channel in int32: cheaper than a reduction over the
+        # short channel axis and exact for any int16 input.
+        summed = self._sum[:frames]
+        np.copyto(summed, block[:, 0])
+        for channel in range(1, block.shape[1]):
+            np.add(summed, block[:, channel], out=summed)
+        np.copyto(mono, summed, casting="unsafe")
+        np.multiply(mono, self._scale, out=mono)
+        return mono
+
+    def _grow(self, frames: int) -> None:
+        self._sum = np.zeros(frames, dtype=np.int32)
+        self._mono = np.zeros(frames, dtype=np.float32)
+
+
+def block_rms(samples: np.ndarray) -> float:
+    """RMS of a float32 block without a temporary squared copy."""
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.dot(samples, samples) / samples.size))
+
+
+class StreamingResampler:
+    """Rational-ratio polyphase FIR resampler that keeps filter state across blocks.
+
+    Unlike a per-block FFT resample there are no edge artefacts between blocks,
+    and all work buffers are preallocated for ``max_block`` input samples.
+    """
+
+    def __init__(
+        self,
+        in_rate: int,
+        out_rate: int,
+        max_block: int,
+        taps_per_cycle: int = 16,
+    ):
+        divisor = gcd(int(in_rate), int(out_rate))
+        self.up = int(out_rate) // divisor
+        self.down = int(in_rate) // divisor
+        self.passthrough = self.up == self.down
+        self._max_block = max_block
+
+        # Scale the filter with the decimation so the anti-alias skirt stays sharp
+        taps = -(-taps_per_cycle * max(self.up, self.down) // self.up)
+        if not self.passthrough:
+            prototype = firwin(
+                self.up * taps, 1.0 / max(self.up, self.down), window=("kaiser", 6.0)
+            ) * self.up
+            # phases[p, j] is tap p + (taps-1-j)*up, i.e. each phase pre-reversed
+            # so an output is a plain dot product with a window of the input.
+            self._phases = np.ascontiguousarray(
+                prototype.reshape(taps, self.up).T[:, ::-1], dtype=np.float32
+            )
+        self._taps = taps
+        self._history = taps - 1
+        self._work = np.zeros(self._history + max_block, dtype=np.float32)
+        self._out = np.zeros(self.max_output(max_block), dtype=np.float32)
+        self._scratch = np.zeros(self._out.shape[0], dtype=np.float32)
+        self._gathered = np.zeros((self._out.shape[0], taps), dtype=np.float32)
+        self._plans: dict[tuple[int, int], tuple[np.ndarray, np.ndarray]] = {}
+        self._pos = 0  # next output position, in 1/up input samples
+
+    def max_output(self, block: int) -> int:
+        """Upper bound on outputs produced for ``block`` input samples."""
+        return (block * self.up) // self.down + 1
+
+    def reset(self) -> None:
+        self._work.fill(0.0)
+        self._pos = 0
+
+    def _plan(self, pos: int, n_out: int) -> tuple[np.ndarray, np.ndarray]:
+        """Input window offsets and per-output taps for a block.
+
+        With a fixed block size ``pos`` cycles through a handful of values, so
+        plans are built once and then reused for every block.
+        """
+        key = (pos, n_out)
+        plan = self._plans.get(key)
+        if plan is None:
+            positions = pos + np.arange(n_out) * self.down
+            starts, phases = np.divmod(positions, self.up)
+            index = starts[:, None] + np.arange(self._taps)[None, :]
+            plan = (index.astype(np.intp), self._phases[phases])
+            if len(self._plans) >= 16:
+                self._plans.clear()
+            self._plans[key] = plan
+        return plan
+
+    def _filter_grouped(self, n_out: int, out: np.ndarray) -> None:
+        # Outputs r, r+up, r+2*up, ... share a filter phase and read input
+        # windows spaced ``down`` samples apart, so each group is one matvec
+        # over a strided view of the work buffer.
+        work = self._work
+        stride = work.strides[0]
+        for r in range(min(self.up, n_out)):
+            index, phase = divmod(self._pos + r * self.down, self.up)
+            group = -(-(n_out - r) // self.up)
+            windows = as_strided(
+                work[index:],
+                shape=(group, self._taps),
+                strides=(stride * self.down, stride),
+                writeable=False,
+            )
+            scratch = self._scratch[:group]
+            # einsum walks the strided view in place; np.dot would copy it
+            np.einsum("ij,j->i", windows, self._phases[phase], out=scratch)
+            out[r : r + (group - 1) * self.up + 1 : self.up] = scratch
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample a float32 block; returns a view valid until the next call."""
+        if self.passthrough:
+            return block
+        count = block.shape[0]
+        if count > self._max_block:
+            self._grow(count)
+
+        history = self._history
+        work = self._work
+        work[history : history + count] = block
+
+        span = count * self.up
+        n_out = 0 if self._pos >= span else -(-(span - self._pos) // self.down)
+        out = self._out[:n_out]
+        if self.up <= _GROUPED_MAX_UP:
+            self._filter_grouped(n_out, out)
+        else:
+            index, coeffs = self._plan(self._pos, n_out)
+            gathered = self._gathered[:n_out]
+            np.take(work, index, out=gathered, mode="clip")
+            np.einsum("ij,ij->i", gathered, coeffs, out=out)
+
+        self._pos += n_out * self.down - span
+        # Keep the last taps-1 inputs as history for the next block
+        work[:history] = work[count : count + history]
+        return out
+
+    def _grow(self, block: int) -> None:
+        self._max_block = block
+        work = np.zeros(self._history + block, dtype=np.float32)
+        work[: self._history] = self._work[: self._history]
+        self._work = work
+        self._out = np.zeros(self.max_output(block), dtype=np.float32)
+        self._scratch = np.zeros(self._out.shape[0], dtype=np.float32)
+        self._gathered = np.zeros((self._out.shape[0], self._taps), dtype=np.float32)
+        self._plans.clear()
+
+
+class FrameAssembler:
+    """Collect samples into fixed-length int16 frames for a keyword engine."""
+
+    def __init__(self, frame_length: int):
+        self.frame_length = int(frame_length)
+        self._frame = np.zeros(self.frame_length, dtype=np.int16)
+        self._fill = 0
+
+    def reset(self) -> None:
+        self._fill = 0
+
+    def push(self, samples: np.ndarray, on_frame) -> None:
+        """Append float32 samples; call ``on_frame(frame)`` for each full frame.
+
+        ``frame`` is reused between calls, so ``on_frame`` must not keep it.
+        """
+        offset = 0
+        total = samples.shape[0]
+        frame = self._frame
+        while offset < total:
+            take = min(self.frame_length - self._fill, total - offset)
+            target = frame[self._fill : self._fill + take]
+            np.clip(
+                samples[offset : offset + take],
+                -32768,
+                32767,
+                out=target,
+                casting="unsafe",
+            )
+            self._fill += take
+            offset += take
+            if self._fill == self.frame_length:
+                self._fill = 0
+                on_frame(frame)
+
+
+class VadGate:
+    """Energy and spectral-flux voice activity gate run on every idle block.
+
+    A block is active when its RMS is ``ratio`` times above the tracked noise
+    floor and its band spectrum changed since the previous block: speech onsets
+    and syllables do, while fans, hum and other steady noise mostly don't. The
+    gate opens on an active block and closes ``hold`` seconds after the last
+    one. The noise floor only adapts while the gate is closed.
+    """
+
+    def __init__(
+        self,
+        block_size: int,
+        block_time: float,
+        *,
+        ratio: float = 3.0,
+        flux: float = 0.3,
+        hold: float = 1.0,
+        min_level: float = 50.0,
+        bands: int = 12,
+    ):
+        self.ratio = ratio
+        self.flux_threshold = flux
+        self.min_level = min_level
+        self._hold_blocks = max(1, int(round(hold / block_time)))
+        # Largest power of two that fits the block, analysed with a Hann window
+        self._fft_size = 1 << max(6, int(block_size).bit_length() - 1)
+        self._window = np.hanning(self._fft_size).astype(np.float32)
+        self._windowed = np.zeros(self._fft_size, dtype=np.float32)
+        self._magnitude = np.zeros(self._fft_size // 2 + 1, dtype=np.float32)
+        # Log-spaced bands over the upper three quarters of the bins, skipping
+        # DC and the lowest bins where mains hum lives
+        bins = self._magnitude.shape[0]
+        edges = np.unique(
+            np.geomspace(max(2, bins // 64), bins, bands + 1).astype(np.intp)
+        )
+        self._edges = edges[:-1]
+        self._bands = np.zeros(self._edges.shape[0], dtype=np.float32)
+        self._previous = np.zeros_like(self._bands)
+        self._diff = np.zeros_like(self._bands)
+        self._primed = False
+        self.noise_floor: float | None = None
+        self.is_open = False
+        self.active = False  # whether the last block itself was speech-like
+        self.last_flux = 0.0
+        self._remaining = 0
+
+    def reset(self) -> None:
+        self._primed = False
+        self.noise_floor = None
+        self.is_open = False
+        self.active = False
+        self._remaining = 0
+
+    def spectral_flux(self, samples: np.ndarray) -> float:
+        """Mean positive change of log band energy against the previous block."""
+        size = self._fft_size
+        if samples.shape[0] < size:
+            return 0.0
+        np.multiply(samples[-size:], self._window, out=self._windowed)
+        np.abs(np.fft.rfft(self._windowed), out=self._magnitude)
+        bands = self._bands
+        np.add.reduceat(self._magnitude, self._edges, out=bands)
+        np.log1p(bands, out=bands)
+        if not self._primed:
+            self._primed = True
+            self._previous[:] = bands
+            return 0.0
+        diff = self._diff
+        np.subtract(bands, self._previous, out=diff)
+        np.maximum(diff, 0.0, out=diff)
+        self._previous[:] = bands
+        return float(diff.sum()) / diff.shape[0]
+
+    def process(self, samples: np.ndarray, rms: float) -> bool:
+        """Feed one mono block and its RMS; returns whether the gate is open."""
+        flux = self.spectral_flux(samples)
+        self.last_flux = flux
+        floor = self.noise_floor
+        if floor is None:
+            floor = self.noise_floor = max(rms, self.min_level)
+
+        active = rms >= floor * self.ratio and flux >= self.flux_threshold
+        self.active = active
+        if active:
+            self.is_open = True
+            self._remaining = self._hold_blocks
+        elif self.is_open:
+            self._remaining -= 1
+            if self._remaining <= 0:
+                self.is_open = False
+
+        if not self.is_open:
+            # Follow drops quickly and rises slowly so speech can't raise it
+            rate = 0.2 if rms < floor else 0.02
+            self.noise_floor = max(floor + (rms - floor) * rate, self.min_level)
+        return self.is_open
+
+
+class PreRollBuffer:
+    """Ring buffer of the most recent int16 samples."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._buffer = np.zeros(self.capacity, dtype=np.int16)
+        self._write = 0
+        self._filled = 0
+
+    def reset(self) -> None:
+        self._write = 0
+        self._filled = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append float32 or int16 samples, overwriting the oldest ones."""
+        total = samples.shape[0]
+        if total >= self.capacity:
+            samples = samples[total - self.capacity :]
+            total = self.capacity
+        buffer = self._buffer
+        first = min(total, self.capacity - self._write)
+        np.clip(
+            samples[:first],
+            -32768,
+            32767,
+            out=buffer[self._write : self._write + first],
+            casting="unsafe",
+        )
+        if first < total:
+            np.clip(samples[first:], -32768, 32767, out=buffer[: total - first], casting="unsafe")
+        self._write = (self._write + total) % self.capacity
+        self._filled = min(self._filled + total, self.capacity)
+
+    def latest(self, out: np.ndarray) -> int:
+        """Copy the newest samples into the end of ``out``; returns how many."""
+        count = min(out.shape[0], self._filled)
+        if count == 0:
+            return 0
+        start = (self._write - count) % self.capacity
+        first = min(count, self.capacity - start)
+        target = out[out.shape[0] - count :]
+        target[:first] = self._buffer[start : start + first]
+        if first < count:
+            target[first:] = self._buffer[: count - first]
+        return count
@@ -0,0 +1,261 @@
+"""
+Keyword-spotting engines behind the wake-word listener.
+
+Every engine consumes fixed-size int16 frames at its own sample rate and
+returns one score in ``[0, 1]`` per loaded keyword; a keyword counts as
+detected when its score reaches ``engine.threshold``. Porcupine needs the
+``pvporcupine`` package and a Picovoice access key. The openWakeWord backend
+runs the ONNX/tflite models in ``wake-word-models/`` on the CPU through the
+``openwakeword`` package, offline and without a key.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+
+from .config import ROOT_DIR
+
+
+try:  # Optional dependency for Porcupine support
+    import pvporcupine
+
+    _PORCUPINE_AVAILABLE = True
+except Exception:
+    pvporcupine = None
+    _PORCUPINE_AVAILABLE = False
+
+try:  # Optional dependency for openWakeWord support
+    from openwakeword.model import Model as _OpenWakeWordModel
+
+    _OPENWAKEWORD_AVAILABLE = True
+except Exception:
+    _OpenWakeWordModel = None
+    _OPENWAKEWORD_AVAILABLE = False
+
+
+WAKE_WORD_MODELS_DIR = os.path.join(ROOT_DIR, "wake-word-models")
+DEFAULT_OPENWAKEWORD_MODELS = os.path.join(WAKE_WORD_MODELS_DIR, "billy_en")
+PORCUPINE_SUFFIXES = (".ppn",)
+OPENWAKEWORD_SUFFIXES = (".onnx", ".tflite")
+
+
+class WakeWordEngine(ABC):
+    """A keyword spotter fed with fixed-length int16 frames."""
+
+    name = ""
+    sample_rate = 16000
+    frame_length = 0
+
+    def __init__(self, keywords: list[str], threshold: float):
+        self.keywords = keywords
+        self.threshold = threshold
+        self._scores = np.zeros(len(keywords), dtype=np.float32)
+
+    @abstractmethod
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """Score one frame; returns a per-keyword array reused between calls."""
+
+    def process_batch(self, frames: np.ndarray) -> np.ndarray:
+        """Score consecutive frames (``n x frame_length``); returns per-keyword max."""
+        best = np.zeros(len(self.keywords), dtype=np.float32)
+        for frame in frames:
+            np.maximum(best, self.process(frame), out=best)
+        return best
+
+    def set_sensitivity(self, sensitivity: float) -> bool:
+        """Apply a new sensitivity; returns False if the engine must be rebuilt."""
+        return False
+
+    def reset(self) -> None:
+        """Forget any streaming state, e.g. after the listener was paused."""
+
+    def close(self) -> None:
+        """Release native resources."""
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "sample_rate": self.sample_rate,
+            "frame_length": self.frame_length,
+            "keywords": list(self.keywords),
+            "threshold": self.threshold,
+        }
+
+
+class PorcupineEngine(WakeWordEngine):
+    """Picovoice Porcupine; scores are 1.0 for the detected keyword, else 0."""
+
+    name = "porcupine"
+
+    def __init__(self, keyword_paths: list[str], access_key: str, sensitivity: float):
+        if not _PORCUPINE_AVAILABLE or pvporcupine is None:
+            raise RuntimeError(
+                "Porcupine engine requested but the pvporcupine package is not installed"
+            )
+        if not keyword_paths:
+            raise RuntimeError(
+                "WAKE_WORD_ENDPOINT must point to a Porcupine keyword (.ppn) file"
+            )
+        for path in keyword_paths:
+            if not os.path.exists(path):
+                raise RuntimeError(f"Porcupine keyword not found: {path}")
+        if not access_key:
+            raise RuntimeError("WAKE_WORD_PORCUPINE_ACCESS_KEY must be set for Porcupine")
+        try:
+            self._porcupine = pvporcupine.create(
+                access_key=access_key,
+                keyword_paths=keyword_paths,
+                sensitivities=[sensitivity] * len(keyword_paths),
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeError(f"Failed to load Porcupine keyword: {exc}") from exc
+        self.sample_rate = self._porcupine.sample_rate
+        self.frame_length = self._porcupine.frame_length
+        super().__init__([Path(p).stem for p in keyword_paths], threshold=0.5)
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        scores = self._scores
+        scores.fill(0.0)
+        result = self._porcupine.process(frame)
+        if result >= 0:
+            scores[result] = 1.0
+        return scores
+
+    def close(self) -> None:
+        try:
+            self._porcupine.delete()
+        except Exception:
+            pass
+
+
+class OpenWakeWordEngine(WakeWordEngine):
+    """openWakeWord ONNX/tflite models running on the CPU."""
+
+    name = "openwakeword"
+    frame_length = 1280  # 80 ms at 16 kHz
+
+    def __init__(self, model_paths: list[str], sensitivity: float):
+        if not _OPENWAKEWORD_AVAILABLE or _OpenWakeWordModel is None:
+            raise RuntimeError(
+                "openWakeWord engine requested but the openwakeword package is not "
+                "installed"
+            )
+        if not model_paths:
+            raise RuntimeError(
+                "No openWakeWord models (.onnx/.tflite) found in "
+                f"{DEFAULT_OPENWAKEWORD_MODELS}"
+            )
+        for path in model_paths:
+            if not os.path.exists(path):
+                raise RuntimeError(f"openWakeWord model not found: {path}")
+        framework = "onnx" if model_paths[0].endswith(".onnx") else "tflite"
+        try:
+            self._model = _OpenWakeWordModel(
+                wakeword_models=model_paths, inference_framework=framework
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeError(
+                f"Failed to load openWakeWord models: {exc}. The shared feature "
+                "models can be fetched once with "
+                "openwakeword.utils.download_models()"
+            ) from exc
+        self._labels = list(self._model.models.keys())
+        super().__init__(self._labels, self._threshold_for(sensitivity))
+
+    @staticmethod
+    def _threshold_for(sensitivity: float) -> float:
+        # Sensitivity 0.5 maps to openWakeWord's recommended 0.5 score threshold
+        return min(max(1.0 - sensitivity, 0.1), 0.9)
+
+    def _fill(self, predictions: dict) -> np.ndarray:
+        scores = self._scores
+        for i, label in enumerate(self._labels):
+            scores[i] = predictions.get(label, 0.0)
+        return scores
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        return self._fill(self._model.predict(frame))
+
+    def process_batch(self, frames: np.ndarray) -> np.ndarray:
+        # openWakeWord computes features for the whole buffer in one pass and
+        # returns the max score over its 80 ms steps.
+        return self._fill(self._model.predict(frames.reshape(-1))).copy()
+
+    def set_sensitivity(self, sensitivity: float) -> bool:
+        self.threshold = self._threshold_for(sensitivity)
+        return True
+
+    def reset(self) -> None:
+        self._model.reset()
+
+
+def available_engines() -> dict[str, bool]:
+    """Which engine backends can be imported on this system."""
+    return {
+        PorcupineEngine.name: _PORCUPINE_AVAILABLE,
+        OpenWakeWordEngine.name: _OPENWAKEWORD_AVAILABLE,
+    }
+
+
+def find_models(
+    endpoint: str, suffixes: tuple[str, ...], default: str = WAKE_WORD_MODELS_DIR
+) -> list[str]:
+    """Model files named by ``endpoint`` (comma-separated files or directories).
+
+    An empty endpoint searches ``default``. A model present as both .onnx and
+    .tflite is only returned once, preferring ONNX.
+    """
+    entries = [e.strip() for e in (endpoint or "").split(",") if e.strip()]
+    if not entries:
+        entries = [default]
+
+    found: list[str] = []
+    for entry in entries:
+        path = Path(entry)
+        if path.is_dir():
+            found.extend(
+                str(p) for p in sorted(path.rglob("*")) if p.suffix in suffixes
+            )
+        elif path.suffix in suffixes:
+            found.append(str(path))
+
+    by_stem: dict[str, str] = {}
+    for model in found:
+        stem = str(Path(model).with_suffix(""))
+        if stem not in by_stem or model.endswith(suffixes[0]):
+            by_stem[stem] = model
+    models = list(by_stem.values())
+    # openWakeWord loads every model with one framework
+    if suffixes == OPENWAKEWORD_SUFFIXES and any(m.endswith(".onnx") for m in models):
+        models = [m for m in models if m.endswith(".onnx")]
+    return models
+
+
+def create_engine(
+    engine: str, endpoint: str, access_key: str, sensitivity: float
+) -> WakeWordEngine:
+    """Build the configured engine; ``auto`` prefers Porcupine when it can run."""
+    engine = (engine or "auto").strip().lower()
+    access_key = (access_key or "").strip()
+
+    if engine == "auto":
+        porcupine_ready = (
+            _PORCUPINE_AVAILABLE
+            and access_key
+            and find_models(endpoint, PORCUPINE_SUFFIXES)
+        )
+        engine = PorcupineEngine.name if porcupine_ready else OpenWakeWordEngine.name
+
+    if engine == PorcupineEngine.name:
+        return PorcupineEngine(
+            find_models(endpoint, PORCUPINE_SUFFIXES), access_key, sensitivity
+        )
+    if engine == OpenWakeWordEngine.name:
+        # A .ppn endpoint left over from Porcupine means "use the bundled model"
+        models = find_models(
+            endpoint, OPENWAKEWORD_SUFFIXES, DEFAULT_OPENWAKEWORD_MODELS
+        ) or find_models("", OPENWAKEWORD_SUFFIXES, DEFAULT_OPENWAKEWORD_MODELS)
+        return OpenWakeWordEngine(models, sensitivity)
+    raise RuntimeError(f"Unknown wake word engine: {engine}")
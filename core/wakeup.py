@@ -1,10 +1,13 @@
 import asyncio
+import hashlib
+import json
 import os
 import re
+import shutil
 import wave
-from typing import Optional
+from typing import Callable, Optional
 
-from .config import CUSTOM_INSTRUCTIONS
+from .config import CACHE_DIR, CUSTOM_INSTRUCTIONS
 from .realtime_ai_provider import voice_provider_registry
 
 
@@ -13,6 +16,13 @@ WAKEUP_DIR = os.path.abspath(
 )
 os.makedirs(WAKEUP_DIR, exist_ok=True)
 
+# Generated clips by content address (see ``clip_cache_key``)
+CLIP_CACHE_DIR = os.path.join(CACHE_DIR, "wakeup-clips")
+os.makedirs(CLIP_CACHE_DIR, exist_ok=True)
+
+# Upper bound on the provider's time per clip before a batch is abandoned
+CLIP_TIMEOUT_SECONDS = 30
+
 
 def get_persona_wakeup_dir(persona_name: str) -> str:
     """Get the wake-up directory for a specific persona."""
@@ -24,6 +34,23 @@ def get_persona_wakeup_dir(persona_name: str) -> str:
     return wakeup_dir
 
 
+def find_wakeup_clip(index: int, persona_name: Optional[str]) -> Optional[str]:
+    """Path of wake-up clip ``index`` for a persona, or None if it is missing.
+
+    Personas other than ``default`` use their own ``wakeup/`` folder and fall
+    back to the custom clips.
+    """
+    if persona_name and persona_name != "default":
+        persona_dir = os.path.join(os.path.dirname(__file__), "..", "personas")
+        path = os.path.abspath(
+            os.path.join(persona_dir, persona_name, "wakeup", f"{index}.wav")
+        )
+        if os.path.exists(path):
+            return path
+    path = os.path.join(WAKEUP_DIR, f"{index}.wav")
+    return path if os.path.exists(path) else None
+
+
 def slugify(text: str) -> str:
     return re.sub(r"[^a-zA-Z0-9_-]+", "_", text).strip("_").lower()
 
@@ -32,6 +59,13 @@ def get_wakeup_path(phrase: str) -> str:
     return os.path.join(WAKEUP_DIR, f"{slugify(phrase)}.wav")
 
 
+def clip_cache_key(provider: str, voice: str, instructions: str, text: str) -> str:
+    """Content address of a generated clip."""
+    instructions_hash = hashlib.sha256(instructions.encode("utf-8")).hexdigest()
+    key = json.dumps([provider, voice, instructions_hash, text], ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
 class WakeupClipGenerator:
     def __init__(self, *, voice: Optional[str] = None, persona_name: str = "default"):
         self.persona_name = persona_name
@@ -47,20 +81,15 @@ class WakeupClipGenerator:
             except Exception:
                 self.voice = "ballad"  # Default voice
 
-    async def generate(self, prompt: str, index: int) -> str:
+    def _clip_path(self, index: int) -> str:
         # Use appropriate directory based on persona
         if self.persona_name == "default":
             # For default persona, use the custom directory
-            path = os.path.join(WAKEUP_DIR, f"{index}.wav")
-        else:
-            # For other personas, use persona-specific directory
-            persona_wakeup_dir = get_persona_wakeup_dir(self.persona_name)
-            path = os.path.join(persona_wakeup_dir, f"{index}.wav")
-
-        provider = voice_provider_registry.get_provider()
-
-        print(f"🔊 Generating wakeup clip for: {prompt} → {index}")
+            return os.path.join(WAKEUP_DIR, f"{index}.wav")
+        # For other personas, use persona-specific directory
+        return os.path.join(get_persona_wakeup_dir(self.persona_name), f"{index}.wav")
 
+    def _instructions(self) -> str:
         # Get current persona instructions
         try:
             from .persona_manager import persona_manager
@@ -71,25 +100,93 @@ class WakeupClipGenerator:
         except Exception:
             persona_instructions = CUSTOM_INSTRUCTIONS
 
-        instructions = (
+        return (
             "IMPORTANT: Always respond by speaking the exact user text out loud. Do not add, change or rephrase anything!\n\n"
             + persona_instructions
         )
 
-        audio_bytes = await provider.generate_audio_clip(
-            prompt=prompt,
-            voice=self.voice,
-            instructions=instructions,
-        )
+    async def generate(self, prompt: str, index: int) -> str:
+        paths = await self.generate_batch([(index, prompt)])
+        return paths[index]
+
+    async def generate_batch(
+        self,
+        clips: list[tuple[int, str]],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> dict[int, str]:
+        """Write clip ``index`` for each ``(index, prompt)``; returns the paths.
+
+        Clips are looked up in ``CLIP_CACHE_DIR`` by (provider, voice,
+        instructions, text) first, so a phrase already generated for any
+        persona with the same voice and instructions is copied instead of
+        generated again. The rest go to the provider in one batch.
+        ``on_progress(done, total)`` follows each clip.
+        """
+        provider = voice_provider_registry.get_provider()
+        provider_name = provider.get_provider_name()
+        instructions = self._instructions()
+        paths = {index: self._clip_path(index) for index, _ in clips}
+        total = len(clips)
+        done = 0
+
+        def finished(count: int = 1) -> None:
+            nonlocal done
+            done += count
+            if on_progress:
+                on_progress(done, total)
+
+        # Prompt -> indices; a phrase repeated in the batch is generated once
+        pending: dict[str, list[int]] = {}
+        for index, prompt in clips:
+            key = clip_cache_key(provider_name, self.voice, instructions, prompt)
+            cached = os.path.join(CLIP_CACHE_DIR, f"{key}.wav")
+            if os.path.exists(cached):
+                print(f"♻️ Reusing cached wakeup clip for: {prompt} → {index}")
+                shutil.copyfile(cached, paths[index])
+                finished()
+            else:
+                pending.setdefault(prompt, []).append(index)
+
+        if pending:
+            prompts = list(pending)
+            print(f"🔊 Generating {len(prompts)} wakeup clip(s) with {provider_name}")
+
+            def store(i: int, audio_bytes: bytes) -> None:
+                prompt = prompts[i]
+                key = clip_cache_key(provider_name, self.voice, instructions, prompt)
+                cached = os.path.join(CLIP_CACHE_DIR, f"{key}.wav")
+                _write_wav(cached, audio_bytes)
+                for index in pending[prompt]:
+                    shutil.copyfile(cached, paths[index])
+                    print(f"✅ Saved wakeup clip: {paths[index]}")
+                finished(len(pending[prompt]))
+
+            await asyncio.wait_for(
+                provider.generate_audio_clips(
+                    prompts,
+                    voice=self.voice,
+                    instructions=instructions,
+                    on_clip=store,
+                ),
+                CLIP_TIMEOUT_SECONDS * len(prompts),
+            )
+
+        # Overwriting a clip leaves the folder mtime alone; bump it so cached
+        # persona bundles in the Billy process reload their clip bank.
+        for folder in {os.path.dirname(path) for path in paths.values()}:
+            os.utime(folder)
+        return paths
 
-        with wave.open(path, "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(24000)
-            wf.writeframes(audio_bytes)
 
-        print(f"✅ Saved wakeup clip: {path}")
-        return path
+def _write_wav(path: str, audio_bytes: bytes) -> None:
+    # Written aside and renamed, so a cache hit never sees half a file
+    partial = f"{path}.partial"
+    with wave.open(partial, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(24000)
+        wf.writeframes(audio_bytes)
+    os.replace(partial, path)
 
 
 def generate_wake_clip_async(prompt, index, persona_name="default"):
@@ -98,3 +195,13 @@ def generate_wake_clip_async(prompt, index, persona_name="default"):
         return await gen.generate(prompt, index)
 
     return asyncio.run(_run())
+
+
+def generate_wake_clips(clips, persona_name="default", on_progress=None):
+    """Blocking batch version of ``generate_wake_clip_async``."""
+
+    async def _run():
+        gen = WakeupClipGenerator(persona_name=persona_name)
+        return await gen.generate_batch(clips, on_progress)
+
+    return asyncio.run(_run())
@@ -5,12 +5,13 @@ from __future__ import annotations
 import asyncio
 from typing import Any
 
-import aiohttp
-
 from .config import WEATHER_LATITUDE, WEATHER_LONGITUDE, WEATHER_LOCATION_NAME
+from .http_client import get_session
+from .weather_cache import build_forecast_params, weather_cache
 
 
 OPEN_METEO_ENDPOINT = "https://api.open-meteo.com/v1/forecast"
+WEATHER_TIMEZONE = "auto"
 
 
 def weather_configured() -> bool:
@@ -26,14 +27,16 @@ async def fetch_current_weather() -> str:
             "WEATHER_LONGITUDE in your .env file."
         )
 
-    params = {
-        "latitude": WEATHER_LATITUDE,
-        "longitude": WEATHER_LONGITUDE,
-        "current_weather": "true",
-        "hourly": "temperature_2m,relative_humidity_2m,apparent_temperature",
-    }
+    try:
+        latitude = float(WEATHER_LATITUDE)
+        longitude = float(WEATHER_LONGITUDE)
+    except (TypeError, ValueError):
+        return "WEATHER_LATITUDE and WEATHER_LONGITUDE must be numbers."
 
-    async with aiohttp.ClientSession() as session:
+    payload = weather_cache.get_forecast(latitude, longitude, WEATHER_TIMEZONE)
+    if payload is None:
+        params = build_forecast_params(latitude, longitude, WEATHER_TIMEZONE)
+        session = get_session()
         try:
             async with session.get(OPEN_METEO_ENDPOINT, params=params) as resp:
                 if resp.status != 200:
@@ -46,12 +49,13 @@ async def fetch_current_weather() -> str:
             raise
         except Exception as exc:  # pragma: no cover - network failure path
             return f"Weather service request failed: {exc}"
+        weather_cache.store_forecast(latitude, longitude, WEATHER_TIMEZONE, payload)
 
-    current = payload.get("current_weather") or {}
-    temperature = current.get("temperature")
-    windspeed = current.get("windspeed")
-    winddirection = current.get("winddirection")
-    weather_code = current.get("weathercode")
+    current = payload.get("current") or {}
+    temperature = current.get("temperature_2m")
+    windspeed = current.get("wind_speed_10m")
+    winddirection = current.get("wind_direction_10m")
+    weather_code = current.get("weather_code")
 
     location = WEATHER_LOCATION_NAME or "your area"
 
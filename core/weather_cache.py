@@ -0,0 +1,172 @@
+"""Shared cache for Open-Meteo geocoding and forecast lookups.
+
+Geocoding results are persisted to disk because a place name always resolves
+to the same coordinates. Forecasts are kept in memory, keyed by rounded
+coordinates and timezone, and expire at the next boundary of the forecast's
+update cadence (hourly unless the payload reports its own interval).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .config import CACHE_DIR
+from .logger import logger
+
+
+GEOCODE_CACHE_PATH = Path(CACHE_DIR) / "weather_geocode.json"
+
+# Rounding to two decimals (~1 km) keeps nearby lookups on the same grid cell.
+COORDINATE_PRECISION = 2
+DEFAULT_FORECAST_INTERVAL_SECONDS = 3600
+
+FORECAST_CURRENT_FIELDS = [
+    "temperature_2m",
+    "apparent_temperature",
+    "relative_humidity_2m",
+    "wind_speed_10m",
+    "wind_direction_10m",
+    "weather_code",
+]
+FORECAST_DAILY_FIELDS = [
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "precipitation_probability_max",
+]
+
+
+def build_forecast_params(
+    latitude: float, longitude: float, timezone: str = "auto"
+) -> dict[str, Any]:
+    """Return the canonical forecast query shared by every weather consumer."""
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current": ",".join(FORECAST_CURRENT_FIELDS),
+        "daily": ",".join(FORECAST_DAILY_FIELDS),
+        "timezone": timezone or "auto",
+        "forecast_days": 1,
+    }
+
+
+class WeatherCache:
+    """Thread-safe geocode and forecast cache used by weather and news digests."""
+
+    def __init__(self, geocode_path: Path = GEOCODE_CACHE_PATH):
+        self.geocode_path = geocode_path
+        self._lock = threading.Lock()
+        self._geocodes: dict[str, dict[str, Any]] | None = None
+        self._forecasts: dict[tuple[float, float, str], tuple[float, dict]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ---- Geocoding -------------------------------------------------------
+    @staticmethod
+    def _geocode_key(name: str, language: str) -> str:
+        return f"{(language or 'en').strip().lower()}:{' '.join(name.lower().split())}"
+
+    def _ensure_geocodes_loaded(self) -> dict[str, dict[str, Any]]:
+        if self._geocodes is None:
+            try:
+                payload = json.loads(self.geocode_path.read_text(encoding="utf-8"))
+                self._geocodes = payload if isinstance(payload, dict) else {}
+            except FileNotFoundError:
+                self._geocodes = {}
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable geocode cache: {e}")
+                self._geocodes = {}
+        return self._geocodes
+
+    def get_geocode(self, name: str, language: str = "en") -> dict[str, Any] | None:
+        """Return a cached geocoding result for ``name`` or None."""
+        key = self._geocode_key(name, language)
+        with self._lock:
+            place = self._ensure_geocodes_loaded().get(key)
+            if place is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(place)
+
+    def store_geocode(self, name: str, language: str, place: dict[str, Any]) -> None:
+        """Remember a geocoding result and persist the cache to disk."""
+        key = self._geocode_key(name, language)
+        entry = {
+            field: place.get(field)
+            for field in ("name", "admin1", "country", "latitude", "longitude")
+        }
+        with self._lock:
+            geocodes = self._ensure_geocodes_loaded()
+            geocodes[key] = entry
+            snapshot = json.dumps(geocodes, ensure_ascii=False, indent=2)
+        try:
+            self.geocode_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.geocode_path.with_suffix(".tmp")
+            tmp_path.write_text(snapshot + "\n", encoding="utf-8")
+            os.replace(tmp_path, self.geocode_path)
+        except Exception as e:
+            logger.warning(f"Failed to persist geocode cache: {e}")
+
+    # ---- Forecasts -------------------------------------------------------
+    @staticmethod
+    def _forecast_key(
+        latitude: float, longitude: float, timezone: str
+    ) -> tuple[float, float, str]:
+        return (
+            round(float(latitude), COORDINATE_PRECISION),
+            round(float(longitude), COORDINATE_PRECISION),
+            (timezone or "auto").strip(),
+        )
+
+    @staticmethod
+    def _forecast_expiry(payload: dict[str, Any], now: float) -> float:
+        """Expire at the next boundary of the forecast's update interval."""
+        current = payload.get("current") or {}
+        try:
+            interval = int(current.get("interval") or 0)
+        except (TypeError, ValueError):
+            interval = 0
+        if interval <= 0:
+            interval = DEFAULT_FORECAST_INTERVAL_SECONDS
+        return (now // interval + 1) * interval
+
+    def get_forecast(
+        self, latitude: float, longitude: float, timezone: str = "auto"
+    ) -> dict[str, Any] | None:
+        """Return a still-valid cached forecast payload or None."""
+        key = self._forecast_key(latitude, longitude, timezone)
+        with self._lock:
+            entry = self._forecasts.get(key)
+            if entry is None or entry[0] <= time.time():
+                self._forecasts.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def store_forecast(
+        self,
+        latitude: float,
+        longitude: float,
+        timezone: str,
+        payload: dict[str, Any],
+    ) -> None:
+        """Cache a forecast payload until its next update boundary."""
+        now = time.time()
+        key = self._forecast_key(latitude, longitude, timezone)
+        with self._lock:
+            self._forecasts = {k: v for k, v in self._forecasts.items() if v[0] > now}
+            self._forecasts[key] = (self._forecast_expiry(payload, now), payload)
+
+    def clear_forecasts(self) -> None:
+        with self._lock:
+            self._forecasts.clear()
+
+
+# Global instance
+weather_cache = WeatherCache()
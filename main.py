@@ -38,6 +38,7 @@ from pathlib import Path
 
 import core.button
 from core.audio import playback_queue
+from core.ha_ws import ha_ws_client
 
 # --- Reload logger level after environment is loaded ---
 from core.logger import reload_log_level
@@ -50,12 +51,13 @@ print(f"🔧 Log level set to: {current_level.name}")
 
 
 def signal_handler(sig, frame):
-    logger.info("Exiting cleanly (signal received).", "👋")
+    logger.info("Exiting cleanly (signal received).", emoji="👋")
     playback_queue.put(None)
     from core.movements import cleanup_gpio
 
     cleanup_gpio()
     stop_mqtt()
+    ha_ws_client.stop()
     sys.exit(0)
 
 
@@ -69,7 +71,28 @@ def main():
 
     user_manager.load_default_user()
 
+    from core.config import METRICS_HOST, METRICS_PORT
+
+    if METRICS_PORT:
+        from core.metrics import start_metrics_server
+
+        try:
+            start_metrics_server(METRICS_PORT, METRICS_HOST)
+        except OSError as e:
+            logger.warning(f"Metrics server failed to start: {e}")
+
+    from core.config import IPC_SOCKET_PATH
+
+    if IPC_SOCKET_PATH:
+        from core.ipc import start_ipc_server
+
+        try:
+            start_ipc_server(IPC_SOCKET_PATH)
+        except OSError as e:
+            logger.warning(f"Control socket failed to start: {e}")
+
     threading.Thread(target=start_mqtt, daemon=True).start()
+    ha_ws_client.start()
     start_motor_watchdog()
     core.button.start_loop()
 
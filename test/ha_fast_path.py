@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+import sys
+
+from aiohttp import web
+
+
+# Point Billy at the local stub before core.config reads the environment
+STUB_PORT = 18123
+os.environ["HA_HOST"] = f"http://127.0.0.1:{STUB_PORT}"
+os.environ["HA_TOKEN"] = "stub-token"
+
+# Add parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import ha, http_client
+
+
+STATES = [
+    {
+        "entity_id": "light.kitchen_ceiling",
+        "state": "off",
+        "attributes": {"friendly_name": "Kitchen Ceiling"},
+    },
+    {
+        "entity_id": "light.kitchen_counter",
+        "state": "off",
+        "attributes": {"friendly_name": "Kitchen Counter"},
+    },
+    {
+        "entity_id": "light.desk_lamp",
+        "state": "on",
+        "attributes": {"friendly_name": "Desk Lamp"},
+    },
+    {
+        "entity_id": "lock.front_door",
+        "state": "unlocked",
+        "attributes": {"friendly_name": "Front Door"},
+    },
+]
+SERVICES = [
+    {"domain": "light", "services": {"turn_on": {}, "turn_off": {}, "toggle": {}}},
+    {"domain": "lock", "services": {"lock": {}, "unlock": {}}},
+]
+AREAS = {"Kitchen": ["light.kitchen_ceiling", "light.kitchen_counter"]}
+service_calls: list[tuple[str, str, list[str]]] = []
+conversation_calls: list[str] = []
+
+
+async def _states(request):
+    return web.json_response(STATES)
+
+
+async def _services(request):
+    return web.json_response(SERVICES)
+
+
+async def _template(request):
+    return web.Response(text=json.dumps(AREAS), content_type="text/plain")
+
+
+async def _call_service(request):
+    domain = request.match_info["domain"]
+    service = request.match_info["service"]
+    body = await request.json()
+    service_calls.append((domain, service, body["entity_id"]))
+    new_state = {"turn_on": "on", "turn_off": "off", "lock": "locked"}.get(service)
+    changed = []
+    for state in STATES:
+        if state["entity_id"] in body["entity_id"] and new_state:
+            state["state"] = new_state
+            changed.append(state)
+    return web.json_response(changed)
+
+
+async def _conversation(request):
+    body = await request.json()
+    conversation_calls.append(body["text"])
+    return web.json_response({
+        "response": {"speech": {"plain": {"speech": "Handled by HA."}}}
+    })
+
+
+async def main():
+    app = web.Application()
+    app.router.add_get("/api/states", _states)
+    app.router.add_get("/api/services", _services)
+    app.router.add_post("/api/template", _template)
+    app.router.add_post("/api/services/{domain}/{service}", _call_service)
+    app.router.add_post("/api/conversation/process", _conversation)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", STUB_PORT).start()
+
+    cases = [
+        ("turn on the kitchen lights", "local"),
+        ("Please turn off Desk Lamp.", "local"),
+        ("lock the front door", "local"),
+        ("turn on the kitchen light", "conversation"),  # singular, ambiguous
+        ("turn on the kit lights", "conversation"),  # part of an area name
+        ("turn off the desk lights", "local"),
+        ("make it cozy in here", "conversation"),
+    ]
+    failures = 0
+    try:
+        for prompt, expected_path in cases:
+            before = len(conversation_calls)
+            response = await ha.handle_smart_home_prompt(prompt)
+            path = "conversation" if len(conversation_calls) > before else "local"
+            speech = (response or {}).get("speech", {}).get("plain", {}).get("speech")
+            ok = path == expected_path and bool(speech)
+            failures += 0 if ok else 1
+            print(f"{'✅' if ok else '❌'} {prompt!r} -> {path}: {speech}")
+    finally:
+        await http_client.close_session()
+        await runner.cleanup()
+
+    print(f"🔧 Service calls: {service_calls}")
+    for path, stats in ha.get_command_stats().items():
+        print(
+            f"⏱️ {path}: count={stats['count']} avg={stats['avg_ms']:.1f} ms "
+            f"max={stats['max_ms']:.1f} ms"
+        )
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(main()) else 0)
@@ -0,0 +1,132 @@
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+# Add parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import memory_index as memory_index_module
+from core.memory_index import MemoryIndex
+from core.memory_store import MemoryStore
+
+
+MEMORY_COUNT = 10_000
+QUERIES = 200
+USER = "bench"
+
+SUBJECTS = [
+    "dog",
+    "cat",
+    "sister",
+    "brother",
+    "boss",
+    "neighbor",
+    "band",
+    "team",
+    "car",
+    "garden",
+    "kitchen",
+    "boat",
+    "bike",
+    "guitar",
+    "job",
+    "school",
+]
+VERBS = ["loves", "hates", "bought", "painted", "visited", "fixed", "named", "sold"]
+OBJECTS = [
+    "jazz records",
+    "a red kayak",
+    "sourdough bread",
+    "the old lighthouse",
+    "chess openings",
+    "tomato plants",
+    "a vintage camera",
+    "hiking boots",
+    "spicy noodles",
+    "a sailing trip",
+    "board games",
+    "marathon training",
+]
+NEEDLES = {
+    "what is my dog called": "My dog is called Biscuit",
+    "favorite kind of music": "User's favorite music is Swedish death metal",
+    "which city do I live in": "User lives in Gothenburg with two kids",
+}
+
+
+def _synthetic_memories() -> list[dict]:
+    rng = random.Random(7)
+    memories = [
+        {
+            "id": f"m{i}",
+            "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00",
+            "memory": f"My {rng.choice(SUBJECTS)} {rng.choice(VERBS)} "
+            f"{rng.choice(OBJECTS)}",
+            "importance": rng.choice(["low", "medium", "high"]),
+            "category": "fact",
+        }
+        for i in range(MEMORY_COUNT - len(NEEDLES))
+    ]
+    memories += [
+        {"id": f"needle{i}", "memory": text, "importance": "medium"}
+        for i, text in enumerate(NEEDLES.values())
+    ]
+    return memories
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(Path(tmp) / "memories.db")
+        # Point the index module at the temporary store
+        memory_index_module.memory_store = store
+        store.replace_all(USER, _synthetic_memories())
+        index = MemoryIndex()
+
+        start = time.perf_counter()
+        index.search(USER, "warm up")
+        build_ms = (time.perf_counter() - start) * 1000
+
+        rng = random.Random(11)
+        queries = [
+            f"{rng.choice(SUBJECTS)} {rng.choice(OBJECTS)}" for _ in range(QUERIES)
+        ]
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(USER, query)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        failures = 0
+        for query, expected in NEEDLES.items():
+            results = [m["memory"] for m in index.search(USER, query, 3)]
+            ok = expected in results
+            failures += 0 if ok else 1
+            print(f"{'✅' if ok else '❌'} {query!r} -> {results[:1]}")
+
+        store.add(USER, "My parrot is named Captain", "medium", "fact")
+        start = time.perf_counter()
+        results = [m["memory"] for m in index.search(USER, "parrot name", 1)]
+        incremental_ms = (time.perf_counter() - start) * 1000
+        ok = results == ["My parrot is named Captain"]
+        failures += 0 if ok else 1
+        print(f"{'✅' if ok else '❌'} new memory picked up -> {results}")
+        store.close()
+
+    latencies.sort()
+    print(f"📁 {MEMORY_COUNT} memories, index built in {build_ms:.0f} ms")
+    print(
+        f"⏱️ query: p50={statistics.median(latencies):.2f} ms "
+        f"p95={latencies[int(len(latencies) * 0.95)]:.2f} ms "
+        f"max={latencies[-1]:.2f} ms"
+    )
+    print(f"⏱️ query after adding one memory: {incremental_ms:.1f} ms")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
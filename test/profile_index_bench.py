@@ -0,0 +1,90 @@
+import configparser
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+# Add parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.profile_index import ProfileIndex
+
+
+PROFILE_COUNT = 500
+LOOKUPS = 200
+
+
+def _write_profiles(profiles_dir: Path) -> None:
+    for i in range(PROFILE_COUNT):
+        config = configparser.ConfigParser()
+        config["USER_INFO"] = {
+            "name": f"User{i:03d}",
+            "display_name": f"Nickname {i:03d}",
+            "preferred_persona": "default",
+        }
+        config["CORE_MEMORIES"] = {"memories": "[]"}
+        with open(profiles_dir / f"user{i:03d}.ini", "w") as f:
+            config.write(f)
+
+
+def _scan_lookup(profiles_dir: Path, name: str):
+    """The previous lookup: exact file check, then parse every profile."""
+    name = name.strip().title()
+    if (profiles_dir / f"{name.lower()}.ini").exists():
+        return name
+    for profile_file in profiles_dir.glob("*.ini"):
+        config = configparser.ConfigParser()
+        config.read(profile_file)
+        display_name = config.get("USER_INFO", "display_name", fallback="")
+        if name.lower() == display_name.lower():
+            return profile_file.stem.title()
+    return None
+
+
+def _time_ms(fn, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        profiles_dir = Path(tmp)
+        _write_profiles(profiles_dir)
+        queries = [f"nickname {i * 7 % PROFILE_COUNT:03d}" for i in range(LOOKUPS)]
+
+        index = ProfileIndex(profiles_dir)
+        start = time.perf_counter()
+        index.names()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        scan_ms = _time_ms(lambda q: _scan_lookup(profiles_dir, q), queries[:20])
+        index_ms = _time_ms(index.find, queries)
+
+        failures = 0
+        for query in queries:
+            if index.find(query) != _scan_lookup(profiles_dir, query).lower():
+                failures += 1
+                print(f"❌ Mismatch for {query!r}")
+
+        index.update("user001", "Renamed")
+        ok = index.find("renamed") == "user001" and index.find("nickname 001") is None
+        failures += 0 if ok else 1
+        print(f"{'✅' if ok else '❌'} display name update")
+
+        (profiles_dir / "user002.ini").unlink()
+        ok = index.find("nickname 002") is None
+        failures += 0 if ok else 1
+        print(f"{'✅' if ok else '❌'} external delete picked up via directory mtime")
+
+    print(f"📁 {PROFILE_COUNT} profiles, index built in {build_ms:.1f} ms")
+    print(f"⏱️ directory scan: {scan_ms:.3f} ms/lookup")
+    print(f"⏱️ profile index:  {index_ms:.4f} ms/lookup")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,75 @@
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+
+# Add parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import config
+from core.wake_engines import available_engines, create_engine
+
+
+SECONDS = 30
+BATCH = 8
+
+
+def _frames(engine, seconds: int) -> np.ndarray:
+    count = int(seconds * engine.sample_rate / engine.frame_length)
+    rng = np.random.default_rng(5)
+    return rng.integers(
+        -2000, 2000, size=(count, engine.frame_length), dtype=np.int16
+    )
+
+
+def _bench(name: str) -> None:
+    try:
+        engine = create_engine(
+            name,
+            config.WAKE_WORD_ENDPOINT,
+            config.WAKE_WORD_PORCUPINE_ACCESS_KEY,
+            config.WAKE_WORD_SENSITIVITY,
+        )
+    except RuntimeError as e:
+        print(f"{name:<13} skipped: {e}")
+        return
+
+    frames = _frames(engine, SECONDS)
+    frame_ms = engine.frame_length / engine.sample_rate * 1000
+    for frame in frames[:10]:  # warm up
+        engine.process(frame)
+
+    start = time.process_time()
+    for frame in frames:
+        engine.process(frame)
+    single = (time.process_time() - start) / len(frames)
+
+    engine.reset()
+    start = time.process_time()
+    for i in range(0, len(frames), BATCH):
+        engine.process_batch(frames[i : i + BATCH])
+    batched = (time.process_time() - start) / len(frames)
+    engine.close()
+
+    print(
+        f"{name:<13} {len(engine.keywords)} kw  frame {frame_ms:.0f} ms  "
+        f"single {single * 1e6:8.1f} us ({single / frame_ms * 1e5:5.2f}% CPU)  "
+        f"batch x{BATCH} {batched * 1e6:8.1f} us/frame "
+        f"({batched / frame_ms * 1e5:5.2f}% CPU)"
+    )
+
+
+def main():
+    print(f"{platform.machine()} / {platform.python_version()}, {SECONDS}s of audio")
+    for name, available in available_engines().items():
+        if available:
+            _bench(name)
+        else:
+            print(f"{name:<13} not installed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import glob
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+from scipy.signal import resample_poly
+
+
+# Add parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import config
+from core.wake_dsp import VadGate, block_rms
+
+
+RATE = 48000
+CHUNK_MS = 40
+SECONDS = 120
+SPEECH_EVERY = 4.0
+BLOCK = RATE * CHUNK_MS // 1000
+CLIPS = os.path.join(os.path.dirname(__file__), "..", "sounds", "wake-up", "default")
+
+
+def _speech_clips() -> list[np.ndarray]:
+    clips = []
+    for path in sorted(glob.glob(os.path.join(CLIPS, "*.wav"))):
+        with wave.open(path) as wav:
+            data = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+            rate = wav.getframerate()
+        clip = resample_poly(data.astype(np.float32), RATE, rate)
+        clips.append(clip / np.sqrt(np.mean(clip**2)))  # unit RMS
+    return clips
+
+
+def _noise(kind: str, rng: np.random.Generator) -> np.ndarray:
+    n = SECONDS * RATE
+    t = np.arange(n) / RATE
+    if kind == "quiet room":
+        return rng.normal(0, 60, n)
+    if kind == "fan":
+        brown = np.cumsum(rng.normal(0, 1, n))
+        brown -= np.convolve(brown, np.ones(4800) / 4800, mode="same")
+        return brown / brown.std() * 700 + rng.normal(0, 150, n)
+    if kind == "mains hum":
+        return sum(900 / k * np.sin(2 * np.pi * 50 * k * t) for k in (1, 2, 3)) + rng.normal(
+            0, 60, n
+        )
+    if kind == "vacuum switching on":
+        envelope = np.where(t % 20 < 10, 0.02, 1.0)
+        return rng.normal(0, 2500, n) * envelope
+    raise ValueError(kind)
+
+
+def _run(signal: np.ndarray, gate: VadGate) -> tuple[np.ndarray, float]:
+    blocks = len(signal) // BLOCK
+    opened = np.zeros(blocks, dtype=bool)
+    cpu = 0.0
+    for i in range(blocks):
+        mono = signal[i * BLOCK : (i + 1) * BLOCK]
+        start = time.process_time()
+        opened[i] = gate.process(mono, block_rms(mono))
+        cpu += time.process_time() - start
+    return opened, cpu / (blocks * CHUNK_MS / 1000) * 100.0
+
+
+def _gate() -> VadGate:
+    return VadGate(
+        BLOCK,
+        CHUNK_MS / 1000,
+        ratio=config.WAKE_WORD_GATE_RATIO,
+        flux=config.WAKE_WORD_GATE_FLUX,
+        hold=config.WAKE_WORD_GATE_HOLD_MS / 1000,
+    )
+
+
+def _opens(opened: np.ndarray) -> int:
+    return int(np.count_nonzero(opened[1:] & ~opened[:-1]) + opened[0])
+
+
+def main():
+    rng = np.random.default_rng(11)
+    clips = _speech_clips()
+    print(
+        f"{SECONDS}s at {RATE} Hz in {CHUNK_MS}ms blocks; speech every {SPEECH_EVERY:.0f}s "
+        f"from {len(clips)} wake-up clips"
+    )
+    print(
+        f"{'background':<20} {'noise opens/min':>16} {'open %':>7} "
+        f"{'speech caught':>14} {'onset ms p50':>13} {'gate %CPU':>10}"
+    )
+    for kind in ("quiet room", "fan", "mains hum", "vacuum switching on"):
+        noise = _noise(kind, rng).astype(np.float32)
+        opened, cpu = _run(noise, _gate())
+        opens_per_min = _opens(opened) / (SECONDS / 60)
+        open_fraction = opened.mean()
+
+        # Speech at ~15 dB over the background (at least a normal voice level)
+        level = max(float(np.sqrt(np.mean(noise**2))) * 5.6, 1500.0)
+        mixed = noise.copy()
+        starts = []
+        for i, at in enumerate(np.arange(1.0, SECONDS - 2, SPEECH_EVERY)):
+            clip = clips[i % len(clips)] * level
+            begin = int(at * RATE)
+            mixed[begin : begin + len(clip)] += clip
+            starts.append((begin, begin + len(clip)))
+        opened, _ = _run(mixed.astype(np.float32), _gate())
+        caught, onsets = 0, []
+        for begin, end in starts:
+            hits = np.flatnonzero(opened[begin // BLOCK : end // BLOCK + 1])
+            if hits.size:
+                caught += 1
+                onsets.append(hits[0] * CHUNK_MS)
+        onset = f"{np.median(onsets):.0f}" if onsets else "-"
+        print(
+            f"{kind:<20} {opens_per_min:>16.1f} {open_fraction * 100:>6.1f}% "
+            f"{caught:>7}/{len(starts):<6} {onset:>13} {cpu:>9.2f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
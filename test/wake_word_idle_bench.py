@@ -0,0 +1,109 @@
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.signal import resample
+
+
+# Add parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.wake_dsp import Downmixer, FrameAssembler, StreamingResampler, block_rms
+
+
+SECONDS = 60
+CHUNK_MS = 40
+CHANNELS = 2
+PORCUPINE_RATE = 16000
+PORCUPINE_FRAME = 512
+RATES = (48000, 24000, 44100, 16000)
+
+
+def _blocks(rate: int) -> list[np.ndarray]:
+    blocksize = int(rate * CHUNK_MS / 1000)
+    rng = np.random.default_rng(3)
+    return [
+        rng.integers(-3000, 3000, size=(blocksize, CHANNELS), dtype=np.int16)
+        for _ in range(8)
+    ]
+
+
+def _keyword_engine(frame: np.ndarray) -> int:
+    # Stand-in for porcupine.process(); cost is the same for both paths
+    return -1
+
+
+class _Before:
+    """The previous callback body: float copies, FFT resample, concatenate."""
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.buffer = np.zeros(0, dtype=np.int16)
+
+    def __call__(self, indata: np.ndarray) -> None:
+        mono = np.asarray(indata)
+        if mono.ndim > 1:
+            mono = mono.mean(axis=1)
+        mono_float = mono.astype(np.float32)
+        float(np.sqrt(np.mean(np.square(mono_float))))
+        samples = np.clip(mono_float, -32768, 32767).astype(np.int16)
+
+        chunk = samples.astype(np.float32)
+        if self.rate != PORCUPINE_RATE:
+            chunk = resample(chunk, int(len(chunk) * PORCUPINE_RATE / self.rate))
+        chunk = np.clip(chunk, -32768, 32767).astype(np.int16)
+        self.buffer = np.concatenate((self.buffer, chunk))
+        while self.buffer.size >= PORCUPINE_FRAME:
+            frame = self.buffer[:PORCUPINE_FRAME]
+            self.buffer = self.buffer[PORCUPINE_FRAME:]
+            _keyword_engine(frame)
+
+
+class _After:
+    """The preallocated path used by WakeWordController."""
+
+    def __init__(self, rate: int, blocksize: int):
+        self.downmixer = Downmixer(CHANNELS, blocksize)
+        self.resampler = StreamingResampler(rate, PORCUPINE_RATE, blocksize)
+        self.assembler = FrameAssembler(PORCUPINE_FRAME)
+
+    def __call__(self, indata: np.ndarray) -> None:
+        mono = self.downmixer.process(indata)
+        block_rms(mono)
+        self.assembler.push(self.resampler.process(mono), _keyword_engine)
+
+
+def _measure(path, blocks: list[np.ndarray]) -> tuple[float, int]:
+    count = int(SECONDS * 1000 / CHUNK_MS)
+    for block in blocks:  # warm up plans and caches
+        path(block)
+    start = time.process_time()
+    for i in range(count):
+        path(blocks[i % len(blocks)])
+    cpu = time.process_time() - start
+
+    tracemalloc.start()
+    for i in range(50):
+        path(blocks[i % len(blocks)])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu / SECONDS * 100.0, peak
+
+
+def main():
+    print(f"{SECONDS}s of {CHANNELS}ch audio in {CHUNK_MS}ms blocks per rate")
+    print(f"{'rate':>7} {'before %CPU':>12} {'after %CPU':>11} {'before peak':>12} {'after peak':>11}")
+    for rate in RATES:
+        blocks = _blocks(rate)
+        before_cpu, before_peak = _measure(_Before(rate), blocks)
+        after_cpu, after_peak = _measure(_After(rate, blocks[0].shape[0]), blocks)
+        print(
+            f"{rate:>7} {before_cpu:>11.2f}% {after_cpu:>10.2f}% "
+            f"{before_peak:>11}B {after_peak:>10}B"
+        )
+
+
+if __name__ == "__main__":
+    main()
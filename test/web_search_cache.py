@@ -0,0 +1,63 @@
+import asyncio
+import os
+import sys
+
+from aiohttp import web
+
+
+STUB_PORT = 18124
+os.environ["WEB_SEARCH_CACHE_PERSIST"] = "false"
+
+# Add parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import http_client, search
+
+
+requests_seen: list[str] = []
+
+
+async def _instant_answer(request):
+    requests_seen.append(request.query["q"])
+    await asyncio.sleep(0.2)  # keep the first query in flight
+    return web.json_response({"RelatedTopics": [{"Text": "alpha"}, {"Text": "beta"}]})
+
+
+def _check(label: str, results, expected) -> int:
+    ok = results == expected and all(isinstance(item, str) for item in results)
+    print(f"{'✅' if ok else '❌'} {label}: {results!r}")
+    return 0 if ok else 1
+
+
+async def main():
+    app = web.Application()
+    app.router.add_get("/", _instant_answer)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", STUB_PORT).start()
+    search.DUCKDUCKGO_API_ENDPOINT = f"http://127.0.0.1:{STUB_PORT}/"
+
+    expected = ["alpha", "beta"]
+    failures = 0
+    try:
+        first, second = await asyncio.gather(
+            search.fetch_duckduckgo_results("Billy Bass"),
+            search.fetch_duckduckgo_results("billy bass?"),
+        )
+        failures += _check("first of two concurrent queries", first, expected)
+        failures += _check("coalesced query", second, expected)
+        cached = await search.fetch_duckduckgo_results("Billy  Bass")
+        failures += _check("cached query", cached, expected)
+    finally:
+        await http_client.close_session()
+        await runner.cleanup()
+
+    ok = len(requests_seen) == 1
+    failures += 0 if ok else 1
+    print(f"{'✅' if ok else '❌'} upstream requests: {len(requests_seen)}")
+    print(f"🔍 Cache stats: {search.get_search_cache_stats()}")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(main()) else 0)
@@ -24,6 +24,7 @@ def create_app() -> Flask:
     # Late imports to avoid circulars
     from . import websocket
     from .routes.audio import bp as audio_bp
+    from .routes.jobs import bp as jobs_bp
     from .routes.misc import bp as misc_bp
     from .routes.persona import bp as persona_bp
     from .routes.profiles import profiles_bp
@@ -43,6 +44,7 @@ def create_app() -> Flask:
     app.register_blueprint(misc_bp)
     app.register_blueprint(songs_bp)
     app.register_blueprint(wake_word_bp)
+    app.register_blueprint(jobs_bp)
 
     # Register WebSocket routes
     websocket.sock.init_app(app)
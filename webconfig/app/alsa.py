@@ -0,0 +1,325 @@
+"""Cached model of the ALSA sound cards used by the audio routes.
+
+Discovery (``aplay -l``, ``arecord -l`` and one ``amixer contents`` per card)
+runs once and is kept until the set of cards changes: with ``pyudev``
+installed a monitor thread drops the model on sound-card udev events,
+otherwise ``/proc/asound/cards`` (a cheap procfs read, no subprocess) is
+compared on each access. ``rescan()`` forces a fresh discovery.
+
+Mixer controls are addressed by the numid found during discovery. With
+``pyalsaaudio`` installed they are read and written through persistent
+``alsaaudio.Mixer`` handles; otherwise through a single ``amixer cget``/
+``cset`` on the numid, without another lookup.
+"""
+
+import re
+import subprocess
+import threading
+from dataclasses import dataclass, field
+
+from .core_imports import core_config
+
+
+try:  # Optional dependency for in-process mixer access
+    import alsaaudio
+
+    _ALSAAUDIO_AVAILABLE = hasattr(alsaaudio, "VOLUME_UNITS_RAW")
+except Exception:
+    alsaaudio = None
+    _ALSAAUDIO_AVAILABLE = False
+
+try:  # Optional dependency for hotplug notifications
+    import pyudev
+
+    _PYUDEV_AVAILABLE = True
+except Exception:
+    pyudev = None
+    _PYUDEV_AVAILABLE = False
+
+
+CARDS_PATH = "/proc/asound/cards"
+VOLUME_CONTROL = "PCM Playback Volume"
+MIC_GAIN_CONTROL = "Mic Capture Volume"
+
+_PCM_RE = re.compile(r"card (\d+): ([^\s]+) \[(.*?)\], device (\d+): (.*?) \[")
+_NUMID_RE = re.compile(r"numid=(\d+),.*?name='([^']*)'")
+_RANGE_RE = re.compile(r"min=(-?\d+),max=(-?\d+)")
+
+
+@dataclass(frozen=True)
+class PcmDevice:
+    card: int
+    device: int
+    card_id: str
+    card_name: str
+    name: str
+
+    @property
+    def label(self) -> str:
+        """The name PortAudio shows for this device."""
+        return f"{self.card_name}: {self.name} (hw:{self.card},{self.device})"
+
+    def matches(self, preference: str) -> bool:
+        return preference in f"{self.card_id} {self.card_name} {self.name}".lower()
+
+
+class MixerControl:
+    """One integer mixer control on a card (``None`` = the default device)."""
+
+    def __init__(
+        self, card: int | None, numid: int, name: str, minimum: int, maximum: int
+    ):
+        self.card = card
+        self.numid = numid
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self._mixer = None
+
+    @property
+    def target(self) -> str:
+        return "default" if self.card is None else f"card {self.card}"
+
+    def get(self) -> int:
+        mixer = self._alsa_mixer()
+        if mixer is not None:
+            return int(
+                mixer.getvolume(
+                    pcmtype=self._pcmtype(), units=alsaaudio.VOLUME_UNITS_RAW
+                )[0]
+            )
+        output = subprocess.check_output(
+            ["amixer", *self._device_args(), "cget", f"numid={self.numid}"], text=True
+        )
+        match = re.search(r": values=(-?\d+)", output)
+        if not match:
+            raise RuntimeError(f"Could not read {self.name}")
+        return int(match.group(1))
+
+    def set(self, value: int) -> None:
+        value = min(max(int(value), self.minimum), self.maximum)
+        mixer = self._alsa_mixer()
+        if mixer is not None:
+            mixer.setvolume(
+                value, pcmtype=self._pcmtype(), units=alsaaudio.VOLUME_UNITS_RAW
+            )
+            return
+        subprocess.check_call([
+            "amixer",
+            "-q",
+            *self._device_args(),
+            "cset",
+            f"numid={self.numid}",
+            str(value),
+        ])
+
+    def get_percent(self) -> int:
+        span = self.maximum - self.minimum
+        return round((self.get() - self.minimum) * 100 / span) if span else 0
+
+    def set_percent(self, percent: int) -> None:
+        self.set(self.minimum + round((self.maximum - self.minimum) * percent / 100))
+
+    def _device_args(self) -> list[str]:
+        return ["-D", "default"] if self.card is None else ["-c", str(self.card)]
+
+    def _pcmtype(self) -> int:
+        return (
+            alsaaudio.PCM_CAPTURE if "Capture" in self.name else alsaaudio.PCM_PLAYBACK
+        )
+
+    def _alsa_mixer(self):
+        if not _ALSAAUDIO_AVAILABLE or self.card is None:
+            return None
+        if self._mixer is None:
+            simple = re.sub(r" (Playback|Capture) Volume$", "", self.name)
+            try:
+                self._mixer = alsaaudio.Mixer(control=simple, cardindex=self.card)
+            except alsaaudio.ALSAAudioError:
+                return None
+        return self._mixer
+
+
+@dataclass
+class AlsaModel:
+    """Cards, devices, preferred matches and mixer controls at one point in time."""
+
+    playback: list[PcmDevice] = field(default_factory=list)
+    capture: list[PcmDevice] = field(default_factory=list)
+    speaker_card: int | None = None
+    mic_card: int | None = None
+    volume: MixerControl | None = None
+    mic_gain: MixerControl | None = None
+    fingerprint: str = ""
+
+    @property
+    def play_device(self) -> str:
+        return (
+            "default" if self.speaker_card is None else f"plughw:{self.speaker_card},0"
+        )
+
+    @property
+    def speaker_name(self) -> str:
+        return self._device_name(self.playback, self.speaker_card)
+
+    @property
+    def mic_name(self) -> str:
+        return self._device_name(self.capture, self.mic_card)
+
+    @staticmethod
+    def _device_name(devices: list[PcmDevice], card: int | None) -> str:
+        for device in devices:
+            if card is None or device.card == card:
+                return device.label
+        return "Unknown"
+
+    def summary(self) -> dict:
+        return {
+            "speaker_card": self.speaker_card,
+            "mic_card": self.mic_card,
+            "speaker": self.speaker_name,
+            "mic": self.mic_name,
+            "volume_numid": self.volume.numid if self.volume else None,
+            "mic_gain_numid": self.mic_gain.numid if self.mic_gain else None,
+            "playback_devices": [d.label for d in self.playback],
+            "capture_devices": [d.label for d in self.capture],
+        }
+
+
+def _read_fingerprint() -> str:
+    try:
+        with open(CARDS_PATH, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _list_pcms(command: str) -> list[PcmDevice]:
+    try:
+        output = subprocess.check_output([command, "-l"], text=True)
+    except Exception as e:
+        print(f"Failed to list ALSA devices with {command}:", e)
+        return []
+    return [
+        PcmDevice(int(card), int(device), card_id, card_name, name)
+        for card, card_id, card_name, device, name in _PCM_RE.findall(output)
+    ]
+
+
+def _mixer_controls(card: int | None) -> dict[str, MixerControl]:
+    """Integer controls of a card by name, from one ``amixer contents``."""
+    device_args = ["-D", "default"] if card is None else ["-c", str(card)]
+    try:
+        output = subprocess.check_output(
+            ["amixer", *device_args, "contents"], text=True
+        )
+    except Exception as e:
+        print(f"Failed to read mixer controls for {card}:", e)
+        return {}
+    controls = {}
+    numid = name = None
+    for line in output.splitlines():
+        match = _NUMID_RE.search(line)
+        if match:
+            numid, name = int(match.group(1)), match.group(2)
+            continue
+        limits = _RANGE_RE.search(line)
+        if limits and numid is not None:
+            controls[name] = MixerControl(
+                card, numid, name, int(limits.group(1)), int(limits.group(2))
+            )
+            numid = None
+    return controls
+
+
+def _speaker_card(playback: list[PcmDevice]) -> int | None:
+    preference = (core_config.SPEAKER_PREFERENCE or "").lower().strip()
+    if not preference:
+        return None
+    return next((d.card for d in playback if d.matches(preference)), None)
+
+
+def _mic_card(capture: list[PcmDevice]) -> int | None:
+    preference = (core_config.MIC_PREFERENCE or "").lower()
+    for device in capture:
+        if device.matches(preference):
+            return device.card
+    for device in capture:
+        if "usb" in device.card_name.lower():
+            return device.card
+    return None
+
+
+def discover() -> AlsaModel:
+    fingerprint = _read_fingerprint()
+    playback = _list_pcms("aplay")
+    capture = _list_pcms("arecord")
+    speaker_card = _speaker_card(playback)
+    mic_card = _mic_card(capture)
+    speaker_controls = _mixer_controls(speaker_card)
+    if mic_card is None:
+        mic_controls = {}
+    elif mic_card == speaker_card:
+        mic_controls = speaker_controls
+    else:
+        mic_controls = _mixer_controls(mic_card)
+    return AlsaModel(
+        playback=playback,
+        capture=capture,
+        speaker_card=speaker_card,
+        mic_card=mic_card,
+        volume=speaker_controls.get(VOLUME_CONTROL),
+        mic_gain=mic_controls.get(MIC_GAIN_CONTROL),
+        fingerprint=fingerprint,
+    )
+
+
+class AlsaCache:
+    """Hand out the current model, rediscovering only when cards change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._model: AlsaModel | None = None
+        self._preferences: tuple = ()
+        self._observer = None
+
+    def get(self) -> AlsaModel:
+        preferences = (core_config.SPEAKER_PREFERENCE, core_config.MIC_PREFERENCE)
+        with self._lock:
+            model = self._model
+            fresh = self._observer is not None or (
+                model is not None and _read_fingerprint() == model.fingerprint
+            )
+            if model is not None and preferences == self._preferences and fresh:
+                return model
+            self._start_observer()
+            self._model = model = discover()
+            self._preferences = preferences
+            return model
+
+    def rescan(self) -> AlsaModel:
+        with self._lock:
+            self._model = None
+        return self.get()
+
+    def invalidate(self) -> None:
+        self._model = None
+
+    def _start_observer(self) -> None:
+        if self._observer is not None or not _PYUDEV_AVAILABLE:
+            return
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by(subsystem="sound")
+            self._observer = pyudev.MonitorObserver(
+                monitor, callback=lambda device: self.invalidate(), name="alsa-udev"
+            )
+            self._observer.daemon = True
+            self._observer.start()
+        except Exception as e:
+            print("Sound hotplug monitoring unavailable:", e)
+            self._observer = None
+
+
+# Global instance
+alsa = AlsaCache()
@@ -0,0 +1,194 @@
+"""Client for the Billy runtime's control socket (see ``core/ipc.py``).
+
+An asyncio loop on a background thread owns one connection to the runtime.
+Flask routes call ``billy.call(...)`` from their worker threads; requests are
+multiplexed over the connection by id. While a browser is connected to
+``/ws`` the client also subscribes to runtime events and hands them to the
+registered listeners, reconnecting whenever Billy restarts.
+
+``call`` raises ``BillyUnavailable`` when the runtime cannot be reached (not
+running, socket disabled) so callers can fall back to doing the work
+themselves. A runtime that is reachable but slow raises ``BillyTimeout``
+instead: the request may still be running there, so doing it locally too
+would start a second session or listener, or fight over the GPIO.
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import threading
+from collections.abc import Callable
+
+from core.logger import logger
+
+from .core_imports import core_config
+
+
+CONNECT_TIMEOUT = 1.0
+RECONNECT_SECONDS = 2.0
+MAX_LINE_BYTES = 64 * 1024
+
+EventListener = Callable[[str, object], None]
+
+
+class BillyUnavailable(RuntimeError):
+    """The Billy runtime could not be reached."""
+
+
+class BillyTimeout(RuntimeError):
+    """The Billy runtime got the request but did not answer in time."""
+
+
+class BillyClient:
+    def __init__(self, path: str):
+        self.path = path
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._disconnected: asyncio.Event | None = None
+        self._connect_lock: asyncio.Lock | None = None
+        self._listeners: list[EventListener] = []
+        self._topics: list[str] = []
+        self._follower: asyncio.Task | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    # ---- Thread-side API -------------------------------------------------
+    def call(self, method: str, timeout: float = 2.0, **params):
+        """Run ``method`` in the runtime and return its result."""
+        if not self.path:
+            raise BillyUnavailable("control socket disabled")
+        future = asyncio.run_coroutine_threadsafe(
+            self._request(method, params, timeout), self._ensure_loop()
+        )
+        try:
+            return future.result(timeout + CONNECT_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise BillyTimeout(f"Billy did not answer {method} in time") from None
+
+    def add_listener(self, listener: EventListener) -> None:
+        """Call ``listener(topic, data)`` for every runtime event."""
+        self._listeners.append(listener)
+
+    def follow_events(self, topics: list[str]) -> None:
+        """Subscribe to ``topics`` (empty list stops following)."""
+        if not self.path:
+            return
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(self._set_topics, list(topics))
+
+    # ---- Loop side -------------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="billy-ipc", daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    def _set_topics(self, topics: list[str]) -> None:
+        self._topics = topics
+        if self._writer is not None:
+            self._loop.create_task(self._subscribe())
+        if topics and (self._follower is None or self._follower.done()):
+            self._follower = self._loop.create_task(self._follow())
+
+    async def _follow(self) -> None:
+        # Keep a connection up while someone wants events
+        while self._topics:
+            try:
+                await self._connect()
+                await self._disconnected.wait()
+            except BillyUnavailable:
+                pass
+            if self._topics:
+                await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def _subscribe(self) -> None:
+        try:
+            await self._request("subscribe", {"topics": list(self._topics)}, 2.0)
+        except (BillyUnavailable, RuntimeError) as e:
+            logger.warning(f"Billy event subscription failed: {e}")
+
+    async def _connect(self) -> None:
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_unix_connection(self.path, limit=MAX_LINE_BYTES),
+                    CONNECT_TIMEOUT,
+                )
+            except (TimeoutError, OSError) as e:
+                raise BillyUnavailable(f"Billy is not running ({e})") from None
+            self._writer = writer
+            self._disconnected = asyncio.Event()
+            self._loop.create_task(self._read(reader, writer))
+        if self._topics:
+            self._loop.create_task(self._subscribe())
+
+    async def _request(self, method: str, params: dict, timeout: float):
+        await self._connect()
+        request_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+        try:
+            line = json.dumps({"id": request_id, "method": method, "params": params})
+            self._writer.write(line.encode("utf-8") + b"\n")
+            await self._writer.drain()
+            reply = await asyncio.wait_for(future, timeout)
+        except TimeoutError:
+            # Checked first: TimeoutError is an OSError
+            raise BillyTimeout(f"Billy did not answer {method} in time") from None
+        except (OSError, AttributeError):
+            raise BillyUnavailable("connection to Billy lost") from None
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply.get("result")
+
+    async def _read(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if "event" in message:
+                    self._dispatch(message["event"], message.get("data"))
+                    continue
+                future = self._pending.get(message.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            writer.close()
+            if self._writer is writer:
+                self._writer = None
+                self._disconnected.set()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(BillyUnavailable("connection to Billy lost"))
+
+    def _dispatch(self, topic: str, data: object) -> None:
+        for listener in self._listeners:
+            try:
+                listener(topic, data)
+            except Exception as e:
+                logger.warning(f"Billy event listener failed: {e}")
+
+
+# Global instance
+billy = BillyClient(core_config.IPC_SOCKET_PATH)
@@ -0,0 +1,131 @@
+"""Fan-out hub for pushing live updates to websocket clients.
+
+Producers publish JSON-serialisable messages once; every subscriber gets them
+through its own bounded queue, so a slow browser tab can never hold up a
+producer or the other tabs. A subscriber that falls too far behind has its
+queue emptied and is flagged ``overflowed``; the websocket handler then sends
+it a fresh snapshot instead of the backlog it missed.
+
+High-rate streams (live meters) go to a named channel and reach only the
+subscribers that joined it.
+"""
+
+import queue
+import threading
+from collections.abc import Callable
+
+
+class Subscription:
+    """One client's view of the hub."""
+
+    def __init__(self, hub: "Hub", maxsize: int):
+        self._hub = hub
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+        self.channels: frozenset[str] = frozenset()
+
+    def offer(self, message: dict) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # Drop the backlog; the client resyncs from a snapshot
+            self.overflowed = True
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def get(self, timeout: float | None = None) -> dict | None:
+        """Next message, or None if nothing arrived within ``timeout``."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def join(self, channel: str) -> None:
+        self._hub._set_channel(self, channel, True)
+
+    def leave(self, channel: str) -> None:
+        self._hub._set_channel(self, channel, False)
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self)
+
+
+class Hub:
+    """Broadcast messages to every subscriber's bounded queue."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: list[Subscription] = []
+        self._listeners: list[Callable[[int], None]] = []
+        self._channel_listeners: list[Callable[[str, int], None]] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def on_subscribers_changed(self, callback: Callable[[int], None]) -> None:
+        """Call ``callback(count)`` whenever a client subscribes or leaves."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def on_channel_changed(self, callback: Callable[[str, int], None]) -> None:
+        """Call ``callback(channel, count)`` when a client joins or leaves one."""
+        with self._lock:
+            self._channel_listeners.append(callback)
+
+    def channel_count(self, channel: str) -> int:
+        return sum(1 for s in self._subscribers if channel in s.channels)
+
+    def subscribe(self, maxsize: int = 256) -> Subscription:
+        subscription = Subscription(self, maxsize)
+        with self._lock:
+            self._subscribers = [*self._subscribers, subscription]
+            count = len(self._subscribers)
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback(count)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription not in self._subscribers:
+                return
+            self._subscribers = [s for s in self._subscribers if s is not subscription]
+            count = len(self._subscribers)
+            listeners = list(self._listeners)
+        for channel in subscription.channels:
+            self._channel_changed(channel)
+        for callback in listeners:
+            callback(count)
+
+    def _set_channel(
+        self, subscription: Subscription, channel: str, joined: bool
+    ) -> None:
+        with self._lock:
+            if joined == (channel in subscription.channels):
+                return
+            if joined:
+                subscription.channels = subscription.channels | {channel}
+            else:
+                subscription.channels = subscription.channels - {channel}
+            if subscription not in self._subscribers:
+                return
+        self._channel_changed(channel)
+
+    def _channel_changed(self, channel: str) -> None:
+        count = self.channel_count(channel)
+        for callback in list(self._channel_listeners):
+            callback(channel, count)
+
+    def publish(self, message: dict, channel: str | None = None) -> None:
+        # The list is replaced, never mutated, so iterating it needs no lock
+        for subscription in self._subscribers:
+            if channel is None or channel in subscription.channels:
+                subscription.offer(message)
+
+
+# Global instance
+hub = Hub()
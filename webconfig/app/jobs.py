@@ -0,0 +1,121 @@
+"""Background jobs for slow web UI operations.
+
+Routes that would otherwise hold a request open for seconds or minutes
+(generating a wake-up clip over the voice provider, updating the software)
+submit the work here and answer at once with the job. The work runs on a
+small thread pool and reports progress through the ``report`` callable it is
+given; every change is pushed to the open tabs through the hub as
+``{"type": "job", "data": {...}}`` and can be polled at ``/jobs/<id>``.
+
+Only the last ``JOB_HISTORY`` jobs are kept, and they live in this process:
+they are gone after the web UI restarts.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+from core.logger import logger
+
+from .hub import hub
+
+
+JOB_HISTORY = 50
+WORKERS = 2
+
+Reporter = Callable[..., None]
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = "queued"  # queued, running, done, error
+    progress: float = 0.0
+    message: str = ""
+    result: object = None
+    error: str | None = None
+    created: float = field(default_factory=time.time)
+    updated: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+
+
+class JobManager:
+    """Run jobs on a thread pool and keep the recent ones for polling."""
+
+    def __init__(self, workers: int = WORKERS):
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="job"
+        )
+
+    def submit(
+        self, kind: str, function: Callable, *args, exclusive: bool = False, **kwargs
+    ) -> dict:
+        """Queue ``function(report, *args, **kwargs)`` and return the job.
+
+        ``report(progress, message="")`` updates the job (progress 0..1).
+        With ``exclusive`` an unfinished job of the same kind is returned
+        instead of starting another one.
+        """
+        with self._lock:
+            if exclusive:
+                for job in self._jobs.values():
+                    if job.kind == kind and not job.finished:
+                        return asdict(job)
+            job = Job(id=f"{int(time.time()):x}-{next(self._ids)}", kind=kind)
+            self._jobs[job.id] = job
+            while len(self._jobs) > JOB_HISTORY:
+                self._jobs.popitem(last=False)
+        self._publish(job)
+
+        def report(progress: float | None = None, message: str | None = None):
+            self._update(job, progress=progress, message=message)
+
+        self._executor.submit(self._run, job, function, report, args, kwargs)
+        return self.get(job.id)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return asdict(job) if job else None
+
+    def list(self) -> list[dict]:
+        with self._lock:
+            return [asdict(job) for job in reversed(self._jobs.values())]
+
+    def _run(self, job: Job, function, report, args, kwargs) -> None:
+        self._update(job, status="running")
+        try:
+            result = function(report, *args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Job {job.kind} ({job.id}) failed: {e}")
+            self._update(job, status="error", error=str(e) or type(e).__name__)
+        else:
+            self._update(job, status="done", progress=1.0, result=result)
+
+    def _update(self, job: Job, **changes) -> None:
+        with self._lock:
+            for key, value in changes.items():
+                if value is not None:
+                    setattr(job, key, value)
+            job.updated = time.time()
+        self._publish(job)
+
+    def _publish(self, job: Job) -> None:
+        with self._lock:
+            data = asdict(job)
+        hub.publish({"type": "job", "data": data})
+
+
+# Global instance
+jobs = JobManager()
@@ -5,92 +5,31 @@ import os
 import queue
 import re
 import subprocess
+import threading
 
 import numpy as np
-import paho.mqtt.client as mqtt
 import sounddevice as sd
 from flask import Blueprint, Response, jsonify, request, send_from_directory
 
-from core.wakeup import generate_wake_clip_async
+from core.wakeup import (
+    find_wakeup_clip,
+    generate_wake_clip_async,
+    generate_wake_clips,
+)
 
+from ..alsa import alsa
+from ..billy_ipc import BillyUnavailable, billy
 from ..core_imports import core_config
+from ..jobs import jobs
 from ..state import PERSONA_PATH, PROJECT_ROOT, WAKE_UP_DIR
+from .persona import save_wakeup_phrases
 
 
 bp = Blueprint("audio", __name__)
 
-mic_check_running = False
-rms_queue = queue.Queue()
-
-
-def get_usb_pcm_card_index():
-    preference = (core_config.SPEAKER_PREFERENCE or "").lower().strip()
-    try:
-        if not preference:
-            return None
-        out = subprocess.check_output(["aplay", "-l"], text=True)
-        cards = re.findall(
-            r"card (\d+): ([^\s]+) \[(.*?)\], device (\d+): (.*?) \[", out
-        )
-        for card_index, shortname, longname, device_index, desc in cards:
-            name = f"{shortname} {longname} {desc}".lower()
-            if preference in name:
-                return int(card_index)
-        return None
-    except Exception as e:
-        print("Failed to detect speaker card:", e)
-        return None
-
-
-def get_usb_capture_card_index():
-    preference = (core_config.MIC_PREFERENCE or "").lower()
-    try:
-        output = subprocess.check_output(["arecord", "-l"], text=True)
-        cards = re.findall(
-            r"card (\d+): ([^\s]+) \[(.*?)\], device (\d+): (.*?) \[", output
-        )
-        for card_index, shortname, longname, device_index, desc in cards:
-            name_combined = f"{shortname} {longname} {desc}".lower()
-            if preference in name_combined:
-                return int(card_index)
-        for card_index, _, longname, _, _ in cards:
-            if "usb" in longname.lower():
-                return int(card_index)
-        return None
-    except Exception as e:
-        print("Failed to detect mic card:", e)
-        return None
-
-
-def amixer_base_args_for_card(card_index):
-    return ["-D", "default"] if card_index is None else ["-c", str(card_index)]
-
-
-def alsa_play_device(card_index):
-    return "default" if card_index is None else f"plughw:{card_index},0"
-
-
-def get_mic_gain_numid(card_index):
-    """Find the numid for mic gain on the specified card."""
-    try:
-        output = subprocess.check_output(
-            ["amixer", "-c", str(card_index), "controls"], text=True
-        )
-        for line in output.splitlines():
-            if "Mic Capture Volume" in line:
-                match = re.search(r"numid=(\d+)", line)
-                if match:
-                    return int(match.group(1))
-    except Exception as e:
-        print("Failed to get mic gain numid:", e)
-        return None
-
-
-def audio_callback(indata, frames, time_info, status):
-    if not mic_check_running:
-        raise sd.CallbackStop()
-    rms = float(np.sqrt(np.mean(np.square(indata))))
-    rms_queue.put(rms)
+# Stop events of the running local mic checks, keyed by the client's stream id
+_mic_checks: dict[str, threading.Event] = {}
+_mic_checks_lock = threading.Lock()
 
 
 @bp.route("/wakeup", methods=["GET"])
@@ -154,6 +93,16 @@ def play_wakeup_clip():
         if index < 1 or index > 99:
             return jsonify({"error": "Invalid clip index"}), 400
 
+        # Prefer playback in the running Billy process: it owns the GPIO, so
+        # mouth movement works. Without a persona it uses its current one.
+        try:
+            billy.call("wakeup.play", index=index, persona=persona_name)
+            return jsonify({"status": f"Queued clip {index}.wav for Billy playback"})
+        except BillyUnavailable:
+            pass
+        except RuntimeError as e:
+            return jsonify({"error": str(e)}), 404 if "not found" in str(e) else 500
+
         # If no persona specified, get current persona from persona manager
         if not persona_name:
             try:
@@ -163,57 +112,12 @@ def play_wakeup_clip():
             except Exception:
                 persona_name = "default"
 
-        # Check appropriate directory based on persona
-        sound_path = None
-        if persona_name and persona_name != "default":
-            # For non-default personas, check persona-specific directory
-            persona_sound_path = os.path.join(
-                PROJECT_ROOT, "personas", persona_name, "wakeup", f"{index}.wav"
-            )
-            if os.path.exists(persona_sound_path):
-                sound_path = persona_sound_path
-        elif persona_name == "default":
-            # For default persona, use custom directory
-            sound_path = os.path.join(
-                PROJECT_ROOT, "sounds", "wake-up", "custom", f"{index}.wav"
-            )
-
-        # If no sound path found yet, check custom directory as fallback
+        sound_path = find_wakeup_clip(index, persona_name)
         if not sound_path:
-            sound_path = os.path.join(
-                PROJECT_ROOT, "sounds", "wake-up", "custom", f"{index}.wav"
-            )
-
-        if not os.path.exists(sound_path):
             return jsonify({"error": f"Clip {index}.wav not found"}), 404
 
-        # Prefer sending preview request to the running Billy service process.
-        # That process owns GPIO, so mouth movement works reliably.
-        mqtt_host = (core_config.MQTT_HOST or "").strip()
-        mqtt_user = (core_config.MQTT_USERNAME or "").strip()
-        mqtt_pass = (core_config.MQTT_PASSWORD or "").strip()
-        mqtt_port = int(core_config.MQTT_PORT or 1883)
-        if mqtt_host and mqtt_user and mqtt_pass:
-            try:
-                client = mqtt.Client()
-                client.username_pw_set(mqtt_user, mqtt_pass)
-                client.connect(mqtt_host, mqtt_port, 5)
-                payload = json.dumps({
-                    "index": index,
-                    "persona": persona_name,
-                })
-                result = client.publish("billy/wakeup/play", payload, retain=False)
-                client.disconnect()
-                if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                    return jsonify({
-                        "status": f"Queued clip {index}.wav via MQTT for Billy service playback"
-                    })
-            except Exception:
-                pass
-
         # Fallback: plain local playback without touching Billy GPIO ownership.
-        card_index = get_usb_pcm_card_index()
-        device = alsa_play_device(card_index)
+        device = alsa.get().play_device
         subprocess.Popen(["aplay", "-q", "-D", device, sound_path])
         return jsonify({"status": f"Playing clip {index}.wav on {device}"})
     except Exception as e:
@@ -235,20 +139,63 @@ def generate_wakeup_clip():
     if not prompt or index is None:
         return jsonify({"error": "Missing 'text' or 'index'"}), 400
 
-    # If no persona specified, get current persona from persona manager
-    if not persona_name:
-        try:
-            from core.persona_manager import persona_manager
+    persona_name = _requested_persona(persona_name)
+    job = jobs.submit("wakeup_generate", _generate_clip, prompt, index, persona_name)
+    return jsonify({"status": "started", "job": job}), 202
 
-            persona_name = persona_manager.current_persona
-        except Exception:
-            persona_name = "default"
 
+@bp.route("/wakeup/generate-batch", methods=["POST"])
+def generate_wakeup_clips():
+    """Generate several clips of one persona as a single job."""
+    data = request.get_json() or {}
     try:
-        path = generate_wake_clip_async(prompt, index, persona_name)
-        return jsonify({"status": "ok", "path": path})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        clips = [
+            (int(clip["index"]), str(clip["text"]).strip())
+            for clip in data.get("clips", [])
+            if str(clip.get("text", "")).strip()
+        ]
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return jsonify({"error": "Each clip needs an 'index' and 'text'"}), 400
+    if not clips:
+        return jsonify({"error": "No phrases to generate"}), 400
+
+    persona_name = _requested_persona(data.get("persona"))
+    job = jobs.submit("wakeup_generate", _generate_clips, clips, persona_name)
+    return jsonify({"status": "started", "job": job}), 202
+
+
+def _requested_persona(persona_name: str | None) -> str:
+    # If no persona specified, get current persona from persona manager
+    if persona_name:
+        return persona_name
+    try:
+        from core.persona_manager import persona_manager
+
+        return persona_manager.current_persona
+    except Exception:
+        return "default"
+
+
+def _generate_clip(report, prompt: str, index: int, persona_name: str) -> dict:
+    report(0.1, f"Generating clip {index}")
+    path = generate_wake_clip_async(prompt, index, persona_name)
+    return {"path": path, "index": index, "persona": persona_name}
+
+
+def _generate_clips(
+    report, clips: list[tuple[int, str]], persona_name: str
+) -> dict:
+    def progress(done: int, total: int) -> None:
+        report(done / total, f"{done}/{total} clips ready")
+
+    progress(0, len(clips))
+    paths = generate_wake_clips(clips, persona_name, progress)
+    # Phrases are saved here, in one write, once their clips exist
+    save_wakeup_phrases(persona_name, dict(clips))
+    return {
+        "paths": {str(i): path for i, path in paths.items()},
+        "persona": persona_name,
+    }
 
 
 @bp.route("/wakeup/remove", methods=["POST"])
@@ -310,8 +257,7 @@ def remove_wakeup_clip():
 def speaker_test():
     try:
         sound_path = os.path.join(PROJECT_ROOT, "sounds", "speakertest.wav")
-        card_index = get_usb_pcm_card_index()
-        device = alsa_play_device(card_index)
+        device = alsa.get().play_device
         subprocess.Popen(["aplay", "-q", "-D", device, sound_path])
         return jsonify({"status": f"playing on {device}"})
     except Exception as e:
@@ -320,49 +266,73 @@ def speaker_test():
 
 @bp.route("/mic-check")
 def mic_check():
+    """Stream mic RMS from a local input stream (Server-Sent Events).
+
+    Only used while Billy is not running; otherwise the dashboard shows the
+    runtime's own meters over ``/ws`` and the mic stays with Billy. The
+    client passes an ``id`` and stops just that stream with
+    ``/mic-check/stop?id=...``.
+    """
+    stream_id = request.args.get("id") or os.urandom(8).hex()
+    stop_event = threading.Event()
+
     def rms_stream_generator():
-        # use module-level flag
-        global mic_check_running
-        mic_check_running = True
+        levels = queue.Queue(maxsize=100)
+
+        def callback(indata, frames, time_info, status):
+            if stop_event.is_set():
+                raise sd.CallbackStop()
+            samples = indata[:, 0].astype(np.float32)
+            if not levels.full():
+                levels.put_nowait(float(np.sqrt(np.mean(np.square(samples)))))
+
+        with _mic_checks_lock:
+            previous = _mic_checks.get(stream_id)
+            _mic_checks[stream_id] = stop_event
+        if previous is not None:
+            previous.set()
         try:
-            with sd.InputStream(callback=audio_callback):
-                while mic_check_running:
+            with sd.InputStream(callback=callback, dtype="int16"):
+                while not stop_event.is_set():
                     try:
-                        rms = rms_queue.get(timeout=1.0)
-                        payload = {
-                            "rms": round(rms, 4),
-                            "threshold": round(float(core_config.SILENCE_THRESHOLD), 4),
-                        }
-                        yield f"data: {json.dumps(payload)}\n\n"
+                        rms = levels.get(timeout=1.0)
                     except queue.Empty:
                         continue
+                    payload = {
+                        "rms": round(rms, 1),
+                        "threshold": round(float(core_config.SILENCE_THRESHOLD), 4),
+                    }
+                    yield f"data: {json.dumps(payload)}\n\n"
         except Exception as e:
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        finally:
+            with _mic_checks_lock:
+                if _mic_checks.get(stream_id) is stop_event:
+                    del _mic_checks[stream_id]
 
     return Response(rms_stream_generator(), mimetype="text/event-stream")
 
 
 @bp.route("/mic-check/stop")
 def mic_check_stop():
-    global mic_check_running
-    mic_check_running = False
+    stream_id = request.args.get("id")
+    if not stream_id:
+        return jsonify({"error": "Missing mic check id"}), 400
+    with _mic_checks_lock:
+        stop_event = _mic_checks.get(stream_id)
+    if stop_event is not None:
+        stop_event.set()
     return jsonify({"status": "stopped"})
 
 
 @bp.route("/mic-gain", methods=["GET", "POST"])
 def mic_gain():
-    card_index = get_usb_capture_card_index()
-    numid = get_mic_gain_numid(card_index)
-    if card_index is None or numid is None:
+    control = alsa.get().mic_gain
+    if control is None:
         return jsonify({"error": "Could not determine mic card or control ID"}), 500
     if request.method == "GET":
         try:
-            output = subprocess.check_output(
-                ["amixer", "-c", str(card_index), "cget", f"numid={numid}"], text=True
-            )
-            match = re.search(r": values=(\d+)", output)
-            gain = int(match.group(1)) if match else None
-            return jsonify({"gain": gain})
+            return jsonify({"gain": control.get()})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
     if request.method == "POST":
@@ -370,14 +340,7 @@ def mic_gain():
             data = request.get_json()
             value = int(data.get("value", 8))
             if 0 <= value <= 16:
-                subprocess.check_call([
-                    "amixer",
-                    "-c",
-                    str(card_index),
-                    "cset",
-                    f"numid={numid}",
-                    str(value),
-                ])
+                control.set(value)
                 return "OK"
             return jsonify({"error": "Mic gain must be between 0 and 16"}), 400
         except Exception as e:
@@ -388,20 +351,14 @@ def mic_gain():
 @bp.route("/volume", methods=["GET", "POST"])
 def volume():
     try:
-        card_index = get_usb_pcm_card_index()
-        base = amixer_base_args_for_card(card_index)
-        control = "PCM"
+        control = alsa.get().volume
+        if control is None:
+            return jsonify({"error": "Could not find the PCM volume control"}), 500
         if request.method == "GET":
-            output = subprocess.check_output(
-                ["amixer", *base, "get", control], text=True
-            )
-            m = re.search(r"\[(\d{1,3})%\]", output)
-            if not m:
-                return jsonify({"error": f"Could not parse volume for {control}"}), 500
             return jsonify({
-                "volume": int(m.group(1)),
-                "control": control,
-                "target": "default" if card_index is None else f"card {card_index}",
+                "volume": control.get_percent(),
+                "control": "PCM",
+                "target": control.target,
             })
         data = request.get_json()
         if data is None or "volume" not in data:
@@ -409,11 +366,11 @@ def volume():
         value = int(data["volume"])
         if not (0 <= value <= 100):
             return jsonify({"error": "Volume must be 0–100"}), 400
-        subprocess.check_call(["amixer", *base, "set", control, f"{value}%"])
+        control.set_percent(value)
         return jsonify({
             "volume": value,
-            "control": control,
-            "target": "default" if card_index is None else f"card {card_index}",
+            "control": "PCM",
+            "target": control.target,
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -422,28 +379,16 @@ def volume():
 @bp.route("/device-info")
 def device_info():
     try:
-        devices = sd.query_devices()
-        mic_name = "Unknown"
-        speaker_name = "Unknown"
-        for dev in devices:
-            if (
-                mic_name == "Unknown"
-                and dev["max_input_channels"] > 0
-                and (
-                    not core_config.MIC_PREFERENCE
-                    or core_config.MIC_PREFERENCE.lower() in dev["name"].lower()
-                )
-            ):
-                mic_name = dev["name"]
-            if (
-                speaker_name == "Unknown"
-                and dev["max_output_channels"] > 0
-                and (
-                    not core_config.SPEAKER_PREFERENCE
-                    or core_config.SPEAKER_PREFERENCE.lower() in dev["name"].lower()
-                )
-            ):
-                speaker_name = dev["name"]
-        return jsonify({"mic": mic_name, "speaker": speaker_name})
+        model = alsa.get()
+        return jsonify({"mic": model.mic_name, "speaker": model.speaker_name})
     except Exception as e:
         return jsonify({"mic": "Unknown", "speaker": "Unknown", "error": str(e)}), 500
+
+
+@bp.route("/audio/rescan", methods=["POST"])
+def rescan_audio_devices():
+    """Rediscover sound cards and mixer controls (e.g. after replugging)."""
+    try:
+        return jsonify(alsa.rescan().summary())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
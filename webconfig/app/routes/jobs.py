@@ -0,0 +1,19 @@
+from flask import Blueprint, jsonify
+
+from ..jobs import jobs
+
+
+bp = Blueprint("jobs", __name__)
+
+
+@bp.route("/jobs")
+def list_jobs():
+    return jsonify(jobs.list())
+
+
+@bp.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    return jsonify(job)
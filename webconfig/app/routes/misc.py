@@ -4,6 +4,8 @@ import subprocess
 
 from flask import Blueprint, jsonify, request
 
+from ..billy_ipc import BillyUnavailable, billy
+
 
 bp = Blueprint("misc", __name__)
 
@@ -121,10 +123,9 @@ def service_status():
         memory_count = 0
         if current_user:
             try:
-                memories = current_user.get_memories(
-                    100
-                )  # Get up to 100 memories to count
-                memory_count = len(memories)
+                from core.memory_store import memory_store
+
+                memory_count = memory_store.count(current_user.name)
             except Exception as e:
                 print(f"Failed to get memory count: {e}")
 
@@ -339,6 +340,19 @@ def change_password():
 @bp.route("/test-motor", methods=["POST"])
 def test_motor():
     """Test individual motors (mouth, head, or tail)."""
+    motor = (request.get_json() or {}).get("motor")
+    if motor not in ("mouth", "head", "tail"):
+        return jsonify({"error": "Invalid motor"}), 400
+
+    # A running Billy owns the GPIO: ask it to move instead of stopping it
+    try:
+        billy.call("motor.test", timeout=5.0, motor=motor)
+        return jsonify({"status": f"{motor} tested", "service_was_active": True})
+    except BillyUnavailable:
+        pass
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 500
+
     try:
         import time
 
@@ -356,9 +370,6 @@ def test_motor():
             subprocess.check_call(["sudo", "systemctl", "stop", "billy.service"])
             time.sleep(1)  # Wait for service to fully release GPIO
 
-        data = request.get_json()
-        motor = data.get("motor")
-
         import core.movements as movements
 
         # Perform the requested test
@@ -370,8 +381,6 @@ def test_motor():
             movements.move_head("off")
         elif motor == "tail":
             movements.move_tail(duration=1)
-        else:
-            return jsonify({"error": "Invalid motor"}), 400
 
         # Release GPIO pins so billy.service can reclaim them
         movements.cleanup_gpio()
@@ -1,12 +1,19 @@
 import configparser
+import os
+import threading
+from pathlib import Path
 
 from flask import Blueprint, jsonify, request, send_file
 
+from ..billy_ipc import BillyUnavailable, billy
 from ..state import PERSONA_PATH
 
 
 bp = Blueprint("persona", __name__)
 
+# Guards read-modify-write of persona.ini files across request threads
+_persona_file_lock = threading.Lock()
+
 
 @bp.route("/persona", methods=["GET"])
 def get_default_persona():
@@ -54,16 +61,10 @@ def delete_persona(persona_name):
         return jsonify({"error": "Cannot delete the default persona"}), 400
 
     try:
-        from pathlib import Path
-
-        personas_dir = Path("personas")
-        # Check new folder structure first: personas/persona_name/persona.ini
-        persona_file = personas_dir / persona_name / "persona.ini"
-        if not persona_file.exists():
-            # Fall back to old structure: personas/persona_name.ini
-            persona_file = personas_dir / f"{persona_name}.ini"
+        from core.persona_manager import persona_manager
 
-        if not persona_file.exists():
+        persona_file = persona_manager.catalog.path_for(persona_name)
+        if persona_file is None:
             return jsonify({"error": f"Persona '{persona_name}' not found"}), 404
 
         # If it's a folder structure, remove the entire folder
@@ -78,6 +79,8 @@ def delete_persona(persona_name):
             # Old structure, just remove the file
             persona_file.unlink()
 
+        persona_manager.clear_persona_cache(persona_name)
+
         return jsonify({"message": f"Persona '{persona_name}' deleted successfully"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -105,6 +108,11 @@ def switch_persona():
 
         # Switch persona manager to new persona
         persona_manager.switch_persona(persona_name)
+        try:
+            # The running Billy switches straight away, not on its next session
+            billy.call("persona.switch", name=persona_name)
+        except (BillyUnavailable, RuntimeError) as e:
+            print(f"Billy did not switch persona live: {e}")
 
         # If there's a current user (not guest), also update their preferred persona
         current_user = user_manager.get_current_user()
@@ -198,6 +206,34 @@ def save_persona():
     return jsonify({"status": "ok"})
 
 
+def save_wakeup_phrases(persona_name: str, phrases: dict) -> None:
+    """Set ``[WAKEUP]`` phrases (index -> text) of a persona in one write.
+
+    Requests run on many threads, so the read-modify-write is serialised and
+    the file is replaced atomically; a concurrent reader never sees it
+    half-written.
+    """
+    # Determine the file path based on the persona
+    if persona_name == "default":
+        persona_file = Path(PERSONA_PATH)
+    else:
+        persona_file = Path("personas") / persona_name / "persona.ini"
+
+    with _persona_file_lock:
+        # Ensure the directory exists
+        persona_file.parent.mkdir(exist_ok=True)
+        config = configparser.ConfigParser()
+        config.read(persona_file)
+        if "WAKEUP" not in config:
+            config["WAKEUP"] = {}
+        for index, phrase in phrases.items():
+            config["WAKEUP"][str(index)] = phrase
+        partial = persona_file.with_name(f"{persona_file.name}.partial")
+        with open(partial, "w") as f:
+            config.write(f)
+        os.replace(partial, persona_file)
+
+
 @bp.route("/persona/wakeup", methods=["POST"])
 def save_single_wakeup_phrase():
     data = request.get_json()
@@ -215,24 +251,7 @@ def save_single_wakeup_phrase():
     except Exception:
         pass
 
-    # Determine the file path based on current persona
-    if current_persona == "default":
-        persona_file = PERSONA_PATH
-    else:
-        from pathlib import Path
-
-        personas_dir = Path("personas")
-        persona_file = personas_dir / current_persona / "persona.ini"
-        # Ensure the directory exists
-        persona_file.parent.mkdir(exist_ok=True)
-
-    config = configparser.ConfigParser()
-    config.read(persona_file)
-    if "WAKEUP" not in config:
-        config["WAKEUP"] = {}
-    config["WAKEUP"][index] = phrase
-    with open(persona_file, "w") as f:
-        config.write(f)
+    save_wakeup_phrases(current_persona, {index: phrase})
     return jsonify({"status": "ok"})
 
 
@@ -249,6 +268,10 @@ def import_persona():
     try:
         with open(PERSONA_PATH, 'w') as f:
             f.write(ini)
+
+        from core.persona_manager import persona_manager
+
+        persona_manager.clear_persona_cache("default")
         return jsonify({'status': 'ok'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -27,6 +27,23 @@ def _get_env_path() -> Path:
     return project_root / ".env"
 
 
+def _profile_index():
+    """Return the shared profile index (imported lazily to avoid circular imports)."""
+    from core.profile_manager import user_manager
+
+    return user_manager.profile_index
+
+
+def _fold_profile_journal(profile_name: str) -> None:
+    """Compact pending journaled mutations into the INI before editing it."""
+    from core.profile_manager import UserProfile
+    from core.profile_store import journal_path_for
+
+    profile_file = get_profiles_dir() / f"{profile_name.lower()}.ini"
+    if profile_file.exists() and journal_path_for(profile_file).exists():
+        UserProfile(profile_name).compact(wait=True)
+
+
 profiles_bp = Blueprint('profiles', __name__)
 
 
@@ -38,30 +55,22 @@ def list_profiles():
         if not profiles_dir.exists():
             return jsonify({"profiles": []})
 
+        index = _profile_index()
         profiles = []
-        for profile_file in profiles_dir.glob("*.ini"):
-            profile_name = profile_file.stem.title()  # Convert to title case
-
-            # Read display name from profile
-            display_name = profile_name  # Default to profile name
+        for stem in index.names():
+            profile_file = profiles_dir / f"{stem}.ini"
             try:
-                import configparser
-
-                config = configparser.ConfigParser()
-                config.read(profile_file)
-                if config.has_section("USER_INFO") and config.has_option(
-                    "USER_INFO", "display_name"
-                ):
-                    display_name = config.get("USER_INFO", "display_name")
-            except Exception:
-                pass  # Use default display name if reading fails
+                stat = profile_file.stat()
+            except FileNotFoundError:
+                continue
+            profile_name = stem.title()  # Convert to title case
 
             profiles.append({
                 "name": profile_name,
-                "display_name": display_name,
+                "display_name": index.display_name(stem) or profile_name,
                 "file": str(profile_file),
-                "size": profile_file.stat().st_size,
-                "modified": profile_file.stat().st_mtime,
+                "size": stat.st_size,
+                "modified": stat.st_mtime,
             })
 
         return jsonify({"profiles": profiles})
@@ -103,6 +112,13 @@ def delete_profile(profile_name):
             return jsonify({"error": "Profile not found"}), 404
 
         profile_file.unlink()
+        from core.profile_store import journal_path_for
+
+        journal_path_for(profile_file).unlink(missing_ok=True)
+        from core.memory_store import memory_store
+
+        memory_store.delete_user(profile_name)
+        _profile_index().remove(profile_name)
         return jsonify({"message": f"Profile {profile_name} deleted successfully"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -196,7 +212,7 @@ def get_current_user():
         return jsonify({
             "user": {
                 "name": current_user.name,
-                "data": current_user.data,
+                "data": current_user.to_dict(),
                 "memories": current_user.get_memories(10),  # Last 10 memories
                 "context": current_user.get_context_string(),
             }
@@ -237,7 +253,7 @@ def set_current_user():
 
             return jsonify({
                 "message": f"Switched to user: {user_name}",
-                "user": {"name": profile.name, "data": profile.data},
+                "user": {"name": profile.name, "data": profile.to_dict()},
             })
         return jsonify({"error": "Failed to load user profile"}), 500
 
@@ -335,7 +351,8 @@ def rename_profile():
         if new_file.exists():
             return jsonify({"error": "A profile with this name already exists"}), 400
 
-        # Rename the file
+        # Rename the file (folding any journaled changes in first)
+        _fold_profile_journal(old_name)
         old_file.rename(new_file)
 
         # Update the profile name inside the file
@@ -350,6 +367,10 @@ def rename_profile():
             with open(new_file, 'w') as f:
                 config.write(f)
 
+        _profile_index().rename(old_name, new_name)
+        from core.memory_store import memory_store
+
+        memory_store.rename_user(old_name, new_name)
         return jsonify({"message": f"Profile renamed from {old_name} to {new_name}"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -372,54 +393,20 @@ def delete_memory():
         if not profile_file.exists():
             return jsonify({"error": "Profile not found"}), 404
 
-        # Read the profile
-        import configparser
-
-        config = configparser.ConfigParser()
-        config.read(profile_file)
-
-        if not config.has_section("CORE_MEMORIES"):
-            return jsonify({"error": "No memories found"}), 404
-
-        # Parse existing memories
-        memories_str = config.get("CORE_MEMORIES", "memories", fallback="[]")
-        try:
-            memories = json.loads(memories_str)
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error in delete_memory: {e}")
-            print(f"Malformed memories string: {memories_str}")
-            return jsonify({"error": f"Invalid memories format: {str(e)}"}), 500
-
-        # Find and remove the memory with matching ID
-        original_count = len(memories)
-        print(f"DEBUG: Original memory count: {original_count}")
-        print(f"DEBUG: Looking for memory ID: {memory_id}")
-        print(f"DEBUG: Available memory IDs: {[m.get('id') for m in memories]}")
+        from core.memory_store import memory_store
 
         # Handle both real IDs and temporary IDs (for backward compatibility)
         if memory_id.startswith('temp_'):
             # For temporary IDs, use the date part to match
-            date_part = memory_id.replace('temp_', '')
-            print(f"DEBUG: Using date-based matching for temp ID: {date_part}")
-            memories = [m for m in memories if m.get("date") != date_part]
+            deleted = memory_store.delete_by_date(
+                user_name, memory_id.replace('temp_', '')
+            )
         else:
-            # For real IDs, match by ID
-            print(f"DEBUG: Using ID-based matching")
-            memories = [m for m in memories if m.get("id") != memory_id]
-
-        new_count = len(memories)
-        print(f"DEBUG: New memory count: {new_count}")
+            deleted = memory_store.delete(user_name, memory_id)
 
-        if new_count == original_count:
-            print(f"DEBUG: No memory was removed - memory not found")
+        if not deleted:
             return jsonify({"error": "Memory not found"}), 404
 
-        # Update the profile
-        config.set("CORE_MEMORIES", "memories", json.dumps(memories))
-
-        with open(profile_file, 'w') as f:
-            config.write(f)
-
         return jsonify({"message": "Memory deleted successfully"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -445,56 +432,24 @@ def update_memory():
         if not profile_file.exists():
             return jsonify({"error": "Profile not found"}), 404
 
-        # Read the profile
-        import configparser
-
-        config = configparser.ConfigParser()
-        config.read(profile_file)
-
-        if not config.has_section("CORE_MEMORIES"):
-            return jsonify({"error": "No memories found"}), 404
-
-        # Parse existing memories
-        memories_str = config.get("CORE_MEMORIES", "memories", fallback="[]")
-        try:
-            memories = json.loads(memories_str)
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error in update_memory: {e}")
-            print(f"Malformed memories string: {memories_str}")
-            return jsonify({"error": f"Invalid memories format: {str(e)}"}), 500
-
-        # Find and update the memory with matching ID
-        memory_found = False
+        from core.memory_store import memory_store
 
         # Handle both real IDs and temporary IDs (for backward compatibility)
         if memory_id.startswith('temp_'):
-            # For temporary IDs, use the date part to match
             date_part = memory_id.replace('temp_', '')
-            for memory in memories:
-                if memory.get("date") == date_part:
-                    memory["memory"] = new_memory
-                    memory["category"] = new_category
-                    memory["importance"] = new_importance
-                    memory_found = True
-                    break
-        else:
-            # For real IDs, match by ID
-            for memory in memories:
-                if memory.get("id") == memory_id:
-                    memory["memory"] = new_memory
-                    memory["category"] = new_category
-                    memory["importance"] = new_importance
-                    memory_found = True
-                    break
-
-        if not memory_found:
-            return jsonify({"error": "Memory not found"}), 404
-
-        # Update the profile
-        config.set("CORE_MEMORIES", "memories", json.dumps(memories))
+            memory_id = next(
+                (
+                    m["id"]
+                    for m in memory_store.recent(user_name)
+                    if m.get("date") == date_part
+                ),
+                "",
+            )
 
-        with open(profile_file, 'w') as f:
-            config.write(f)
+        if not memory_id or not memory_store.update(
+            user_name, memory_id, new_memory, new_category, new_importance
+        ):
+            return jsonify({"error": "Memory not found"}), 404
 
         return jsonify({"message": "Memory updated successfully"})
     except Exception as e:
@@ -518,19 +473,10 @@ def save_memories():
         if not profile_file.exists():
             return jsonify({"error": "Profile not found"}), 404
 
-        # Read the profile
-        import configparser
-
-        config = configparser.ConfigParser()
-        config.read(profile_file)
+        from core.memory_store import memory_store
 
-        # Update the memories
-        config.set("CORE_MEMORIES", "memories", json.dumps(memories))
-
-        with open(profile_file, 'w') as f:
-            config.write(f)
-
-        return jsonify({"message": f"Saved {len(memories)} memories successfully"})
+        saved = memory_store.replace_all(user_name, memories)
+        return jsonify({"message": f"Saved {saved} memories successfully"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -585,6 +531,7 @@ def update_display_name():
         # Write back to file
         with open(profile_file, 'w') as f:
             config.write(f)
+        _profile_index().update(user, display_name or None)
 
         return jsonify({"message": f"Updated display name for {user}'s profile"})
 
@@ -607,8 +554,25 @@ def export_profile(profile_name):
         print(f"DEBUG: Profile file not found: {profile_file}")
         return jsonify({'error': 'Profile not found'}), 404
 
+    # Memories live in the memory store; put them back into the exported INI
+    import configparser
+    import io
+
+    from core.memory_store import memory_store
+
+    _fold_profile_journal(profile_name)
+    config = configparser.ConfigParser()
+    config.read(profile_file)
+    if not config.has_section("CORE_MEMORIES"):
+        config.add_section("CORE_MEMORIES")
+    config.set(
+        "CORE_MEMORIES", "memories", json.dumps(memory_store.recent(profile_name))
+    )
+    buffer = io.StringIO()
+    config.write(buffer)
+
     return send_file(
-        str(profile_file),
+        io.BytesIO(buffer.getvalue().encode("utf-8")),
         as_attachment=True,
         download_name=f"{profile_name}.ini",
         mimetype="text/plain",
@@ -639,6 +603,21 @@ def import_profile(profile_name):
         # Write the imported content
         with open(target_file, 'w') as f:
             f.write(ini_content)
+        _profile_index().update(profile_name)
+
+        # Imported memories replace the profile's memories in the memory store
+        import configparser
+
+        from core.memory_store import memory_store, parse_ini_memories
+        from core.profile_store import journal_path_for
+
+        journal_path_for(target_file).unlink(missing_ok=True)
+        config = configparser.ConfigParser()
+        config.read_string(ini_content)
+        memory_store.replace_all(
+            profile_name,
+            parse_ini_memories(config.get("CORE_MEMORIES", "memories", fallback="[]")),
+        )
 
         return jsonify({'status': 'ok'})
     except Exception as e:
@@ -16,6 +16,7 @@ from packaging.version import parse as parse_version
 from core.news_manager import load_news_sources, save_news_sources
 
 from ..core_imports import core_config, voice_provider_registry
+from ..jobs import jobs
 from ..state import (
     PROJECT_ROOT,
     RELEASE_NOTE,
@@ -66,6 +67,7 @@ CONFIG_KEYS = [
     "FLAP_ON_BOOT",
     "NEWS_REQUEST_TIMEOUT_SECONDS",
     "WAKE_WORD_ENABLED",
+    "WAKE_WORD_ENGINE",
     "WAKE_WORD_SENSITIVITY",
     "WAKE_WORD_THRESHOLD",
     "WAKE_WORD_ENDPOINT",
@@ -244,7 +246,7 @@ def _remove_active_wifi_connections() -> dict:
     errors: list[str] = []
     try:
         logger.info(
-            "[factory_reset] Checking active NetworkManager connections...", "📡"
+            "[factory_reset] Checking active NetworkManager connections...", emoji="📡"
         )
         result = subprocess.run(
             ["nmcli", "-t", "-f", "NAME,TYPE,DEVICE", "connection", "show", "--active"],
@@ -392,6 +394,69 @@ def version_info():
     return jsonify(response)
 
 
+def _install_requirements(report) -> None:
+    report(0.5, "Installing requirements")
+    venv_pip = os.path.join(PROJECT_ROOT, "venv", "bin", "pip")
+    output = subprocess.check_output(
+        [venv_pip, "install", "--upgrade", "-r", "requirements.txt"],
+        cwd=PROJECT_ROOT,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    logger.info(f"📦 Pip install output:\n{output}")
+
+
+def _restart_services_soon() -> None:
+    # Late enough for the finished job to reach the browser first
+    for unit in ("billy-webconfig.service", "billy.service"):
+        threading.Thread(
+            target=lambda unit=unit: (
+                time.sleep(2),
+                subprocess.run(["sudo", "systemctl", "restart", unit]),
+            )
+        ).start()
+
+
+def _run_update(report, latest: str) -> dict:
+    report(0.05, "Fetching releases")
+    subprocess.check_output(["git", "remote", "-v"], cwd=PROJECT_ROOT, text=True)
+    subprocess.check_call(["git", "fetch", "--tags"], cwd=PROJECT_ROOT)
+    report(0.3, f"Checking out {latest}")
+    subprocess.check_call(
+        ["git", "checkout", "--force", f"tags/{latest}"], cwd=PROJECT_ROOT
+    )
+    _install_requirements(report)
+    # Refresh current version from git after checkout to ensure accuracy
+    actual_current = get_current_version()
+    save_versions(actual_current, latest)
+    report(0.95, "Restarting services")
+    _restart_services_soon()
+    return {"status": "updated", "version": latest}
+
+
+def _run_simulated_update(report) -> dict:
+    versions = load_versions()
+    latest = versions["version"].get("latest", "unknown")
+
+    # Keep current code version: reinstall deps for current checkout and restart services.
+    report(0.1, "Checking out the current revision")
+    current_ref = subprocess.check_output(
+        ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, text=True
+    ).strip()
+    subprocess.check_call(["git", "checkout", "--force", current_ref], cwd=PROJECT_ROOT)
+    _install_requirements(report)
+
+    actual_current = get_current_version()
+    save_versions(actual_current, latest)
+    report(0.95, "Restarting services")
+    _restart_services_soon()
+    return {
+        "status": "restarting",
+        "message": "Simulated update complete. Restarting services...",
+        "version": actual_current,
+    }
+
+
 @bp.route("/update", methods=["POST"])
 def perform_update():
     versions = load_versions()
@@ -399,99 +464,15 @@ def perform_update():
     latest = versions["version"].get("latest", "unknown")
     if current == latest or latest == "unknown":
         return jsonify({"status": "up-to-date", "version": current})
-    try:
-        subprocess.check_output(["git", "remote", "-v"], cwd=PROJECT_ROOT, text=True)
-        subprocess.check_call(["git", "fetch", "--tags"], cwd=PROJECT_ROOT)
-        subprocess.check_call(
-            ["git", "checkout", "--force", f"tags/{latest}"], cwd=PROJECT_ROOT
-        )
-        venv_pip = os.path.join(PROJECT_ROOT, "venv", "bin", "pip")
-        output = subprocess.check_output(
-            [venv_pip, "install", "--upgrade", "-r", "requirements.txt"],
-            cwd=PROJECT_ROOT,
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
-        logger.info(f"📦 Pip install output:\n{output}")
-        # Refresh current version from git after checkout to ensure accuracy
-        actual_current = get_current_version()
-        save_versions(actual_current, latest)
-        threading.Thread(
-            target=lambda: (
-                time.sleep(2),
-                subprocess.run([
-                    "sudo",
-                    "systemctl",
-                    "restart",
-                    "billy-webconfig.service",
-                ]),
-            )
-        ).start()
-        threading.Thread(
-            target=lambda: (
-                time.sleep(2),
-                subprocess.run(["sudo", "systemctl", "restart", "billy.service"]),
-            )
-        ).start()
-        return jsonify({"status": "updated", "version": latest})
-    except subprocess.CalledProcessError as e:
-        return jsonify({"status": "error", "error": str(e)}), 500
+    job = jobs.submit("update", _run_update, latest, exclusive=True)
+    return jsonify({"status": "started", "job": job}), 202
 
 
 @bp.route("/update-simulate", methods=["POST"])
 def simulate_update():
     """Run update workflow against currently checked-out revision."""
-    try:
-        versions = load_versions()
-        latest = versions["version"].get("latest", "unknown")
-
-        # Keep current code version: reinstall deps for current checkout and restart services.
-        current_ref = subprocess.check_output(
-            ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, text=True
-        ).strip()
-        subprocess.check_call(
-            ["git", "checkout", "--force", current_ref], cwd=PROJECT_ROOT
-        )
-
-        venv_pip = os.path.join(PROJECT_ROOT, "venv", "bin", "pip")
-        output = subprocess.check_output(
-            [venv_pip, "install", "--upgrade", "-r", "requirements.txt"],
-            cwd=PROJECT_ROOT,
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
-        logger.info(f"📦 Simulated update pip output:\n{output}")
-
-        actual_current = get_current_version()
-        save_versions(actual_current, latest)
-
-        threading.Thread(
-            target=lambda: (
-                time.sleep(2),
-                subprocess.run([
-                    "sudo",
-                    "systemctl",
-                    "restart",
-                    "billy-webconfig.service",
-                ]),
-            )
-        ).start()
-        threading.Thread(
-            target=lambda: (
-                time.sleep(2),
-                subprocess.run(["sudo", "systemctl", "restart", "billy.service"]),
-            )
-        ).start()
-
-        return jsonify({
-            "status": "restarting",
-            "message": "Simulated update complete. Restarting services...",
-            "version": actual_current,
-        })
-    except subprocess.CalledProcessError as e:
-        return jsonify({"status": "error", "error": str(e)}), 500
-    except Exception as e:
-        return jsonify({"status": "error", "error": str(e)}), 500
+    job = jobs.submit("update", _run_simulated_update, exclusive=True)
+    return jsonify({"status": "started", "job": job}), 202
 
 
 @bp.route("/release-note")
@@ -585,7 +566,7 @@ def get_config():
         if current_user:
             config_data["CURRENT_USER"] = {
                 "name": current_user.name,
-                "data": current_user.data,
+                "data": current_user.to_dict(),
                 "memories": current_user.get_memories(10),
                 "context": current_user.get_context_string(),
             }
@@ -770,7 +751,7 @@ def auto_refresh_config():
             if current_user:
                 config_data["CURRENT_USER"] = {
                     "name": current_user.name,
-                    "data": current_user.data,
+                    "data": current_user.to_dict(),
                     "memories": current_user.get_memories(10),
                     "context": current_user.get_context_string(),
                 }
@@ -1,7 +1,9 @@
 """Wake word detection web routes.
 
 Exposes the WakeWordController's functionality (status, events, runtime config,
-test triggers, and calibration) to the web dashboard.
+test triggers, and calibration) to the web dashboard. Requests go to the
+controller in the running Billy process over the control socket; this
+process's own controller is only used when Billy is not running.
 """
 
 import dataclasses
@@ -11,13 +13,33 @@ import numpy as np
 import sounddevice as sd
 from flask import Blueprint, jsonify, request
 
+from ..billy_ipc import BillyUnavailable, billy
+
 
 bp = Blueprint("wake_word", __name__)
 
 
+def _set_parameters(controller, params: dict) -> None:
+    try:
+        billy.call("wake_word.configure", timeout=5.0, **params)
+    except BillyUnavailable:
+        controller.set_parameters(**params)
+
+
 @bp.route("/wake-word/status")
 def status():
     """Return current wake word controller status."""
+    try:
+        return jsonify(billy.call("wake_word.status"))
+    except BillyUnavailable:
+        pass
+    except RuntimeError as e:
+        return jsonify({
+            "enabled": False,
+            "running": False,
+            "error": str(e),
+            "mode": "unavailable",
+        })
     try:
         from core.hotword import controller
 
@@ -34,6 +56,13 @@ def status():
 @bp.route("/wake-word/events")
 def events():
     """Drain up to 50 pending events from the controller queue."""
+    try:
+        drained = billy.call("wake_word.events", limit=50)
+        return jsonify({"events": drained, "count": len(drained)})
+    except BillyUnavailable:
+        pass
+    except RuntimeError as e:
+        return jsonify({"events": [], "count": 0, "error": str(e)})
     try:
         import queue as queue_module
 
@@ -66,6 +95,8 @@ def runtime_config():
                 "1",
                 "yes",
             )
+        if "engine" in data:
+            params["engine"] = str(data["engine"])
         if "sensitivity" in data:
             params["sensitivity"] = float(data["sensitivity"])
         if "threshold" in data:
@@ -74,7 +105,7 @@ def runtime_config():
             params["endpoint"] = str(data["endpoint"])
         if "porcupine_access_key" in data:
             params["porcupine_access_key"] = str(data["porcupine_access_key"])
-        controller.set_parameters(**params)
+        _set_parameters(controller, params)
         return jsonify({"status": "ok", "applied": list(params.keys())})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -85,68 +116,89 @@ def test():
     """Simulate or stop a session trigger for testing."""
     data = request.get_json() or {}
     action = data.get("action", "simulate")
-    try:
-        from core.trigger import trigger_session_start, trigger_session_stop
-
-        if action == "simulate":
-            trigger_session_start("ui_test")
-            return jsonify({"status": "ok", "action": "simulate"})
-        if action == "stop":
-            trigger_session_stop("ui_test")
-            return jsonify({"status": "ok", "action": "stop"})
+    if action not in ("simulate", "stop"):
         return jsonify({"error": f"Unknown action: {action}"}), 400
+    try:
+        method = "session.start" if action == "simulate" else "session.stop"
+        try:
+            billy.call(method, source="ui_test")
+        except BillyUnavailable:
+            from core.trigger import trigger_session_start, trigger_session_stop
+
+            trigger = trigger_session_start if action == "simulate" else trigger_session_stop
+            trigger("ui_test")
+        return jsonify({"status": "ok", "action": action})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @bp.route("/wake-word/calibrate", methods=["POST"])
 def calibrate():
-    """Record ambient or phrase audio and return RMS metrics."""
+    """Measure ambient or phrase audio and return RMS metrics.
+
+    Uses the meter frames of Billy's own mic input, so the listener keeps
+    running; only without a running Billy is a local input stream opened.
+    """
     data = request.get_json() or {}
     mode = data.get("mode", "ambient")
     duration = 3  # seconds -- sufficient for RMS baseline
 
     try:
-        from core.hotword import controller
-
-        # Pause wake word listener to free the mic
-        controller.notify_session_state(True)
         try:
-            rms_values = []
-
-            def _cal_callback(indata, frames, time_info, status):
-                rms = float(np.sqrt(np.mean(np.square(indata))))
-                rms_values.append(rms)
-
-            with sd.InputStream(callback=_cal_callback):
-                time.sleep(duration)
-
+            frames = billy.call("meter.capture", timeout=duration + 2, seconds=duration)
+            rms_values = [frame["rms"] for frame in frames]
             if not rms_values:
-                return jsonify({"error": "No audio data captured"}), 500
-
-            rms_mean = float(np.mean(rms_values))
-            rms_peak = float(np.max(rms_values))
-            # For ambient mode: suggest threshold 50% above peak noise
-            suggested_threshold = round(rms_peak * 1.5) if mode == "ambient" else None
-
-            result = {
-                "mode": mode,
-                "rms_mean": round(rms_mean, 1),
-                "rms_peak": round(rms_peak, 1),
-                "duration_seconds": duration,
-                "sample_count": len(rms_values),
-            }
-            if suggested_threshold is not None:
-                result["suggested_threshold"] = suggested_threshold
-
-            return jsonify(result)
-        finally:
-            # Always resume wake word listener
-            controller.notify_session_state(False)
+                return jsonify({
+                    "error": "Billy is not listening to the mic right now; "
+                    "enable the wake word and try again"
+                }), 409
+        except BillyUnavailable:
+            rms_values = _record_locally(duration)
+
+        if not rms_values:
+            return jsonify({"error": "No audio data captured"}), 500
+
+        rms_mean = float(np.mean(rms_values))
+        rms_peak = float(np.max(rms_values))
+        # For ambient mode: suggest threshold 50% above peak noise
+        suggested_threshold = round(rms_peak * 1.5) if mode == "ambient" else None
+
+        result = {
+            "mode": mode,
+            "rms_mean": round(rms_mean, 1),
+            "rms_peak": round(rms_peak, 1),
+            "duration_seconds": duration,
+            "sample_count": len(rms_values),
+        }
+        if suggested_threshold is not None:
+            result["suggested_threshold"] = suggested_threshold
+
+        return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def _record_locally(duration: float) -> list[float]:
+    from core.hotword import controller
+
+    # Pause this process's wake word listener to free the mic
+    controller.notify_session_state(True)
+    try:
+        rms_values = []
+
+        def _cal_callback(indata, frames, time_info, status):
+            samples = indata[:, 0].astype(np.float32)
+            rms_values.append(float(np.sqrt(np.mean(np.square(samples)))))
+
+        # int16 like Billy's own input, so levels match WAKE_WORD_THRESHOLD
+        with sd.InputStream(callback=_cal_callback, dtype="int16"):
+            time.sleep(duration)
+        return rms_values
+    finally:
+        # Always resume wake word listener
+        controller.notify_session_state(False)
+
+
 @bp.route("/wake-word/calibrate/apply", methods=["POST"])
 def calibrate_apply():
     """Persist calibration values to .env and update runtime controller."""
@@ -185,7 +237,7 @@ def calibrate_apply():
         if "sensitivity" in data:
             params["sensitivity"] = float(data["sensitivity"])
         if params:
-            controller.set_parameters(**params)
+            _set_parameters(controller, params)
 
         return jsonify({"status": "ok", "applied": applied})
     except Exception as e:
@@ -1,80 +1,344 @@
+"""Live status and log updates for the dashboard over ``/ws``.
+
+One shared ``ServiceMonitor`` produces updates for every connected tab: it
+follows the billy.service journal with a single ``journalctl -f`` process and
+re-checks ``systemctl is-active`` only when systemd logs something about the
+unit (or every ``STATE_POLL_SECONDS`` as a fallback). Only new log lines and
+changed status fields are broadcast through the hub; a newly connected tab
+first gets a snapshot of the full status and the last ``BACKLOG_LINES`` lines.
+The monitor runs while at least one tab is connected.
+
+While it runs, the monitor also follows the Billy runtime's own events over
+the control socket: persona and state changes become status fields, and
+everything else (mic levels, wake-word events) is forwarded as
+``{"type": "billy", "topic": ..., "data": ...}``. Persona is only read
+in-process when the runtime cannot be reached.
+
+Live mic meters (``{"type": "meter"}``, ~20 per second) are opt-in: a tab
+sends ``{"type": "meters", "enabled": true}`` and joins the meters channel,
+and only while that channel has members does the monitor ask Billy for them.
+"""
+
 import json
+import os
+import select
 import subprocess
+import threading
 import time
+from collections import deque
 
 from flask import Blueprint
 from flask_sock import Sock
 
+from core.logger import logger
+
+from .billy_ipc import billy
+from .hub import Subscription, hub
+
 
 bp = Blueprint("websocket", __name__)
 sock = Sock()
 
+UNIT = "billy.service"
+BACKLOG_LINES = 50
+STATE_POLL_SECONDS = 10.0
+PERSONA_POLL_SECONDS = 1.0
+JOURNAL_RESTART_SECONDS = 2.0
+MAX_BATCH_LINES = 100
+# A burst (startup, traceback) is sent once the journal is quiet this long
+BATCH_WINDOW_SECONDS = 0.05
+IDLE_CHECK_SECONDS = 15.0
+BILLY_TOPICS = ["state", "persona", "wake_word"]
+METER_CHANNEL = "meters"
 
-def get_service_status():
-    """Get full billy.service status with persona/personality data."""
+
+def get_service_state() -> str:
+    """``systemctl is-active`` for billy.service."""
     try:
         result = subprocess.run(
-            ["systemctl", "is-active", "billy.service"],
+            ["systemctl", "is-active", UNIT],
             capture_output=True,
             text=True,
             timeout=2,
         )
-        status = result.stdout.strip()
+        return result.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
 
-        # Get persona and personality data
-        try:
-            from core.persona_manager import persona_manager
-            from core.personality import PERSONALITY
-
-            return {
-                "status": status,
-                "current_persona": persona_manager.current_persona,
-                "current_personality": PERSONALITY.to_dict()
-                if hasattr(PERSONALITY, 'to_dict')
-                else None,
-            }
-        except Exception:
-            return {"status": status}
+
+def get_persona_status() -> dict:
+    """Current persona and personality as seen by this process."""
+    try:
+        from core.persona_manager import persona_manager
+        from core.personality import PERSONALITY
+
+        return {
+            "current_persona": persona_manager.current_persona,
+            "current_personality": PERSONALITY.to_dict()
+            if hasattr(PERSONALITY, 'to_dict')
+            else None,
+        }
     except Exception:
-        return {"status": "unknown"}
+        return {}
 
 
-def get_logs(lines=50):
-    """Get recent logs from billy.service."""
+def get_service_status():
+    """Get full billy.service status with persona/personality data."""
+    return {"status": get_service_state(), **get_persona_status()}
+
+
+def format_journal_entry(entry: dict) -> str:
+    """Render a ``journalctl -o json`` entry like ``-o short`` does."""
     try:
-        result = subprocess.run(
-            ["journalctl", "-u", "billy.service", "-n", str(lines), "--no-pager"],
-            capture_output=True,
-            text=True,
-            timeout=2,
-        )
-        return result.stdout
+        stamp = int(entry.get("__REALTIME_TIMESTAMP", "0")) / 1_000_000
+    except (TypeError, ValueError):
+        stamp = time.time()
+    message = entry.get("MESSAGE", "")
+    if isinstance(message, list):  # non-UTF-8 messages come as byte arrays
+        message = bytes(message).decode("utf-8", errors="replace")
+    ident = entry.get("SYSLOG_IDENTIFIER") or entry.get("_COMM") or "?"
+    pid = entry.get("_PID")
+    source = f"{ident}[{pid}]" if pid else ident
+    return (
+        f"{time.strftime('%b %d %H:%M:%S', time.localtime(stamp))} "
+        f"{entry.get('_HOSTNAME', '')} {source}: {message}"
+    )
+
+
+def _is_systemd_entry(entry: dict) -> bool:
+    # systemd's own "Started/Stopping/Failed" lines for the unit
+    return entry.get("_PID") == "1" or entry.get("SYSLOG_IDENTIFIER") == "systemd"
+
+
+class ServiceMonitor:
+    """Shared producer of status deltas and new journal lines."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._status: dict = {}
+        self._backlog: deque[str] = deque(maxlen=BACKLOG_LINES)
+        self._cursor: str | None = None
+        self._stop: threading.Event | None = None
+        self._state_dirty = threading.Event()
+        self._proc: subprocess.Popen | None = None
+
+    # ---- Subscribers -----------------------------------------------------
+    def subscribe(self) -> tuple[Subscription, list[dict]]:
+        """Subscribe a client; returns its subscription and initial snapshot."""
+        with self._lock:
+            subscription = hub.subscribe()
+            return subscription, self.snapshot()
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return [
+                {"type": "status", "data": dict(self._status)},
+                {
+                    "type": "log_lines",
+                    "data": {"lines": list(self._backlog), "reset": True},
+                },
+            ]
+
+    def on_subscribers_changed(self, count: int) -> None:
+        with self._lock:
+            if count and self._stop is None:
+                self._start()
+            elif not count and self._stop is not None:
+                self._halt()
+
+    def on_channel_changed(self, channel: str, count: int) -> None:
+        with self._lock:
+            if channel == METER_CHANNEL and self._stop is not None:
+                self._follow_billy()
+
+    # ---- Lifecycle -------------------------------------------------------
+    def _start(self) -> None:
+        self._stop = stop = threading.Event()
+        self._status = {}
+        self._backlog.clear()
+        self._cursor = None
+        self._state_dirty.set()
+        self._follow_billy()
+        for target in (self._follow_journal, self._watch_status):
+            threading.Thread(target=target, args=(stop,), daemon=True).start()
+
+    def _follow_billy(self) -> None:
+        meters = ["meter"] if hub.channel_count(METER_CHANNEL) else []
+        billy.follow_events(BILLY_TOPICS + meters)
+
+    def _halt(self) -> None:
+        self._stop.set()
+        self._stop = None
+        self._state_dirty.set()
+        billy.follow_events([])
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+
+    # ---- Producers -------------------------------------------------------
+    def _update_status(self, status: dict, stop: threading.Event) -> None:
+        with self._lock:
+            if stop.is_set():
+                return
+            delta = {k: v for k, v in status.items() if self._status.get(k) != v}
+            if not delta:
+                return
+            self._status.update(delta)
+            hub.publish({"type": "status", "data": delta})
+
+    def _publish_lines(self, lines: list[str], stop: threading.Event) -> None:
+        with self._lock:
+            if stop.is_set():
+                return
+            self._backlog.extend(lines)
+            hub.publish({"type": "log_lines", "data": {"lines": lines}})
+
+    def on_billy_event(self, topic: str, data) -> None:
+        with self._lock:
+            stop = self._stop
+        if stop is None:
+            return
+        if topic == "persona":
+            self._update_status(data, stop)
+        elif topic == "state":
+            self._update_status({"billy_state": data.get("state")}, stop)
+        elif topic == "meter":
+            hub.publish({"type": "meter", "data": data}, channel=METER_CHANNEL)
+        else:
+            hub.publish({"type": "billy", "topic": topic, "data": data})
+
+    def _watch_status(self, stop: threading.Event) -> None:
+        state = "unknown"
+        next_state_check = 0.0
+        while not stop.is_set():
+            now = time.monotonic()
+            if self._state_dirty.is_set() or now >= next_state_check:
+                self._state_dirty.clear()
+                state = get_service_state()
+                next_state_check = now + STATE_POLL_SECONDS
+            status = {"status": state}
+            if not billy.connected:
+                # Fallback without the runtime: this process's own view
+                status.update(get_persona_status())
+            self._update_status(status, stop)
+            self._state_dirty.wait(PERSONA_POLL_SECONDS)
+
+    def _follow_journal(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            args = ["journalctl", "-u", UNIT, "-f", "-o", "json", "--no-pager"]
+            if self._cursor:
+                # Resume exactly where the previous journalctl stopped
+                args.append(f"--after-cursor={self._cursor}")
+            else:
+                args += ["-n", str(BACKLOG_LINES)]
+            try:
+                proc = subprocess.Popen(
+                    args,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    bufsize=0,
+                )
+            except FileNotFoundError:
+                self._publish_lines(
+                    ["Running in development mode - no systemd logs available"], stop
+                )
+                return
+            with self._lock:
+                if stop.is_set():
+                    proc.terminate()
+                    return
+                self._proc = proc
+
+            self._read_journal(proc, stop)
+            proc.wait()
+            if not stop.is_set():
+                logger.warning("journalctl exited; restarting log follower", emoji="⚠️")
+                stop.wait(JOURNAL_RESTART_SECONDS)
+
+    def _read_journal(self, proc: subprocess.Popen, stop: threading.Event) -> None:
+        # Read the pipe unbuffered: select() on a buffered file object misses
+        # lines that are already sitting in its buffer.
+        fd = proc.stdout.fileno()
+        partial = b""
+        batch: list[str] = []
+        while True:
+            timeout = BATCH_WINDOW_SECONDS if batch else None
+            ready, _, _ = select.select([fd], [], [], timeout)
+            if not ready:
+                self._publish_lines(batch, stop)
+                batch = []
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            *lines, partial = (partial + chunk).split(b"\n")
+            for raw in lines:
+                line = self._journal_line(raw)
+                if line is not None:
+                    batch.append(line)
+                if len(batch) >= MAX_BATCH_LINES:
+                    self._publish_lines(batch, stop)
+                    batch = []
+        line = self._journal_line(partial)
+        if line is not None:
+            batch.append(line)
+        if batch:
+            self._publish_lines(batch, stop)
+
+    def _journal_line(self, raw: bytes) -> str | None:
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            return None
+        self._cursor = entry.get("__CURSOR") or self._cursor
+        if _is_systemd_entry(entry):
+            self._state_dirty.set()
+        return format_journal_entry(entry)
+
+
+# Global instance
+monitor = ServiceMonitor()
+hub.on_subscribers_changed(monitor.on_subscribers_changed)
+hub.on_channel_changed(monitor.on_channel_changed)
+billy.add_listener(monitor.on_billy_event)
+
+
+def _read_client(ws, subscription: Subscription) -> None:
+    """Handle messages from the browser (meter opt-in) until it goes away."""
+    try:
+        while True:
+            try:
+                message = json.loads(ws.receive())
+            except (TypeError, ValueError):
+                continue
+            if isinstance(message, dict) and message.get("type") == "meters":
+                if message.get("enabled"):
+                    subscription.join(METER_CHANNEL)
+                else:
+                    subscription.leave(METER_CHANNEL)
     except Exception:
-        return ""
+        pass
 
 
 @sock.route("/ws")
 def websocket_handler(ws):
     """WebSocket endpoint for real-time updates."""
-    last_status = None
-    last_logs = None
-
-    while True:
-        try:
-            # Check for status changes
-            status = get_service_status()
-            if status != last_status:
-                ws.send(json.dumps({"type": "status", "data": status}))
-                last_status = status
-
-            # Check for new logs
-            logs = get_logs(50)
-            if logs != last_logs:
-                ws.send(json.dumps({"type": "logs", "data": logs}))
-                last_logs = logs
-
-            # Sleep to avoid excessive polling
-            time.sleep(1)
-
-        except Exception:
-            break
+    subscription, snapshot = monitor.subscribe()
+    threading.Thread(target=_read_client, args=(ws, subscription), daemon=True).start()
+    try:
+        for message in snapshot:
+            ws.send(json.dumps(message))
+        while ws.connected:
+            message = subscription.get(timeout=IDLE_CHECK_SECONDS)
+            if subscription.overflowed:
+                # Too slow to keep up: start over from a fresh snapshot
+                subscription.overflowed = False
+                for message in monitor.snapshot():
+                    ws.send(json.dumps(message))
+                continue
+            if message is not None:
+                ws.send(json.dumps(message))
+    except Exception:
+        pass
+    finally:
+        subscription.close()
@@ -19,10 +19,39 @@ user_manager.load_default_user()
 
 app = create_app()
 
+# Each open tab holds a thread for its websocket (and one for a mic-check
+# stream), so leave plenty for ordinary requests
+SERVER_THREADS = 32
+
+
+def serve(port: int) -> None:
+    """Serve the app with gunicorn's threaded worker, or Werkzeug without it.
+
+    A single worker process: the websocket hub, background jobs and device
+    caches live in memory and must be shared by every request.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("⚠️ gunicorn not installed; using the Flask development server")
+        app.run(
+            host="0.0.0.0", port=port, debug=False, use_reloader=False, threaded=True
+        )
+        return
+
+    class WebconfigServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"0.0.0.0:{port}")
+            self.cfg.set("workers", 1)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("threads", SERVER_THREADS)
+            self.cfg.set("accesslog", None)
+
+        def load(self):
+            return app
+
+    WebconfigServer().run()
+
+
 if __name__ == "__main__":
-    app.run(
-        host="0.0.0.0",
-        port=int(core_config.FLASK_PORT),
-        debug=False,
-        use_reloader=False,
-    )
+    serve(int(core_config.FLASK_PORT))
@@ -1,7 +1,10 @@
 // ===================== AUDIO =====================
 const AudioPanel = (() => {
     let micCheckSource = null;
-    let serviceWasRunning = false; // Track if service was running before mic test
+    let micCheckId = null; // identifies our stream to /mic-check/stop
+    let liveMeter = null; // meter listener while showing Billy's own input
+    let serviceWasRunning = false; // Track if service was stopped for the mic test
+    const METER_WAIT_MS = 1500;
 
     const micCheckBtn = document.getElementById("mic-check-btn");
     if (micCheckBtn) {
@@ -46,8 +49,9 @@ const AudioPanel = (() => {
             btn.classList.add("bg-zinc-800");
             showNotification("Mic check stopped");
             
-            // Restart service if it was running before
+            // Restart service if it was stopped for the check
             if (serviceWasRunning) {
+                serviceWasRunning = false;
                 try {
                     showNotification("Restarting Billy service...", "warning");
                     await fetch("/restart-billy", {method: "POST"});
@@ -61,17 +65,13 @@ const AudioPanel = (() => {
         } else {
             try {
                 const data = await ServiceStatus.fetchStatus();
-                serviceWasRunning = (data.status === "active");
-                
-                if (serviceWasRunning) {
-                    showNotification("Stopping Billy service for mic test...", "warning");
-                    await fetch("/stop-billy", {method: "POST"});
-                    // Wait a moment for the service to stop
-                    await new Promise(resolve => setTimeout(resolve, 2000));
-                    showNotification("Billy service stopped. Starting mic test...", "success");
+                serviceWasRunning = false;
+                if (data.status === "active") {
+                    // Billy keeps the mic; show the meters of its own input
+                    startLiveMeter();
+                } else {
+                    startMicCheck();
                 }
-                
-                startMicCheck();
                 btn.classList.remove("bg-zinc-800");
                 btn.classList.add("bg-emerald-600");
                 showNotification("Mic check started");
@@ -83,27 +83,63 @@ const AudioPanel = (() => {
     }
 
     function stopMicCheck() {
-        if (micCheckSource) micCheckSource.close();
-        fetch("/mic-check/stop");
+        stopLiveMeter();
+        if (micCheckSource) {
+            micCheckSource.close();
+            fetch(`/mic-check/stop?id=${micCheckId}`);
+        }
         micCheckSource = null;
         updateMicBar(0);
     }
 
+    function showLevel(rms, threshold) {
+        const percent = Math.min((rms / threshold) * 100, 100);
+        const thresholdPercent = Math.min((threshold / 32768) * 100, 100);
+        updateMicBar(percent, thresholdPercent);
+    }
+
+    function startLiveMeter() {
+        const onFrame = (e) => {
+            clearTimeout(liveMeter.timer);
+            showLevel(e.detail.rms, e.detail.threshold);
+        };
+        liveMeter = {onFrame, timer: setTimeout(fallBackToDirectCheck, METER_WAIT_MS)};
+        window.addEventListener("billy:meter", onFrame);
+        window.billyWebSocket?.setMeters(true);
+    }
+
+    function stopLiveMeter() {
+        if (!liveMeter) return;
+        clearTimeout(liveMeter.timer);
+        window.removeEventListener("billy:meter", liveMeter.onFrame);
+        window.billyWebSocket?.setMeters(false);
+        liveMeter = null;
+    }
+
+    async function fallBackToDirectCheck() {
+        // Billy is idle with the wake word off, so nothing is reading the mic
+        stopLiveMeter();
+        try {
+            showNotification("Billy isn't listening right now. Stopping Billy service for mic test...", "warning");
+            serviceWasRunning = true;
+            await fetch("/stop-billy", {method: "POST"});
+            await new Promise(resolve => setTimeout(resolve, 2000));
+            if (micCheckBtn.classList.contains("bg-emerald-600")) startMicCheck();
+        } catch (err) {
+            console.error("Failed to stop Billy for mic check:", err);
+            showNotification("Mic check failed: " + err.message, "error");
+        }
+    }
+
     function startMicCheck() {
-        let maxRms = 0;
-        const SCALING_FACTOR = 32768;
-        micCheckSource = new EventSource("/mic-check");
+        micCheckId = Date.now().toString(36) + Math.random().toString(36).slice(2);
+        micCheckSource = new EventSource(`/mic-check?id=${micCheckId}`);
         micCheckSource.onmessage = (e) => {
             let data;
             try { data = JSON.parse(e.data); }
             catch (err) { console.error("Invalid JSON from /mic-check:", e.data); return; }
             if (data.error) { console.error("Mic check error:", data.error); return; }
-            const rms = data.rms * SCALING_FACTOR;
-            const threshold = data.threshold;
-            maxRms = Math.max(maxRms, rms);
-            const percent = Math.min((rms / threshold) * 100, 100);
-            const thresholdPercent = Math.min((threshold / SCALING_FACTOR) * 100, 100);
-            updateMicBar(percent, thresholdPercent);
+            showLevel(data.rms, data.threshold);
         };
         micCheckSource.onerror = () => { console.error("Mic check connection error."); stopMicCheck(); };
     }
@@ -138,15 +174,40 @@ const AudioPanel = (() => {
         }
     }
 
+    // Send slider values as they move: one request in flight, and only the
+    // latest value is sent once it returns (mixer writes are cheap now)
+    function latestValueSender(url, toBody) {
+        let pending = null;
+        let sending = false;
+        const flush = async () => {
+            sending = true;
+            while (pending !== null) {
+                const value = pending;
+                pending = null;
+                try {
+                    await fetch(url, {
+                        method: "POST",
+                        headers: {"Content-Type": "application/json"},
+                        body: JSON.stringify(toBody(value))
+                    });
+                } catch (err) {
+                    console.error(`Failed to update ${url}:`, err);
+                }
+            }
+            sending = false;
+        };
+        return (value) => {
+            pending = value;
+            if (!sending) flush();
+        };
+    }
+
     const micGainElement = document.getElementById("mic-gain");
     if (micGainElement) {
-        micGainElement.addEventListener("input", async () => {
+        const sendMicGain = latestValueSender("/mic-gain", (value) => ({value}));
+        micGainElement.addEventListener("input", () => {
             const value = parseInt(micGainElement.value, 10);
-            await fetch("/mic-gain", {
-                method: "POST",
-                headers: {"Content-Type": "application/json"},
-                body: JSON.stringify({value})
-            });
+            sendMicGain(value);
             const micGainValue = document.getElementById("mic-gain-value");
             if (micGainValue) {
                 micGainValue.textContent = value;
@@ -194,16 +255,9 @@ const AudioPanel = (() => {
                     }
                 }
             });
-        let volumeDebounceTimeout;
+        const sendVolume = latestValueSender("/volume", (volume) => ({volume}));
         speakerSlider.addEventListener("input", () => {
-        clearTimeout(volumeDebounceTimeout);
-        volumeDebounceTimeout = setTimeout(() => {
-            fetch("/volume", {
-                method: "POST",
-                headers: {"Content-Type": "application/json"},
-                body: JSON.stringify({volume: parseInt(speakerSlider.value)})
-            }).catch(err => console.error("Failed to set speaker volume:", err));
-        }, 500);
+            sendVolume(parseInt(speakerSlider.value, 10));
         });
     }
 
@@ -4,6 +4,8 @@ const LogPanel = (() => {
     let isLogHidden = true;
     let isReleaseHidden = true;
     let restoreSettingsPanelAfterEnvClose = false;
+    let logLines = [];
+    const MAX_LOG_LINES = 500;
 
     const rebootBilly = async () => {
         if (!confirm("Are you sure you want to reboot Billy? This will reboot the whole system.")) return;
@@ -197,9 +199,9 @@ const LogPanel = (() => {
         }
     };
 
-    const updateLogsUI = (logs) => {
+    const renderLogs = () => {
         if (!elements.logOutput || !elements.logContainer) return;
-        elements.logOutput.textContent = logs;
+        elements.logOutput.textContent = logLines.join("\n");
         if (autoScrollEnabled) {
             requestAnimationFrame(() => {
                 elements.logContainer.scrollTop = elements.logContainer.scrollHeight;
@@ -207,8 +209,22 @@ const LogPanel = (() => {
         }
     };
 
+    const updateLogsUI = (logs) => {
+        logLines = logs.replace(/\n$/, "").split("\n");
+        renderLogs();
+    };
+
+    const appendLogLines = (lines, reset = false) => {
+        logLines = reset ? [...lines] : logLines.concat(lines);
+        if (logLines.length > MAX_LOG_LINES) {
+            logLines = logLines.slice(-MAX_LOG_LINES);
+        }
+        renderLogs();
+    };
+
     // Expose for WebSocket
     window.updateLogs = updateLogsUI;
+    window.appendLogLines = appendLogLines;
 
     const toggleLogPanel = () => {
         isLogHidden = !isLogHidden;
@@ -21,6 +21,12 @@
         button.classList.toggle("cursor-not-allowed", !!loading);
     };
 
+    const showUpdateProgress = (title, job) => {
+        if (!job.message || !window.LoadingOverlay || !window.LoadingOverlay.show) return;
+        const percent = Math.round((job.progress || 0) * 100);
+        window.LoadingOverlay.show(`${title} ${job.message} (${percent}%)`);
+    };
+
     fetch("/version")
         .then(res => res.json())
         .then(data => {
@@ -53,8 +59,12 @@
         }
         showNotification("Update started");
         fetch("/update", {method: "POST"})
-            .then(res => res.json())
-            .then(data => {
+            .then(async res => {
+                const data = await res.json();
+                if (!res.ok) throw new Error(data.error || "Update failed");
+                return data;
+            })
+            .then(async data => {
                 if (data.status === "up-to-date") {
                     showNotification("Already up to date.", "info");
                     setButtonLoading(updateBtn, false);
@@ -63,6 +73,12 @@
                     }
                     return;
                 }
+                if (data.job) {
+                    // Runs as a background job; the services restart after it
+                    data = await window.billyJobs.wait(data.job, (job) => {
+                        showUpdateProgress("Updating software...", job);
+                    });
+                }
                 if (data.message) { showNotification(data.message); }
                 let attempts = 0, maxAttempts = 24;
                 const checkForUpdate = async () => {
@@ -91,7 +107,8 @@
             })
             .catch(err => {
                 console.error("Failed to update:", err);
-                showNotification("Failed to update", "error");
+                showNotification(`Failed to update: ${err.message}`, "error");
+                sessionStorage.removeItem("billy:reload_on_ws_reconnect");
                 setButtonLoading(updateBtn, false);
                 if (window.LoadingOverlay && window.LoadingOverlay.hide) {
                     window.LoadingOverlay.hide();
@@ -117,7 +134,7 @@
                 clearTimeout(simulateForceReloadTimer);
                 simulateForceReloadTimer = null;
             }
-            simulateWatchdogTimer = setTimeout(() => {
+            const onWatchdog = () => {
                 setButtonLoading(simulateUpdateBtn, false);
                 if (window.LoadingOverlay && window.LoadingOverlay.hide) {
                     window.LoadingOverlay.hide();
@@ -128,7 +145,8 @@
                     3000
                 );
                 setTimeout(() => location.reload(), 1200);
-            }, 30000);
+            };
+            simulateWatchdogTimer = setTimeout(onWatchdog, 30000);
             try {
                 const controller = new AbortController();
                 const requestTimeout = setTimeout(() => controller.abort(), 15000);
@@ -146,6 +164,15 @@
                 if (!res.ok || !data || data.status === "error") {
                     throw new Error((data && data.error) || "Reinstall failed");
                 }
+                if (data.job) {
+                    // The reinstall runs as a background job; the watchdog
+                    // covers the restart once it has finished
+                    clearTimeout(simulateWatchdogTimer);
+                    data = await window.billyJobs.wait(data.job, (job) => {
+                        showUpdateProgress("Reinstalling current version...", job);
+                    });
+                    simulateWatchdogTimer = setTimeout(onWatchdog, 30000);
+                }
                 if (data.status === "restarting") {
                     showNotification(data.message || "Restarting services...", "success");
                     waitForReconnect = true;
@@ -185,7 +212,7 @@
                 showNotification(data.message || "Reinstall complete", "success");
             } catch (err) {
                 console.error("Failed to reinstall current version:", err);
-                showNotification("Failed to reinstall current version", "error");
+                showNotification(`Failed to reinstall current version: ${err.message}`, "error");
             } finally {
                 if (!waitForReconnect) {
                     if (simulateWatchdogTimer) {
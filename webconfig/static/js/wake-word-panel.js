@@ -61,6 +61,7 @@ const WakeWordPanel = (() => {
             const data = await res.json();
             if (data.error) throw new Error(data.error);
             updateStatusBadge(data);
+            updateGateStats(data.gate);
             // Sync enable toggle
             const toggle = document.getElementById("ww-enable-toggle");
             if (toggle) toggle.checked = data.enabled;
@@ -93,6 +94,26 @@ const WakeWordPanel = (() => {
         text.textContent = state.charAt(0).toUpperCase() + state.slice(1);
     }
 
+    function updateGateStats(gate) {
+        const el = document.getElementById("ww-gate-stats");
+        if (!el) return;
+        if (!gate || !gate.enabled || !gate.opens) {
+            el.classList.add("hidden");
+            return;
+        }
+        const pct = (value) => value == null ? "–" : `${Math.round(value * 100)}%`;
+        const latency = gate.detection_latency_ms || {};
+        const parts = [
+            `Gate ${gate.open ? "open" : "closed"}`,
+            `${gate.opens} opens, ${pct(gate.false_open_rate)} false`,
+            `engine skipped ${pct(gate.engine_skipped_fraction)} of audio`,
+        ];
+        if (gate.cpu_saved != null) parts.push(`~${(gate.cpu_saved * 100).toFixed(1)}% CPU saved`);
+        if (latency.p50 != null) parts.push(`detection p50 ${Math.round(latency.p50)} ms`);
+        el.textContent = parts.join(" · ");
+        el.classList.remove("hidden");
+    }
+
     // === Enable/Disable toggle ===
 
     async function handleToggle() {
@@ -321,9 +342,9 @@ const WakeWordPanel = (() => {
                 headers: { "Content-Type": "application/json" },
                 body: JSON.stringify({ mode: "ambient" }),
             });
-            if (!res.ok) throw new Error(`HTTP ${res.status}`);
             const data = await res.json();
             if (data.error) throw new Error(data.error);
+            if (!res.ok) throw new Error(`HTTP ${res.status}`);
 
             clearInterval(countdownInterval);
             calState.ambient = data;
@@ -392,9 +413,9 @@ const WakeWordPanel = (() => {
                 headers: { "Content-Type": "application/json" },
                 body: JSON.stringify({ mode: "phrase" }),
             });
-            if (!res.ok) throw new Error(`HTTP ${res.status}`);
             const data = await res.json();
             if (data.error) throw new Error(data.error);
+            if (!res.ok) throw new Error(`HTTP ${res.status}`);
 
             clearInterval(countdownInterval);
             calState.phrase = data;
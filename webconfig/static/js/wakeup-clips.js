@@ -64,6 +64,51 @@ function addWakeupSound(index = null, phrase = "", hasAudio = false) {
     container.appendChild(row);
 }
 
+// Generate every phrase in one job: the server reuses cached clips, batches
+// the rest over the voice provider and saves the phrases in one write
+async function generateAllWakeupClips() {
+    const button = document.getElementById("wakeup-generate-all-btn");
+    const label = document.getElementById("wakeup-generate-all-label");
+    const rows = document.querySelectorAll("#wakeup-sound-list div[data-index]");
+    const clips = Array.from(rows)
+        .map(row => ({
+            index: parseInt(row.dataset.index, 10),
+            text: row.querySelector("input[type='text']").value.trim(),
+        }))
+        .filter(clip => clip.text);
+    if (clips.length === 0) {
+        showNotification("Please enter a phrase", "warning");
+        return;
+    }
+    const selectedRow = document.querySelector('#persona-list [data-persona].border-emerald-500');
+    const currentPersona = selectedRow && selectedRow.getAttribute('data-persona') || 'default';
+
+    button.disabled = true;
+    button.classList.add("opacity-50");
+    label.textContent = `Generating 0/${clips.length}`;
+    try {
+        const res = await fetch("/wakeup/generate-batch", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ clips, persona: currentPersona }),
+        });
+        const data = await res.json();
+        if (!res.ok) throw new Error(data.error || "Failed to generate audio");
+        await window.billyJobs.wait(data.job, (job) => {
+            if (job.message) label.textContent = `Generating ${job.message.split(" ")[0]}`;
+        });
+        showNotification(`${clips.length} clips generated and saved!`, "success");
+        await loadWakeupClips();
+    } catch (err) {
+        console.error("Generate all error:", err);
+        showNotification("Generate failed: " + err.message, "error");
+    } finally {
+        button.disabled = false;
+        button.classList.remove("opacity-50");
+        label.textContent = "Generate All";
+    }
+}
+
 document.getElementById("wakeup-sound-list").addEventListener("click", async (e) => {
     const row = e.target.closest(".flex");
     if (!row) return;
@@ -124,10 +169,12 @@ document.getElementById("wakeup-sound-list").addEventListener("click", async (e)
                 headers: { "Content-Type": "application/json" },
                 body: JSON.stringify({ text: phrase, index: parseInt(clipIndex), persona: currentPersona }),
             });
+            const data = await res.json();
             if (!res.ok) {
-                const err = await res.json();
-                throw new Error(err.error || "Failed to generate audio");
+                throw new Error(data.error || "Failed to generate audio");
             }
+            // Generation runs as a background job; wait for it to finish
+            await window.billyJobs.wait(data.job);
             const resPersona = await fetch("/persona/wakeup", {
                 method: "POST",
                 headers: { "Content-Type": "application/json" },
@@ -1,6 +1,16 @@
 // WebSocket connection for real-time updates
 let ws = null;
 let reconnectTimeout = null;
+// The server sends the full status once, then only changed fields
+let serviceStatusState = {};
+// Live mic meters are only sent while some panel asks for them
+let metersWanted = false;
+
+function sendMetersWanted() {
+    if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({type: 'meters', enabled: metersWanted}));
+    }
+}
 
 function connectWebSocket() {
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
@@ -10,6 +20,8 @@ function connectWebSocket() {
     
     ws.onopen = () => {
         console.log('WebSocket connected');
+        serviceStatusState = {};
+        if (metersWanted) sendMetersWanted();
         window.dispatchEvent(new CustomEvent('billy:websocket:connected'));
         if (reconnectTimeout) {
             clearTimeout(reconnectTimeout);
@@ -22,7 +34,8 @@ function connectWebSocket() {
             const message = JSON.parse(event.data);
             
             if (message.type === 'status') {
-                const statusData = message.data;
+                serviceStatusState = {...serviceStatusState, ...message.data};
+                const statusData = serviceStatusState;
                 
                 // Update service status display
                 if (window.updateServiceStatus) {
@@ -33,11 +46,22 @@ function connectWebSocket() {
                 if (window.handleStatusUpdate && typeof statusData === 'object') {
                     window.handleStatusUpdate(statusData);
                 }
-            } else if (message.type === 'logs') {
-                // Update logs display
-                if (window.updateLogs) {
-                    window.updateLogs(message.data);
+            } else if (message.type === 'log_lines') {
+                // New journal lines; reset replaces the backlog on (re)connect
+                if (window.appendLogLines) {
+                    window.appendLogLines(message.data.lines, message.data.reset);
                 }
+            } else if (message.type === 'meter') {
+                // ~20 frames/s of peak/RMS/VAD from Billy's own mic input
+                window.dispatchEvent(new CustomEvent('billy:meter', {detail: message.data}));
+            } else if (message.type === 'job') {
+                // Progress of background jobs (clip generation, updates)
+                window.dispatchEvent(new CustomEvent('billy:job', {detail: message.data}));
+            } else if (message.type === 'billy') {
+                // Live runtime events (mic levels, wake word) from Billy itself
+                window.dispatchEvent(new CustomEvent('billy:runtime', {
+                    detail: {topic: message.topic, data: message.data}
+                }));
             }
         } catch (e) {
             console.error('Error parsing WebSocket message:', e);
@@ -56,6 +80,55 @@ function connectWebSocket() {
     };
 }
 
+// Resolve with a background job's result once it finishes (reject on error).
+// Progress arrives over the websocket; /jobs/<id> is polled while it is down,
+// and also after a few quiet seconds, since the hub may drop a lagging tab's
+// backlog (including the final job event).
+const JOB_QUIET_POLL_MS = 5000;
+
+function waitForJob(job, onProgress) {
+    return new Promise((resolve, reject) => {
+        let finished = false;
+        let poll = null;
+        let lastUpdate = Date.now();
+        const settle = (data) => {
+            if (finished || !data) return;
+            lastUpdate = Date.now();
+            if (onProgress) onProgress(data);
+            if (data.status !== 'done' && data.status !== 'error') return;
+            finished = true;
+            window.removeEventListener('billy:job', onEvent);
+            clearInterval(poll);
+            if (data.status === 'done') {
+                resolve(data.result);
+            } else {
+                reject(new Error(data.error || 'Job failed'));
+            }
+        };
+        const onEvent = (event) => {
+            if (event.detail.id === job.id) settle(event.detail);
+        };
+        const fetchJob = async () => {
+            try {
+                const res = await fetch(`/jobs/${job.id}`);
+                if (res.ok) settle(await res.json());
+            } catch (_) {
+                // Web UI restarting; try again on the next tick
+            }
+        };
+        window.addEventListener('billy:job', onEvent);
+        poll = setInterval(() => {
+            const socketDown = !ws || ws.readyState !== WebSocket.OPEN;
+            if (socketDown || Date.now() - lastUpdate >= JOB_QUIET_POLL_MS) fetchJob();
+        }, 2000);
+        settle(job);
+        // It may have finished before the listener was added
+        fetchJob();
+    });
+}
+
+window.billyJobs = {wait: waitForJob};
+
 // Auto-connect on page load
 if (document.readyState === 'loading') {
     document.addEventListener('DOMContentLoaded', connectWebSocket);
@@ -66,6 +139,10 @@ if (document.readyState === 'loading') {
 // Export for use in other scripts
 window.billyWebSocket = {
     connect: connectWebSocket,
+    setMeters: (enabled) => {
+        metersWanted = enabled;
+        sendMetersWanted();
+    },
     disconnect: () => {
         if (ws) {
             ws.close();